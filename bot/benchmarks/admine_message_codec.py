@@ -0,0 +1,72 @@
+"""Micro-benchmark for AdmineMessage encode/decode throughput.
+
+Run with ``make bench``. Compares the stdlib JSON baseline (str in/str out) with the bytes paths of each codec
+available in the current environment.
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+# Add src directory to path to allow module imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bot.models import admine_message_codec  # noqa: E402
+from bot.models.admine_message import AdmineMessage  # noqa: E402
+from bot.models.admine_message_codec import CodecType  # noqa: E402
+
+ITERATIONS = 100_000
+
+MESSAGE = AdmineMessage(
+    "server_handler",
+    ["server_on", "notification"],
+    "Server started: Minecraft 1.21.1 on 10.8.0.2:25565 with 12 mods loaded",
+)
+
+
+def _report(name: str, seconds: float):
+    print(f"{name:<28} {ITERATIONS / seconds:>12,.0f} msg/s  {seconds / ITERATIONS * 1e6:>7.2f} us/msg")
+
+
+def bench_stdlib_baseline():
+    # What the model did before the codec layer: build a dict, dumps to str, encode; decode, loads, splat.
+    def encode():
+        return json.dumps({"origin": MESSAGE.origin, "tags": list(MESSAGE.tags), "message": MESSAGE.message}).encode(
+            "utf-8"
+        )
+
+    payload = encode()
+
+    def decode():
+        data = json.loads(payload.decode("utf-8"))
+        return AdmineMessage(data["origin"], data["tags"], data["message"])
+
+    _report("stdlib json encode", timeit.timeit(encode, number=ITERATIONS))
+    _report("stdlib json decode", timeit.timeit(decode, number=ITERATIONS))
+
+
+def bench_codec(codec_type: CodecType):
+    payload = MESSAGE.to_bytes(codec_type)
+    _report(f"{codec_type.value} encode", timeit.timeit(lambda: MESSAGE.to_bytes(codec_type), number=ITERATIONS))
+    _report(
+        f"{codec_type.value} decode",
+        timeit.timeit(lambda: AdmineMessage.from_bytes(payload, codec_type), number=ITERATIONS),
+    )
+    print(f"{'':<28} payload size: {len(payload)} bytes")
+
+
+def main():
+    print(f"AdmineMessage codec benchmark ({ITERATIONS:,} iterations)")
+    print(
+        f"orjson: {'yes' if admine_message_codec.orjson else 'no'}, msgpack: {'yes' if admine_message_codec.msgpack else 'no'}"
+    )
+    print()
+    bench_stdlib_baseline()
+    bench_codec(CodecType.JSON)
+    if admine_message_codec.msgpack is not None:
+        bench_codec(CodecType.MSGPACK)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from loguru import logger
+
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage
+from bot.models.minecraft_server_status import MinecraftServerStatus
+from bot.models.resource_usage import ResourceUsage
+
+
+class AnomalyRule(NamedTuple):
+    """Alert when the smoothed ``metric`` crosses ``trigger`` and clear only once it is back past ``clear``.
+
+    ``trigger`` below ``clear`` means "alert on low values" (TPS), above means "alert on high values" (memory).
+    """
+
+    name: str
+    label: str
+    trigger: float
+    clear: float
+
+    @property
+    def alerts_on_low(self) -> bool:
+        return self.trigger < self.clear
+
+
+DEFAULT_RULES = (
+    AnomalyRule("tps", "TPS", trigger=15.0, clear=18.0),
+    AnomalyRule("cpu", "CPU usage %", trigger=90.0, clear=75.0),
+    AnomalyRule("memory", "Memory usage %", trigger=90.0, clear=85.0),
+    AnomalyRule("disk", "Disk usage %", trigger=90.0, clear=85.0),
+)
+
+
+def rules_with_thresholds(thresholds: Dict[str, Dict[str, float]]) -> Tuple[AnomalyRule, ...]:
+    """Default rules with ``{"tps": {"trigger": 12, "clear": 16}}`` style overrides applied."""
+    return tuple(
+        rule._replace(
+            trigger=float(thresholds.get(rule.name, {}).get("trigger", rule.trigger)),
+            clear=float(thresholds.get(rule.name, {}).get("clear", rule.clear)),
+        )
+        for rule in DEFAULT_RULES
+    )
+
+
+class _RuleState:
+    def __init__(self):
+        self.ewma: Optional[float] = None
+        self.streak = 0
+        self.active = False
+
+
+class AnomalyDetector:
+    """Watches polled TPS and resource usage for sustained problems.
+
+    Every sample updates an exponentially weighted moving average per rule. An alert fires once the average has been
+    past ``trigger`` for ``sustain`` samples in a row, and clears the same way past ``clear``. The gap between the two
+    thresholds keeps a value hovering around one of them from flapping. Alerts and recoveries are emitted as
+    ``notification`` events, so they reach Discord through EventHandle like any pub/sub notification.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[AdmineMessage], Awaitable[None]],
+        rules: Tuple[AnomalyRule, ...] = DEFAULT_RULES,
+        alpha: float = 0.3,
+        sustain: int = 3,
+    ):
+        self.__emit = emit
+        self.__rules = rules
+        self.__alpha = alpha
+        self.__sustain = max(1, sustain)
+        self.__states: Dict[str, _RuleState] = {rule.name: _RuleState() for rule in rules}
+
+    @property
+    def active(self) -> List[str]:
+        return [name for name, state in self.__states.items() if state.active]
+
+    async def observe(self, status: Optional[MinecraftServerStatus], resources: Optional[ResourceUsage]):
+        samples = {
+            "tps": status.tps if status is not None else None,
+            "cpu": resources.cpu_usage if resources is not None else None,
+            "memory": resources.memory_used_percent if resources is not None else None,
+            "disk": resources.disk_used_percent if resources is not None else None,
+        }
+        for rule in self.__rules:
+            value = samples.get(rule.name)
+            if value is not None:
+                await self.__update(rule, float(value))
+
+    async def __update(self, rule: AnomalyRule, value: float):
+        state = self.__states[rule.name]
+        state.ewma = value if state.ewma is None else self.__alpha * value + (1 - self.__alpha) * state.ewma
+        metrics.gauge("anomaly_ewma", {"rule": rule.name}).set(round(state.ewma, 2))
+
+        if state.active:
+            crossed = state.ewma >= rule.clear if rule.alerts_on_low else state.ewma <= rule.clear
+        else:
+            crossed = state.ewma <= rule.trigger if rule.alerts_on_low else state.ewma >= rule.trigger
+        state.streak = state.streak + 1 if crossed else 0
+        if state.streak < self.__sustain:
+            return
+
+        state.streak = 0
+        state.active = not state.active
+        metrics.gauge("anomaly_active", {"rule": rule.name}).set(1 if state.active else 0)
+        if state.active:
+            metrics.counter("anomaly_alerts_total", {"rule": rule.name}).inc()
+            direction = "below" if rule.alerts_on_low else "above"
+            text = f"⚠️ **{rule.label} alert:** averaging {state.ewma:.1f}, {direction} {rule.trigger:g}"
+            logger.warning(text)
+        else:
+            text = f"✅ **{rule.label} recovered:** averaging {state.ewma:.1f}"
+            logger.info(text)
+        try:
+            await self.__emit(AdmineMessage("Bot", ["notification"], text))
+        except Exception as e:
+            logger.error(f"Failed to emit anomaly notification: {e}")
@@ -1,14 +1,26 @@
 import asyncio
-from typing import List
+from typing import List, Optional
 
 from loguru import logger
 
+from bot.anomaly_detector import AnomalyDetector, rules_with_thresholds
 from bot.config import Config
 from bot.handles.command_handle import CommandHandle
+from bot.handles.event_deduplicator import DedupeKey, EventDeduplicator
+from bot.handles.event_dispatcher import EventDispatcher, OverflowPolicy
 from bot.handles.event_handle import EventHandle
+from bot.log_index import LogIndex
+from bot.mod_index import ModIndex
+from bot.models.admine_message import AdmineMessage
+from bot.resource_history import ResourceHistory
 from bot.services.messaging.discord_message_service import MessageServiceFactory, MessageServiceProviderType
 from bot.services.messaging.message_service import MessageService
+from bot.services.minecraft.caching_minecraft_service import CachingMinecraftServerService
+from bot.services.minecraft.log_tail import LogTail
+from bot.services.minecraft.mod_bulk_install import ModInstallWaiters
+from bot.services.minecraft.mod_list_cache import ModListCache
 from bot.services.minecraft.server_handler_api_service import MinecraftServiceFactory, MinecraftServiceProviderType
+from bot.services.minecraft.status_poller import StatusPoller
 from bot.services.pubsub.pubsub_service import PubSubService
 from bot.services.pubsub.redis_pubsub_service import PubSubServiceFactory, PubSubServiceProviderType
 from bot.services.vpn.api_vpn_service import VpnServiceFactory, VpnServiceProviderType
@@ -29,8 +41,16 @@ class Bot:
         # Minecraft Info Service Provider
         minecraft_provider_str = self.__config.get("providers.minecraft", "SERVER_HANDLER_API")
         minecraft_provider_type = MinecraftServiceProviderType[minecraft_provider_str]
-        self.__minecraft_info_service = MinecraftServiceFactory.create(minecraft_provider_type, self.__config)
+        minecraft_provider = MinecraftServiceFactory.create(minecraft_provider_type, self.__config)
+        self.__minecraft_info_service = minecraft_provider
         logger.info(f"{minecraft_provider_str} minecraft info service provider initialized.")
+        if self.__config.get("minecraft.cache.enabled", True):
+            self.__minecraft_info_service = CachingMinecraftServerService(
+                self.__minecraft_info_service,
+                ttls=self.__config.get("minecraft.cache.ttls", {}),
+                max_stale=float(self.__config.get("minecraft.cache.maxstale", 30)),
+            )
+            logger.info("Minecraft status/info/resources cache enabled.")
 
         # Vpn Service Provider
         vpn_provider_str = self.__config.get("providers.vpn", "VPN_API")
@@ -38,14 +58,107 @@ class Bot:
         self.__vpn_service = VpnServiceFactory.create(vpn_provider_type, self.__config)
         logger.info(f"{vpn_provider_str} vpn provider initialized.")
 
+        # Background status poller; it reads the provider directly so its polls are never answered from the cache
+        self.__status_poller = None
+        self.__resource_history = None
+        if self.__config.get("minecraft.poller.enabled", False):
+            self.__resource_history = ResourceHistory(int(self.__config.get("minecraft.history.capacity", 60480)))
+            self.__status_poller = StatusPoller(
+                minecraft_provider,
+                self.__message_services,
+                fast_interval=float(self.__config.get("minecraft.poller.fastinterval", 2)),
+                slow_interval=float(self.__config.get("minecraft.poller.slowinterval", 30)),
+                offline_interval=float(self.__config.get("minecraft.poller.offlineinterval", 60)),
+                settle_time=float(self.__config.get("minecraft.poller.settletime", 60)),
+                notify=bool(self.__config.get("minecraft.poller.notify", True)),
+                history=self.__resource_history,
+                anomaly_detector=self.__create_anomaly_detector(),
+            )
+            logger.info("Status poller enabled.")
+
+        # Local copy of the server log, refreshed with incremental reads; a buffer size of 0 disables it
+        self.__log_tail = None
+        log_buffer_size = int(self.__config.get("minecraft.logs.buffersize", 2000))
+        if log_buffer_size > 0:
+            log_index_size = int(self.__config.get("minecraft.logs.indexsize", 200000))
+            self.__log_tail = LogTail(
+                minecraft_provider,
+                capacity=log_buffer_size,
+                index=LogIndex(log_index_size) if log_index_size > 0 else None,
+            )
+            logger.info(f"Log tail enabled ({log_buffer_size} lines, {log_index_size} indexed for search).")
+
+        # Content-addressed record of installed mods, so the same jar isn't uploaded twice; an empty path disables it
+        self.__mod_index = None
+        mod_index_file = self.__config.get("minecraft.mods.indexfile", "./mod_index.json")
+        if mod_index_file:
+            self.__mod_index = ModIndex(mod_index_file)
+            logger.info(f"Mod index enabled ({mod_index_file}).")
+
+        # Shared by CommandHandle (bulk installs wait on it) and EventHandle (mod_install_result events resolve it)
+        self.__mod_install_waiters = ModInstallWaiters()
+
+        # Installed jar names for /list_mods and /remove_mod autocomplete, patched by install results; a TTL of 0
+        # disables it
+        self.__mod_list_cache = None
+        mod_list_ttl = float(self.__config.get("minecraft.mods.listttl", 300))
+        if mod_list_ttl > 0:
+            self.__mod_list_cache = ModListCache(mod_list_ttl)
+            logger.info(f"Mod list cache enabled ({mod_list_ttl:g}s).")
+
         self.__tasks = []
         self.__command_handle = CommandHandle(
             self.__pubsub_service,
             self.__minecraft_info_service,
             self.__vpn_service,
             self.__config,
+            self.__status_poller,
+            self.__resource_history,
+            self.__log_tail,
+            self.__mod_index,
+            self.__mod_install_waiters,
+            self.__mod_list_cache,
+        )
+        self.__event_handle = EventHandle(
+            self.__message_services,
+            self.__minecraft_info_service,
+            self.__mod_index,
+            self.__mod_install_waiters,
+            self.__mod_list_cache,
         )
-        self.__event_handle = EventHandle(self.__message_services)
+
+        # Event queue between the pubsub reader and EventHandle; 0 workers handles events inline
+        self.__event_dispatcher = None
+        event_workers = int(self.__config.get("events.workers", 4))
+        if event_workers > 0 and pubsub_provider_type == PubSubServiceProviderType.REDIS_STREAMS:
+            # Streams acknowledge an entry when the callback returns, which must mean EventHandle ran, not that the
+            # event was queued
+            logger.info("Redis Streams acknowledge after handling, so events are handled inline (events.workers=0).")
+            event_workers = 0
+        if event_workers > 0:
+            overflow_policy_str = self.__config.get("events.overflow", "BLOCK")
+            self.__event_dispatcher = EventDispatcher(
+                self.__event_handle.handle_event,
+                workers=event_workers,
+                max_queue_size=int(self.__config.get("events.queuesize", 100)),
+                overflow_policy=OverflowPolicy[overflow_policy_str],
+            )
+            logger.info(f"Event dispatcher initialized with {event_workers} workers ({overflow_policy_str}).")
+
+        # Duplicate filter in front of the queue; a TTL of 0 disables it
+        self.__event_callback = (
+            self.__event_dispatcher.submit if self.__event_dispatcher is not None else self.__event_handle.handle_event
+        )
+        dedupe_ttl = float(self.__config.get("events.dedupe.ttl", 10))
+        if dedupe_ttl > 0:
+            dedupe_key_str = self.__config.get("events.dedupe.key", "MESSAGE_ID")
+            self.__event_callback = EventDeduplicator(
+                self.__event_callback,
+                ttl=dedupe_ttl,
+                max_size=int(self.__config.get("events.dedupe.maxsize", 1024)),
+                key=DedupeKey[dedupe_key_str],
+            ).handle
+            logger.info(f"Event deduplication enabled ({dedupe_key_str}, {dedupe_ttl}s window).")
 
         # Message Service Provider
         messaging_provider_str = self.__config.get("providers.messaging", "DISCORD")
@@ -53,15 +166,38 @@ class Bot:
         self.__message_services.append(MessageServiceFactory.create(messaging_provider_type, self.__config))
         logger.info(f"{messaging_provider_str} message service provider initialized.")
 
+    def __create_anomaly_detector(self) -> Optional[AnomalyDetector]:
+        if not self.__config.get("minecraft.anomaly.enabled", True):
+            return None
+        logger.info("TPS/resource anomaly detection enabled.")
+        return AnomalyDetector(
+            self.__emit_event,
+            rules=rules_with_thresholds(self.__config.get("minecraft.anomaly.thresholds", {}) or {}),
+            alpha=float(self.__config.get("minecraft.anomaly.alpha", 0.3)),
+            sustain=int(self.__config.get("minecraft.anomaly.sustain", 3)),
+        )
+
+    async def __emit_event(self, event: AdmineMessage):
+        """Feed an event raised inside the bot through the same path as pub/sub events."""
+        await self.__event_callback(event)
+
     async def start(self):
         logger.info("Starting bot...")
 
         self.__message_services[0].set_callback(self.__command_handle.process_command)
 
+        if self.__event_dispatcher is not None:
+            self.__event_dispatcher.start()
+
         self.__tasks = [
             asyncio.create_task(self.__message_services[0].connect()),
-            asyncio.create_task(self.__pubsub_service.listen_message(self.__event_handle.handle_event)),
+            asyncio.create_task(self.__pubsub_service.listen_message(self.__event_callback)),
         ]
+        if self.__status_poller is not None:
+            self.__tasks.append(asyncio.create_task(self.__status_poller.run()))
+        log_follow_interval = float(self.__config.get("minecraft.logs.followinterval", 15))
+        if self.__log_tail is not None and self.__log_tail.index is not None and log_follow_interval > 0:
+            self.__tasks.append(asyncio.create_task(self.__log_tail.run(log_follow_interval)))
         try:
             await asyncio.gather(*self.__tasks)
         except asyncio.CancelledError:
@@ -73,7 +209,12 @@ class Bot:
             task.cancel()
         await asyncio.gather(*self.__tasks, return_exceptions=True)
 
-        self.__pubsub_service.close()
+        if self.__event_dispatcher is not None:
+            await self.__event_dispatcher.stop()
+        await self.__pubsub_service.close()
+        await self.__minecraft_info_service.close()
+        if self.__mod_index is not None:
+            await self.__mod_index.flush()
         for svc in self.__message_services:
             await svc.disconnect()
 
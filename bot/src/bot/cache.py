@@ -0,0 +1,132 @@
+import asyncio
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+from bot.metrics import metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TtlLruCache(Generic[K, V]):
+    """Size-bounded LRU whose entries also expire ``ttl`` seconds after they were stored.
+
+    A hit refreshes recency but not the expiry, so a value is never served for longer than ``ttl``.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.__max_size = max(1, max_size)
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self.__entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= self.__clock():
+            del self.__entries[key]
+            return default
+        self.__entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V):
+        now = self.__clock()
+        self.__entries[key] = (now + self.__ttl, value)
+        self.__entries.move_to_end(key)
+        self.__evict(now)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self.__entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self.__entries.clear()
+
+    def __evict(self, now: float):
+        # Least recently used entries sit at the front; drop expired ones there first, then whatever exceeds the bound.
+        while self.__entries:
+            key, (expires_at, _) = next(iter(self.__entries.items()))
+            if expires_at > now and len(self.__entries) <= self.__max_size:
+                break
+            del self.__entries[key]
+
+
+class StaleWhileRevalidateCache(Generic[K, V]):
+    """Async cache that serves stale values while refreshing them, with one upstream call per key at a time.
+
+    A value younger than ``ttl`` is returned as is. Up to ``max_stale`` seconds after that it is still returned, but
+    a background refresh is started. Older values and misses wait for a load. Concurrent callers for the same key share
+    one in-flight load. Lookups are counted in ``cache_requests_total{cache,result}`` with result ``hit``, ``stale``,
+    ``miss`` or ``coalesced``.
+    """
+
+    def __init__(self, name: str, ttl: float, max_stale: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.__ttl = ttl
+        self.__max_stale = max_stale
+        self.__clock = clock
+        self.__entries: Dict[K, Tuple[float, V]] = {}
+        self.__inflight: Dict[K, "asyncio.Future[V]"] = {}
+        self.__generation = 0
+
+    async def get(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        entry = self.__entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = self.__clock() - stored_at
+            if age < self.__ttl:
+                self.__count("hit")
+                return value
+            if age < self.__ttl + self.__max_stale:
+                self.__count("stale")
+                self.__load(key, loader)
+                return value
+            del self.__entries[key]
+
+        self.__count("coalesced" if key in self.__inflight else "miss")
+        # Shielded so a caller that gives up (e.g. a Discord timeout) doesn't cancel the load for everyone else
+        return await asyncio.shield(self.__load(key, loader))
+
+    def invalidate(self):
+        """Drop every value. Loads already in flight still answer their callers but are not stored."""
+        self.__generation += 1
+        self.__entries.clear()
+        self.__inflight.clear()
+
+    def __load(self, key: K, loader: Callable[[], Awaitable[V]]) -> "asyncio.Future[V]":
+        task = self.__inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.__fetch(key, loader, self.__generation))
+            self.__inflight[key] = task
+            task.add_done_callback(partial(self.__loaded, key))
+        return task
+
+    async def __fetch(self, key: K, loader: Callable[[], Awaitable[V]], generation: int) -> V:
+        value = await loader()
+        if generation == self.__generation:
+            self.__entries[key] = (self.__clock(), value)
+        return value
+
+    def __loaded(self, key: K, task: "asyncio.Future[V]"):
+        if self.__inflight.get(key) is task:
+            del self.__inflight[key]
+        # Retrieve the error so a failed background refresh doesn't log "exception was never retrieved"
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Cache {self.name} failed to load {key!r}: {task.exception()}")
+
+    def __count(self, result: str):
+        metrics.counter("cache_requests_total", {"cache": self.name, "result": result}).inc()
@@ -40,6 +40,12 @@ class PubSubServiceFactoryException(Exception):
         super().__init__(f"{message}: {provider_type}")
 
 
+class PubSubNoSubscriberError(Exception):
+    def __init__(self, channels, message="No subscriber received the request"):
+        self.channels = channels
+        super().__init__(f"{message}: {channels}")
+
+
 class MinecraftInfoServiceFactoryException(Exception):
     def __init__(self, provider_type, message="Failed to create Minecraft info service provider"):
         self.provider_type = provider_type
@@ -50,3 +56,23 @@ class VpnServiceFactoryException(Exception):
     def __init__(self, provider_type, message="Failed to create Vpn info service provider"):
         self.provider_type = provider_type
         super().__init__(f"{message}: {provider_type}")
+
+
+class AdmineMessageError(Exception):
+    def __init__(self, message: str = "Invalid AdmineMessage"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, service: str, retry_after: float):
+        self.service = service
+        self.retry_after = retry_after
+        super().__init__(f"{service} is unavailable, not retrying for another {retry_after:.0f}s")
+
+
+class UploadTooLargeError(Exception):
+    def __init__(self, size: int, max_bytes: int):
+        self.size = size
+        self.max_bytes = max_bytes
+        super().__init__(f"Upload is larger than the {max_bytes / 1024**2:.0f} MB limit")
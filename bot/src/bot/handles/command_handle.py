@@ -1,11 +1,30 @@
+import asyncio
+import contextlib
+import hashlib
+import os
+import re
+import time
 from functools import wraps
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Union
 
 from loguru import logger
 
 from bot.config import Config
+from bot.exceptions import PubSubNoSubscriberError, UploadTooLargeError
+from bot.jar_metadata import parse_jar_metadata, read_jar_metadata
+from bot.log_index import LEVELS, parse_time_spec
+from bot.metrics import metrics
+from bot.mod_index import INSTALLED, ModIndex
 from bot.models.admine_message import AdmineMessage
+from bot.models.dashboard import Dashboard
+from bot.resource_history import ResourceHistory
+from bot.services.minecraft.command_batch import parse_command_script, run_command_batch
+from bot.services.minecraft.log_tail import LogTail
 from bot.services.minecraft.minecraft_server_service import MinecraftServerService
+from bot.services.minecraft.mod_bulk_install import BulkModInstall, ModInstallWaiters, parse_mod_manifest
+from bot.services.minecraft.mod_list_cache import ModListCache
+from bot.services.minecraft.status_poller import StatusPoller
+from bot.services.mod_upload import JarSpool, UploadStream, hash_chunks, iter_url_chunks, url_content_length
 from bot.services.pubsub.pubsub_service import PubSubService
 from bot.services.vpn.vpn_service import VpnService
 
@@ -26,11 +45,23 @@ class CommandHandle:
         minecraft_info_service: MinecraftServerService,
         vpn_service: VpnService,
         config: Config,
+        status_poller: Optional[StatusPoller] = None,
+        resource_history: Optional[ResourceHistory] = None,
+        log_tail: Optional[LogTail] = None,
+        mod_index: Optional[ModIndex] = None,
+        mod_install_waiters: Optional[ModInstallWaiters] = None,
+        mod_list_cache: Optional[ModListCache] = None,
     ):
         self.__pubsub_service = pubsub_service
         self.__minecraft_info_service = minecraft_info_service
         self.__vpn_service = vpn_service
         self.__config = config
+        self.__status_poller = status_poller
+        self.__resource_history = resource_history
+        self.__log_tail = log_tail
+        self.__mod_index = mod_index
+        self.__mod_install_waiters = mod_install_waiters or ModInstallWaiters()
+        self.__mod_list_cache = mod_list_cache
 
         self.__HANDLES: Dict[str, Callable[[List[str]], None]] = {
             "on": self.__server_on,
@@ -38,18 +69,24 @@ class CommandHandle:
             "restart": self.__restart,
             "auth": self.__auth_member,
             "command": self.__command,
+            "command_batch": self.__command_batch,
             "info": self.__info,
             "status": self.__status,
             "resources": self.__resources,
+            "dashboard": self.__dashboard,
             "logs": self.__logs,
+            "logs_search": self.__logs_search,
             "adm": self.__turn_admin,
             "vpn_id": self.__vpn_id,
             "server_ips": self.__server_ips,
             "add_channel": self.__add_channel,
             "remove_channel": self.__remove_channel,
             "install_mod": self.__install_mod,
+            "install_mods": self.__install_mods,
             "list_mods": self.__list_mods,
             "remove_mod": self.__remove_mod,
+            "mod_suggestions": self.__mod_suggestions,
+            "metrics": self.__metrics,
         }
 
     async def process_command(
@@ -81,19 +118,41 @@ class CommandHandle:
     async def __server_on(self, args: List[str]):
         logger.debug(f"Starting server with args: {args}")
         message = AdmineMessage("Bot", ["server_on"], " ")
-        self.__pubsub_service.send_message(message)
+        return await self.__request(message, "server_on", "✅ Server started.")
 
     @admin_command
     async def __server_off(self, args: List[str]):
         logger.debug(f"Stopping server with args: {args}")
         message = AdmineMessage("Bot", ["server_off"], " ")
-        self.__pubsub_service.send_message(message)
+        return await self.__request(message, "server_off", "✅ Server stopped.")
 
     @admin_command
     async def __restart(self, args: List[str]):
         logger.debug(f"Restarting server with args: {args}")
         message = AdmineMessage("Bot", ["restart"], " ")
-        self.__pubsub_service.send_message(message)
+        return await self.__request(message, "server_on", "✅ Server restarted.")
+
+    async def __request(self, message: AdmineMessage, success_tag: str, success_text: str) -> str:
+        """Publish a lifecycle command and wait for server_handler's correlated outcome."""
+        if self.__status_poller is not None:
+            self.__status_poller.poke()
+        timeout = float(self.__config.get("pubsub.replytimeout", 180))
+        try:
+            reply = await self.__pubsub_service.request(message, [success_tag, "command_failed"], timeout)
+        except PubSubNoSubscriberError:
+            logger.warning(f"No subscriber received message with tags {message.tags}")
+            return "⚠️ No service is listening for this command. Is the server handler running?"
+        except TimeoutError:
+            return f"⏳ No answer from the server handler after {timeout:.0f}s. It may still be working on it."
+
+        if "command_failed" in reply.tags:
+            return f"❌ {reply.message}"
+        # The server changed state; don't answer the next /status from what was cached before it
+        self.__minecraft_info_service.invalidate_cache("status", "info", "resources")
+        if self.__status_poller is not None:
+            self.__status_poller.poke()
+        details = reply.message.strip()
+        return f"{success_text}\n{details}" if details else success_text
 
     async def __auth_member(self, args: List[str]):
         logger.debug(f"Authorizing members with args: {args}")
@@ -110,6 +169,20 @@ class CommandHandle:
         except Exception:
             return {"error": "Error executing command"}
 
+    @admin_command
+    async def __command_batch(self, args: List[str]):
+        """args: [script, "ordered" or "parallel"]."""
+        logger.debug(f"Execute a command batch in Minecraft with args: {args}")
+        commands = parse_command_script(args[0]) if args else []
+        if not commands:
+            return {"error": "No commands given. Separate commands with new lines or ';'."}
+        max_commands = int(self.__config.get("minecraft.commands.batchmax", 500))
+        if len(commands) > max_commands:
+            return {"error": f"Too many commands ({len(commands)}), the limit is {max_commands}."}
+        ordered = not (len(args) > 1 and args[1] == "parallel")
+        concurrency = int(self.__config.get("minecraft.commands.batchconcurrency", 4))
+        return await run_command_batch(self.__minecraft_info_service, commands, ordered, concurrency)
+
     # @admin_command
     async def __info(self, args: List[str]):
         logger.debug(f"Getting info off the server with args: {args}")
@@ -121,6 +194,9 @@ class CommandHandle:
     # admin_command
     async def __status(self, args: List[str]):
         logger.debug(f"Getting status off the server with args: {args}")
+        snapshot = self.__status_poller.fresh_snapshot() if self.__status_poller is not None else None
+        if snapshot is not None:
+            return snapshot.status
         try:
             return await self.__minecraft_info_service.get_status()
         except Exception:
@@ -129,30 +205,126 @@ class CommandHandle:
     @admin_command
     async def __resources(self, args: List[str]):
         logger.debug(f"Getting resource usage with args: {args}")
+        if args and args[0] == "history":
+            if self.__resource_history is None or not len(self.__resource_history):
+                return {"error": "No resource history yet. Enable the status poller (minecraft.poller.enabled)."}
+            return self.__resource_history.report()
+        snapshot = self.__status_poller.fresh_snapshot() if self.__status_poller is not None else None
+        if snapshot is not None and snapshot.resources is not None:
+            return snapshot.resources
         try:
             return await self.__minecraft_info_service.get_resources()
         except Exception:
             return {"error": "Error getting resource usage"}
 
+    @admin_command
+    async def __dashboard(self, args: List[str]):
+        """Status, info and resources (plus mods and server IPs when asked for) fetched concurrently.
+
+        Everything shares one deadline (``dashboard.deadline``); parts still running then are cancelled and reported
+        as timed out, so the answer takes as long as the slowest call, capped by the deadline.
+        """
+        logger.debug(f"Building dashboard with args: {args}")
+        deadline = float(self.__config.get("dashboard.deadline", 5))
+        # Parts the status poller already knows don't need a request
+        parts, missing = {}, {}
+        snapshot = self.__status_poller.fresh_snapshot() if self.__status_poller is not None else None
+        if snapshot is not None:
+            parts["status"] = snapshot.status
+            if snapshot.resources is not None:
+                parts["resources"] = snapshot.resources
+        fetches = {
+            "status": self.__minecraft_info_service.get_status,
+            "info": self.__minecraft_info_service.get_info,
+            "resources": self.__minecraft_info_service.get_resources,
+        }
+        if "mods" in args:
+            fetches["mods"] = self.__mod_listing
+        if "vpn" in args:
+            fetches["server_ips"] = self.__vpn_service.get_server_ips
+
+        started = time.perf_counter()
+        tasks = {name: asyncio.ensure_future(fetch()) for name, fetch in fetches.items() if name not in parts}
+        pending = set()
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+
+        for name, task in tasks.items():
+            if task in pending:
+                missing[name] = "timed out"
+            elif task.exception() is not None:
+                logger.warning(f"Dashboard part '{name}' failed: {task.exception()}")
+                missing[name] = "error"
+            else:
+                parts[name] = task.result()
+        elapsed = time.perf_counter() - started
+        metrics.histogram("dashboard_seconds").observe(elapsed)
+        for name in missing:
+            metrics.counter("dashboard_missing_parts_total", {"part": name}).inc()
+        return Dashboard(parts, missing, elapsed)
+
     @admin_command
     async def __logs(self, args: List[str]):
         logger.debug(f"Getting server logs with args: {args}")
 
+        max_lines = self.__log_tail.capacity if self.__log_tail is not None else 100
+        invalid = {"error": f"Invalid logs line count. Use a number between 1 and {max_lines}."}
         n = 20
         if args and args[0]:
             try:
                 n = int(args[0])
             except Exception:
-                return {"error": "Invalid logs line count. Use a number between 1 and 100."}
+                return invalid
 
-        if n < 1 or n > 100:
-            return {"error": "Invalid logs line count. Use a number between 1 and 100."}
+        if n < 1 or n > max_lines:
+            return invalid
 
         try:
+            if self.__log_tail is not None:
+                return await self.__log_tail.tail(n)
             return await self.__minecraft_info_service.get_logs(n)
         except Exception:
             return {"error": "Error getting server logs"}
 
+    @admin_command
+    async def __logs_search(self, args: List[str]):
+        """args: [query, "regex" or "keyword", level, since, until, limit]; all but the query may be empty."""
+        logger.debug(f"Searching server logs with args: {args}")
+        if self.__log_tail is None or self.__log_tail.index is None:
+            return {"error": "Log search is disabled (minecraft.logs.buffersize / minecraft.logs.indexsize)."}
+        query, mode, level, since, until, limit = (list(args) + [""] * 6)[:6]
+
+        levels = None
+        if level:
+            levels = [part.strip().upper() for part in level.split(",") if part.strip()]
+            unknown = [part for part in levels if part not in LEVELS]
+            if unknown:
+                return {"error": f"Unknown log level: {', '.join(unknown)}. Use one of {', '.join(LEVELS)}."}
+
+        now = time.time()
+        try:
+            since_ts = parse_time_spec(since, now) if since else None
+            until_ts = parse_time_spec(until, now) if until else None
+            limit_n = int(limit) if limit else 20
+        except ValueError as e:
+            return {"error": str(e)}
+        if limit_n < 1 or limit_n > 100:
+            return {"error": "Invalid result limit. Use a number between 1 and 100."}
+
+        try:
+            await self.__log_tail.refresh()
+        except Exception as e:
+            # Searching what is already indexed is still useful while server_handler is unreachable
+            logger.warning(f"Could not refresh logs before searching: {e}")
+        try:
+            return self.__log_tail.index.search(
+                query, regex=mode == "regex", levels=levels, since=since_ts, until=until_ts, limit=limit_n
+            )
+        except re.error as e:
+            return {"error": f"Invalid regex: {e}"}
+
     async def __vpn_id(self, args: List[str]):
         logger.debug(f"Getting vpn id off the server with args: {args}")
         try:
@@ -229,29 +401,188 @@ class CommandHandle:
 
         try:
             mode = args[0]
+            # Known content is not sent again unless the trailing "force" flag is given
+            force = args[-1] == "force"
             if mode == "url":
                 url = args[1]
                 logger.debug(f"Installing mod from URL: {url}")
-                return await self.__minecraft_info_service.install_mod_url(url)
+                if self.__mod_index is None:
+                    return await self.__minecraft_info_service.install_mod_url(url)
+                if not force:
+                    duplicate = await self.__mod_duplicate(self.__mod_index.by_source(url), url)
+                    if duplicate is not None:
+                        return duplicate
+                ssl_verify = bool(self.__config.get("security.ssl_verify", False))
+                # server_handler downloads the jar anyway; the bot only does too when asked to, or when it may be a copy
+                if not self.__config.get("minecraft.mods.hashurls", False) and not await self.__url_may_be_known(
+                    url, ssl_verify
+                ):
+                    return await self.__minecraft_info_service.install_mod_url(url)
+                with JarSpool() as spool:
+                    sha256, size = None, 0
+                    try:
+                        sha256, size = await hash_chunks(spool.tee(iter_url_chunks(url, ssl=ssl_verify)))
+                    except Exception as e:
+                        # server_handler may still reach it; install without deduplication
+                        logger.warning(f"Could not hash mod at {url}: {e}")
+                    if not force and sha256 is not None:
+                        duplicate = await self.__mod_duplicate(self.__mod_index.get(sha256), url)
+                        if duplicate is not None:
+                            return duplicate
+                    response = await self.__minecraft_info_service.install_mod_url(url)
+                    return await self.__record_mod(response, sha256, os.path.basename(url), size, url, spool.path)
             elif mode == "file":
                 filename = args[1]
                 file_bytes = args[2]
                 logger.debug(f"Installing mod from file: {filename} ({len(file_bytes)} bytes)")
-                return await self.__minecraft_info_service.install_mod_file(filename, file_bytes)
+                sha256 = hashlib.sha256(file_bytes).hexdigest()
+                if self.__mod_index is not None and not force:
+                    duplicate = await self.__mod_duplicate(self.__mod_index.get(sha256), f"upload:{filename}")
+                    if duplicate is not None:
+                        return duplicate
+                response = await self.__minecraft_info_service.install_mod_file(filename, file_bytes)
+                return await self.__record_mod(
+                    response, sha256, filename, len(file_bytes), f"upload:{filename}", file_bytes
+                )
+            elif mode == "stream":
+                # args: ["stream", filename, chunk iterator or a function opening one, declared size or None]
+                filename = args[1]
+                open_chunks = args[2] if callable(args[2]) else None
+                chunks = open_chunks() if open_chunks is not None else args[2]
+                declared_size = args[3] if len(args) > 3 and isinstance(args[3], int) else None
+                max_bytes = int(float(self.__config.get("minecraft.mods.maxuploadmb", 256)) * 1024**2)
+                if declared_size is not None and declared_size > max_bytes:
+                    return {"error": f"Mod file is larger than the {max_bytes // 1024**2} MB limit."}
+                source = f"upload:{filename}"
+                # Only a file the size of an installed jar can be a duplicate; hash it before uploading anything
+                if (
+                    self.__mod_index is not None
+                    and not force
+                    and open_chunks is not None
+                    and declared_size is not None
+                    and self.__mod_index.has_size(declared_size)
+                ):
+                    sha256, _ = await hash_chunks(open_chunks(), max_bytes)
+                    duplicate = await self.__mod_duplicate(self.__mod_index.get(sha256), source)
+                    if duplicate is not None:
+                        return duplicate
+                logger.debug(f"Streaming mod file: {filename} ({declared_size} bytes declared)")
+                # With an index, a copy goes to a temp file on the way through so the jar's metadata can be read
+                with JarSpool() if self.__mod_index is not None else contextlib.nullcontext() as spool:
+                    upload = UploadStream(spool.tee(chunks) if spool is not None else chunks, max_bytes)
+                    response = await self.__minecraft_info_service.install_mod_stream(filename, upload)
+                    logger.info(f"Uploaded {filename}: {upload.bytes} bytes at {upload.throughput / 1024**2:.1f} MB/s")
+                    jar = spool.path if spool is not None and spool.complete else None
+                    response = await self.__record_mod(response, upload.sha256, filename, upload.bytes, source, jar)
+                return {**response, "upload": upload.as_dict()}
             else:
                 return {"error": "Invalid mode. Use url or file."}
+        except UploadTooLargeError as e:
+            return {"error": f"Mod file is larger than the {e.max_bytes // 1024**2} MB limit."}
         except Exception as e:
             logger.error(f"Error installing mod: {e}")
             return {"error": f"Error installing mod: {str(e)}"}
 
+    @admin_command
+    async def __install_mods(self, args: List[str]):
+        """args: [manifest text: URLs or JSON]. Returns a started BulkModInstall to follow."""
+        logger.debug("Installing mods in bulk")
+        urls, rejected = parse_mod_manifest(args[0]) if args else ([], [])
+        if not urls:
+            return {"error": "No mod URLs found. Give .jar URLs separated by new lines, or a JSON manifest."}
+        max_mods = int(self.__config.get("minecraft.mods.bulkmax", 100))
+        if len(urls) > max_mods:
+            return {"error": f"Too many mods ({len(urls)}), the limit is {max_mods}."}
+        bulk = BulkModInstall(
+            urls,
+            lambda url: self.__install_mod(["url", url]),
+            self.__mod_install_waiters,
+            list_mods=self.__minecraft_info_service.list_mods,
+            concurrency=int(self.__config.get("minecraft.mods.bulkconcurrency", 4)),
+            result_timeout=float(self.__config.get("minecraft.mods.resulttimeout", 300)),
+            rejected=rejected,
+        )
+        bulk.start()
+        return bulk
+
+    async def __url_may_be_known(self, url: str, ssl_verify: bool) -> bool:
+        """Whether the size ``url`` announces is that of an installed jar. Unknown sizes are assumed to be new."""
+        try:
+            size = await url_content_length(url, ssl=ssl_verify)
+        except Exception as e:
+            logger.debug(f"Could not get the size of {url}: {e}")
+            return False
+        return size is not None and self.__mod_index.has_size(size)
+
+    async def __mod_duplicate(self, entry: Optional[dict], source: str) -> Optional[dict]:
+        """Reply for a jar that is already installed, or None. ``list_mods`` confirms it is still on the server."""
+        if entry is None or entry["status"] != INSTALLED:
+            return None
+        try:
+            listing = await self.__minecraft_info_service.list_mods()
+        except Exception as e:
+            logger.warning(f"Could not confirm {entry['filename']} is installed, installing again: {e}")
+            return None
+        # server_handler sends null for an empty mods directory
+        installed = listing.get("mods") or []
+        self.__mod_index.reconcile(installed)
+        if self.__mod_list_cache is not None:
+            self.__mod_list_cache.set(installed)
+        entry = self.__mod_index.get(entry["sha256"])
+        if entry["status"] != INSTALLED:
+            return None
+        self.__mod_index.add_source(entry["sha256"], source)
+        metrics.counter("mod_install_duplicates_total").inc()
+        logger.info(f"Skipping install from {source}: same content as installed {entry['filename']}")
+        return {
+            "status": "duplicate",
+            "message": f"Already installed as {entry['filename']}, nothing to do.",
+            "file_name": entry["filename"],
+            "sha256": entry["sha256"],
+        }
+
+    async def __record_mod(
+        self,
+        response: dict,
+        sha256: Optional[str],
+        filename: str,
+        size: int,
+        source: str,
+        jar: Union[str, bytes, None] = None,
+    ) -> dict:
+        """Index an accepted install and add its hash, plus the jar's metadata (``jar`` is a path or the content)."""
+        if sha256 is None or not isinstance(response, dict):
+            return response
+        response = {**response, "sha256": sha256}
+        if self.__mod_index is None or response.get("status") != "accepted":
+            return response
+        entry = self.__mod_index.record(sha256, filename, size, source)
+        metadata = entry.get("metadata")
+        if "metadata" not in entry and jar is not None:
+            try:
+                parse = read_jar_metadata if isinstance(jar, str) else parse_jar_metadata
+                parsed = await asyncio.to_thread(parse, jar)
+                metadata = parsed.as_dict() if parsed is not None else None
+                self.__mod_index.set_metadata(sha256, metadata)
+            except Exception as e:
+                logger.warning(f"Could not read metadata of {filename}: {e}")
+        return {**response, "metadata": metadata} if metadata else response
+
     @admin_command
     async def __list_mods(self, args: List[str]):
-        logger.debug("Listing installed mods")
+        logger.debug(f"Listing installed mods with args: {args}")
+        if "refresh" in args and self.__mod_list_cache is not None:
+            self.__mod_list_cache.invalidate()
         try:
-            return await self.__minecraft_info_service.list_mods()
+            response = await self.__mod_listing()
         except Exception as e:
             logger.error(f"Error listing mods: {e}")
             return {"error": f"Error listing mods: {str(e)}"}
+        if self.__mod_index is not None and isinstance(response, dict) and "mods" in response:
+            installed = response["mods"] or []
+            self.__mod_index.reconcile(installed)
+            response = {**response, "sources": self.__mod_index.describe(installed)}
+        return response
 
     @admin_command
     async def __remove_mod(self, args: List[str]):
@@ -261,7 +592,42 @@ class CommandHandle:
 
         try:
             filename = args[0]
-            return await self.__minecraft_info_service.remove_mod(filename)
+            response = await self.__minecraft_info_service.remove_mod(filename)
         except Exception as e:
             logger.error(f"Error removing mod: {e}")
             return {"error": f"Error removing mod: {str(e)}"}
+        if isinstance(response, dict) and response.get("success"):
+            if self.__mod_index is not None:
+                self.__mod_index.mark_removed(filename)
+            if self.__mod_list_cache is not None:
+                self.__mod_list_cache.discard(filename)
+        return response
+
+    @admin_command
+    async def __mod_suggestions(self, args: List[str]):
+        """Installed jars matching the typed prefix, for autocomplete. Answered from the mod list cache only; before
+        its first load (or once it is stale) a load is started in the background for the next keystroke."""
+        if self.__mod_list_cache is None:
+            return {"mods": []}
+        if not self.__mod_list_cache.fresh:
+            self.__mod_list_cache.refresh(self.__load_mod_names)
+        return {"mods": self.__mod_list_cache.suggest(args[0] if args else "")}
+
+    async def __mod_listing(self) -> dict:
+        """The ``list_mods`` response, from the mod list cache when there is one."""
+        if self.__mod_list_cache is None:
+            return await self.__minecraft_info_service.list_mods()
+        mods = await self.__mod_list_cache.get(self.__load_mod_names)
+        return {"mods": mods, "total": len(mods)}
+
+    async def __load_mod_names(self) -> List[str]:
+        response = await self.__minecraft_info_service.list_mods()
+        if not isinstance(response, dict) or "mods" not in response:
+            raise ValueError(f"Unexpected list_mods response: {response}")
+        # server_handler sends null for an empty mods directory
+        return response["mods"] or []
+
+    @admin_command
+    async def __metrics(self, args: List[str]):
+        logger.debug(f"Getting bot metrics with args: {args}")
+        return metrics.snapshot()
@@ -0,0 +1,69 @@
+import hashlib
+from enum import Enum, auto
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from bot.cache import TtlLruCache
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage
+
+
+class DedupeKey(Enum):
+    CONTENT = auto()
+    MESSAGE_ID = auto()
+
+
+class EventDeduplicator:
+    """Drops repeated events within a time window before they reach the handler.
+
+    ``DedupeKey.MESSAGE_ID`` (the default) only drops redeliveries of the same message and falls back to the content
+    for messages without an id. With ``DedupeKey.CONTENT`` two events are duplicates when they carry the same tags and
+    message, whoever published them, which also covers several publishers announcing the same ``server_on`` but drops
+    a real second start within the window.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[AdmineMessage], Awaitable[None]],
+        ttl: float = 10.0,
+        max_size: int = 1024,
+        key: DedupeKey = DedupeKey.MESSAGE_ID,
+    ):
+        self.__handler = handler
+        self.__key = key
+        self.__seen: TtlLruCache[bytes, bool] = TtlLruCache(max_size, ttl)
+
+        self.__hits = metrics.counter("event_dedupe_hits_total")
+        self.__misses = metrics.counter("event_dedupe_misses_total")
+        self.__size = metrics.gauge("event_dedupe_size")
+
+    async def handle(self, event: AdmineMessage):
+        key = self.__key_for(event)
+        if key in self.__seen:
+            self.__hits.inc()
+            logger.debug(f"Dropping duplicate event with tags {event.tags}")
+            return
+
+        # Recorded before handling so a copy arriving meanwhile is dropped, and forgotten if handling fails so a
+        # redelivery (e.g. a pending Redis Streams entry) is handled instead of being acknowledged as a duplicate
+        self.__seen.set(key, True)
+        self.__misses.inc()
+        self.__size.set(len(self.__seen))
+        try:
+            await self.__handler(event)
+        except Exception:
+            self.__seen.pop(key)
+            self.__size.set(len(self.__seen))
+            raise
+
+    def __key_for(self, event: AdmineMessage) -> bytes:
+        if self.__key == DedupeKey.MESSAGE_ID and event.message_id:
+            return b"id:" + event.message_id.encode("utf-8")
+        digest = hashlib.blake2b(digest_size=16)
+        for tag in event.tags:
+            digest.update(tag.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(b"\1")
+        digest.update(event.message.encode("utf-8"))
+        return digest.digest()
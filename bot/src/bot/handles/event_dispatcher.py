@@ -0,0 +1,122 @@
+import asyncio
+from collections import deque
+from enum import Enum, auto
+from typing import Awaitable, Callable, Deque, List, Optional, Tuple
+
+from loguru import logger
+
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage
+
+QueuedEvent = Tuple[AdmineMessage, float]
+
+
+class OverflowPolicy(Enum):
+    BLOCK = auto()
+    DROP_OLDEST = auto()
+    SPILL = auto()
+
+
+class _Shard:
+    def __init__(self, max_queue_size: int):
+        self.queue: asyncio.Queue[QueuedEvent] = asyncio.Queue(maxsize=max_queue_size)
+        # Overflow for SPILL. Once anything is spilled, newer events go here too so ordering is kept.
+        self.spill: Deque[QueuedEvent] = deque()
+
+    def depth(self) -> int:
+        return self.queue.qsize() + len(self.spill)
+
+
+class EventDispatcher:
+    """Bounded queue and worker pool between the pubsub reader and the event handler.
+
+    Events are sharded by their first tag, so events sharing a tag are handled in the order they arrived while
+    different tags are handled concurrently. A slow handler only delays its own shard.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[AdmineMessage], Awaitable[None]],
+        workers: int = 4,
+        max_queue_size: int = 100,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+    ):
+        self.__handler = handler
+        self.__overflow_policy = overflow_policy
+        self.__shards = [_Shard(max(1, max_queue_size)) for _ in range(max(1, workers))]
+        self.__tasks: List[asyncio.Task] = []
+
+        self.__depth = metrics.gauge("event_queue_depth")
+        self.__wait_seconds = metrics.histogram("event_queue_wait_seconds")
+        self.__dropped = metrics.counter("event_queue_dropped_total")
+        self.__spilled = metrics.counter("event_queue_spilled_total")
+
+    @property
+    def depth(self) -> int:
+        return sum(shard.depth() for shard in self.__shards)
+
+    def start(self):
+        if self.__tasks:
+            return
+        self.__tasks = [asyncio.create_task(self.__worker(shard)) for shard in self.__shards]
+        logger.info(f"Event dispatcher started with {len(self.__shards)} workers ({self.__overflow_policy.name})")
+
+    async def stop(self):
+        for task in self.__tasks:
+            task.cancel()
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        self.__tasks = []
+
+    async def join(self):
+        """Wait until every queued event has been handled."""
+        while True:
+            await asyncio.gather(*(shard.queue.join() for shard in self.__shards))
+            if not self.depth:
+                return
+
+    async def submit(self, event: AdmineMessage):
+        shard = self.__shards[self.__shard_index(event)]
+        item = (event, asyncio.get_running_loop().time())
+
+        if self.__overflow_policy == OverflowPolicy.SPILL and shard.spill:
+            self.__spill(shard, item)
+            return
+
+        try:
+            shard.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if self.__overflow_policy == OverflowPolicy.BLOCK:
+                await shard.queue.put(item)
+            elif self.__overflow_policy == OverflowPolicy.DROP_OLDEST:
+                dropped, _ = shard.queue.get_nowait()
+                shard.queue.task_done()
+                shard.queue.put_nowait(item)
+                self.__dropped.inc()
+                logger.warning(f"Event queue full, dropped oldest event with tags {dropped.tags}")
+            else:
+                self.__spill(shard, item)
+        self.__depth.set(self.depth)
+
+    def __spill(self, shard: _Shard, item: QueuedEvent):
+        shard.spill.append(item)
+        self.__spilled.inc()
+        self.__depth.set(self.depth)
+
+    def __shard_index(self, event: AdmineMessage) -> int:
+        key: Optional[str] = event.tags[0] if event.tags else None
+        return hash(key) % len(self.__shards)
+
+    async def __worker(self, shard: _Shard):
+        loop = asyncio.get_running_loop()
+        while True:
+            event, enqueued_at = await shard.queue.get()
+            if shard.spill:
+                shard.queue.put_nowait(shard.spill.popleft())
+            self.__wait_seconds.observe(loop.time() - enqueued_at)
+            self.__depth.set(self.depth)
+            try:
+                await self.__handler(event)
+            except Exception as e:
+                logger.error(f"Error handling event with tags {event.tags}: {e}")
+            finally:
+                shard.queue.task_done()
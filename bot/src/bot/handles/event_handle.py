@@ -1,14 +1,32 @@
+import time
 from typing import Callable, Dict, List, Optional
 
 from loguru import logger
 
-from bot.models.admine_message import AdmineMessage
+from bot.metrics import metrics
+from bot.mod_index import ModIndex, parse_mod_install_result
+from bot.models.admine_message import AdmineMessage, now_ms
 from bot.services.messaging.message_service import MessageService
+from bot.services.minecraft.minecraft_server_service import MinecraftServerService
+from bot.services.minecraft.mod_bulk_install import ModInstallWaiters
+from bot.services.minecraft.mod_list_cache import ModListCache
+from bot.services.pubsub.tracing import HOP_SERVICE, observe_segments
 
 
 class EventHandle:
-    def __init__(self, message_services: Optional[List[MessageService]]):
+    def __init__(
+        self,
+        message_services: Optional[List[MessageService]],
+        minecraft_service: Optional[MinecraftServerService] = None,
+        mod_index: Optional[ModIndex] = None,
+        mod_install_waiters: Optional[ModInstallWaiters] = None,
+        mod_list_cache: Optional[ModListCache] = None,
+    ):
         self.__message_services = message_services if message_services is not None else []
+        self.__minecraft_service = minecraft_service
+        self.__mod_index = mod_index
+        self.__mod_install_waiters = mod_install_waiters
+        self.__mod_list_cache = mod_list_cache
 
         self.__HANDLES: Dict[str, Callable[[AdmineMessage], None]] = {
             "server_on": self.__server_on,
@@ -16,29 +34,53 @@ class EventHandle:
             "notification": self.__notification,
             "new_server_ips": self.__new_server_ips,
             "mod_install_result": self.__mod_install_result,
+            "command_failed": self.__command_failed,
         }
 
     async def handle_event(self, event: AdmineMessage):
         logger.info(f"Handling event: {event.message}")
         tags = event.tags
+        started = time.perf_counter()
 
-        for tag in tags:
-            if tag in self.__HANDLES:
-                handler = self.__HANDLES[tag]
-                await handler(event)
-            else:
-                logger.warning(f"No handler registered for tag: {tag}")
+        try:
+            for tag in tags:
+                if tag in self.__HANDLES:
+                    handler = self.__HANDLES[tag]
+                    await handler(event)
+                else:
+                    logger.warning(f"No handler registered for tag: {tag}")
+        finally:
+            self.__record_latency(event, time.perf_counter() - started)
+
+    def __record_latency(self, event: AdmineMessage, elapsed: float):
+        tag = event.tags[0] if event.tags else "none"
+        metrics.histogram("event_handle_seconds", {"tag": tag}).observe(elapsed)
+        if not event.hops:
+            return
+
+        # Close the trace: the last segment is queueing plus handling inside the bot, the total is the whole round
+        # trip starting at the first publish (for a server_on reply, the /on that caused it).
+        handled = event.with_hop(HOP_SERVICE, "handled")
+        observe_segments(handled.hops[-2:])
+        end_to_end = max(0, now_ms() - event.hops[0].at) / 1000
+        metrics.histogram("event_end_to_end_seconds", {"tag": tag}).observe(end_to_end)
 
     async def __notify_all(self, notification: str):
         for message_service in self.__message_services:
             await message_service.send_message(notification)
 
+    def __invalidate_server_state(self):
+        if self.__minecraft_service is not None:
+            self.__minecraft_service.invalidate_cache("status", "info", "resources")
+
     async def __server_on(self, event: AdmineMessage):
         logger.debug(f"Handler: Server has started with message: {event.message}")
+        self.__invalidate_server_state()
         await self.__notify_all(f"Server has started with message: {event.message}")
 
     async def __server_off(self, event: AdmineMessage):
         logger.debug(f"Handler: Server has stopped with message: {event.message}")
+        self.__invalidate_server_state()
         await self.__notify_all(f"Server has stopped with message: {event.message}")
 
     async def __new_server_ips(self, event: AdmineMessage):
@@ -51,4 +93,25 @@ class EventHandle:
 
     async def __mod_install_result(self, event: AdmineMessage):
         logger.debug(f"Handler: Mod install result: {event.message}")
+        result = parse_mod_install_result(event.message)
+        if result is None:
+            # Some jar changed, but not one we can name; the next /list_mods reloads the list
+            if self.__mod_list_cache is not None:
+                self.__mod_list_cache.invalidate()
+        else:
+            filename, success = result
+            if self.__mod_index is not None:
+                self.__mod_index.record_result(filename, success, event.message)
+            if success and self.__mod_list_cache is not None:
+                self.__mod_list_cache.add(filename)
+            # A bulk install shows its results in its own progress message instead of one notification per mod
+            if self.__mod_install_waiters is not None and self.__mod_install_waiters.resolve(
+                filename, success, event.message
+            ):
+                return
         await self.__notify_all(f"📦 **Mod Install Result:** {event.message}")
+
+    async def __command_failed(self, event: AdmineMessage):
+        # Always paired with a notification tag, which already delivered the text. Only a reply that arrived after
+        # its request timed out gets here.
+        logger.debug(f"Handler: Uncorrelated command failure: {event.message}")
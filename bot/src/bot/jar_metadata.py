@@ -0,0 +1,174 @@
+import json
+import mmap
+import re
+import struct
+import tomllib
+import zlib
+from typing import Dict, NamedTuple, Optional
+
+# End of central directory record: signature, disk numbers, entry counts, directory size and offset, comment length
+_EOCD = struct.Struct("<4s4H2LH")
+_EOCD_SIGNATURE = b"PK\x05\x06"
+# Central directory file header, up to and including the local header offset
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+_CENTRAL_SIGNATURE = b"PK\x01\x02"
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+# Largest metadata file that is decompressed; real ones are a few KB
+_MAX_METADATA_SIZE = 1024 * 1024
+
+# Checked in this order; the first one present decides the loader
+_METADATA_FILES = (
+    ("fabric.mod.json", "Fabric"),
+    ("quilt.mod.json", "Quilt"),
+    ("META-INF/neoforge.mods.toml", "NeoForge"),
+    ("META-INF/mods.toml", "Forge"),
+)
+_MANIFEST = "META-INF/MANIFEST.MF"
+_WANTED = frozenset(name.encode() for name, _ in _METADATA_FILES) | {_MANIFEST.encode()}
+
+
+class JarMetadata(NamedTuple):
+    mod_id: str
+    name: str
+    version: str
+    loader: str
+
+    def as_dict(self) -> Dict[str, str]:
+        return self._asdict()
+
+
+def read_jar_metadata(path: str) -> Optional[JarMetadata]:
+    """Mod id, name, version and loader of the jar at ``path``, or None if it isn't a readable zip.
+
+    The file is memory-mapped and only the central directory and the metadata entries are read, so the cost doesn't
+    depend on the size of the jar.
+    """
+    with open(path, "rb") as file:
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return parse_jar_metadata(mapped)
+        except ValueError:
+            # Empty file, which mmap refuses
+            return None
+
+
+def parse_jar_metadata(data) -> Optional[JarMetadata]:
+    """Same as ``read_jar_metadata`` for a jar already in a buffer (``bytes``, ``mmap``)."""
+    entries = _central_directory(data)
+    if entries is None:
+        return None
+
+    manifest = _read_entry(data, entries[_MANIFEST]) if _MANIFEST in entries else None
+    attributes = _parse_manifest(manifest) if manifest else {}
+    for filename, loader in _METADATA_FILES:
+        if filename in entries:
+            content = _read_entry(data, entries[filename])
+            metadata = _parse_mod_file(filename, content, loader, attributes) if content else None
+            if metadata is not None:
+                return metadata
+
+    # Plain libraries and some older mods only have a manifest
+    name = attributes.get("Implementation-Title") or attributes.get("Specification-Title")
+    if not name:
+        return None
+    version = attributes.get("Implementation-Version") or attributes.get("Specification-Version") or ""
+    mod_id = attributes.get("Automatic-Module-Name", name)
+    return JarMetadata(mod_id, name, version, "Unknown")
+
+
+def _central_directory(data) -> Optional[Dict[str, tuple]]:
+    """Metadata entry name -> (method, compressed size, uncompressed size, local header offset).
+
+    Instead of walking every entry, the directory is searched for the few wanted names, so jars with thousands of
+    entries cost about the same as small ones.
+    """
+    size = len(data)
+    # The record sits before a comment of at most 64 KB
+    search_start = max(0, size - _EOCD.size - 0xFFFF)
+    eocd_at = data.rfind(_EOCD_SIGNATURE, search_start)
+    if eocd_at < 0 or eocd_at + _EOCD.size > size:
+        return None
+    _, _, _, _, _, directory_size, directory_offset, _ = _EOCD.unpack_from(data, eocd_at)
+    if directory_offset + directory_size > eocd_at:
+        # ZIP64 or a corrupt archive; mod jars are never large enough to need ZIP64
+        return None
+
+    entries = {}
+    for name in _WANTED:
+        # The name follows its fixed-size header, so a match is confirmed by the signature and length before it
+        found = data.find(name, directory_offset + _CENTRAL_HEADER.size, eocd_at)
+        while found >= 0:
+            header_at = found - _CENTRAL_HEADER.size
+            header = _CENTRAL_HEADER.unpack_from(data, header_at)
+            if header[0] == _CENTRAL_SIGNATURE and header[10] == len(name):
+                entries[name.decode()] = (header[4], header[8], header[9], header[16])
+                break
+            found = data.find(name, found + 1, eocd_at)
+    return entries
+
+
+def _read_entry(data, entry: tuple) -> Optional[bytes]:
+    method, compressed, uncompressed, offset = entry
+    if uncompressed > _MAX_METADATA_SIZE or offset + _LOCAL_HEADER.size > len(data):
+        return None
+    header = _LOCAL_HEADER.unpack_from(data, offset)
+    if header[0] != _LOCAL_SIGNATURE:
+        return None
+    start = offset + _LOCAL_HEADER.size + header[9] + header[10]
+    raw = data[start : start + compressed]
+    if method == 0:
+        return bytes(raw)
+    if method == 8:
+        try:
+            return zlib.decompressobj(-zlib.MAX_WBITS).decompress(raw, _MAX_METADATA_SIZE)
+        except zlib.error:
+            return None
+    return None
+
+
+def _parse_manifest(content: bytes) -> Dict[str, str]:
+    """Main section of a MANIFEST.MF. Lines starting with a space continue the previous value."""
+    attributes: Dict[str, str] = {}
+    key = None
+    for line in content.decode("utf-8", errors="replace").splitlines():
+        if not line:
+            break
+        if line.startswith(" ") and key is not None:
+            attributes[key] += line[1:]
+        elif ":" in line:
+            key, value = line.split(":", 1)
+            attributes[key.strip()] = value.strip()
+    return attributes
+
+
+def _parse_mod_file(filename: str, content: bytes, loader: str, attributes: Dict[str, str]) -> Optional[JarMetadata]:
+    text = content.decode("utf-8-sig", errors="replace")
+    if filename.endswith(".json"):
+        try:
+            # Real-world fabric.mod.json files often contain raw newlines inside strings
+            document = json.loads(text, strict=False)
+        except ValueError:
+            return None
+        if not isinstance(document, dict):
+            return None
+        if loader == "Quilt":
+            quilt = document.get("quilt_loader", {})
+            mod_id = quilt.get("id", "")
+            return JarMetadata(mod_id, quilt.get("metadata", {}).get("name", mod_id), quilt.get("version", ""), loader)
+        mod_id = document.get("id", "")
+        return JarMetadata(mod_id, document.get("name", mod_id), str(document.get("version", "")), loader)
+
+    try:
+        mods = tomllib.loads(text).get("mods", [])
+        mod = mods[0] if mods else {}
+    except tomllib.TOMLDecodeError:
+        # Some mods ship TOML that tomllib rejects; the first mod's keys are enough
+        mod = dict(re.findall(r'^\s*(modId|displayName|version)\s*=\s*"([^"]*)"', text, re.MULTILINE))
+    mod_id = mod.get("modId", "")
+    if not mod_id:
+        return None
+    version = str(mod.get("version", ""))
+    if "${file.jarVersion}" in version:
+        version = version.replace("${file.jarVersion}", attributes.get("Implementation-Version", "?"))
+    return JarMetadata(mod_id, mod.get("displayName", mod_id), version, loader)
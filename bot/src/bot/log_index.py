@@ -0,0 +1,209 @@
+import bisect
+import heapq
+import re
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+LEVELS = ("TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FATAL")
+
+# "[12:00:01] [Server thread/INFO]: ..." (vanilla/Fabric) and "[12:00:01] [main/WARN] [mixin/]: ..." (Forge)
+_LINE_PATTERN = re.compile(r"^\[(\d{1,2}):(\d{2}):(\d{2})(?:\.\d+)?\]\s*\[[^\]]*/([A-Z]+)\]")
+_TOKEN_PATTERN = re.compile(r"\w+")
+_DURATION_PATTERN = re.compile(r"^(\d+)\s*([smhd])$")
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class LogMatch(NamedTuple):
+    timestamp: float
+    level: str
+    line: str
+
+
+class LogSearchResult(NamedTuple):
+    matches: List[LogMatch]
+    scanned: int
+    truncated: bool
+    elapsed_ms: float
+    indexed: int
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_time_spec(spec: str, now: float) -> float:
+    """``30m``/``2h``/``1d`` ago, or ``HH:MM[:SS]`` today (yesterday if that is still ahead), as a unix time."""
+    spec = spec.strip().lower()
+    duration = _DURATION_PATTERN.match(spec)
+    if duration:
+        return now - int(duration.group(1)) * _DURATION_UNITS[duration.group(2)]
+    parts = spec.split(":")
+    if 2 <= len(parts) <= 3 and all(part.isdigit() for part in parts):
+        hour, minute, second = (int(part) for part in (parts + ["0"])[:3])
+        if hour < 24 and minute < 60 and second < 60:
+            at = datetime.fromtimestamp(now).replace(hour=hour, minute=minute, second=second, microsecond=0)
+            if at.timestamp() > now:
+                at -= timedelta(days=1)
+            return at.timestamp()
+    raise ValueError(f"Invalid time '{spec}': use a duration like 30m, 2h, 1d or a time like 14:05")
+
+
+class LogIndex:
+    """Size-bounded store of server log lines with a level index and a token inverted index.
+
+    Lines get increasing sequence numbers. Timestamps (float64, non-decreasing) live in an ``array`` so a time range
+    maps to a sequence range with bisect. Every level and every lowercase word token keeps a posting list of sequence
+    numbers in an ``array('q')``. Keyword queries walk the shortest posting list newest first and check the others with
+    bisect, level-only queries walk the level postings, and only regex queries scan lines (within the time range).
+    Every search stops as soon as ``limit`` matches are found. Evicted lines are dropped from the postings lazily, in batches.
+
+    Lines without a ``[HH:MM:SS] [thread/LEVEL]`` prefix, such as stack trace frames, inherit the timestamp and level of
+    the line before them, so a level filter of ``ERROR`` also returns the trace of an error.
+    """
+
+    def __init__(self, capacity: int = 200_000, clock: Callable[[], float] = time.time):
+        self.capacity = max(1, capacity)
+        self.__clock = clock
+        self.__lines: List[str] = []
+        self.__levels: List[str] = []
+        self.__timestamps = array("d")
+        self.__level_postings: Dict[str, array] = {}
+        self.__token_postings: Dict[str, array] = {}
+        # Sequence number of self.__lines[self.__head]; entries before __head are evicted but not yet compacted
+        self.__first_seq = 0
+        self.__head = 0
+
+    def __len__(self) -> int:
+        return len(self.__lines) - self.__head
+
+    def add(self, lines: Iterable[str]):
+        now = self.__clock()
+        midnight = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        for line in lines:
+            previous_ts = self.__timestamps[-1] if len(self.__timestamps) > self.__head else None
+            timestamp, level = self.__parse(line, midnight, now)
+            if timestamp is None:
+                timestamp = previous_ts if previous_ts is not None else now
+                level = self.__levels[-1] if previous_ts is not None else "INFO"
+            elif previous_ts is not None and timestamp < previous_ts:
+                timestamp = previous_ts
+
+            seq = self.__first_seq + len(self.__lines) - self.__head
+            self.__lines.append(line)
+            self.__levels.append(level)
+            self.__timestamps.append(timestamp)
+            self.__level_postings.setdefault(level, array("q")).append(seq)
+            for token in set(tokenize(line)):
+                self.__token_postings.setdefault(token, array("q")).append(seq)
+
+        overflow = len(self) - self.capacity
+        if overflow > 0:
+            self.__head += overflow
+            self.__first_seq += overflow
+            if self.__head >= max(1024, self.capacity // 4):
+                self.__compact()
+
+    def search(
+        self,
+        query: str = "",
+        regex: bool = False,
+        levels: Optional[Sequence[str]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 20,
+    ) -> LogSearchResult:
+        """Newest-first matches for a keyword query (all words must appear) or a regex, within the filters.
+
+        An empty query matches every line. Raises ValueError for an invalid regex.
+        """
+        started = time.perf_counter()
+        pattern = re.compile(query, re.IGNORECASE) if regex and query else None
+
+        lo = self.__head if since is None else bisect.bisect_left(self.__timestamps, since, self.__head)
+        hi = len(self.__lines) if until is None else bisect.bisect_right(self.__timestamps, until, self.__head)
+        lo_seq, hi_seq = self.__seq(lo), self.__seq(hi)
+
+        level_set = {level.upper() for level in levels} if levels else None
+        token_postings = [
+            self.__slice(self.__token_postings.get(token), lo_seq, hi_seq)
+            for token in (set(tokenize(query)) if query and not regex else ())
+        ]
+        if token_postings:
+            candidates = _intersect_newest_first(token_postings)
+        elif level_set is not None:
+            candidates = heapq.merge(
+                *(reversed(self.__slice(self.__level_postings.get(level), lo_seq, hi_seq)) for level in level_set),
+                reverse=True,
+            )
+        else:
+            candidates = reversed(range(lo_seq, hi_seq))
+
+        matches: List[LogMatch] = []
+        scanned = 0
+        truncated = False
+        for seq in candidates:
+            index = seq - self.__first_seq + self.__head
+            line = self.__lines[index]
+            scanned += 1
+            if level_set is not None and self.__levels[index] not in level_set:
+                continue
+            if pattern is not None and not pattern.search(line):
+                continue
+            if len(matches) == limit:
+                truncated = True
+                break
+            matches.append(LogMatch(self.__timestamps[index], self.__levels[index], line))
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        return LogSearchResult(matches, scanned, truncated, elapsed_ms, len(self))
+
+    def __parse(self, line: str, midnight: float, now: float):
+        match = _LINE_PATTERN.match(line)
+        if not match:
+            return None, None
+        hour, minute, second = int(match.group(1)), int(match.group(2)), int(match.group(3))
+        if hour >= 24 or minute >= 60 or second >= 60:
+            return None, None
+        level = "WARN" if match.group(4) == "WARNING" else match.group(4)
+        # Log lines carry only the time of day; pick the most recent day that doesn't put it in the future
+        timestamp = midnight + hour * 3600 + minute * 60 + second
+        if timestamp > now + 60:
+            timestamp -= 86400
+        return timestamp, level
+
+    def __seq(self, index: int) -> int:
+        return self.__first_seq + index - self.__head
+
+    def __slice(self, posting: Optional[array], lo_seq: int, hi_seq: int) -> array:
+        if posting is None:
+            return array("q")
+        return posting[bisect.bisect_left(posting, lo_seq) : bisect.bisect_left(posting, hi_seq)]
+
+    def __compact(self):
+        del self.__lines[: self.__head]
+        del self.__levels[: self.__head]
+        del self.__timestamps[: self.__head]
+        self.__head = 0
+        for postings in (self.__level_postings, self.__token_postings):
+            for key in list(postings):
+                posting = postings[key]
+                start = bisect.bisect_left(posting, self.__first_seq)
+                if start == len(posting):
+                    del postings[key]
+                elif start:
+                    del posting[:start]
+
+
+def _intersect_newest_first(postings: List[array]) -> Iterator[int]:
+    """Sequence numbers present in every posting list, newest first, walking the shortest list."""
+    shortest, *others = sorted(postings, key=len)
+    for seq in reversed(shortest):
+        if all(_contains(other, seq) for other in others):
+            yield seq
+
+
+def _contains(posting: array, seq: int) -> bool:
+    index = bisect.bisect_left(posting, seq)
+    return index < len(posting) and posting[index] == seq
@@ -0,0 +1,114 @@
+import bisect
+from typing import Dict, Optional, Tuple
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Gauge:
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket that contains it."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class MetricsRegistry:
+    """In-process registry of counters, gauges and histograms, optionally split by labels."""
+
+    def __init__(self):
+        self.__counters: Dict[Tuple[str, LabelSet], Counter] = {}
+        self.__gauges: Dict[Tuple[str, LabelSet], Gauge] = {}
+        self.__histograms: Dict[Tuple[str, LabelSet], Histogram] = {}
+
+    @staticmethod
+    def __key(name: str, labels: Optional[Dict[str, str]]) -> Tuple[str, LabelSet]:
+        return name, tuple(sorted((labels or {}).items()))
+
+    def counter(self, name: str, labels: Optional[Dict[str, str]] = None) -> Counter:
+        return self.__counters.setdefault(self.__key(name, labels), Counter())
+
+    def gauge(self, name: str, labels: Optional[Dict[str, str]] = None) -> Gauge:
+        return self.__gauges.setdefault(self.__key(name, labels), Gauge())
+
+    def histogram(
+        self, name: str, labels: Optional[Dict[str, str]] = None, buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        key = self.__key(name, labels)
+        if key not in self.__histograms:
+            self.__histograms[key] = Histogram(buckets)
+        return self.__histograms[key]
+
+    def snapshot(self) -> Dict[str, float]:
+        """Flatten every metric into ``name{label=value}`` keys for display."""
+        result: Dict[str, float] = {}
+        for (name, labels), counter in self.__counters.items():
+            result[self.__format_name(name, labels)] = counter.value
+        for (name, labels), gauge in self.__gauges.items():
+            result[self.__format_name(name, labels)] = gauge.value
+        for (name, labels), histogram in self.__histograms.items():
+            result[self.__format_name(f"{name}_count", labels)] = histogram.count
+            result[self.__format_name(f"{name}_mean", labels)] = histogram.mean
+            result[self.__format_name(f"{name}_p95", labels)] = histogram.quantile(0.95)
+            result[self.__format_name(f"{name}_max", labels)] = histogram.max
+        return result
+
+    @staticmethod
+    def __format_name(name: str, labels: LabelSet) -> str:
+        if not labels:
+            return name
+        return name + "{" + ",".join(f"{key}={value}" for key, value in labels) + "}"
+
+    def clear(self):
+        self.__counters.clear()
+        self.__gauges.clear()
+        self.__histograms.clear()
+
+
+metrics = MetricsRegistry()
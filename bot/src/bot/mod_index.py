@@ -0,0 +1,270 @@
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from loguru import logger
+
+PENDING = "pending"
+INSTALLED = "installed"
+FAILED = "failed"
+REMOVED = "removed"
+REPLACED = "replaced"
+
+# Sources kept per entry; the oldest are dropped first
+MAX_SOURCES = 5
+
+# Changes made within this many seconds of each other are saved in one write
+SAVE_DELAY = 1.0
+
+# A pending jar missing from list_mods is still being downloaded or copied; it is given up on only after this long
+PENDING_TTL = 3600.0
+
+# "create.jar: Mod installed successfully" / "Failed to install mod create.jar: ..." / "Failed to download mod ..."
+_RESULT_FAILED_PATTERN = re.compile(r"^Failed to (?:install|download) mod (.+?\.jar): ", re.IGNORECASE)
+_RESULT_OK_PATTERN = re.compile(r"^(.+?\.jar): ", re.IGNORECASE)
+
+
+def parse_mod_install_result(message: str) -> Optional[Tuple[str, bool]]:
+    """Jar name and success flag of a ``mod_install_result`` message, or None if it doesn't name a jar."""
+    failed = _RESULT_FAILED_PATTERN.match(message)
+    if failed:
+        return failed.group(1), False
+    ok = _RESULT_OK_PATTERN.match(message)
+    if ok:
+        return ok.group(1), True
+    return None
+
+
+class ModIndex:
+    """Persistent content-addressed index of the mods installed through the bot.
+
+    Entries are keyed by the SHA-256 of the jar and record its file name on the server, size, the sources it came from
+    (URLs or ``upload:<name>``), and the install status: ``pending`` until server_handler reports the result,
+    ``installed``/``failed`` after, ``removed`` once it disappears from ``list_mods`` and ``replaced`` when another jar
+    is installed under the same file name. Metadata read from the jar is cached in its entry, so it is parsed once per
+    content. Lookups by hash, source, file name and size are dictionary reads. The index is saved to ``path`` as JSON
+    (write to a temp file, then rename); without a path it lives in memory only. Inside a running event loop, changes
+    are batched for ``save_delay`` seconds and written from a worker thread, one write at a time; call ``flush`` before
+    exiting. Outside a loop every change is written at once.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        pending_ttl: float = PENDING_TTL,
+        save_delay: float = SAVE_DELAY,
+    ):
+        self.__path = path
+        self.__clock = clock
+        self.__pending_ttl = pending_ttl
+        self.__save_delay = save_delay
+        self.__dirty = False
+        self.__save_timer: Optional[asyncio.TimerHandle] = None
+        self.__writer: Optional[asyncio.Task] = None
+        self.__entries: Dict[str, dict] = {}
+        self.__sources: Dict[str, str] = {}
+        self.__files: Dict[str, str] = {}
+        self.__sizes: Dict[int, Set[str]] = {}
+        if path:
+            self.__load()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, sha256: str) -> Optional[dict]:
+        entry = self.__entries.get(sha256)
+        return _copy(entry) if entry is not None else None
+
+    def by_source(self, source: str) -> Optional[dict]:
+        sha256 = self.__sources.get(source)
+        return self.get(sha256) if sha256 is not None else None
+
+    def by_filename(self, filename: str) -> Optional[dict]:
+        """The entry currently installed (or being installed) under ``filename``."""
+        sha256 = self.__files.get(filename)
+        return self.get(sha256) if sha256 is not None else None
+
+    def has_size(self, size: int) -> bool:
+        """Whether some installed jar has exactly ``size`` bytes, i.e. whether a file of that size could be a duplicate."""
+        return any(self.__entries[sha256]["status"] == INSTALLED for sha256 in self.__sizes.get(size, ()))
+
+    def record(self, sha256: str, filename: str, size: int, source: str) -> dict:
+        """Register a jar sent to server_handler as ``filename``. Its status is pending until the result arrives."""
+        previous = self.__files.get(filename)
+        if previous is not None and previous != sha256:
+            self.__entries[previous]["status"] = REPLACED
+        entry = self.__entries.get(sha256)
+        if entry is not None and entry["filename"] != filename and self.__files.get(entry["filename"]) == sha256:
+            del self.__files[entry["filename"]]
+        if entry is None:
+            entry = {"sha256": sha256, "sources": []}
+            self.__entries[sha256] = entry
+            self.__sizes.setdefault(size, set()).add(sha256)
+        entry.update(filename=filename, size=size, status=PENDING, message="", updated_at=self.__clock())
+        self.__files[filename] = sha256
+        self.__add_source(entry, source)
+        self.__save()
+        return _copy(entry)
+
+    def add_source(self, sha256: str, source: str):
+        """Remember that ``source`` has the same content as an indexed jar."""
+        entry = self.__entries.get(sha256)
+        if entry is not None and source not in entry["sources"]:
+            self.__add_source(entry, source)
+            self.__save()
+
+    def record_result(self, filename: str, success: bool, message: str = "") -> Optional[dict]:
+        """Apply a ``mod_install_result`` to the jar sent as ``filename``. Returns the entry, if it is indexed."""
+        sha256 = self.__files.get(filename)
+        if sha256 is None:
+            return None
+        entry = self.__entries[sha256]
+        entry.update(status=INSTALLED if success else FAILED, message=message, updated_at=self.__clock())
+        self.__save()
+        return _copy(entry)
+
+    def set_metadata(self, sha256: str, metadata: Optional[dict]):
+        """Cache what was read from the jar itself (name, version, loader); None records that nothing was found."""
+        entry = self.__entries.get(sha256)
+        if entry is not None:
+            entry["metadata"] = metadata
+            self.__save()
+
+    def mark_removed(self, filename: str):
+        sha256 = self.__files.pop(filename, None)
+        if sha256 is not None:
+            self.__entries[sha256].update(status=REMOVED, updated_at=self.__clock())
+            self.__save()
+
+    def reconcile(self, installed: Iterable[str]):
+        """Align statuses with the jars server_handler reports: missing jars become ``removed``, and pending ones that
+        show up become ``installed`` (for results that were missed or came from a server_handler that doesn't name
+        the jar). A pending jar that isn't listed yet is left alone until it is ``pending_ttl`` seconds old, so its
+        result still applies."""
+        present = set(installed)
+        changed = False
+        now = self.__clock()
+        for filename, sha256 in list(self.__files.items()):
+            entry = self.__entries[sha256]
+            if filename not in present and (
+                entry["status"] == INSTALLED
+                or (entry["status"] == PENDING and now - entry["updated_at"] >= self.__pending_ttl)
+            ):
+                entry.update(status=REMOVED, updated_at=self.__clock())
+                del self.__files[filename]
+                changed = True
+            elif filename in present and entry["status"] == PENDING:
+                entry.update(status=INSTALLED, updated_at=self.__clock())
+                changed = True
+        if changed:
+            self.__save()
+
+    def describe(self, filenames: Iterable[str]) -> Dict[str, dict]:
+        """Hash, status, latest source and cached jar metadata of each indexed jar among ``filenames``."""
+        described = {}
+        for filename in filenames:
+            sha256 = self.__files.get(filename)
+            if sha256 is not None:
+                entry = self.__entries[sha256]
+                described[filename] = {
+                    "sha256": sha256,
+                    "status": entry["status"],
+                    "source": entry["sources"][-1] if entry["sources"] else None,
+                    "metadata": entry.get("metadata"),
+                }
+        return described
+
+    def entries(self) -> List[dict]:
+        return [_copy(entry) for entry in self.__entries.values()]
+
+    def __add_source(self, entry: dict, source: str):
+        if source in entry["sources"]:
+            entry["sources"].remove(source)
+        entry["sources"].append(source)
+        for dropped in entry["sources"][:-MAX_SOURCES]:
+            if self.__sources.get(dropped) == entry["sha256"]:
+                del self.__sources[dropped]
+        del entry["sources"][:-MAX_SOURCES]
+        # A URL now serving different content points at the new entry
+        self.__sources[source] = entry["sha256"]
+
+    def __load(self):
+        if not os.path.exists(self.__path):
+            return
+        try:
+            with open(self.__path, "r") as file:
+                entries = json.load(file).get("mods", [])
+            for entry in sorted(entries, key=lambda entry: entry.get("updated_at", 0)):
+                sha256 = entry["sha256"]
+                self.__entries[sha256] = entry
+                self.__sizes.setdefault(entry["size"], set()).add(sha256)
+                for source in entry["sources"]:
+                    self.__sources[source] = sha256
+                if entry["status"] not in (REMOVED, REPLACED):
+                    self.__files[entry["filename"]] = sha256
+        except (OSError, ValueError, AttributeError, KeyError, TypeError) as e:
+            # The index is an optimization; starting empty only costs one re-upload per mod
+            logger.warning(f"Could not read mod index {self.__path}, starting empty: {e!r}")
+            for lookup in (self.__entries, self.__sources, self.__files, self.__sizes):
+                lookup.clear()
+            return
+        logger.info(f"Loaded mod index with {len(self.__entries)} entries from {self.__path}.")
+
+    async def flush(self):
+        """Write any change that is still waiting for its batch to be saved."""
+        if self.__save_timer is not None:
+            self.__save_timer.cancel()
+            self.__save_timer = None
+            self.__start_writer()
+        if self.__writer is not None:
+            await asyncio.shield(self.__writer)
+
+    def __save(self):
+        if not self.__path:
+            return
+        self.__dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.__write(self.__serialize())
+            self.__dirty = False
+            return
+        # A running writer picks the change up when it is done
+        if self.__save_timer is None and self.__writer is None:
+            self.__save_timer = loop.call_later(self.__save_delay, self.__start_writer)
+
+    def __start_writer(self):
+        self.__save_timer = None
+        if self.__writer is None:
+            self.__writer = asyncio.ensure_future(self.__write_changes())
+
+    async def __write_changes(self):
+        try:
+            while self.__dirty:
+                self.__dirty = False
+                # Serialized on the loop, so the entries can't change while they are being read
+                await asyncio.to_thread(self.__write, self.__serialize())
+        finally:
+            self.__writer = None
+
+    def __serialize(self) -> str:
+        return json.dumps({"mods": list(self.__entries.values())}, indent=4)
+
+    def __write(self, data: str):
+        temp_path = f"{self.__path}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.__path)
+        except OSError as e:
+            logger.error(f"Could not save mod index {self.__path}: {e}")
+
+
+def _copy(entry: dict) -> dict:
+    return {**entry, "sources": list(entry["sources"])}
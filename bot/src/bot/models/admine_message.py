@@ -1,16 +1,202 @@
-import json
+import time
+import uuid
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Union
+
+from bot.exceptions import AdmineMessageError
+from bot.models.admine_message_codec import CodecType, get_codec
+
+
+def now_ms() -> int:
+    """Wall clock in Unix milliseconds, the unit used for every envelope timestamp."""
+    return time.time_ns() // 1_000_000
+
+
+class Hop(NamedTuple):
+    """One stamp on a message's way through the system, e.g. ``("server_handler", "receive", 1718000000123)``."""
+
+    service: str
+    stage: str
+    at: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.service}.{self.stage}"
 
 
 class AdmineMessage:
-    def __init__(self, origin: str, tags: list[str], message: str):
-        self.origin = origin
-        self.tags = tags
-        self.message = message
+    """Immutable pub/sub envelope, wire-compatible with the Go and Rust ``AdmineMessage``.
+
+    Decoding is strict about the fields it knows (types must match) and tolerant about everything else: unknown
+    fields are ignored and a null ``tags``/``message`` is read as empty.
+
+    ``message_id``, ``correlation_id``, ``emitted_at`` and ``hops`` are optional tracing fields. They are left out of
+    the payload when unset so producers that don't know them (vpn_handler) keep working. A reply carries the
+    ``correlation_id`` and ``hops`` of the message that caused it, so the full command round trip can be measured.
+    """
+
+    __slots__ = ("origin", "tags", "message", "message_id", "correlation_id", "emitted_at", "hops")
+
+    def __init__(
+        self,
+        origin: str,
+        tags: Iterable[str],
+        message: str,
+        message_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        emitted_at: Optional[int] = None,
+        hops: Iterable[Hop] = (),
+    ):
+        _set_origin(self, origin)
+        _set_tags(self, tuple(tags))
+        _set_message(self, message)
+        _set_message_id(self, message_id)
+        _set_correlation_id(self, correlation_id)
+        _set_emitted_at(self, emitted_at)
+        _set_hops(self, tuple(hops))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"AdmineMessage is immutable, cannot set '{name}'")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"AdmineMessage is immutable, cannot delete '{name}'")
+
+    def __key(self) -> tuple:
+        return (
+            self.origin,
+            self.tags,
+            self.message,
+            self.message_id,
+            self.correlation_id,
+            self.emitted_at,
+            self.hops,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AdmineMessage):
+            return NotImplemented
+        return self.__key() == other.__key()
+
+    def __hash__(self) -> int:
+        return hash(self.__key())
+
+    def __repr__(self) -> str:
+        envelope = f", message_id={self.message_id!r}" if self.message_id else ""
+        return f"AdmineMessage(origin={self.origin!r}, tags={list(self.tags)!r}, message={self.message!r}{envelope})"
+
+    def replace(self, **changes: Any) -> "AdmineMessage":
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return AdmineMessage(**fields)
+
+    def stamped(self, service: str, stage: str = "publish") -> "AdmineMessage":
+        """Return a copy ready to publish: an id and ``emitted_at`` are assigned if missing and a hop is appended."""
+        at = now_ms()
+        return self.replace(
+            message_id=self.message_id or uuid.uuid4().hex,
+            emitted_at=at,
+            hops=self.hops + (Hop(service, stage, at),),
+        )
+
+    def with_hop(self, service: str, stage: str, at: Optional[int] = None) -> "AdmineMessage":
+        return self.replace(hops=self.hops + (Hop(service, stage, now_ms() if at is None else at),))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AdmineMessage":
+        if not isinstance(data, dict):
+            raise AdmineMessageError(f"expected an object, got {type(data).__name__}")
+
+        origin = data.get("origin")
+        if not isinstance(origin, str):
+            raise AdmineMessageError("'origin' must be a string")
+
+        tags = data.get("tags") or ()
+        if not isinstance(tags, (list, tuple)):
+            raise AdmineMessageError("'tags' must be a list of strings")
+        for tag in tags:
+            if not isinstance(tag, str):
+                raise AdmineMessageError("'tags' must be a list of strings")
+
+        message = data.get("message")
+        if message is None:
+            message = ""
+        elif not isinstance(message, str):
+            raise AdmineMessageError("'message' must be a string")
+
+        message_id = data.get("id") or None
+        if message_id is not None and not isinstance(message_id, str):
+            raise AdmineMessageError("'id' must be a string")
+
+        correlation_id = data.get("correlation_id") or None
+        if correlation_id is not None and not isinstance(correlation_id, str):
+            raise AdmineMessageError("'correlation_id' must be a string")
+
+        emitted_at = data.get("emitted_at") or None
+        if emitted_at is not None and (not isinstance(emitted_at, int) or isinstance(emitted_at, bool)):
+            raise AdmineMessageError("'emitted_at' must be an integer timestamp in milliseconds")
+
+        return cls(origin, tags, message, message_id, correlation_id, emitted_at, _parse_hops(data.get("hops")))
+
+    def to_dict(self) -> dict:
+        data = {"origin": self.origin, "tags": list(self.tags), "message": self.message}
+        if self.message_id:
+            data["id"] = self.message_id
+        if self.correlation_id:
+            data["correlation_id"] = self.correlation_id
+        if self.emitted_at:
+            data["emitted_at"] = self.emitted_at
+        if self.hops:
+            data["hops"] = [{"service": hop.service, "stage": hop.stage, "at": hop.at} for hop in self.hops]
+        return data
+
+    @classmethod
+    def from_bytes(
+        cls, payload: Union[bytes, bytearray, memoryview], codec_type: Optional[CodecType] = None
+    ) -> "AdmineMessage":
+        """Decode a wire payload written with ``codec_type`` (JSON by default)."""
+        if not isinstance(payload, bytes):
+            payload = bytes(payload)
+        try:
+            data = get_codec(codec_type or CodecType.JSON).decode(payload)
+        except AdmineMessageError:
+            raise
+        except Exception as e:
+            raise AdmineMessageError(f"undecodable payload: {e}") from e
+        return cls.from_dict(data)
+
+    def to_bytes(self, codec_type: Optional[CodecType] = None) -> bytes:
+        return get_codec(codec_type or CodecType.JSON).encode(self.to_dict())
 
     @classmethod
-    def from_json_to_object(cls, json_str):
-        data = json.loads(json_str)
-        return cls(**data)
+    def from_json_to_object(cls, json_str: Union[str, bytes]):
+        if isinstance(json_str, str):
+            json_str = json_str.encode("utf-8")
+        return cls.from_bytes(json_str)
+
+    def from_object_to_json(self) -> str:
+        return self.to_bytes(CodecType.JSON).decode("utf-8")
+
+
+def _parse_hops(raw: Any) -> tuple:
+    if not raw:
+        return ()
+    if not isinstance(raw, (list, tuple)):
+        raise AdmineMessageError("'hops' must be a list")
+    hops = []
+    for item in raw:
+        if not isinstance(item, dict):
+            raise AdmineMessageError("every hop must be an object")
+        service, stage, at = item.get("service"), item.get("stage", ""), item.get("at")
+        if not isinstance(service, str) or not isinstance(stage, str) or not isinstance(at, int):
+            raise AdmineMessageError("a hop needs a string 'service' and 'stage' and an integer 'at'")
+        hops.append(Hop(service, stage, at))
+    return tuple(hops)
+
 
-    def from_object_to_json(self):
-        return json.dumps({"origin": self.origin, "tags": self.tags, "message": self.message})
+# Slot descriptors bypass the immutable __setattr__ and are cheaper than object.__setattr__ on the decode hot path.
+_set_origin = AdmineMessage.origin.__set__
+_set_tags = AdmineMessage.tags.__set__
+_set_message = AdmineMessage.message.__set__
+_set_message_id = AdmineMessage.message_id.__set__
+_set_correlation_id = AdmineMessage.correlation_id.__set__
+_set_emitted_at = AdmineMessage.emitted_at.__set__
+_set_hops = AdmineMessage.hops.__set__
@@ -0,0 +1,94 @@
+import json
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class CodecType(Enum):
+    JSON = "json"
+    MSGPACK = "msgpack"
+
+
+class AdmineMessageCodec(ABC):
+    codec_type: CodecType
+
+    @abstractmethod
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, payload: bytes) -> Any:
+        pass
+
+
+class JsonCodec(AdmineMessageCodec):
+    """Wire format shared with server_handler and vpn_handler. Uses orjson when it is installed."""
+
+    codec_type = CodecType.JSON
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def decode(self, payload: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(payload)
+        # json.loads detects the encoding of bytes input itself, no intermediate str needed
+        return json.loads(payload)
+
+
+class MsgpackCodec(AdmineMessageCodec):
+    """Compact binary format for bot-only channels. Requires the optional msgpack dependency."""
+
+    codec_type = CodecType.MSGPACK
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is not installed; install it to use the MSGPACK codec")
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+
+_CODECS: Dict[CodecType, AdmineMessageCodec] = {}
+
+
+def get_codec(codec_type: CodecType = CodecType.JSON) -> AdmineMessageCodec:
+    codec = _CODECS.get(codec_type)
+    if codec is None:
+        codec = JsonCodec() if codec_type == CodecType.JSON else MsgpackCodec()
+        _CODECS[codec_type] = codec
+    return codec
+
+
+# Channels server_handler and vpn_handler read or write; they only understand JSON
+JSON_ONLY_CHANNELS = frozenset({"command_channel", "server_channel", "vpn_channel"})
+
+
+def parse_channel_codecs(raw: Optional[Dict[str, str]]) -> Dict[str, CodecType]:
+    """Codec per channel from a ``{"channel": "msgpack"}`` config map. Channels not listed use JSON.
+
+    Publishers and subscribers of a channel must use the same map, since the codec is agreed on in configuration and
+    never guessed from the payload.
+    """
+    codecs = {channel: CodecType(value) for channel, value in (raw or {}).items()}
+    shared = sorted(
+        channel for channel, codec in codecs.items() if codec != CodecType.JSON and channel in JSON_ONLY_CHANNELS
+    )
+    if shared:
+        raise ValueError(f"Channels shared with server_handler/vpn_handler must use JSON: {', '.join(shared)}")
+    return codecs
@@ -0,0 +1,10 @@
+from typing import Any, Dict
+
+
+class Dashboard:
+    """Combined answer of /dashboard: the parts that arrived before the deadline and why the others are missing."""
+
+    def __init__(self, parts: Dict[str, Any], missing: Dict[str, str], elapsed: float):
+        self.parts = parts
+        self.missing = missing
+        self.elapsed = elapsed
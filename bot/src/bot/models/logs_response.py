@@ -1,9 +1,13 @@
+from typing import Optional
+
+
 class LogsResponse:
-    def __init__(self, lines: list[str], total: int):
+    def __init__(self, lines: list[str], total: int, cursor: Optional[str] = None):
         self.lines = lines
         self.total = total
+        self.cursor = cursor
 
     @classmethod
     def from_json(cls, json_data: dict) -> "LogsResponse":
         lines = json_data.get("lines", [])
-        return cls(lines=lines, total=int(json_data.get("total", len(lines))))
+        return cls(lines=lines, total=int(json_data.get("total", len(lines))), cursor=json_data.get("cursor") or None)
@@ -0,0 +1,112 @@
+import bisect
+import math
+import time
+from array import array
+from itertools import filterfalse
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+SERIES = ("cpu", "memory", "disk", "tps", "players")
+WINDOWS: Tuple[Tuple[str, float], ...] = (("5m", 300.0), ("1h", 3600.0), ("24h", 86400.0))
+SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+
+
+class WindowStats(NamedTuple):
+    count: int
+    min: float
+    avg: float
+    p95: float
+    max: float
+
+
+class HistoryReport(NamedTuple):
+    samples: int
+    windows: Dict[str, Dict[str, Optional[WindowStats]]]
+    sparklines: Dict[str, str]
+    sparkline_window: str
+
+
+class ResourceHistory:
+    """Fixed-size ring buffer of resource samples, stored column-wise in ``array`` buffers.
+
+    Timestamps are float64, every series is float32 with NaN for "not measured" (e.g. no TPS while the server is
+    offline). Memory is ``capacity * 28`` bytes, so a week of 10-second samples is about 1.7 MB. Samples must be
+    recorded in time order, which keeps both halves of the ring sorted and lets a window be found with bisect.
+    """
+
+    def __init__(self, capacity: int = 60480, clock: Callable[[], float] = time.time):
+        self.capacity = max(1, capacity)
+        self.__clock = clock
+        self.__timestamps = array("d", bytes(8 * self.capacity))
+        self.__series: Dict[str, array] = {name: array("f", bytes(4 * self.capacity)) for name in SERIES}
+        self.__next = 0
+        self.__size = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def record(self, timestamp: Optional[float] = None, **values: Optional[float]):
+        """Store one sample. Series not given (or None) are stored as NaN."""
+        unknown = set(values) - set(SERIES)
+        if unknown:
+            raise ValueError(f"Unknown resource series: {', '.join(sorted(unknown))}")
+        index = self.__next
+        self.__timestamps[index] = self.__clock() if timestamp is None else timestamp
+        for name, column in self.__series.items():
+            value = values.get(name)
+            column[index] = math.nan if value is None else value
+        self.__next = (index + 1) % self.capacity
+        self.__size = min(self.__size + 1, self.capacity)
+
+    def window(self, seconds: float, series: str) -> Tuple[array, array]:
+        """Timestamps and values of ``series`` for the last ``seconds``, oldest first, as contiguous copies."""
+        since = self.__clock() - seconds
+        timestamps, values = array("d"), array("f")
+        column = self.__series[series]
+        for start, end in self.__segments():
+            lo = bisect.bisect_left(self.__timestamps, since, start, end)
+            timestamps.extend(self.__timestamps[lo:end])
+            values.extend(column[lo:end])
+        return timestamps, values
+
+    def summarize(self, seconds: float) -> Dict[str, Optional[WindowStats]]:
+        return {name: _stats(self.window(seconds, name)[1]) for name in SERIES}
+
+    def sparkline(self, seconds: float, series: str, width: int = 30) -> str:
+        """One character per time slice of the window, scaled between the window's min and max."""
+        timestamps, values = self.window(seconds, series)
+        since = self.__clock() - seconds
+        sums, counts = [0.0] * width, [0] * width
+        for at, value in zip(timestamps, values):
+            if value != value:  # NaN
+                continue
+            slot = min(width - 1, int((at - since) / seconds * width))
+            sums[slot] += value
+            counts[slot] += 1
+        means = [total / count if count else None for total, count in zip(sums, counts)]
+        present = [mean for mean in means if mean is not None]
+        if not present:
+            return ""
+        low, high = min(present), max(present)
+        span = high - low or 1.0
+        top = len(SPARK_BLOCKS) - 1
+        return "".join(" " if mean is None else SPARK_BLOCKS[round((mean - low) / span * top)] for mean in means)
+
+    def report(self, sparkline_window: str = "1h", width: int = 30) -> HistoryReport:
+        windows = {label: self.summarize(seconds) for label, seconds in WINDOWS}
+        seconds = dict(WINDOWS)[sparkline_window]
+        sparklines = {name: self.sparkline(seconds, name, width) for name in ("cpu", "memory", "tps")}
+        return HistoryReport(self.__size, windows, sparklines, sparkline_window)
+
+    def __segments(self) -> List[Tuple[int, int]]:
+        # Oldest samples first: once the ring wrapped, they start at the write position
+        if self.__size < self.capacity:
+            return [(0, self.__size)]
+        return [(self.__next, self.capacity), (0, self.__next)]
+
+
+def _stats(values: array) -> Optional[WindowStats]:
+    present = sorted(filterfalse(math.isnan, values))
+    if not present:
+        return None
+    p95 = present[min(len(present) - 1, math.ceil(0.95 * len(present)) - 1)]
+    return WindowStats(len(present), present[0], math.fsum(present) / len(present), p95, present[-1])
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+from typing import Dict
+
+import aiohttp
+
+from bot.metrics import metrics
+
+
+class HttpConnectionStats:
+    """Counts new versus reused pooled connections through aiohttp's tracing hooks."""
+
+    def __init__(self, service: str):
+        self.__created = metrics.counter("http_connections_created_total", {"service": service})
+        self.__reused = metrics.counter("http_connections_reused_total", {"service": service})
+        self.__requests = metrics.counter("http_requests_total", {"service": service})
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self.__on_created)
+        trace_config.on_connection_reuseconn.append(self.__on_reused)
+        trace_config.on_request_start.append(self.__on_request)
+        return trace_config
+
+    def as_dict(self) -> Dict[str, float]:
+        created, reused = self.__created.value, self.__reused.value
+        total = created + reused
+        return {
+            "requests": self.__requests.value,
+            "connections_created": created,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / total, 3) if total else 0.0,
+        }
+
+    async def __on_created(self, session, context: SimpleNamespace, params):
+        self.__created.inc()
+
+    async def __on_reused(self, session, context: SimpleNamespace, params):
+        self.__reused.inc()
+
+    async def __on_request(self, session, context: SimpleNamespace, params):
+        self.__requests.inc()
+
+
+def create_http_session(
+    stats: HttpConnectionStats,
+    limit: int = 20,
+    limit_per_host: int = 10,
+    dns_cache_ttl: int = 300,
+    keepalive_timeout: float = 30.0,
+    ssl: bool = True,
+) -> aiohttp.ClientSession:
+    """Build a ClientSession with one keep-alive connection pool and a DNS cache. Must be called inside the loop."""
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=dns_cache_ttl,
+        keepalive_timeout=keepalive_timeout,
+        ssl=ssl,
+    )
+    return aiohttp.ClientSession(connector=connector, trace_configs=[stats.trace_config()])
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import ssl
 from enum import Enum, auto
 from typing import Any, Callable, Dict, List, Optional
@@ -10,11 +11,25 @@ from loguru import logger
 
 from bot.config import Config
 from bot.exceptions import MessageServiceFactoryError
+from bot.log_index import LogSearchResult
+from bot.models.dashboard import Dashboard
 from bot.models.logs_response import LogsResponse
 from bot.models.minecraft_server_info import MinecraftServerInfo
 from bot.models.minecraft_server_status import HealthStatus, MinecraftServerStatus, ServerStatus
 from bot.models.resource_usage import ResourceUsage
+from bot.resource_history import HistoryReport
 from bot.services.messaging.message_service import MessageService
+from bot.services.minecraft.command_batch import CommandBatchReport
+from bot.services.minecraft.mod_bulk_install import (
+    FAILED,
+    INSTALLED,
+    INSTALLING,
+    QUEUED,
+    REQUESTING,
+    SKIPPED,
+    BulkModInstall,
+)
+from bot.services.mod_upload import iter_url_chunks
 
 
 class _DiscordClient(commands.Bot):
@@ -51,6 +66,7 @@ class _DiscordClient(commands.Bot):
             connector=connector,
         )
         self.command_handle_function_callback = callback_function
+        self._ssl_verify = ssl_verify
 
         self._ready_event = asyncio.Event()
         self._administrators = administrators
@@ -70,9 +86,15 @@ class _DiscordClient(commands.Bot):
             logger.debug(f"Received 'on' command. Callback function: {self.command_handle_function_callback}")
             if self.command_handle_function_callback is not None:
                 logger.info("Calling the command handle callback with 'on'.")
-                await self.command_handle_function_callback("on", [], str(interaction.user.id), self._administrators)
-                await interaction.response.send_message("Request to start the Minecraft server received!")
-                logger.info("Sent confirmation message for 'on' command.")
+                # Starting can take minutes; the deferred response is edited once server_handler replies.
+                await interaction.response.defer(thinking=True)
+                response = await self.command_handle_function_callback(
+                    "on", [], str(interaction.user.id), self._administrators
+                )
+                await interaction.edit_original_response(
+                    content=response or "Request to start the Minecraft server received!"
+                )
+                logger.info("Sent result for 'on' command.")
             else:
                 logger.warning("Callback function not set for 'on' command.")
                 await interaction.response.send_message("No processor available for this command.")
@@ -83,9 +105,14 @@ class _DiscordClient(commands.Bot):
             logger.debug(f"Received 'off' command. Callback function: {self.command_handle_function_callback}")
             if self.command_handle_function_callback is not None:
                 logger.info("Calling the command handle callback with 'off'.")
-                await self.command_handle_function_callback("off", [], str(interaction.user.id), self._administrators)
-                await interaction.response.send_message("Request to take down the Minecraft server received!")
-                logger.info("Sent confirmation message for 'off' command.")
+                await interaction.response.defer(thinking=True)
+                response = await self.command_handle_function_callback(
+                    "off", [], str(interaction.user.id), self._administrators
+                )
+                await interaction.edit_original_response(
+                    content=response or "Request to take down the Minecraft server received!"
+                )
+                logger.info("Sent result for 'off' command.")
             else:
                 logger.warning("Callback function not set for 'off' command.")
                 await interaction.response.send_message("No processor available for this command.")
@@ -96,11 +123,14 @@ class _DiscordClient(commands.Bot):
             logger.debug(f"Received 'restart' command. Callback function: {self.command_handle_function_callback}")
             if self.command_handle_function_callback is not None:
                 logger.info("Calling the command handle callback with 'restart'.")
-                await self.command_handle_function_callback(
+                await interaction.response.defer(thinking=True)
+                response = await self.command_handle_function_callback(
                     "restart", [], str(interaction.user.id), self._administrators
                 )
-                await interaction.response.send_message("Request to restart the Minecraft server received!")
-                logger.info("Sent confirmation message for 'restart' command.")
+                await interaction.edit_original_response(
+                    content=response or "Request to restart the Minecraft server received!"
+                )
+                logger.info("Sent result for 'restart' command.")
             else:
                 logger.warning("Callback function not set for 'restart' command.")
                 await interaction.response.send_message("No processor available for this command.")
@@ -243,6 +273,48 @@ class _DiscordClient(commands.Bot):
                 logger.warning("Callback function not set for 'command' command.")
                 await interaction.response.send_message("No processor available for this command.")
 
+        # Command to run several minecraft commands at once
+        @self.tree.command(
+            name="command_batch",
+            description="Run several server commands (separated by ';' or one per line in a .txt/.mcfunction file)",
+        )
+        async def command_batch(
+            interaction: discord.Interaction,
+            script: Optional[str] = None,
+            file: Optional[discord.Attachment] = None,
+            parallel: bool = False,
+        ):
+            logger.debug(
+                f"Received 'command_batch' command. Callback function: {self.command_handle_function_callback}"
+            )
+            if self.command_handle_function_callback is None:
+                logger.warning("Callback function not set for 'command_batch' command.")
+                await interaction.response.send_message("No processor available for this command.")
+                return
+            if bool(script) == bool(file):
+                await interaction.response.send_message("❌ Please provide either a script or a file, not both.")
+                return
+            if file and file.size > 64 * 1024:
+                await interaction.response.send_message("❌ Script files are limited to 64 KB.")
+                return
+
+            await interaction.response.defer(thinking=True)
+            if file:
+                script = (await file.read()).decode("utf-8", errors="replace")
+            logger.info("Calling the command handle callback with 'command_batch'.")
+            response_data = await self.command_handle_function_callback(
+                "command_batch",
+                [script, "parallel" if parallel else "ordered"],
+                str(interaction.user.id),
+                self._administrators,
+            )
+            if isinstance(response_data, (dict, CommandBatchReport)):
+                formatted_response = self._provider._format_command_batch_response(response_data)
+            else:
+                formatted_response = str(response_data)
+            await interaction.followup.send(formatted_response)
+            logger.info("Sent confirmation message for 'command_batch' command.")
+
         # Command to get info off the server!
         @self.tree.command(
             name="info",
@@ -300,15 +372,17 @@ class _DiscordClient(commands.Bot):
             name="resources",
             description="Get host resource usage (CPU, memory, disk)",
         )
-        async def resources(interaction: discord.Interaction):
+        async def resources(interaction: discord.Interaction, history: bool = False):
             logger.debug(f"Received 'resources' command. Callback function: {self.command_handle_function_callback}")
             if self.command_handle_function_callback is not None:
                 logger.info("Calling the command handle callback with 'resources'.")
                 response_data = await self.command_handle_function_callback(
-                    "resources", [], str(interaction.user.id), self._administrators
+                    "resources", ["history"] if history else [], str(interaction.user.id), self._administrators
                 )
                 if isinstance(response_data, dict) and "error" in response_data:
                     formatted_response = self._provider._format_resources_response(response_data)
+                elif isinstance(response_data, HistoryReport):
+                    formatted_response = self._provider._format_resource_history_response(response_data)
                 elif hasattr(response_data, "cpu_usage"):
                     formatted_response = self._provider._format_resources_response(response_data)
                 else:
@@ -319,6 +393,29 @@ class _DiscordClient(commands.Bot):
                 logger.warning("Callback function not set for 'resources' command.")
                 await interaction.response.send_message("No processor available for this command.")
 
+        # Command to show status, info and resources (optionally mods and server IPs) in one embed
+        @self.tree.command(
+            name="dashboard",
+            description="Server status, info and resource usage at a glance",
+        )
+        async def dashboard(interaction: discord.Interaction, mods: bool = False, vpn: bool = False):
+            logger.debug(f"Received 'dashboard' command. Callback function: {self.command_handle_function_callback}")
+            if self.command_handle_function_callback is not None:
+                logger.info("Calling the command handle callback with 'dashboard'.")
+                args = (["mods"] if mods else []) + (["vpn"] if vpn else [])
+                await interaction.response.defer(thinking=True)
+                response_data = await self.command_handle_function_callback(
+                    "dashboard", args, str(interaction.user.id), self._administrators
+                )
+                if isinstance(response_data, Dashboard):
+                    await interaction.followup.send(embed=self._provider._format_dashboard_embed(response_data))
+                else:
+                    await interaction.followup.send(str(response_data))
+                logger.info("Sent confirmation message for 'dashboard' command.")
+            else:
+                logger.warning("Callback function not set for 'dashboard' command.")
+                await interaction.response.send_message("No processor available for this command.")
+
         # Command to get latest server logs
         @self.tree.command(
             name="logs",
@@ -346,14 +443,53 @@ class _DiscordClient(commands.Bot):
                 logger.warning("Callback function not set for 'logs' command.")
                 await interaction.response.send_message("No processor available for this command.")
 
+        # Command to search the indexed server logs
+        @self.tree.command(
+            name="logs_search",
+            description="Search the server logs by keywords or regex, level and time range",
+        )
+        async def logs_search(
+            interaction: discord.Interaction,
+            query: str = "",
+            regex: bool = False,
+            level: Optional[str] = None,
+            since: Optional[str] = None,
+            until: Optional[str] = None,
+            limit: Optional[int] = None,
+        ):
+            logger.debug(f"Received 'logs_search' command. Callback function: {self.command_handle_function_callback}")
+            if self.command_handle_function_callback is not None:
+                logger.info("Calling the command handle callback with 'logs_search'.")
+                args = [
+                    query,
+                    "regex" if regex else "keyword",
+                    level or "",
+                    since or "",
+                    until or "",
+                    str(limit) if limit is not None else "",
+                ]
+                response_data = await self.command_handle_function_callback(
+                    "logs_search", args, str(interaction.user.id), self._administrators
+                )
+                if isinstance(response_data, (dict, LogSearchResult)):
+                    formatted_response = self._provider._format_logs_search_response(response_data)
+                else:
+                    formatted_response = str(response_data)
+                await interaction.response.send_message(formatted_response)
+                logger.info("Sent confirmation message for 'logs_search' command.")
+            else:
+                logger.warning("Callback function not set for 'logs_search' command.")
+                await interaction.response.send_message("No processor available for this command.")
+
         # Command to install a mod on the server
         @self.tree.command(name="install_mod", description="Install a mod on the server (.jar file or URL)")
         async def install_mod(
             interaction: discord.Interaction,
             url: Optional[str] = None,
             file: Optional[discord.Attachment] = None,
+            force: bool = False,
         ):
-            logger.debug(f"Received 'install_mod' command. url={url}, file={file}")
+            logger.debug(f"Received 'install_mod' command. url={url}, file={file}, force={force}")
             if self.command_handle_function_callback is None:
                 await interaction.response.send_message("No processor available for this command.")
                 return
@@ -374,10 +510,17 @@ class _DiscordClient(commands.Bot):
 
                 await interaction.response.defer(thinking=True)
                 try:
-                    file_bytes = await file.read()
+                    # Streamed from the CDN straight into the upload; the jar is never held in memory whole. A function
+                    # rather than a stream, so the attachment can be read twice when it has to be hashed first.
                     response_data = await self.command_handle_function_callback(
                         "install_mod",
-                        ["file", file.filename, file_bytes],
+                        [
+                            "stream",
+                            file.filename,
+                            functools.partial(iter_url_chunks, file.url, ssl=self._ssl_verify),
+                            file.size,
+                        ]
+                        + (["force"] if force else []),
                         str(interaction.user.id),
                         self._administrators,
                     )
@@ -397,7 +540,7 @@ class _DiscordClient(commands.Bot):
                 try:
                     response_data = await self.command_handle_function_callback(
                         "install_mod",
-                        ["url", url],
+                        ["url", url] + (["force"] if force else []),
                         str(interaction.user.id),
                         self._administrators,
                     )
@@ -414,10 +557,59 @@ class _DiscordClient(commands.Bot):
             await interaction.followup.send(formatted_response)
             logger.info("Sent confirmation message for 'install_mod' command.")
 
+        # Command to install many mods at once
+        @self.tree.command(
+            name="install_mods",
+            description="Install several mods from .jar URLs (one per line) or a manifest file (.txt or .json)",
+        )
+        async def install_mods(
+            interaction: discord.Interaction,
+            urls: Optional[str] = None,
+            manifest: Optional[discord.Attachment] = None,
+        ):
+            logger.debug(f"Received 'install_mods' command. manifest={manifest}")
+            if self.command_handle_function_callback is None:
+                await interaction.response.send_message("No processor available for this command.")
+                return
+            if bool(urls) == bool(manifest):
+                await interaction.response.send_message("❌ Please provide either URLs or a manifest file, not both.")
+                return
+            if manifest and manifest.size > 256 * 1024:
+                await interaction.response.send_message("❌ Manifest files are limited to 256 KB.")
+                return
+
+            await interaction.response.defer(thinking=True)
+            if manifest:
+                urls = (await manifest.read()).decode("utf-8", errors="replace")
+            response_data = await self.command_handle_function_callback(
+                "install_mods", [urls], str(interaction.user.id), self._administrators
+            )
+            if not isinstance(response_data, BulkModInstall):
+                if isinstance(response_data, dict):
+                    await interaction.followup.send(self._provider._format_bulk_install_response(response_data))
+                else:
+                    await interaction.followup.send(str(response_data))
+                return
+
+            # One message for the whole batch, edited as results come in
+            message = await interaction.followup.send(
+                self._provider._format_bulk_install_response(response_data), wait=True
+            )
+            async for progress in response_data.updates():
+                try:
+                    await message.edit(content=self._provider._format_bulk_install_response(progress))
+                except discord.HTTPException as e:
+                    # The interaction token expires after 15 minutes; finish in a plain channel message
+                    logger.warning(f"Could not update bulk install progress: {e}")
+                    await response_data.wait()
+                    await interaction.channel.send(self._provider._format_bulk_install_response(response_data))
+                    break
+            logger.info("Finished bulk install progress for 'install_mods' command.")
+
         # Command to list installed mods
         @self.tree.command(name="list_mods", description="List all installed mods on the server")
-        async def list_mods(interaction: discord.Interaction):
-            logger.debug("Received 'list_mods' command.")
+        async def list_mods(interaction: discord.Interaction, refresh: bool = False):
+            logger.debug(f"Received 'list_mods' command. refresh={refresh}")
             if self.command_handle_function_callback is None:
                 await interaction.response.send_message("No processor available for this command.")
                 return
@@ -426,7 +618,7 @@ class _DiscordClient(commands.Bot):
             try:
                 response_data = await self.command_handle_function_callback(
                     "list_mods",
-                    [],
+                    ["refresh"] if refresh else [],
                     str(interaction.user.id),
                     self._administrators,
                 )
@@ -474,6 +666,45 @@ class _DiscordClient(commands.Bot):
             await interaction.followup.send(formatted_response)
             logger.info("Sent response for 'remove_mod' command.")
 
+        # Suggests installed jars while typing; answered from the bot's mod list cache, never from server_handler
+        @remove_mod.autocomplete("filename")
+        async def remove_mod_filename(
+            interaction: discord.Interaction, current: str
+        ) -> List[discord.app_commands.Choice[str]]:
+            if self.command_handle_function_callback is None:
+                return []
+            response_data = await self.command_handle_function_callback(
+                "mod_suggestions", [current], str(interaction.user.id), self._administrators
+            )
+            if not isinstance(response_data, dict):
+                return []
+            # Discord rejects choices longer than 100 characters
+            return [
+                discord.app_commands.Choice(name=mod, value=mod)
+                for mod in response_data.get("mods", [])
+                if len(mod) <= 100
+            ]
+
+        # Command to show internal bot metrics
+        @self.tree.command(name="metrics", description="Show internal bot metrics (pubsub, queues, latencies)")
+        async def metrics(interaction: discord.Interaction):
+            logger.debug("Received 'metrics' command.")
+            if self.command_handle_function_callback is None:
+                await interaction.response.send_message("No processor available for this command.")
+                return
+
+            response_data = await self.command_handle_function_callback(
+                "metrics", [], str(interaction.user.id), self._administrators
+            )
+
+            if isinstance(response_data, dict):
+                formatted_response = self._provider._format_metrics_response(response_data)
+            else:
+                formatted_response = str(response_data)
+
+            await interaction.response.send_message(formatted_response)
+            logger.info("Sent response for 'metrics' command.")
+
         # Help command - comprehensive guide for new players
         @self.tree.command(name="help", description="Complete guide on how to play on the server")
         async def help_command(interaction: discord.Interaction):
@@ -518,8 +749,10 @@ class _DiscordClient(commands.Bot):
                     "`/restart` - Restart the server\n"
                     "`/status` - Check server status and health\n"
                     "`/info` - Get detailed server information\n"
-                    "`/resources` - Host CPU, memory and disk usage\n"
-                    "`/logs [n]` - Show latest server logs"
+                    "`/resources` - Host CPU, memory and disk usage (`history` for 5m/1h/24h trends)\n"
+                    "`/dashboard` - Status, info and resources in one view\n"
+                    "`/logs [n]` - Show latest server logs\n"
+                    "`/logs_search` - Search logs by words/regex, level, time"
                 ),
                 inline=True,
             )
@@ -528,7 +761,8 @@ class _DiscordClient(commands.Bot):
             help_embed.add_field(
                 name="⚡ **Minecraft Commands** (Admin Only)",
                 value=(
-                    "`/command <minecraft_command>` - Execute server commands\n\n"
+                    "`/command <minecraft_command>` - Execute server commands\n"
+                    "`/command_batch` - Run many commands, separated by `;` or from a file\n\n"
                     "**Examples:**\n"
                     "• `/command say Hello everyone!`\n"
                     "• `/command tp player1 player2`\n"
@@ -559,7 +793,8 @@ class _DiscordClient(commands.Bot):
                 value=(
                     "`/adm @user` - Grant admin privileges to a user\n"
                     "`/add_channel` - Add current channel to bot's allowed channels\n"
-                    "`/remove_channel` - Remove current channel from allowed channels"
+                    "`/remove_channel` - Remove current channel from allowed channels\n"
+                    "`/metrics` - Show internal bot metrics"
                 ),
                 inline=True,
             )
@@ -671,6 +906,40 @@ class DiscordMessageServiceProvider(MessageService):
 
         return formatted_response
 
+    def _format_command_batch_response(self, data: CommandBatchReport | dict) -> str:
+        """Format a per-command batch report for Discord display."""
+        if isinstance(data, dict) and "error" in data:
+            return f"❌ **Error:** {data['error']}"
+
+        total = len(data.outcomes)
+        status_emoji = "✅" if not data.failed else "⚠️"
+        mode = "in order" if data.ordered else "in parallel"
+        header = (
+            f"{status_emoji} **Command Batch:** {total - data.failed}/{total} succeeded "
+            f"({mode}, {data.elapsed * 1000:.0f} ms)\n"
+        )
+
+        lines = []
+        for outcome in data.outcomes:
+            detail = outcome.output if outcome.ok else f"ERROR: {outcome.error}"
+            detail = " ".join(detail.split())
+            line = f"{'✓' if outcome.ok else '✗'} {outcome.command}" + (f" → {detail}" if detail else "")
+            lines.append(line if len(line) <= 120 else line[:117] + "...")
+
+        # Keep within Discord's 2000 characters; when cutting, list failures first so they are never the part dropped
+        available_length = 2000 - len(header) - len("```\n\n```") - 40
+        if sum(len(line) + 1 for line in lines) > available_length:
+            lines.sort(key=lambda line: not line.startswith("✗"))
+        shown, used = [], 0
+        for line in lines:
+            if used + len(line) + 1 > available_length:
+                break
+            shown.append(line)
+            used += len(line) + 1
+        if len(shown) < len(lines):
+            shown.append(f"... {len(lines) - len(shown)} more")
+        return header + "```\n" + "\n".join(shown) + "\n```"
+
     def _format_status_response(self, status: MinecraftServerStatus) -> str:
         """Format the server status response for Discord display."""
         if hasattr(status, "get") and "error" in status:
@@ -754,6 +1023,58 @@ class DiscordMessageServiceProvider(MessageService):
         )
         return formatted_response
 
+    def _format_resource_history_response(self, report: HistoryReport) -> str:
+        """Format min/avg/p95/max per window and sparklines for Discord display."""
+        labels = {"cpu": "CPU %", "memory": "Memory %", "disk": "Disk %", "tps": "TPS", "players": "Players"}
+        lines = [f"{'':<9}{'win':<5}{'min':>7}{'avg':>7}{'p95':>7}{'max':>7}"]
+        for series, label in labels.items():
+            for window, summary in report.windows.items():
+                stats = summary.get(series)
+                if stats is None:
+                    continue
+                lines.append(
+                    f"{label:<9}{window:<5}{stats.min:>7.1f}{stats.avg:>7.1f}{stats.p95:>7.1f}{stats.max:>7.1f}"
+                )
+                label = ""
+        for series, sparkline in report.sparklines.items():
+            if sparkline:
+                lines.append(f"{labels[series]:<9}{report.sparkline_window:<5}{sparkline}")
+
+        formatted_response = f"📈 **Resource History** ({report.samples} samples)\n"
+        formatted_response += "```\n" + "\n".join(lines) + "\n```"
+        return formatted_response
+
+    def _format_dashboard_embed(self, dashboard: Dashboard) -> discord.Embed:
+        """Build one embed from the dashboard parts, marking the ones that timed out or failed."""
+        formatters = {
+            "status": self._format_status_response,
+            "info": self._format_info_response,
+            "resources": self._format_resources_response,
+            "mods": self._format_list_mods_response,
+            "server_ips": str,
+        }
+        titles = {
+            "status": "Status",
+            "info": "Information",
+            "resources": "Resources",
+            "mods": "Mods",
+            "server_ips": "Server IPs",
+        }
+        embed = discord.Embed(title="🖥️ Server Dashboard", color=0x00FF00 if not dashboard.missing else 0xFFA500)
+        for name, title in titles.items():
+            if name in dashboard.parts:
+                text = formatters[name](dashboard.parts[name])
+                # The formatters start with their own bold title line, which the field name replaces
+                header, _, body = text.partition("\n")
+                value = body if body and header.endswith("**") else text
+                value = value if len(value) <= 1024 else value[:1021] + "..."
+                embed.add_field(name=title, value=value or "-", inline=name != "mods")
+            elif name in dashboard.missing:
+                reason = dashboard.missing[name]
+                embed.add_field(name=title, value=f"{'⏱️' if reason == 'timed out' else '❌'} {reason}", inline=True)
+        embed.set_footer(text=f"Fetched in {dashboard.elapsed * 1000:.0f} ms")
+        return embed
+
     def _format_logs_response(self, data: LogsResponse | dict) -> str:
         """Format server logs response for Discord display."""
         if isinstance(data, dict) and "error" in data:
@@ -772,11 +1093,38 @@ class DiscordMessageServiceProvider(MessageService):
         if available_length < 1:
             return "📜 **Server Logs**\n```\nOutput too large to display\n```"
 
+        # Keep the newest lines, which are at the end
         if len(logs_text) > available_length:
-            logs_text = logs_text[: max(available_length - 3, 0)] + "..."
+            logs_text = "..." + logs_text[len(logs_text) - max(available_length - 3, 0) :]
 
         return prefix + logs_text + suffix
 
+    def _format_logs_search_response(self, data: LogSearchResult | dict) -> str:
+        """Format log search matches (newest first) for Discord display."""
+        if isinstance(data, dict) and "error" in data:
+            return f"❌ **Error:** {data['error']}"
+
+        more = "+" if data.truncated else ""
+        header = (
+            f"🔎 **Log Search** ({len(data.matches)}{more} matches in {data.indexed} lines, {data.elapsed_ms:.1f} ms)\n"
+        )
+        if not data.matches:
+            return header + "No matching lines."
+
+        prefix = header + "```\n"
+        suffix = "\n```"
+        available_length = 2000 - len(prefix) - len(suffix)
+        # Newest matches first; stop before the message limit rather than cutting a line
+        shown: List[str] = []
+        used = 0
+        for match in data.matches:
+            line = match.line if len(match.line) <= 300 else match.line[:297] + "..."
+            if used + len(line) + 1 > available_length:
+                break
+            shown.append(line)
+            used += len(line) + 1
+        return prefix + "\n".join(shown) + suffix
+
     def _format_install_mod_response(self, data: dict) -> str:
         """Format the mod install response for Discord display."""
         if isinstance(data, dict) and "error" in data:
@@ -785,11 +1133,76 @@ class DiscordMessageServiceProvider(MessageService):
         status = data.get("status", "")
         message = data.get("message", "Request accepted")
 
+        metadata = data.get("metadata")
+        if metadata:
+            message += f"\n**Mod:** {metadata['name']} {metadata['version']} ({metadata['loader']})"
+
+        upload = data.get("upload")
+        if upload:
+            message += (
+                f"\n**Uploaded:** {upload['bytes'] / 1024**2:.1f} MB in {upload['seconds']:.1f}s "
+                f"({upload['bytes_per_second'] / 1024**2:.1f} MB/s)"
+            )
+
         if status == "accepted":
             return f"📦 **Mod Install:** {message}\n\n_The result will be posted here when installation completes._"
+        elif status == "duplicate":
+            return (
+                f"📦 **Mod Install:** {message}\n"
+                f"_Same SHA-256 as the installed jar (`{data['sha256'][:12]}`). Use `force:True` to install it again._"
+            )
         else:
             return f"📦 **Mod Install:** {message}"
 
+    def _format_bulk_install_response(self, data: BulkModInstall | dict) -> str:
+        """Format bulk install progress for Discord display."""
+        if isinstance(data, dict) and "error" in data:
+            return f"❌ **Error:** {data['error']}"
+
+        counts = data.counts()
+        finished = counts[INSTALLED] + counts[SKIPPED] + counts[FAILED]
+        if data.done:
+            status_emoji = "✅" if not counts[FAILED] else "⚠️"
+            progress = f"done in {data.elapsed:.0f}s"
+        else:
+            status_emoji = "⏳"
+            progress = f"{finished}/{len(data.items)}"
+        header = (
+            f"{status_emoji} **Installing {len(data.items)} mods** ({progress}): {counts[INSTALLED]} installed, "
+            f"{counts[SKIPPED]} already installed, {counts[FAILED]} failed"
+        )
+        if data.rejected:
+            header += f"\n_Ignored {len(data.rejected)} entries that are not .jar URLs or repeat a file name._"
+
+        icons = {
+            QUEUED: "·",
+            REQUESTING: "↑",
+            INSTALLING: "…",
+            INSTALLED: "✓",
+            SKIPPED: "=",
+            FAILED: "✗",
+        }
+        lines = []
+        for item in data.items:
+            line = f"{icons[item.state]} {item.filename}"
+            if item.state in (SKIPPED, FAILED) and item.message:
+                line += f" → {' '.join(item.message.split())}"
+            lines.append(line if len(line) <= 120 else line[:117] + "...")
+
+        # Keep within Discord's 2000 characters; when cutting, failures and unfinished items are listed first
+        available_length = 2000 - len(header) - len("\n```\n\n```") - 40
+        if sum(len(line) + 1 for line in lines) > available_length:
+            lines.sort(key=lambda line: line[0] not in "✗…↑")
+        shown, used = [], 0
+        for line in lines:
+            if used + len(line) + 1 > available_length:
+                break
+            shown.append(line)
+            used += len(line) + 1
+        if len(shown) < len(lines):
+            shown.append(f"... {len(lines) - len(shown)} more")
+        return header + "\n```\n" + "\n".join(shown) + "\n```"
+
     def _format_list_mods_response(self, data: dict) -> str:
         """Format the list mods response for Discord display."""
         if isinstance(data, dict) and "error" in data:
@@ -801,10 +1214,30 @@ class DiscordMessageServiceProvider(MessageService):
         if total == 0:
             return "📦 **Installed Mods:** No mods installed."
 
-        lines = [f"📦 **Installed Mods ({total}):**"]
+        sources = data.get("sources", {})
+        header = f"📦 **Installed Mods ({total}):**"
+        lines = []
         for mod in mods:
-            lines.append(f"  • `{mod}`")
-        return "\n".join(lines)
+            known = sources.get(mod) or {}
+            line = f"  • `{mod}`"
+            metadata = known.get("metadata")
+            if metadata:
+                line += f" — **{metadata['name']}** {metadata['version']} ({metadata['loader']})"
+            if known.get("source"):
+                line += f" · {known['source']} (`{known['sha256'][:12]}`)"
+            lines.append(line)
+
+        # Large modpacks don't fit in one Discord message
+        available_length = 2000 - len(header) - 40
+        shown, used = [], 0
+        for line in lines:
+            if used + len(line) + 1 > available_length:
+                break
+            shown.append(line)
+            used += len(line) + 1
+        if len(shown) < len(lines):
+            shown.append(f"  ... {len(lines) - len(shown)} more")
+        return "\n".join([header] + shown)
 
     def _format_remove_mod_response(self, data: dict) -> str:
         """Format the remove mod response for Discord display."""
@@ -820,6 +1253,26 @@ class DiscordMessageServiceProvider(MessageService):
         else:
             return f"❌ **Failed to remove mod:** `{filename}` — {message}"
 
+    def _format_metrics_response(self, data: dict) -> str:
+        """Format the metrics snapshot for Discord display."""
+        if "error" in data:
+            return f"❌ **Error:** {data['error']}"
+
+        if not data:
+            return "📈 **Bot Metrics:** Nothing recorded yet."
+
+        lines = []
+        for name in sorted(data):
+            value = data[name]
+            lines.append(f"{name} = {value:.3f}" if isinstance(value, float) else f"{name} = {value}")
+
+        header = "📈 **Bot Metrics**\n```\n"
+        body = "\n".join(lines)
+        max_body_length = 2000 - len(header) - len("\n```")
+        if len(body) > max_body_length:
+            body = body[: max_body_length - 3] + "..."
+        return header + body + "\n```"
+
     @property
     def token(self) -> str:
         return self.__token
@@ -0,0 +1,83 @@
+from typing import AsyncIterable, Dict, List, Optional
+
+from loguru import logger
+
+from bot.cache import StaleWhileRevalidateCache
+from bot.models.logs_response import LogsResponse
+from bot.models.minecraft_server_info import MinecraftServerInfo
+from bot.models.minecraft_server_status import MinecraftServerStatus
+from bot.models.resource_usage import ResourceUsage
+from bot.services.minecraft.minecraft_server_service import MinecraftServerService
+
+# Fresh lifetime in seconds per cached endpoint: info rarely changes, status and resources do
+DEFAULT_CACHE_TTLS: Dict[str, float] = {"status": 5, "info": 300, "resources": 5}
+
+
+class CachingMinecraftServerService(MinecraftServerService):
+    """Caches status, info and resources in front of another MinecraftServerService.
+
+    Identical concurrent requests share one upstream call, and stale values are served for up to ``max_stale``
+    seconds while they are refreshed in the background. Everything else is passed through.
+    """
+
+    def __init__(
+        self,
+        inner: MinecraftServerService,
+        ttls: Optional[Dict[str, float]] = None,
+        max_stale: float = 30.0,
+    ):
+        self.__inner = inner
+        ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.__caches: Dict[str, StaleWhileRevalidateCache] = {
+            endpoint: StaleWhileRevalidateCache(f"minecraft_{endpoint}", float(ttl), max_stale)
+            for endpoint, ttl in ttls.items()
+        }
+
+    async def get_status(self) -> MinecraftServerStatus:
+        return await self.__caches["status"].get("status", self.__inner.get_status)
+
+    async def get_info(self) -> MinecraftServerInfo:
+        return await self.__caches["info"].get("info", self.__inner.get_info)
+
+    async def get_resources(self) -> ResourceUsage:
+        return await self.__caches["resources"].get("resources", self.__inner.get_resources)
+
+    async def get_logs(self, n: int) -> LogsResponse:
+        return await self.__inner.get_logs(n)
+
+    async def get_logs_since(self, cursor: Optional[str], n: int) -> LogsResponse:
+        return await self.__inner.get_logs_since(cursor, n)
+
+    async def command(self, command: str) -> dict:
+        return await self.__inner.command(command)
+
+    async def command_batch(self, commands: List[str]) -> List[dict]:
+        return await self.__inner.command_batch(commands)
+
+    async def install_mod_url(self, url: str) -> dict:
+        return await self.__inner.install_mod_url(url)
+
+    async def install_mod_file(self, filename: str, file_bytes: bytes) -> dict:
+        return await self.__inner.install_mod_file(filename, file_bytes)
+
+    async def install_mod_stream(self, filename: str, chunks: AsyncIterable[bytes]) -> dict:
+        return await self.__inner.install_mod_stream(filename, chunks)
+
+    async def list_mods(self) -> dict:
+        return await self.__inner.list_mods()
+
+    async def remove_mod(self, filename: str) -> dict:
+        return await self.__inner.remove_mod(filename)
+
+    def invalidate_cache(self, *endpoints: str):
+        for endpoint in endpoints or self.__caches:
+            cache = self.__caches.get(endpoint)
+            if cache is not None:
+                cache.invalidate()
+        logger.debug(f"Minecraft cache invalidated: {', '.join(endpoints) or 'all'}")
+
+    async def close(self):
+        await self.__inner.close()
+
+    def __str__(self):
+        return f"CachingMinecraftServerService({self.__inner})"
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from typing import List, NamedTuple, Optional
+
+from loguru import logger
+
+from bot.metrics import metrics
+from bot.services.minecraft.minecraft_server_service import MinecraftServerService
+
+# Commands per POST /commands, the server_handler limit
+MAX_COMMANDS_PER_REQUEST = 100
+
+
+class CommandOutcome(NamedTuple):
+    command: str
+    output: str
+    error: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class CommandBatchReport(NamedTuple):
+    outcomes: List[CommandOutcome]
+    ordered: bool
+    elapsed: float
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for outcome in self.outcomes if not outcome.ok)
+
+
+def parse_command_script(script: str) -> List[str]:
+    """Split a script into commands on newlines and on ``;`` outside quotes and brackets.
+
+    Blank lines and ``#`` comments are skipped, and a leading ``/`` is dropped, as RCON doesn't want it. Semicolons
+    inside JSON text (``tellraw @a {"text":"a;b"}``) or NBT stay part of their command. Single quotes only count
+    inside ``{}``/``[]``, where NBT uses them, so an apostrophe in chat text (``say it's done; op bob``) doesn't hide
+    the next ``;``.
+    """
+    commands = []
+    for line in script.splitlines():
+        if line.strip().startswith("#"):
+            continue
+        current, depth, quote, escaped = [], 0, None, False
+        for char in line:
+            if quote:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == quote:
+                    quote = None
+            elif char == '"' or (char == "'" and depth > 0):
+                quote = char
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth = max(0, depth - 1)
+            elif char == ";" and depth == 0:
+                commands.append("".join(current))
+                current = []
+                continue
+            current.append(char)
+        commands.append("".join(current))
+    return [command.strip().removeprefix("/").strip() for command in commands if command.strip().removeprefix("/")]
+
+
+async def run_command_batch(
+    minecraft_service: MinecraftServerService, commands: List[str], ordered: bool = True, concurrency: int = 4
+) -> CommandBatchReport:
+    """Run ``commands`` and report each one's output or error.
+
+    Ordered batches go through ``command_batch`` (one request per 100 commands, run in order on the server).
+    Unordered ones are sent as single commands, at most ``concurrency`` at a time. Either way one failing command
+    doesn't stop the others.
+    """
+    started = time.perf_counter()
+    if ordered:
+        outcomes = []
+        for start in range(0, len(commands), MAX_COMMANDS_PER_REQUEST):
+            chunk = commands[start : start + MAX_COMMANDS_PER_REQUEST]
+            try:
+                results = await minecraft_service.command_batch(chunk)
+            except Exception as e:
+                logger.error(f"Command batch failed: {e}")
+                results = [{"command": command, "error": str(e) or type(e).__name__} for command in chunk]
+            missing = len(chunk) - len(results)
+            results = list(results) + [{"error": "No result returned"}] * max(0, missing)
+            outcomes.extend(
+                CommandOutcome(result.get("command", command), result.get("output", ""), result.get("error") or None)
+                for command, result in zip(chunk, results)
+            )
+    else:
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(command: str) -> CommandOutcome:
+            async with semaphore:
+                try:
+                    response = await minecraft_service.command(command)
+                    return CommandOutcome(command, response.get("response", {}).get("output", ""), None)
+                except Exception as e:
+                    return CommandOutcome(command, "", str(e) or type(e).__name__)
+
+        outcomes = list(await asyncio.gather(*(run_one(command) for command in commands)))
+
+    report = CommandBatchReport(outcomes, ordered, time.perf_counter() - started)
+    mode = "ordered" if ordered else "parallel"
+    metrics.histogram("command_batch_seconds", {"mode": mode}).observe(report.elapsed)
+    metrics.counter("command_batch_commands_total", {"result": "ok"}).inc(len(outcomes) - report.failed)
+    metrics.counter("command_batch_commands_total", {"result": "error"}).inc(report.failed)
+    return report
@@ -0,0 +1,108 @@
+import asyncio
+from collections import deque
+from typing import Deque, List, Optional
+
+from loguru import logger
+
+from bot.log_index import LogIndex
+from bot.metrics import metrics
+from bot.models.logs_response import LogsResponse
+from bot.services.minecraft.minecraft_server_service import MinecraftServerService
+
+# Largest n accepted by /logs on a server_handler without cursor support
+LEGACY_LOG_LIMIT = 100
+
+
+class LogTail:
+    """Local copy of the server log, kept up to date with incremental reads.
+
+    Each refresh asks server_handler only for lines logged after the last cursor and appends them to a ring buffer
+    of ``capacity`` lines, so ``/logs`` transfers deltas and can show more than the API's 100-line window. The first read
+    (and every read against an older server_handler, which returns no cursor) replaces the buffer with the last 100 lines.
+    New lines are also fed to ``index`` for ``/logs_search``; ``run`` keeps reading in the background so the index
+    doesn't depend on someone calling ``/logs``.
+    """
+
+    def __init__(
+        self,
+        minecraft_service: MinecraftServerService,
+        capacity: int = 2000,
+        max_delta: int = 1000,
+        index: Optional[LogIndex] = None,
+    ):
+        self.__minecraft_service = minecraft_service
+        self.__index = index
+        self.__lines: Deque[str] = deque(maxlen=max(1, capacity))
+        self.__max_delta = max_delta
+        self.__cursor: Optional[str] = None
+        self.__generation = 0
+        self.__lock = asyncio.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.__lines.maxlen
+
+    @property
+    def index(self) -> Optional[LogIndex]:
+        return self.__index
+
+    @property
+    def generation(self) -> int:
+        """Incremented whenever lines are added or the buffer is replaced."""
+        return self.__generation
+
+    def lines(self) -> List[str]:
+        return list(self.__lines)
+
+    async def refresh(self) -> int:
+        """Fetch new lines. Returns how many were appended. Concurrent callers wait for the same refresh."""
+        if self.__lock.locked():
+            async with self.__lock:
+                return 0
+        async with self.__lock:
+            # Until a cursor proves the server reads incrementally, stay within the plain endpoint's limit
+            limit = self.__max_delta if self.__cursor is not None else LEGACY_LOG_LIMIT
+            response = await self.__minecraft_service.get_logs_since(self.__cursor, limit)
+            new_lines = response.lines
+            if response.cursor is None:
+                # No incremental support: the answer is the latest window, not a delta
+                new_lines = response.lines[_overlap(self.__lines, response.lines) :]
+                self.__lines.clear()
+            elif self.__cursor is not None and len(response.lines) >= limit:
+                self.__lines.append(f"... more than {limit} new lines, older ones skipped ...")
+            self.__lines.extend(response.lines)
+            if self.__index is not None:
+                self.__index.add(new_lines)
+            self.__cursor = response.cursor
+            self.__generation += 1
+            metrics.counter("log_tail_lines_fetched_total").inc(len(response.lines))
+            logger.debug(f"Log tail refreshed: {len(response.lines)} new lines, cursor={self.__cursor}")
+            return len(response.lines)
+
+    async def tail(self, n: int) -> LogsResponse:
+        await self.refresh()
+        lines = list(self.__lines)[-n:] if n > 0 else []
+        return LogsResponse(lines=lines, total=len(lines), cursor=self.__cursor)
+
+    async def run(self, interval: float):
+        """Refresh every ``interval`` seconds until cancelled."""
+        logger.info(f"Log tail following server logs every {interval}s.")
+        failing = False
+        while True:
+            try:
+                await self.refresh()
+                failing = False
+            except Exception as e:
+                # Logged once per outage; server_handler being down is already reported elsewhere
+                if not failing:
+                    logger.warning(f"Log tail refresh failed: {e}")
+                failing = True
+            await asyncio.sleep(interval)
+
+
+def _overlap(previous: Deque[str], window: List[str]) -> int:
+    """Length of the longest end of ``previous`` that ``window`` starts with, i.e. how many of its lines were seen."""
+    for size in range(min(len(previous), len(window)), 0, -1):
+        if all(previous[len(previous) - size + i] == window[i] for i in range(size)):
+            return size
+    return 0
@@ -1,10 +1,24 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterable, Dict, List, Optional
 
 from bot.models.logs_response import LogsResponse
 from bot.models.minecraft_server_info import MinecraftServerInfo
 from bot.models.minecraft_server_status import MinecraftServerStatus
 from bot.models.resource_usage import ResourceUsage
 
+# Read timeouts in seconds per endpoint; anything not listed uses minecraft.timeouts.read
+DEFAULT_ENDPOINT_TIMEOUTS: Dict[str, float] = {
+    "status": 3,
+    "info": 3,
+    "resources": 3,
+    "logs": 5,
+    "list_mods": 5,
+    "command": 10,
+    "command_batch": 60,
+    "remove_mod": 10,
+    "install_mod": 120,
+}
+
 
 class MinecraftServerService(ABC):
     @abstractmethod
@@ -23,10 +37,31 @@ class MinecraftServerService(ABC):
     def get_logs(self, n: int) -> LogsResponse:
         pass
 
+    async def get_logs_since(self, cursor: Optional[str], n: int) -> LogsResponse:
+        """Lines logged after ``cursor`` (the last ``n`` when it is None) and the cursor for the next call.
+
+        Providers that can't read incrementally return the last ``n`` lines without a cursor.
+        """
+        return await self.get_logs(n)
+
     @abstractmethod
     def command(self, command: str) -> dict:
         pass
 
+    async def command_batch(self, commands: List[str]) -> List[dict]:
+        """Run ``commands`` in order and return ``{"command", "output", "error"}`` for each.
+
+        Providers without a batch endpoint send them one by one. A failing command doesn't stop the rest.
+        """
+        results = []
+        for command in commands:
+            try:
+                response = await self.command(command)
+                results.append({"command": command, "output": response.get("response", {}).get("output", "")})
+            except Exception as e:
+                results.append({"command": command, "output": "", "error": str(e) or type(e).__name__})
+        return results
+
     @abstractmethod
     def install_mod_url(self, url: str) -> dict:
         pass
@@ -35,6 +70,13 @@ class MinecraftServerService(ABC):
     def install_mod_file(self, filename: str, file_bytes: bytes) -> dict:
         pass
 
+    async def install_mod_stream(self, filename: str, chunks: AsyncIterable[bytes]) -> dict:
+        """Upload a mod from an async stream of chunks.
+
+        Providers that can't stream a request body collect the chunks and fall back to ``install_mod_file``.
+        """
+        return await self.install_mod_file(filename, b"".join([chunk async for chunk in chunks]))
+
     @abstractmethod
     def list_mods(self) -> dict:
         pass
@@ -42,3 +84,11 @@ class MinecraftServerService(ABC):
     @abstractmethod
     def remove_mod(self, filename: str) -> dict:
         pass
+
+    def invalidate_cache(self, *endpoints: str):
+        """Forget cached answers for ``endpoints`` (all when empty). A no-op for providers that don't cache."""
+        pass
+
+    async def close(self):
+        """Release network resources. Providers without any keep the default no-op."""
+        pass
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import os
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from bot.metrics import metrics
+
+QUEUED = "queued"
+REQUESTING = "requesting"
+INSTALLING = "installing"
+INSTALLED = "installed"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+FINAL_STATES = (INSTALLED, SKIPPED, FAILED)
+
+
+class ModInstallWaiters:
+    """Futures for jars waiting on their ``mod_install_result`` event, keyed by the jar's file name.
+
+    server_handler answers ``POST /mods`` right away and reports the outcome later as a ``mod_install_result`` event
+    naming the jar, which ``EventHandle`` passes to ``resolve``.
+    """
+
+    def __init__(self):
+        self.__pending: Dict[str, List[asyncio.Future]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(futures) for futures in self.__pending.values())
+
+    def register(self, filename: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.__pending.setdefault(filename, []).append(future)
+        return future
+
+    def discard(self, filename: str, future: asyncio.Future):
+        futures = self.__pending.get(filename, [])
+        if future in futures:
+            futures.remove(future)
+        if not futures:
+            self.__pending.pop(filename, None)
+        if not future.done():
+            future.cancel()
+
+    def resolve(self, filename: str, success: bool, message: str) -> bool:
+        """Complete the futures waiting for ``filename`` with ``(success, message)``. False if nobody waits for it."""
+        futures = self.__pending.pop(filename, [])
+        for future in futures:
+            if not future.done():
+                future.set_result((success, message))
+        return bool(futures)
+
+
+class BulkModItem:
+    def __init__(self, url: str):
+        self.url = url
+        self.filename = os.path.basename(url)
+        self.state = QUEUED
+        self.message = ""
+
+
+def parse_mod_manifest(text: str) -> Tuple[List[str], List[str]]:
+    """Mod URLs in a manifest, in order and without repeats, plus the entries that were rejected.
+
+    Accepts a JSON list of URLs, ``{"mods": [...]}``, a Modrinth ``modrinth.index.json`` (first download of every
+    file), or plain text with one URL per line (or separated by spaces/commas; ``#`` starts a comment). Only
+    ``http(s)`` URLs ending in ``.jar`` are kept, and a second URL for an already listed file name is rejected, since
+    results are matched to requests by file name.
+    """
+    try:
+        document = json.loads(text)
+    except ValueError:
+        document = None
+    if isinstance(document, dict) and isinstance(document.get("files"), list):
+        candidates = [(file.get("downloads") or [""])[0] for file in document["files"] if isinstance(file, dict)]
+    elif isinstance(document, dict):
+        candidates = document.get("mods", [])
+    elif isinstance(document, list):
+        candidates = document
+    else:
+        candidates = []
+        for line in text.splitlines():
+            candidates.extend(line.split("#", 1)[0].replace(",", " ").split())
+
+    urls, rejected, filenames = [], [], set()
+    for candidate in candidates:
+        url = str(candidate).strip()
+        filename = os.path.basename(url)
+        if not url.startswith(("http://", "https://")) or not filename.lower().endswith(".jar"):
+            rejected.append(url)
+        elif filename in filenames:
+            if url not in urls:
+                rejected.append(url)
+        else:
+            filenames.add(filename)
+            urls.append(url)
+    return urls, rejected
+
+
+class BulkModInstall:
+    """Installs a list of mod URLs, at most ``concurrency`` at a time, and tracks each one until its result arrives.
+
+    ``install`` requests one URL and returns the ``/install_mod`` response: ``accepted`` means server_handler is
+    installing it, so the slot stays taken until the matching ``mod_install_result`` reaches ``waiters`` (or
+    ``result_timeout`` passes); ``duplicate`` means the mod index already has it. Results that never arrive, e.g. from
+    a server_handler that doesn't name the jar in them, are checked against ``list_mods`` once at the end.
+    ``updates`` yields whenever items change, at most every ``min_interval`` seconds, so a message can be edited in
+    place without hitting rate limits.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        install: Callable[[str], Awaitable[dict]],
+        waiters: ModInstallWaiters,
+        list_mods: Optional[Callable[[], Awaitable[dict]]] = None,
+        concurrency: int = 4,
+        result_timeout: float = 300.0,
+        rejected: Optional[List[str]] = None,
+    ):
+        self.items = [BulkModItem(url) for url in urls]
+        self.rejected = list(rejected or [])
+        self.__install = install
+        self.__waiters = waiters
+        self.__list_mods = list_mods
+        self.__concurrency = max(1, concurrency)
+        self.__result_timeout = result_timeout
+        self.__changed = asyncio.Event()
+        self.__task: Optional[asyncio.Task] = None
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.__task is not None and self.__task.done()
+
+    def counts(self) -> Dict[str, int]:
+        counts = {state: 0 for state in (QUEUED, REQUESTING, INSTALLING) + FINAL_STATES}
+        for item in self.items:
+            counts[item.state] += 1
+        return counts
+
+    def start(self) -> asyncio.Task:
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.run())
+        return self.__task
+
+    async def wait(self):
+        await self.start()
+
+    async def updates(self, min_interval: float = 1.5) -> AsyncIterator["BulkModInstall"]:
+        """Yield self after changes until every item is final, then once more."""
+        task = self.start()
+        while not task.done():
+            changed = asyncio.create_task(self.__changed.wait())
+            await asyncio.wait({changed, task}, return_when=asyncio.FIRST_COMPLETED)
+            changed.cancel()
+            if task.done():
+                break
+            self.__changed.clear()
+            yield self
+            await asyncio.sleep(min_interval)
+        yield self
+
+    async def run(self):
+        semaphore = asyncio.Semaphore(self.__concurrency)
+
+        async def run_one(item: BulkModItem):
+            async with semaphore:
+                await self.__run_item(item)
+
+        await asyncio.gather(*(run_one(item) for item in self.items))
+        await self.__reconcile()
+        self.elapsed = time.monotonic() - self.started
+        metrics.histogram("mod_bulk_install_seconds").observe(self.elapsed)
+        for state, count in self.counts().items():
+            if count:
+                metrics.counter("mod_bulk_install_items_total", {"result": state}).inc(count)
+        self.__changed.set()
+
+    async def __run_item(self, item: BulkModItem):
+        self.__set(item, REQUESTING)
+        # Registered before the request, since the result can arrive before the response is processed
+        future = self.__waiters.register(item.filename)
+        try:
+            response = await self.__install(item.url)
+            if not isinstance(response, dict) or "error" in response:
+                error = response.get("error") if isinstance(response, dict) else response
+                self.__set(item, FAILED, str(error))
+                return
+            if response.get("status") == "duplicate":
+                self.__set(item, SKIPPED, response.get("message", "Already installed"))
+                return
+            if response.get("status") != "accepted":
+                self.__set(item, FAILED, response.get("message", "Not accepted"))
+                return
+            self.__set(item, INSTALLING)
+            try:
+                success, message = await asyncio.wait_for(asyncio.shield(future), self.__result_timeout)
+            except asyncio.TimeoutError:
+                item.message = "No result received"
+                return
+            self.__set(item, INSTALLED if success else FAILED, message)
+        except Exception as e:
+            logger.error(f"Bulk install of {item.url} failed: {e}")
+            self.__set(item, FAILED, str(e) or type(e).__name__)
+        finally:
+            self.__waiters.discard(item.filename, future)
+
+    async def __reconcile(self):
+        waiting = [item for item in self.items if item.state == INSTALLING]
+        if not waiting or self.__list_mods is None:
+            for item in waiting:
+                self.__set(item, FAILED, item.message or "No result received")
+            return
+        try:
+            installed = set((await self.__list_mods()).get("mods", []))
+        except Exception as e:
+            logger.warning(f"Could not check bulk install results against list_mods: {e}")
+            installed = set()
+        for item in waiting:
+            if item.filename in installed:
+                self.__set(item, INSTALLED, "Installed (found in list_mods)")
+            else:
+                self.__set(item, FAILED, item.message or "No result received")
+
+    def __set(self, item: BulkModItem, state: str, message: str = ""):
+        item.state = state
+        item.message = message
+        self.__changed.set()
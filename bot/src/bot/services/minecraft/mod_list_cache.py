@@ -0,0 +1,146 @@
+import asyncio
+import bisect
+import re
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from loguru import logger
+
+from bot.metrics import metrics
+
+# Discord shows at most 25 autocomplete choices
+MAX_SUGGESTIONS = 25
+
+# Words of a jar name start after these, e.g. "sodium-fabric-0.5.8+mc1.20.1.jar" -> sodium, fabric, 0, 5, 8, mc1, ...
+_WORD_START = re.compile(r"(?:^|[^a-z0-9])([a-z0-9])")
+
+# Match quality, best first
+_NAME_PREFIX = 0
+_WORD_PREFIX = 1
+_SUBSTRING = 2
+_SUBSEQUENCE = 3
+
+
+class ModListCache:
+    """Jar names installed on the server, as last reported by ``list_mods`` and patched since.
+
+    Loaded lazily on the first ``get`` and reloaded once it is older than ``ttl`` seconds, with concurrent loads
+    sharing one upstream call. ``mod_install_result`` events and successful removals patch the list in place, so it
+    stays current between loads; a load that was in flight during a patch answers its callers but isn't stored.
+    ``suggest`` ranks names against what a user typed without any upstream call: prefixes of the name or of one of its
+    words come from a sorted index, substrings and in-order characters (``jei`` for ``just-enough-items``) from a scan
+    of the few hundred names a server has. Lookups are counted in ``cache_requests_total{cache="mod_list",result}``.
+    """
+
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__mods: Optional[List[str]] = None
+        self.__lowered: List[Tuple[str, str]] = []
+        self.__words: List[Tuple[str, str, int]] = []
+        self.__loaded_at = 0.0
+        self.__generation = 0
+        self.__inflight: Optional[asyncio.Future] = None
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the list is loaded and younger than ``ttl``."""
+        return self.__mods is not None and self.__clock() - self.__loaded_at < self.__ttl
+
+    async def get(self, loader: Callable[[], Awaitable[List[str]]]) -> List[str]:
+        """The installed jar names, sorted: from the cache while it is fresh, otherwise from ``loader``."""
+        if self.fresh:
+            self.__count("hit")
+            return list(self.__mods)
+        self.__count("coalesced" if self.__inflight is not None else "miss")
+        # Shielded so a caller that gives up doesn't cancel the load for everyone else
+        return list(await asyncio.shield(self.refresh(loader)))
+
+    def refresh(self, loader: Callable[[], Awaitable[List[str]]]) -> asyncio.Future:
+        """Start a load unless one is in flight. The future can be awaited or left to finish in the background."""
+        if self.__inflight is None:
+            self.__inflight = asyncio.ensure_future(self.__fetch(loader, self.__generation))
+            self.__inflight.add_done_callback(self.__loaded)
+        return self.__inflight
+
+    def set(self, mods: List[str]):
+        """Replace the list with a fresh ``list_mods`` answer obtained elsewhere."""
+        self.__generation += 1
+        self.__store(mods)
+
+    def add(self, filename: str):
+        """A jar was installed. Ignored until the first load, which will include it."""
+        self.__generation += 1
+        if self.__mods is not None and filename not in self.__mods:
+            self.__index(self.__mods + [filename])
+
+    def discard(self, filename: str):
+        self.__generation += 1
+        if self.__mods is not None and filename in self.__mods:
+            self.__index([mod for mod in self.__mods if mod != filename])
+
+    def invalidate(self):
+        """Forget the list, e.g. after an install result that doesn't say which jar it was for."""
+        self.__generation += 1
+        self.__mods = None
+        self.__lowered = []
+        self.__words = []
+
+    def suggest(self, query: str, limit: int = MAX_SUGGESTIONS) -> List[str]:
+        """Cached names matching ``query``, best first: name prefix, word prefix, substring, then in-order characters.
+
+        An empty query lists the first names alphabetically. Before the first load there is nothing to suggest.
+        """
+        if self.__mods is None or limit <= 0:
+            return []
+        query = query.strip().lower()
+        if not query:
+            return self.__mods[:limit]
+
+        ranked = {}
+        start = bisect.bisect_left(self.__words, (query,))
+        for word, filename, position in self.__words[start:]:
+            if not word.startswith(query):
+                break
+            quality = _NAME_PREFIX if position == 0 else _WORD_PREFIX
+            ranked[filename] = min(quality, ranked.get(filename, quality))
+        if len(ranked) < limit:
+            # Letters of the query in order, anything in between
+            subsequence = re.compile(".*?".join(map(re.escape, query)))
+            for lowered, filename in self.__lowered:
+                if filename in ranked:
+                    continue
+                if query in lowered:
+                    ranked[filename] = _SUBSTRING
+                elif subsequence.search(lowered):
+                    ranked[filename] = _SUBSEQUENCE
+        return sorted(ranked, key=lambda filename: (ranked[filename], filename))[:limit]
+
+    async def __fetch(self, loader: Callable[[], Awaitable[List[str]]], generation: int) -> List[str]:
+        mods = sorted(set(await loader()))
+        if generation == self.__generation:
+            self.__store(mods)
+        return mods
+
+    def __loaded(self, task: asyncio.Future):
+        if self.__inflight is task:
+            self.__inflight = None
+        # Retrieve the error so a failed background load doesn't log "exception was never retrieved"
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Could not load the mod list: {task.exception()}")
+
+    def __store(self, mods: List[str]):
+        self.__index(mods)
+        self.__loaded_at = self.__clock()
+
+    def __index(self, mods: List[str]):
+        self.__mods = sorted(set(mods))
+        self.__lowered = [(filename.lower(), filename) for filename in self.__mods]
+        self.__words = sorted(
+            (lowered[match.start(1) :], filename, match.start(1))
+            for lowered, filename in self.__lowered
+            for match in _WORD_START.finditer(lowered)
+        )
+
+    def __count(self, result: str):
+        metrics.counter("cache_requests_total", {"cache": "mod_list", "result": result}).inc()
@@ -0,0 +1,212 @@
+import asyncio
+from typing import Any, AsyncIterable, Dict, List, Optional
+
+import aiohttp
+from aiohttp.payload import AsyncIterablePayload
+from loguru import logger
+
+from bot.exceptions import UploadTooLargeError
+from bot.models.logs_response import LogsResponse
+from bot.models.minecraft_server_info import MinecraftServerInfo
+from bot.models.minecraft_server_status import MinecraftServerStatus
+from bot.models.resource_usage import ResourceUsage
+from bot.services.http_client import HttpConnectionStats, create_http_session
+from bot.services.minecraft.minecraft_server_service import DEFAULT_ENDPOINT_TIMEOUTS, MinecraftServerService
+from bot.services.resilience import CircuitBreaker, EndpointTimeouts, http_status
+
+
+class ServerHandlerAiohttpMinecraftServerServiceProvider(MinecraftServerService):
+    """server_handler REST client on a single pooled aiohttp session.
+
+    Requests run on the event loop instead of executor threads, and keep-alive connections are reused across calls.
+    The session is created on first use, inside the running loop, and closed by ``close()``.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        connection_limit: int = 20,
+        connection_limit_per_host: int = 10,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        timeouts: Optional[EndpointTimeouts] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.api_url = api_url.rstrip("/")
+        self.__connection_limit = connection_limit
+        self.__connection_limit_per_host = connection_limit_per_host
+        self.__dns_cache_ttl = dns_cache_ttl
+        self.__keepalive_timeout = keepalive_timeout
+        self.__timeouts = timeouts or EndpointTimeouts(endpoints=DEFAULT_ENDPOINT_TIMEOUTS)
+        self.__circuit_breaker = circuit_breaker or CircuitBreaker("minecraft")
+        self.__stats = HttpConnectionStats("minecraft")
+        self.__session: Optional[aiohttp.ClientSession] = None
+        self.__session_lock = asyncio.Lock()
+
+    @property
+    def connection_stats(self) -> Dict[str, float]:
+        return self.__stats.as_dict()
+
+    async def get_status(self) -> MinecraftServerStatus:
+        logger.info("Requesting Minecraft server status.")
+        try:
+            resp_json = await self.__request("status", "GET", "/status")
+            logger.debug(f"Status response received: {resp_json}")
+            return MinecraftServerStatus.from_json(resp_json)
+        except Exception as e:
+            logger.error(f"Error fetching server status: {e}")
+            raise
+
+    async def get_info(self) -> MinecraftServerInfo:
+        logger.info("Requesting Minecraft server info.")
+        try:
+            resp_json = await self.__request("info", "GET", "/info")
+            logger.debug(f"Info response received: {resp_json}")
+            return MinecraftServerInfo.from_json(resp_json)
+        except Exception as e:
+            logger.error(f"Error fetching server info: {e}")
+            raise
+
+    async def get_resources(self) -> ResourceUsage:
+        logger.info("Requesting host resource usage.")
+        try:
+            resp_json = await self.__request("resources", "GET", "/resources")
+            logger.debug(f"Resources response received: {resp_json}")
+            return ResourceUsage.from_json(resp_json)
+        except Exception as e:
+            logger.error(f"Error fetching resource usage: {e}")
+            raise
+
+    async def get_logs(self, n: int) -> LogsResponse:
+        logger.info(f"Requesting latest Minecraft server logs with n={n}.")
+        try:
+            resp_json = await self.__request("logs", "GET", "/logs", params={"n": n})
+            logger.debug(f"Logs response received: {resp_json}")
+            return LogsResponse.from_json(resp_json)
+        except Exception as e:
+            logger.error(f"Error fetching server logs: {e}")
+            raise
+
+    async def get_logs_since(self, cursor: Optional[str], n: int) -> LogsResponse:
+        try:
+            resp_json = await self.__request("logs", "GET", "/logs", params={"n": n, "since": cursor or ""})
+            return LogsResponse.from_json(resp_json)
+        except Exception as e:
+            logger.error(f"Error fetching server log delta: {e}")
+            raise
+
+    async def command(self, command: str) -> dict:
+        logger.info(f"Sending command to Minecraft server: {command}")
+        try:
+            resp_json = await self.__request("command", "POST", "/command", json={"command": command})
+            logger.debug(f"Command response received: {resp_json}")
+            return {"command": command, "response": resp_json}
+        except Exception as e:
+            logger.error(f"Error sending command to server: {e}")
+            raise
+
+    async def command_batch(self, commands: List[str]) -> List[dict]:
+        logger.info(f"Sending a batch of {len(commands)} commands to Minecraft server.")
+        try:
+            resp_json = await self.__request("command_batch", "POST", "/commands", json={"commands": commands})
+            return resp_json.get("results", [])
+        except Exception as e:
+            if http_status(e) == 404:
+                logger.info("server_handler has no /commands endpoint, sending the batch one command at a time.")
+                return await super().command_batch(commands)
+            logger.error(f"Error sending command batch to server: {e}")
+            raise
+
+    async def install_mod_url(self, url: str) -> dict:
+        logger.info(f"Requesting mod installation from URL: {url}")
+        try:
+            resp_json = await self.__request("install_mod", "POST", "/mods", json={"url": url})
+            logger.debug(f"Mod install response received: {resp_json}")
+            return resp_json
+        except Exception as e:
+            logger.error(f"Error requesting mod installation from URL: {e}")
+            raise
+
+    async def install_mod_file(self, filename: str, file_bytes: bytes) -> dict:
+        logger.info(f"Uploading mod file: {filename} ({len(file_bytes)} bytes)")
+        try:
+            form = aiohttp.FormData()
+            form.add_field("file", file_bytes, filename=filename, content_type="application/java-archive")
+            resp_json = await self.__request("install_mod", "POST", "/mods", data=form)
+            logger.debug(f"Mod install response received: {resp_json}")
+            return resp_json
+        except Exception as e:
+            logger.error(f"Error uploading mod file: {e}")
+            raise
+
+    async def install_mod_stream(self, filename: str, chunks: AsyncIterable[bytes]) -> dict:
+        logger.info(f"Streaming mod file upload: {filename}")
+        try:
+            # Chunked transfer encoding: each chunk is written to the socket as it arrives, never buffered whole
+            with aiohttp.MultipartWriter("form-data") as writer:
+                part = writer.append_payload(
+                    AsyncIterablePayload(chunks, content_type="application/java-archive"),
+                )
+                part.set_content_disposition("form-data", name="file", filename=filename)
+                resp_json = await self.__request("install_mod", "POST", "/mods", data=writer)
+            logger.debug(f"Mod install response received: {resp_json}")
+            return resp_json
+        except Exception as e:
+            logger.error(f"Error streaming mod file: {e}")
+            # aiohttp reports errors raised by the body as connection errors; surface the size limit as itself
+            if isinstance(e.__cause__, UploadTooLargeError):
+                raise e.__cause__ from None
+            raise
+
+    async def list_mods(self) -> dict:
+        logger.info("Listing installed mods")
+        try:
+            resp_json = await self.__request("list_mods", "GET", "/mods")
+            logger.debug(f"List mods response received: {resp_json}")
+            return resp_json
+        except Exception as e:
+            logger.error(f"Error listing mods: {e}")
+            raise
+
+    async def remove_mod(self, filename: str) -> dict:
+        logger.info(f"Removing mod: {filename}")
+        try:
+            resp_json = await self.__request("remove_mod", "DELETE", f"/mods/{filename}")
+            logger.debug(f"Remove mod response received: {resp_json}")
+            return resp_json
+        except Exception as e:
+            logger.error(f"Error removing mod: {e}")
+            raise
+
+    async def close(self):
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def __request(self, endpoint: str, method: str, path: str, **kwargs) -> Any:
+        url = f"{self.api_url}{path}"
+        logger.debug(f"{method} {url}")
+        connect, read = self.__timeouts.get(endpoint)
+        timeout = aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        session = await self.__get_session()
+        async with self.__circuit_breaker:
+            async with session.request(method, url, timeout=timeout, **kwargs) as response:
+                response.raise_for_status()
+                # Read the whole body so the connection goes back to the pool for reuse.
+                return await response.json(content_type=None)
+
+    async def __get_session(self) -> aiohttp.ClientSession:
+        if self.__session is None or self.__session.closed:
+            async with self.__session_lock:
+                if self.__session is None or self.__session.closed:
+                    self.__session = create_http_session(
+                        self.__stats,
+                        limit=self.__connection_limit,
+                        limit_per_host=self.__connection_limit_per_host,
+                        dns_cache_ttl=self.__dns_cache_ttl,
+                        keepalive_timeout=self.__keepalive_timeout,
+                    )
+        return self.__session
+
+    def __str__(self):
+        return f"ServerHandlerAiohttpMinecraftServerServiceProvider(api_url={self.api_url})"
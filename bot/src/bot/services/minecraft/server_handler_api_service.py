@@ -1,6 +1,9 @@
 import asyncio
+import concurrent.futures
+import threading
+import uuid
 from enum import Enum, auto
-from typing import Any, Callable, Dict
+from typing import Any, AsyncIterable, Callable, Dict, Iterator, List, Optional
 
 import requests
 from loguru import logger
@@ -11,20 +14,35 @@ from bot.models.logs_response import LogsResponse
 from bot.models.minecraft_server_info import MinecraftServerInfo
 from bot.models.minecraft_server_status import MinecraftServerStatus
 from bot.models.resource_usage import ResourceUsage
-from bot.services.minecraft.minecraft_server_service import MinecraftServerService
+from bot.services.minecraft.minecraft_server_service import DEFAULT_ENDPOINT_TIMEOUTS, MinecraftServerService
+from bot.services.minecraft.server_handler_aiohttp_service import ServerHandlerAiohttpMinecraftServerServiceProvider
+from bot.services.resilience import (
+    CircuitBreaker,
+    EndpointTimeouts,
+    circuit_breaker_from_config,
+    http_status,
+    timeouts_from_config,
+)
 
 
 class ServerHandlerApiMinecraftServerServiceProvider(MinecraftServerService):
-    def __init__(self, api_url: str, token: str = ""):
+    def __init__(
+        self,
+        api_url: str,
+        token: str = "",
+        timeouts: Optional[EndpointTimeouts] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
         self.api_url = api_url.rstrip("/")
+        self.__timeouts = timeouts or EndpointTimeouts(endpoints=DEFAULT_ENDPOINT_TIMEOUTS)
+        self.__circuit_breaker = circuit_breaker or CircuitBreaker("minecraft")
 
     async def get_status(self) -> MinecraftServerStatus:
         url = f"{self.api_url}/status"
         logger.info("Requesting Minecraft server status.")
         logger.debug(f"GET {url}")
         try:
-            response = await asyncio.to_thread(requests.get, url)
-            response.raise_for_status()
+            response = await self.__send("status", requests.get, url)
             resp_json = response.json()
             logger.debug(f"Status response received: {resp_json}")
             return MinecraftServerStatus.from_json(resp_json)
@@ -37,8 +55,7 @@ class ServerHandlerApiMinecraftServerServiceProvider(MinecraftServerService):
         logger.info("Requesting Minecraft server info.")
         logger.debug(f"GET {url}")
         try:
-            response = await asyncio.to_thread(requests.get, url)
-            response.raise_for_status()
+            response = await self.__send("info", requests.get, url)
             resp_json = response.json()
             logger.debug(f"Info response received: {resp_json}")
             return MinecraftServerInfo.from_json(resp_json)
@@ -51,8 +68,7 @@ class ServerHandlerApiMinecraftServerServiceProvider(MinecraftServerService):
         logger.info("Requesting host resource usage.")
         logger.debug(f"GET {url}")
         try:
-            response = await asyncio.to_thread(requests.get, url)
-            response.raise_for_status()
+            response = await self.__send("resources", requests.get, url)
             resp_json = response.json()
             logger.debug(f"Resources response received: {resp_json}")
             return ResourceUsage.from_json(resp_json)
@@ -65,8 +81,7 @@ class ServerHandlerApiMinecraftServerServiceProvider(MinecraftServerService):
         logger.info(f"Requesting latest Minecraft server logs with n={n}.")
         logger.debug(f"GET {url}")
         try:
-            response = await asyncio.to_thread(requests.get, url)
-            response.raise_for_status()
+            response = await self.__send("logs", requests.get, url)
             resp_json = response.json()
             logger.debug(f"Logs response received: {resp_json}")
             return LogsResponse.from_json(resp_json)
@@ -74,14 +89,23 @@ class ServerHandlerApiMinecraftServerServiceProvider(MinecraftServerService):
             logger.error(f"Error fetching server logs: {e}")
             raise
 
+    async def get_logs_since(self, cursor: Optional[str], n: int) -> LogsResponse:
+        url = f"{self.api_url}/logs"
+        logger.debug(f"GET {url} | since={cursor} n={n}")
+        try:
+            response = await self.__send("logs", requests.get, url, params={"n": n, "since": cursor or ""})
+            return LogsResponse.from_json(response.json())
+        except Exception as e:
+            logger.error(f"Error fetching server log delta: {e}")
+            raise
+
     async def command(self, command: str) -> dict:
         url = f"{self.api_url}/command"
         payload = {"command": command}
         logger.info(f"Sending command to Minecraft server: {command}")
         logger.debug(f"POST {url} | Payload: {payload}")
         try:
-            response = await asyncio.to_thread(requests.post, url, json=payload)
-            response.raise_for_status()
+            response = await self.__send("command", requests.post, url, json=payload)
             resp_json = response.json()
             logger.debug(f"Command response received: {resp_json}")
             return {"command": command, "response": resp_json}
@@ -89,14 +113,28 @@ class ServerHandlerApiMinecraftServerServiceProvider(MinecraftServerService):
             logger.error(f"Error sending command to server: {e}")
             raise
 
+    async def command_batch(self, commands: List[str]) -> List[dict]:
+        url = f"{self.api_url}/commands"
+        payload = {"commands": commands}
+        logger.info(f"Sending a batch of {len(commands)} commands to Minecraft server.")
+        logger.debug(f"POST {url} | Payload: {payload}")
+        try:
+            response = await self.__send("command_batch", requests.post, url, json=payload)
+            return response.json().get("results", [])
+        except Exception as e:
+            if http_status(e) == 404:
+                logger.info("server_handler has no /commands endpoint, sending the batch one command at a time.")
+                return await super().command_batch(commands)
+            logger.error(f"Error sending command batch to server: {e}")
+            raise
+
     async def install_mod_url(self, url: str) -> dict:
         api_url = f"{self.api_url}/mods"
         payload = {"url": url}
         logger.info(f"Requesting mod installation from URL: {url}")
         logger.debug(f"POST {api_url} | Payload: {payload}")
         try:
-            response = await asyncio.to_thread(requests.post, api_url, json=payload)
-            response.raise_for_status()
+            response = await self.__send("install_mod", requests.post, api_url, json=payload)
             resp_json = response.json()
             logger.debug(f"Mod install response received: {resp_json}")
             return resp_json
@@ -110,8 +148,7 @@ class ServerHandlerApiMinecraftServerServiceProvider(MinecraftServerService):
         logger.debug(f"POST {api_url} | File: {filename} ({len(file_bytes)} bytes)")
         try:
             files = {"file": (filename, file_bytes, "application/java-archive")}
-            response = await asyncio.to_thread(requests.post, api_url, files=files)
-            response.raise_for_status()
+            response = await self.__send("install_mod", requests.post, api_url, files=files)
             resp_json = response.json()
             logger.debug(f"Mod install response received: {resp_json}")
             return resp_json
@@ -119,13 +156,35 @@ class ServerHandlerApiMinecraftServerServiceProvider(MinecraftServerService):
             logger.error(f"Error uploading mod file: {e}")
             raise
 
+    async def install_mod_stream(self, filename: str, chunks: AsyncIterable[bytes]) -> dict:
+        api_url = f"{self.api_url}/mods"
+        logger.info(f"Streaming mod file upload: {filename}")
+        logger.debug(f"POST {api_url} | File: {filename} (streamed)")
+        boundary = uuid.uuid4().hex
+        # Set when this call ends, so a worker thread still sending the body stops pulling chunks
+        aborted = threading.Event()
+        _, chunk_timeout = self.__timeouts.get("install_mod")
+        try:
+            body = _multipart_file_body(
+                boundary, filename, chunks, asyncio.get_running_loop(), chunk_timeout=chunk_timeout, aborted=aborted
+            )
+            headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+            response = await self.__send("install_mod", requests.post, api_url, data=body, headers=headers)
+            resp_json = response.json()
+            logger.debug(f"Mod install response received: {resp_json}")
+            return resp_json
+        except Exception as e:
+            logger.error(f"Error streaming mod file: {e}")
+            raise
+        finally:
+            aborted.set()
+
     async def list_mods(self) -> dict:
         api_url = f"{self.api_url}/mods"
         logger.info("Listing installed mods")
         logger.debug(f"GET {api_url}")
         try:
-            response = await asyncio.to_thread(requests.get, api_url)
-            response.raise_for_status()
+            response = await self.__send("list_mods", requests.get, api_url)
             resp_json = response.json()
             logger.debug(f"List mods response received: {resp_json}")
             return resp_json
@@ -138,8 +197,7 @@ class ServerHandlerApiMinecraftServerServiceProvider(MinecraftServerService):
         logger.info(f"Removing mod: {filename}")
         logger.debug(f"DELETE {api_url}")
         try:
-            response = await asyncio.to_thread(requests.delete, api_url)
-            response.raise_for_status()
+            response = await self.__send("remove_mod", requests.delete, api_url)
             resp_json = response.json()
             logger.debug(f"Remove mod response received: {resp_json}")
             return resp_json
@@ -147,12 +205,58 @@ class ServerHandlerApiMinecraftServerServiceProvider(MinecraftServerService):
             logger.error(f"Error removing mod: {e}")
             raise
 
+    async def __send(self, endpoint: str, method: Callable, url: str, **kwargs) -> requests.Response:
+        async with self.__circuit_breaker:
+            response = await asyncio.to_thread(method, url, timeout=self.__timeouts.get(endpoint), **kwargs)
+            response.raise_for_status()
+            return response
+
     def __str__(self):
         return f"ServerHandlerApiMinecraftServerServiceProvider(api_url={self.api_url})"
 
 
+def _multipart_file_body(
+    boundary: str,
+    filename: str,
+    chunks: AsyncIterable[bytes],
+    loop: asyncio.AbstractEventLoop,
+    chunk_timeout: Optional[float] = None,
+    aborted: Optional[threading.Event] = None,
+) -> Iterator[bytes]:
+    """Multipart body for ``requests``, which sends a generator with chunked encoding.
+
+    ``requests`` consumes it in a worker thread, so each chunk is fetched from the async stream on the event loop.
+    Waiting more than ``chunk_timeout`` seconds for a chunk raises ``TimeoutError``. Once ``aborted`` is set, the loop
+    is closed or a fetch is cancelled, the body ends with ``concurrent.futures.CancelledError`` instead of a closing
+    boundary, so the thread doesn't outlive the upload and server_handler never sees a truncated file as complete.
+    """
+    quoted = filename.replace("\\", "\\\\").replace('"', '\\"')
+    yield (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{quoted}"\r\n'
+        "Content-Type: application/java-archive\r\n\r\n"
+    ).encode()
+    iterator = chunks.__aiter__()
+    while True:
+        if (aborted is not None and aborted.is_set()) or loop.is_closed():
+            raise concurrent.futures.CancelledError(f"Upload of {filename} was abandoned")
+        future = asyncio.run_coroutine_threadsafe(iterator.__anext__(), loop)
+        try:
+            chunk = future.result(timeout=chunk_timeout)
+        except StopAsyncIteration:
+            break
+        except concurrent.futures.TimeoutError:
+            if future.done():
+                raise
+            future.cancel()
+            raise TimeoutError(f"No data to upload for {filename} in {chunk_timeout}s") from None
+        yield chunk
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
 class MinecraftServiceProviderType(Enum):
     REST = auto()
+    AIOHTTP = auto()
 
 
 class MinecraftServiceFactory:
@@ -160,6 +264,17 @@ class MinecraftServiceFactory:
         MinecraftServiceProviderType.REST: lambda config: ServerHandlerApiMinecraftServerServiceProvider(
             config.get("minecraft.connectionstring", "http://localhost:3000"),
             config.get("minecraft.token", ""),
+            timeouts=timeouts_from_config(config, "minecraft", DEFAULT_ENDPOINT_TIMEOUTS),
+            circuit_breaker=circuit_breaker_from_config(config, "minecraft"),
+        ),
+        MinecraftServiceProviderType.AIOHTTP: lambda config: ServerHandlerAiohttpMinecraftServerServiceProvider(
+            config.get("minecraft.connectionstring", "http://localhost:3000"),
+            connection_limit=int(config.get("minecraft.http.connectionlimit", 20)),
+            connection_limit_per_host=int(config.get("minecraft.http.connectionlimitperhost", 10)),
+            dns_cache_ttl=int(config.get("minecraft.http.dnscachettl", 300)),
+            keepalive_timeout=float(config.get("minecraft.http.keepalivetimeout", 30)),
+            timeouts=timeouts_from_config(config, "minecraft", DEFAULT_ENDPOINT_TIMEOUTS),
+            circuit_breaker=circuit_breaker_from_config(config, "minecraft"),
         ),
     }
 
@@ -0,0 +1,166 @@
+import asyncio
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from loguru import logger
+
+from bot.anomaly_detector import AnomalyDetector
+from bot.metrics import metrics
+from bot.models.minecraft_server_status import HealthStatus, MinecraftServerStatus, ServerStatus
+from bot.models.resource_usage import ResourceUsage
+from bot.resource_history import ResourceHistory
+from bot.services.messaging.message_service import MessageService
+from bot.services.minecraft.minecraft_server_service import MinecraftServerService
+
+
+class StatusSnapshot(NamedTuple):
+    status: MinecraftServerStatus
+    resources: Optional[ResourceUsage]
+    updated_at: float
+
+
+class StatusPoller:
+    """Background task that keeps the latest server status and resource usage in memory.
+
+    The poll interval adapts to the server: ``fast_interval`` while it is starting, stopping or unhealthy (and for
+    ``settle_time`` seconds after any change or ``poke()``), ``slow_interval`` while it is online and healthy, and
+    ``offline_interval`` while it is stopped or server_handler can't be reached. The message services are notified
+    only when the status, the health or reachability changes. Each successful poll is also recorded in ``history``
+    and fed to ``anomaly_detector``.
+    """
+
+    def __init__(
+        self,
+        minecraft_service: MinecraftServerService,
+        message_services: Optional[List[MessageService]] = None,
+        fast_interval: float = 2.0,
+        slow_interval: float = 30.0,
+        offline_interval: float = 60.0,
+        settle_time: float = 60.0,
+        notify: bool = True,
+        history: Optional[ResourceHistory] = None,
+        anomaly_detector: Optional[AnomalyDetector] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.__minecraft_service = minecraft_service
+        self.__message_services = message_services if message_services is not None else []
+        self.__fast_interval = fast_interval
+        self.__slow_interval = slow_interval
+        self.__offline_interval = offline_interval
+        self.__settle_time = settle_time
+        self.__notify = notify
+        self.__history = history
+        self.__anomaly_detector = anomaly_detector
+        self.__clock = clock
+
+        self.__snapshot: Optional[StatusSnapshot] = None
+        self.__reachable: Optional[bool] = None
+        self.__outage_reported = False
+        self.__fast_until = 0.0
+        self.__wake = asyncio.Event()
+
+        self.__interval_gauge = metrics.gauge("status_poller_interval_seconds")
+
+    @property
+    def snapshot(self) -> Optional[StatusSnapshot]:
+        return self.__snapshot
+
+    def fresh_snapshot(self, max_age: Optional[float] = None) -> Optional[StatusSnapshot]:
+        """The last snapshot if it is younger than ``max_age`` (default: twice the slowest interval)."""
+        if self.__snapshot is None:
+            return None
+        if max_age is None:
+            max_age = 2 * max(self.__slow_interval, self.__offline_interval)
+        if self.__clock() - self.__snapshot.updated_at > max_age:
+            return None
+        return self.__snapshot
+
+    def poke(self):
+        """Poll now and keep polling fast for a while, e.g. right after /on or /off was sent."""
+        self.__fast_until = self.__clock() + self.__settle_time
+        self.__wake.set()
+
+    async def run(self):
+        logger.info("Status poller started.")
+        while True:
+            await self.poll_once()
+            interval = self.next_interval()
+            self.__interval_gauge.set(interval)
+            self.__wake.clear()
+            try:
+                await asyncio.wait_for(self.__wake.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def poll_once(self):
+        try:
+            status = await self.__minecraft_service.get_status()
+        except Exception as e:
+            metrics.counter("status_poller_polls_total", {"result": "error"}).inc()
+            logger.warning(f"Status poll failed: {e}")
+            await self.__set_reachable(False)
+            return
+
+        resources = None
+        if status.status == ServerStatus.ONLINE:
+            try:
+                resources = await self.__minecraft_service.get_resources()
+            except Exception as e:
+                logger.warning(f"Resource poll failed: {e}")
+        metrics.counter("status_poller_polls_total", {"result": "ok"}).inc()
+        self.__record_history(status, resources)
+        if self.__anomaly_detector is not None:
+            await self.__anomaly_detector.observe(status, resources)
+
+        previous = self.__snapshot.status if self.__snapshot is not None else None
+        self.__snapshot = StatusSnapshot(status, resources, self.__clock())
+        await self.__set_reachable(True)
+        if previous is not None and (previous.status, previous.health) != (status.status, status.health):
+            self.__fast_until = self.__clock() + self.__settle_time
+            await self.__notify_all(
+                f"🔔 Server status changed: {previous.status.value} → {status.status.value} "
+                f"(health: {previous.health.value} → {status.health.value})"
+            )
+
+    def __record_history(self, status: MinecraftServerStatus, resources: Optional[ResourceUsage]):
+        if self.__history is None or (resources is None and status.tps is None and status.online_players is None):
+            return
+        self.__history.record(
+            cpu=resources.cpu_usage if resources is not None else None,
+            memory=resources.memory_used_percent if resources is not None else None,
+            disk=resources.disk_used_percent if resources is not None else None,
+            tps=status.tps,
+            players=status.online_players,
+        )
+
+    def next_interval(self) -> float:
+        if self.__clock() < self.__fast_until:
+            return self.__fast_interval
+        if not self.__reachable or self.__snapshot is None:
+            return self.__offline_interval
+        status = self.__snapshot.status
+        if status.status == ServerStatus.OFFLINE:
+            return self.__offline_interval
+        if status.status == ServerStatus.ONLINE and status.health == HealthStatus.HEALTHY:
+            return self.__slow_interval
+        return self.__fast_interval
+
+    async def __set_reachable(self, reachable: bool):
+        was_reachable, self.__reachable = self.__reachable, reachable
+        # Only an outage after a successful poll is reported, so a bot started before server_handler stays quiet
+        if was_reachable is True and not reachable:
+            await self.__notify_all("⚠️ The server handler stopped responding.")
+        elif was_reachable is False and reachable and self.__outage_reported:
+            await self.__notify_all("✅ The server handler is responding again.")
+        if was_reachable is not reachable:
+            self.__outage_reported = was_reachable is True
+
+    async def __notify_all(self, notification: str):
+        logger.info(notification)
+        if not self.__notify:
+            return
+        for message_service in self.__message_services:
+            try:
+                await message_service.send_message(notification)
+            except Exception as e:
+                logger.error(f"Failed to send status notification: {e}")
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from typing import AsyncIterable, AsyncIterator, Callable, Optional, Tuple
+
+import aiohttp
+
+from bot.exceptions import UploadTooLargeError
+from bot.metrics import metrics
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+# Upload rates from 64 KiB/s to 1 GiB/s, doubling; the default buckets are meant for seconds
+BYTE_RATE_BUCKETS = tuple(float(64 * 1024 * 2**i) for i in range(15))
+
+
+async def iter_url_chunks(url: str, chunk_size: int = DEFAULT_CHUNK_SIZE, ssl: bool = True) -> AsyncIterator[bytes]:
+    """Download ``url`` chunk by chunk; nothing is requested until the first chunk is asked for."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, ssl=None if ssl else False) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+
+async def url_content_length(url: str, ssl: bool = True) -> Optional[int]:
+    """Size ``url`` announces in a HEAD request, or None if it doesn't say."""
+    async with aiohttp.ClientSession() as session:
+        async with session.head(url, ssl=None if ssl else False, allow_redirects=True) as response:
+            response.raise_for_status()
+            return response.content_length
+
+
+async def hash_chunks(chunks: AsyncIterable[bytes], max_bytes: Optional[int] = None) -> Tuple[str, int]:
+    """SHA-256 hex digest and size of a stream, read one chunk at a time. Raises ``UploadTooLargeError`` past ``max_bytes``."""
+    digest = hashlib.sha256()
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if max_bytes is not None and size > max_bytes:
+            raise UploadTooLargeError(size, max_bytes)
+        digest.update(chunk)
+    return digest.hexdigest(), size
+
+
+class UploadStream:
+    """Single-use async iterator over an upload's chunks that enforces ``max_bytes`` and measures throughput.
+
+    Only one chunk is held at a time, so memory stays flat whatever the file size. Going past ``max_bytes`` raises
+    ``UploadTooLargeError`` from inside the iteration, which aborts the upload that is consuming it. The SHA-256 of the
+    content is computed along the way and available as ``sha256`` once the stream is exhausted.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterable[bytes],
+        max_bytes: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.__chunks = chunks
+        self.__max_bytes = max_bytes
+        self.__clock = clock
+        self.__started: Optional[float] = None
+        self.__finished: Optional[float] = None
+        self.__digest = hashlib.sha256()
+        self.bytes = 0
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.__iterate()
+
+    async def __iterate(self) -> AsyncIterator[bytes]:
+        self.__started = self.__clock()
+        async for chunk in self.__chunks:
+            self.bytes += len(chunk)
+            if self.__max_bytes is not None and self.bytes > self.__max_bytes:
+                raise UploadTooLargeError(self.bytes, self.__max_bytes)
+            self.__digest.update(chunk)
+            yield chunk
+        self.__finished = self.__clock()
+        metrics.counter("mod_upload_bytes_total").inc(self.bytes)
+        metrics.histogram("mod_upload_bytes_per_second", buckets=BYTE_RATE_BUCKETS).observe(self.throughput)
+
+    @property
+    def sha256(self) -> Optional[str]:
+        """Hex digest of the content, or None until every chunk has been read."""
+        return self.__digest.hexdigest() if self.__finished is not None else None
+
+    @property
+    def elapsed(self) -> float:
+        if self.__started is None:
+            return 0.0
+        return (self.__finished if self.__finished is not None else self.__clock()) - self.__started
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second since the first chunk was requested."""
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "bytes": self.bytes,
+            "seconds": round(self.elapsed, 3),
+            "bytes_per_second": round(self.throughput),
+            "sha256": self.sha256,
+        }
+
+
+class JarSpool:
+    """Temporary file a jar is copied to as it streams past, so its metadata can be read once the upload is done.
+
+    Only disk is used, never memory. Use as a context manager; the file is deleted on exit.
+    """
+
+    def __init__(self):
+        self.__file = tempfile.NamedTemporaryFile(prefix="admine-", suffix=".jar", delete=False)
+        self.complete = False
+
+    @property
+    def path(self) -> str:
+        return self.__file.name
+
+    async def tee(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """Pass ``chunks`` through while appending each one to the file."""
+        async for chunk in chunks:
+            await asyncio.to_thread(self.__file.write, chunk)
+            yield chunk
+        await asyncio.to_thread(self.__file.flush)
+        self.complete = True
+
+    def __enter__(self) -> "JarSpool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.__file.close()
+        try:
+            os.remove(self.__file.name)
+        except OSError:
+            pass
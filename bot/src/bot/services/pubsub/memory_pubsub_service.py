@@ -0,0 +1,127 @@
+import asyncio
+import fnmatch
+import random
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from bot.exceptions import AdmineMessageError
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage
+from bot.models.admine_message_codec import CodecType
+from bot.services.pubsub.pubsub_service import PubSubService
+from bot.services.pubsub.tracing import record_incoming, stamp_outgoing
+
+
+class _Subscription:
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue()
+
+    def matches(self, channel: str) -> bool:
+        # Same glob syntax as Redis PSUBSCRIBE; a pattern without wildcards is a plain channel name.
+        return any(fnmatch.fnmatchcase(channel, pattern) for pattern in self.patterns)
+
+
+class MemoryBroker:
+    """In-process stand-in for a Redis server: fans every published payload out to all matching subscriptions."""
+
+    def __init__(self):
+        self.__subscriptions: List[_Subscription] = []
+
+    def subscribe(self, patterns: List[str]) -> _Subscription:
+        subscription = _Subscription(list(patterns))
+        self.__subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: _Subscription):
+        if subscription in self.__subscriptions:
+            self.__subscriptions.remove(subscription)
+
+    def subscribers(self, channel: str) -> List[_Subscription]:
+        return [subscription for subscription in self.__subscriptions if subscription.matches(channel)]
+
+
+# Providers created by the factory share this broker, so services in one process can talk to each other.
+default_broker = MemoryBroker()
+
+
+class MemoryPubSubServiceProvider(PubSubService):
+    """PubSubService that never leaves the process, for tests, benchmarks and local runs without Redis.
+
+    Messages go through the configured codec like on the wire. ``latency``/``jitter`` (seconds) delay each delivery
+    and ``loss_rate`` drops a share of deliveries; pass ``seed`` for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        subscribed_channels: Optional[list[str]] = None,
+        producer_channels: Optional[list[str]] = None,
+        broker: Optional[MemoryBroker] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        loss_rate: float = 0.0,
+        seed: Optional[int] = None,
+        codec: CodecType = CodecType.JSON,
+    ):
+        super().__init__("memory", 0, subscribed_channels, producer_channels)
+        self.__broker = broker if broker is not None else default_broker
+        self.__latency = latency
+        self.__jitter = jitter
+        self.__loss_rate = loss_rate
+        self.__random = random.Random(seed)
+        self.__codec = codec
+        self.__subscription: Optional[_Subscription] = None
+        self.__stop_event = asyncio.Event()
+        self.__dropped = metrics.counter("pubsub_memory_dropped_total")
+        logger.info(f"In-memory pubsub initialized (latency={latency}s, jitter={jitter}s, loss={loss_rate})")
+
+    @property
+    def broker(self) -> MemoryBroker:
+        return self.__broker
+
+    async def send_message(self, message: AdmineMessage) -> Dict[str, int]:
+        payload = stamp_outgoing(message).to_bytes(self.__codec)
+        loop = asyncio.get_running_loop()
+
+        result = {}
+        for channel in self.producer_channels:
+            subscribers = self.__broker.subscribers(channel)
+            for subscription in subscribers:
+                # Like Redis, the receiver count reflects subscribers, not whether delivery succeeded.
+                if self.__loss_rate and self.__random.random() < self.__loss_rate:
+                    self.__dropped.inc()
+                    continue
+                delay = self.__latency + (self.__random.uniform(0, self.__jitter) if self.__jitter else 0.0)
+                if delay > 0:
+                    loop.call_later(delay, subscription.queue.put_nowait, payload)
+                else:
+                    subscription.queue.put_nowait(payload)
+            result[channel] = len(subscribers)
+        return result
+
+    async def listen_message(self, callback_function):
+        self.__subscription = self.__broker.subscribe(self.subscribed_channels)
+        logger.debug(f"Listening to in-memory channels: {', '.join(self.subscribed_channels)}")
+        try:
+            while not self.__stop_event.is_set():
+                payload = await self.__subscription.queue.get()
+                if self.__stop_event.is_set():
+                    break
+                try:
+                    data = record_incoming(AdmineMessage.from_bytes(payload, self.__codec))
+                except AdmineMessageError as e:
+                    logger.error(f"Dropping malformed in-memory message: {e}")
+                    continue
+                if self.resolve_reply(data):
+                    continue
+                await callback_function(data)
+        finally:
+            self.__broker.unsubscribe(self.__subscription)
+
+    async def close(self):
+        self.__stop_event.set()
+        if self.__subscription is not None:
+            self.__broker.unsubscribe(self.__subscription)
+            # Wake up a listener blocked on an empty queue so it sees the stop event
+            self.__subscription.queue.put_nowait(b"")
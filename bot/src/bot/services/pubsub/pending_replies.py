@@ -0,0 +1,55 @@
+import asyncio
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from loguru import logger
+
+from bot.models.admine_message import AdmineMessage
+
+# Final replies that change the server's state; every channel is told about them, not just the requester
+BROADCAST_TAGS = frozenset({"server_on", "server_off"})
+
+
+class _PendingRequest(NamedTuple):
+    future: asyncio.Future
+    final_tags: frozenset
+
+
+class PendingReplies:
+    """Futures for published requests, keyed by the request's message id.
+
+    Replies name the request in their ``correlation_id``. A reply carrying one of the request's final tags completes
+    its future; any other correlated reply (e.g. a "Starting server" notification) is progress and only logged.
+    Final replies carrying a ``BROADCAST_TAGS`` tag complete the future and are still handled as normal events.
+    """
+
+    def __init__(self):
+        self.__pending: Dict[str, _PendingRequest] = {}
+
+    def __len__(self) -> int:
+        return len(self.__pending)
+
+    def register(self, request_id: str, final_tags: Iterable[str]) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.__pending[request_id] = _PendingRequest(future, frozenset(final_tags))
+        return future
+
+    def discard(self, request_id: str):
+        pending: Optional[_PendingRequest] = self.__pending.pop(request_id, None)
+        if pending is not None and not pending.future.done():
+            pending.future.cancel()
+
+    def resolve(self, message: AdmineMessage) -> bool:
+        """Route a received message to its waiting request. Returns True if it was consumed and must not be dispatched.
+
+        False means nobody is waiting for it, or it completed a request but also announces a state change.
+        """
+        pending = self.__pending.get(message.correlation_id) if message.correlation_id else None
+        if pending is None:
+            return False
+
+        if pending.final_tags.intersection(message.tags):
+            if not pending.future.done():
+                pending.future.set_result(message)
+            return not BROADCAST_TAGS.intersection(message.tags)
+        logger.debug(f"Progress for request {message.correlation_id}: {message.message}")
+        return True
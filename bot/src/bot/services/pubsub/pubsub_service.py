@@ -1,7 +1,14 @@
+import asyncio
+import uuid
 from abc import ABC, abstractmethod
-from typing import Callable, Optional
+from typing import Callable, Dict, Iterable, Optional
 
+from loguru import logger
+
+from bot.exceptions import PubSubNoSubscriberError
+from bot.metrics import metrics
 from bot.models.admine_message import AdmineMessage
+from bot.services.pubsub.pending_replies import PendingReplies
 
 
 class PubSubService(ABC):
@@ -20,6 +27,7 @@ class PubSubService(ABC):
         self.__port = port
         self.__subscribed_channels = subscribed_channels
         self.__producer_channels = producer_channels
+        self.__pending_replies = PendingReplies()
 
     @property
     def host(self) -> str:
@@ -38,13 +46,53 @@ class PubSubService(ABC):
         return self.__producer_channels
 
     @abstractmethod
-    def send_message(self, message):
+    async def send_message(self, message: AdmineMessage) -> Dict[str, int]:
+        """Publish to every producer channel and return the number of subscribers reached per channel."""
         pass
 
+    async def request(self, message: AdmineMessage, final_tags: Iterable[str], timeout: float) -> AdmineMessage:
+        """Publish ``message`` and wait for the reply correlated to it that carries one of ``final_tags``.
+
+        Raises PubSubNoSubscriberError if nobody received the request and TimeoutError if no final reply arrives in
+        ``timeout`` seconds. Correlated replies are consumed here and don't reach the ``listen_message`` callback,
+        except ``server_on``/``server_off`` finals, which are also dispatched as events.
+        """
+        message = message.replace(message_id=message.message_id or uuid.uuid4().hex)
+        future = self.__pending_replies.register(message.message_id, final_tags)
+        tag = message.tags[0] if message.tags else "none"
+        started = asyncio.get_running_loop().time()
+        result = "error"
+        try:
+            receivers = await self.send_message(message)
+            if not any(receivers.values()):
+                result = "no_subscriber"
+                raise PubSubNoSubscriberError(list(receivers))
+            reply = await asyncio.wait_for(future, timeout)
+            result = "ok"
+            return reply
+        except TimeoutError:
+            result = "timeout"
+            logger.warning(f"No reply to request {message.message_id} ({tag}) after {timeout}s")
+            raise
+        finally:
+            self.__pending_replies.discard(message.message_id)
+            metrics.counter("pubsub_requests_total", {"tag": tag, "result": result}).inc()
+            if result == "ok":
+                elapsed = asyncio.get_running_loop().time() - started
+                metrics.histogram("pubsub_request_seconds", {"tag": tag}).observe(elapsed)
+
+    def resolve_reply(self, message: AdmineMessage) -> bool:
+        """Hand a received message to the request waiting for it. Providers call this before their callback.
+
+        Returns True if the message was consumed. ``server_on``/``server_off`` replies complete the request and still
+        return False, so every channel hears that the server started or stopped.
+        """
+        return self.__pending_replies.resolve(message)
+
     @abstractmethod
     def listen_message(self, callback_function: Callable[[AdmineMessage], None] = None):
         pass
 
     @abstractmethod
-    def close(self):
+    async def close(self):
         pass
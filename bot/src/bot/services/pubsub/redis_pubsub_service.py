@@ -1,18 +1,24 @@
 import asyncio
 from enum import Enum, auto
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-import redis
 from loguru import logger
 
 from bot.config import Config
-from bot.exceptions import PubSubServiceFactoryException
+from bot.exceptions import AdmineMessageError, PubSubServiceFactoryException
 from bot.models.admine_message import AdmineMessage
+from bot.models.admine_message_codec import CodecType, parse_channel_codecs
+from bot.services.pubsub.memory_pubsub_service import MemoryPubSubServiceProvider
 from bot.services.pubsub.pubsub_service import PubSubService
+from bot.services.pubsub.redis_reconnect import CONNECTION_ERRORS, RedisReconnector, create_redis_client
+from bot.services.pubsub.redis_streams_pubsub_service import RedisStreamsPubSubServiceProvider
+from bot.services.pubsub.tracing import record_incoming, stamp_outgoing
 
 
 class PubSubServiceProviderType(Enum):
     REDIS = auto()
+    REDIS_STREAMS = auto()
+    MEMORY = auto()
 
 
 class RedisPubSubServiceProvider(PubSubService):
@@ -23,39 +29,108 @@ class RedisPubSubServiceProvider(PubSubService):
         subscribed_channels: Optional[list[str]] = None,
         producer_channels: Optional[list[str]] = None,
         callback_function: Callable[[AdmineMessage], None] = None,
+        max_batch_size: int = 100,
+        health_check_interval: int = 30,
+        max_connections: int = 10,
+        reconnect_base_delay: float = 0.5,
+        reconnect_max_delay: float = 30.0,
+        codecs: Optional[Dict[str, CodecType]] = None,
     ):
         super().__init__(host, port, subscribed_channels, producer_channels)
         self.event_handle_function_callback = callback_function
-        self.__client = redis.StrictRedis(host, port, db=0)
-        self.__pubsub = self.__client.pubsub()
+        self.__codecs = dict(codecs or {})
+        self.__max_batch_size = max(1, max_batch_size)
+        self.__health_check_interval = health_check_interval
+        self.__client = create_redis_client(
+            host, port, health_check_interval, max_connections, reconnect_base_delay, reconnect_max_delay
+        )
+        self.__pubsub = self.__client.pubsub(ignore_subscribe_messages=True)
+        self.__reconnector = RedisReconnector("redis", reconnect_base_delay, reconnect_max_delay)
         self.__stop_event = asyncio.Event()
-        self.__client.ping()
         logger.info(f"Redis client initialized at {host}:{port}")
-        for channel in self.subscribed_channels:
-            self.__pubsub.subscribe(channel)
 
-    def send_message(self, message: AdmineMessage):
+    @property
+    def reconnect_count(self) -> int:
+        return self.__reconnector.reconnect_count
+
+    @property
+    def last_recovery_seconds(self) -> Optional[float]:
+        return self.__reconnector.last_recovery_seconds
+
+    async def send_message(self, message: AdmineMessage) -> Dict[str, int]:
         logger.debug(f"Sending message to channels: {', '.join(self.producer_channels)}")
+        stamped = stamp_outgoing(message)
+        payloads = {}
+
+        # One pipelined round trip for every producer channel instead of one PUBLISH per channel.
+        async with self.__client.pipeline(transaction=False) as pipe:
+            for channel in self.producer_channels:
+                codec = self.__codecs.get(channel, CodecType.JSON)
+                if codec not in payloads:
+                    payloads[codec] = stamped.to_bytes(codec)
+                pipe.publish(channel, payloads[codec])
+            receivers = await pipe.execute()
 
-        for channel in self.producer_channels:
-            self.__client.publish(channel, message.from_object_to_json())
+        result = dict(zip(self.producer_channels, receivers))
+        logger.debug(f"Message delivered to subscribers: {result}")
+        return result
 
     async def listen_message(self, callback_function):
+        while not self.__stop_event.is_set():
+            try:
+                await self.__consume(callback_function)
+            except CONNECTION_ERRORS as e:
+                if self.__stop_event.is_set():
+                    break
+                # Drop the broken subscription; a fresh one re-SUBSCRIBEs once Redis answers again.
+                await self.__pubsub.aclose()
+                self.__pubsub = self.__client.pubsub(ignore_subscribe_messages=True)
+                if not await self.__reconnector.wait_until_reachable(self.__client, self.__stop_event, e):
+                    break
+
+    async def __consume(self, callback_function):
+        await self.__pubsub.subscribe(*self.subscribed_channels)
         logger.debug(f"Listening to channels: {', '.join(self.subscribed_channels)}")
 
         while not self.__stop_event.is_set():
-            message = self.__pubsub.get_message()
-            if message and message["type"] == "message":
-                logger.debug(f"Received message: {message['data']}")
-                data = AdmineMessage.from_json_to_object(message["data"].decode("utf-8"))
+            # Blocks on the socket until Redis pushes something. Waking up once per health check interval lets the
+            # next read PING an idle connection, so a silently dead socket is noticed.
+            message = await self.__pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=self.__health_check_interval
+            )
+            if message is None:
+                continue
+
+            for item in await self.__drain(message):
+                logger.debug(f"Received message: {item['data']}")
+                try:
+                    data = record_incoming(AdmineMessage.from_bytes(item["data"], self.__codec_for(item["channel"])))
+                except AdmineMessageError as e:
+                    logger.error(f"Dropping malformed message from {item['channel']}: {e}")
+                    continue
+                if self.resolve_reply(data):
+                    continue
                 await callback_function(data)
 
-            await asyncio.sleep(0.1)
+    def __codec_for(self, channel) -> CodecType:
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        return self.__codecs.get(channel, CodecType.JSON)
+
+    async def __drain(self, first: dict) -> List[dict]:
+        """Collect messages already buffered on the connection so a burst is handled in one wakeup."""
+        batch = [first]
+        while len(batch) < self.__max_batch_size:
+            message = await self.__pubsub.get_message(ignore_subscribe_messages=True, timeout=0)
+            if message is None:
+                break
+            batch.append(message)
+        return [item for item in batch if item["type"] == "message"]
 
-    def close(self):
+    async def close(self):
         self.__stop_event.set()
-        self.__pubsub.unsubscribe()
-        self.__client.close()
+        await self.__pubsub.aclose()
+        await self.__client.aclose()
 
 
 class PubSubServiceFactory:
@@ -65,7 +140,40 @@ class PubSubServiceFactory:
             port=int(config.get("redis.connectionstring").split(":")[1]),
             subscribed_channels=config.get("redis.subscribedchannels", ["server_channel", "vpn_channel"]),
             producer_channels=config.get("redis.producerchannels", ["command_channel"]),
-        )
+            max_batch_size=int(config.get("redis.maxbatchsize", 100)),
+            health_check_interval=int(config.get("redis.healthcheckinterval", 30)),
+            max_connections=int(config.get("redis.maxconnections", 10)),
+            reconnect_base_delay=float(config.get("redis.reconnect.basedelay", 0.5)),
+            reconnect_max_delay=float(config.get("redis.reconnect.maxdelay", 30.0)),
+            codecs=parse_channel_codecs(config.get("redis.codecs", {})),
+        ),
+        PubSubServiceProviderType.REDIS_STREAMS: lambda config: RedisStreamsPubSubServiceProvider(
+            host=config.get("redis.connectionstring").split(":")[0],
+            port=int(config.get("redis.connectionstring").split(":")[1]),
+            subscribed_channels=config.get("redis.subscribedchannels", ["server_channel", "vpn_channel"]),
+            producer_channels=config.get("redis.producerchannels", ["command_channel"]),
+            group=config.get("redis.streams.group", "admine-bot"),
+            consumer=config.get("redis.streams.consumer"),
+            batch_size=int(config.get("redis.streams.batchsize", 50)),
+            block_ms=int(config.get("redis.streams.blockms", 5000)),
+            max_len=int(config.get("redis.streams.maxlen", 10000)),
+            claim_idle_ms=int(config.get("redis.streams.claimidlems", 60000)),
+            max_deliveries=int(config.get("redis.streams.maxdeliveries", 5)),
+            health_check_interval=int(config.get("redis.healthcheckinterval", 30)),
+            max_connections=int(config.get("redis.maxconnections", 10)),
+            reconnect_base_delay=float(config.get("redis.reconnect.basedelay", 0.5)),
+            reconnect_max_delay=float(config.get("redis.reconnect.maxdelay", 30.0)),
+            codecs=parse_channel_codecs(config.get("redis.codecs", {})),
+        ),
+        PubSubServiceProviderType.MEMORY: lambda config: MemoryPubSubServiceProvider(
+            subscribed_channels=config.get("memory.subscribedchannels", ["server_channel", "vpn_channel"]),
+            producer_channels=config.get("memory.producerchannels", ["command_channel"]),
+            latency=float(config.get("memory.latencyms", 0)) / 1000,
+            jitter=float(config.get("memory.jitterms", 0)) / 1000,
+            loss_rate=float(config.get("memory.lossrate", 0)),
+            seed=config.get("memory.seed"),
+            codec=CodecType(config.get("memory.codec", "json")),
+        ),
     }
 
     @staticmethod
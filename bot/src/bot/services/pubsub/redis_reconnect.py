@@ -0,0 +1,78 @@
+import asyncio
+from typing import Optional
+
+import redis.asyncio as aioredis
+from loguru import logger
+from redis.asyncio.retry import Retry
+from redis.backoff import EqualJitterBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from bot.metrics import metrics
+
+CONNECTION_ERRORS = (RedisConnectionError, RedisTimeoutError, ConnectionError, OSError)
+
+
+def create_redis_client(
+    host: str,
+    port: int,
+    health_check_interval: int = 30,
+    max_connections: int = 10,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+) -> aioredis.Redis:
+    """Build a pooled asyncio client that health-checks idle connections and retries commands on connection errors."""
+    pool = aioredis.ConnectionPool(
+        host=host,
+        port=port,
+        db=0,
+        max_connections=max_connections,
+        health_check_interval=health_check_interval,
+        socket_keepalive=True,
+        socket_connect_timeout=5,
+        retry=Retry(EqualJitterBackoff(cap=max_delay, base=base_delay), retries=3),
+    )
+    return aioredis.Redis(connection_pool=pool)
+
+
+class RedisReconnector:
+    """Waits out a Redis outage with jittered exponential backoff and records how long recovery took."""
+
+    def __init__(self, provider: str, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.__backoff = EqualJitterBackoff(cap=max_delay, base=base_delay)
+        self.__reconnects = metrics.counter("pubsub_reconnects_total", {"provider": provider})
+        self.__recovery_seconds = metrics.histogram("pubsub_recovery_seconds", {"provider": provider})
+        self.__last_recovery_seconds: Optional[float] = None
+
+    @property
+    def reconnect_count(self) -> int:
+        return self.__reconnects.value
+
+    @property
+    def last_recovery_seconds(self) -> Optional[float]:
+        return self.__last_recovery_seconds
+
+    async def wait_until_reachable(self, client: aioredis.Redis, stop_event: asyncio.Event, error: Exception) -> bool:
+        """Ping with backoff until Redis answers. Returns False if the provider was stopped meanwhile."""
+        loop = asyncio.get_running_loop()
+        down_since = loop.time()
+        logger.warning(f"Lost connection to Redis: {error}. Reconnecting...")
+
+        failures = 0
+        while not stop_event.is_set():
+            failures += 1
+            delay = self.__backoff.compute(failures)
+            logger.debug(f"Reconnect attempt {failures} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            try:
+                await client.ping()
+            except CONNECTION_ERRORS as e:
+                logger.warning(f"Redis still unreachable after {failures} attempts: {e}")
+                continue
+
+            self.__last_recovery_seconds = loop.time() - down_since
+            self.__reconnects.inc()
+            self.__recovery_seconds.observe(self.__last_recovery_seconds)
+            logger.info(f"Reconnected to Redis after {self.__last_recovery_seconds:.2f}s ({failures} attempts)")
+            return True
+        return False
@@ -0,0 +1,242 @@
+import asyncio
+import socket
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from redis.exceptions import ResponseError
+
+from bot.exceptions import AdmineMessageError
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage
+from bot.models.admine_message_codec import CodecType
+from bot.services.pubsub.pubsub_service import PubSubService
+from bot.services.pubsub.redis_reconnect import CONNECTION_ERRORS, RedisReconnector, create_redis_client
+from bot.services.pubsub.tracing import record_incoming, stamp_outgoing
+
+StreamEntry = Tuple[bytes, Dict[bytes, bytes]]
+
+
+class RedisStreamsPubSubServiceProvider(PubSubService):
+    """PubSubService backed by Redis Streams and a consumer group.
+
+    Every channel is a stream. Entries stay in the stream until the consumer group acknowledges them, so events
+    published while the bot is offline are delivered once it comes back. Entries whose callback failed stay in the
+    pending list and are reclaimed after ``claim_idle_ms``. An entry already delivered ``max_deliveries`` times is
+    acknowledged and logged instead of being run again, so one that always fails can't be retried forever; those are
+    counted in ``pubsub_dead_letter_total{stream}``.
+    """
+
+    PAYLOAD_FIELD = b"data"
+    # Names the wire format of PAYLOAD_FIELD. Entries without it are read as JSON.
+    CODEC_FIELD = b"codec"
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        subscribed_channels: Optional[list[str]] = None,
+        producer_channels: Optional[list[str]] = None,
+        group: str = "admine-bot",
+        consumer: Optional[str] = None,
+        batch_size: int = 50,
+        block_ms: int = 5000,
+        max_len: int = 10000,
+        claim_idle_ms: int = 60000,
+        max_deliveries: int = 5,
+        health_check_interval: int = 30,
+        max_connections: int = 10,
+        reconnect_base_delay: float = 0.5,
+        reconnect_max_delay: float = 30.0,
+        codecs: Optional[Dict[str, CodecType]] = None,
+    ):
+        super().__init__(host, port, subscribed_channels, producer_channels)
+        self.__group = group
+        self.__codecs = dict(codecs or {})
+        # A stable consumer name lets a restarted bot pick up its own pending entries first.
+        self.__consumer = consumer or f"bot-{socket.gethostname()}"
+        self.__batch_size = max(1, batch_size)
+        self.__block_ms = block_ms
+        self.__max_len = max_len
+        self.__claim_idle_ms = claim_idle_ms
+        self.__max_deliveries = max(1, max_deliveries)
+        self.__client = create_redis_client(
+            host, port, health_check_interval, max_connections, reconnect_base_delay, reconnect_max_delay
+        )
+        self.__reconnector = RedisReconnector("redis_streams", reconnect_base_delay, reconnect_max_delay)
+        self.__stop_event = asyncio.Event()
+        logger.info(f"Redis Streams client initialized at {host}:{port} (group={group}, consumer={self.__consumer})")
+
+    @property
+    def group(self) -> str:
+        return self.__group
+
+    @property
+    def consumer(self) -> str:
+        return self.__consumer
+
+    @property
+    def reconnect_count(self) -> int:
+        return self.__reconnector.reconnect_count
+
+    @property
+    def last_recovery_seconds(self) -> Optional[float]:
+        return self.__reconnector.last_recovery_seconds
+
+    async def send_message(self, message: AdmineMessage) -> Dict[str, int]:
+        logger.debug(f"Appending message to streams: {', '.join(self.producer_channels)}")
+        stamped = stamp_outgoing(message)
+        fields_by_codec = {}
+
+        async with self.__client.pipeline(transaction=False) as pipe:
+            for channel in self.producer_channels:
+                codec = self.__codecs.get(channel, CodecType.JSON)
+                if codec not in fields_by_codec:
+                    fields_by_codec[codec] = {
+                        self.PAYLOAD_FIELD: stamped.to_bytes(codec),
+                        self.CODEC_FIELD: codec.value,
+                    }
+                pipe.xadd(channel, fields_by_codec[codec], maxlen=self.__max_len, approximate=True)
+            entry_ids = await pipe.execute()
+
+        # A stream entry is stored until acknowledged, so every successful XADD counts as delivered.
+        result = {channel: 1 if entry_id else 0 for channel, entry_id in zip(self.producer_channels, entry_ids)}
+        logger.debug(f"Message appended to streams: {result}")
+        return result
+
+    async def listen_message(self, callback_function):
+        while not self.__stop_event.is_set():
+            try:
+                await self.__consume(callback_function)
+            except CONNECTION_ERRORS as e:
+                if self.__stop_event.is_set():
+                    break
+                # Unacknowledged entries stay pending on the server and are replayed after reconnecting.
+                if not await self.__reconnector.wait_until_reachable(self.__client, self.__stop_event, e):
+                    break
+
+    async def __consume(self, callback_function):
+        await self.__ensure_groups()
+        logger.debug(f"Listening to streams: {', '.join(self.subscribed_channels)}")
+
+        # Entries delivered to this consumer before a crash are replayed before reading new ones.
+        await self.__replay_pending(callback_function)
+        await self.__reclaim(callback_function)
+        loop = asyncio.get_running_loop()
+        next_claim = loop.time() + self.__claim_idle_ms / 1000
+
+        while not self.__stop_event.is_set():
+            await self.__read_new(callback_function)
+            if loop.time() >= next_claim:
+                await self.__reclaim(callback_function)
+                next_claim = loop.time() + self.__claim_idle_ms / 1000
+
+    async def __ensure_groups(self):
+        for stream in self.subscribed_channels:
+            try:
+                await self.__client.xgroup_create(stream, self.__group, id="$", mkstream=True)
+                logger.info(f"Created consumer group {self.__group} on stream {stream}")
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    async def __read_new(self, callback_function):
+        # BLOCK parks the connection server-side until entries arrive; COUNT lets one round trip carry a burst.
+        response = await self.__client.xreadgroup(
+            self.__group,
+            self.__consumer,
+            {stream: ">" for stream in self.subscribed_channels},
+            count=self.__batch_size,
+            block=self.__block_ms,
+        )
+        for stream, entries in response or []:
+            await self.__process(stream, entries, callback_function)
+
+    async def __replay_pending(self, callback_function):
+        last_ids = {stream: "0" for stream in self.subscribed_channels}
+        while last_ids:
+            response = await self.__client.xreadgroup(self.__group, self.__consumer, last_ids, count=self.__batch_size)
+            progressed = {}
+            for stream, entries in response or []:
+                if entries:
+                    logger.info(f"Replaying {len(entries)} pending entries from stream {stream}")
+                    progressed[stream] = entries[-1][0]
+                    await self.__process(stream, await self.__drop_exhausted(stream, entries), callback_function)
+            last_ids = progressed
+
+    async def __reclaim(self, callback_function):
+        for stream in self.subscribed_channels:
+            start_id = "0-0"
+            while True:
+                response = await self.__client.xautoclaim(
+                    stream,
+                    self.__group,
+                    self.__consumer,
+                    self.__claim_idle_ms,
+                    start_id=start_id,
+                    count=self.__batch_size,
+                )
+                start_id, entries = response[0], response[1]
+                if entries:
+                    logger.info(f"Reclaimed {len(entries)} pending entries from stream {stream}")
+                    await self.__process(stream, await self.__drop_exhausted(stream, entries), callback_function)
+                if start_id in (b"0-0", "0-0"):
+                    break
+
+    async def __drop_exhausted(self, stream, entries: List[StreamEntry]) -> List[StreamEntry]:
+        """Acknowledge the redelivered entries that reached ``max_deliveries`` and return the others."""
+        pending = await self.__client.xpending_range(
+            stream, self.__group, min=entries[0][0], max=entries[-1][0], count=len(entries)
+        )
+        deliveries = {item["message_id"]: item["times_delivered"] for item in pending}
+        exhausted = [entry_id for entry_id, _ in entries if deliveries.get(entry_id, 0) > self.__max_deliveries]
+        if not exhausted:
+            return entries
+        for entry_id in exhausted:
+            logger.error(
+                f"Giving up on stream entry {entry_id} from {stream} after {deliveries[entry_id] - 1} deliveries: "
+                f"{dict(entries)[entry_id]}"
+            )
+        metrics.counter("pubsub_dead_letter_total", {"stream": _text(stream)}).inc(len(exhausted))
+        await self.__client.xack(stream, self.__group, *exhausted)
+        return [entry for entry in entries if entry[0] not in exhausted]
+
+    async def __process(self, stream, entries: List[StreamEntry], callback_function):
+        acked = []
+        for entry_id, fields in entries:
+            if not fields:
+                # Entry was trimmed while pending; nothing left to deliver.
+                acked.append(entry_id)
+                continue
+            try:
+                data = record_incoming(self.__decode(fields))
+            except (AdmineMessageError, KeyError, ValueError) as e:
+                logger.error(f"Dropping malformed stream entry {entry_id} from {stream}: {e}")
+                acked.append(entry_id)
+                continue
+
+            if self.resolve_reply(data):
+                acked.append(entry_id)
+                continue
+
+            try:
+                await callback_function(data)
+            except Exception as e:
+                logger.error(f"Callback failed for stream entry {entry_id} from {stream}, leaving it pending: {e}")
+                continue
+            acked.append(entry_id)
+
+        if acked:
+            await self.__client.xack(stream, self.__group, *acked)
+
+    def __decode(self, fields: Dict[bytes, bytes]) -> AdmineMessage:
+        codec = fields.get(self.CODEC_FIELD)
+        codec_type = CodecType(codec.decode("ascii")) if codec is not None else CodecType.JSON
+        return AdmineMessage.from_bytes(fields[self.PAYLOAD_FIELD], codec_type)
+
+    async def close(self):
+        self.__stop_event.set()
+        await self.__client.aclose()
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
@@ -0,0 +1,33 @@
+from typing import Sequence
+
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage, Hop
+
+# Service name the bot uses for its own hops. server_handler stamps its configured origin.
+HOP_SERVICE = "bot"
+
+
+def stamp_outgoing(message: AdmineMessage) -> AdmineMessage:
+    """Assign an id and emit time to a message about to be published and record the publish hop."""
+    return message.stamped(HOP_SERVICE, "publish")
+
+
+def record_incoming(message: AdmineMessage) -> AdmineMessage:
+    """Append the receive hop and record the latency of every segment the message travelled."""
+    received = message.with_hop(HOP_SERVICE, "receive")
+    if len(received.hops) > 1:
+        observe_segments(received.hops)
+    elif received.emitted_at:
+        # Producer sets emitted_at but no hops (e.g. an older server_handler): only the transit is known.
+        _observe(f"{received.origin}.publish -> {HOP_SERVICE}.receive", received.hops[0].at - received.emitted_at)
+    return received
+
+
+def observe_segments(hops: Sequence[Hop]):
+    for previous, current in zip(hops, hops[1:]):
+        _observe(f"{previous.label} -> {current.label}", current.at - previous.at)
+
+
+def _observe(hop: str, elapsed_ms: int):
+    # Hops are stamped on different hosts; clock skew can make a segment look negative.
+    metrics.histogram("pubsub_hop_seconds", {"hop": hop}).observe(max(0, elapsed_ms) / 1000)
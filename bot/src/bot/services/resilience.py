@@ -0,0 +1,160 @@
+import time
+from enum import Enum
+from typing import Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from bot.config import Config
+from bot.exceptions import CircuitOpenError, UploadTooLargeError
+from bot.metrics import metrics
+
+
+class CircuitState(Enum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+def http_status(error: Exception) -> Optional[int]:
+    """HTTP status carried by an aiohttp or requests error, if any."""
+    status = getattr(error, "status", None)  # aiohttp.ClientResponseError
+    response = getattr(error, "response", None)  # requests.HTTPError
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_backend_failure(error: Exception) -> bool:
+    """Timeouts, connection errors and 5xx count against a breaker. A 4xx means the backend is up and answered.
+
+    An upload aborted because our own request body was too large says nothing about the backend either, even when the
+    HTTP client reports it as a connection error.
+    """
+    if isinstance(error, UploadTooLargeError) or isinstance(error.__cause__, UploadTooLargeError):
+        return False
+    status = http_status(error)
+    return not (status is not None and 400 <= status < 500)
+
+
+class CircuitBreaker:
+    """Fails fast once a backend has failed ``failure_threshold`` times in a row.
+
+    Wrap each backend call in ``async with breaker:``. While open, calls raise ``CircuitOpenError`` without touching
+    the network. After ``reset_timeout`` seconds one probe call is let through (half-open): success closes the
+    breaker, failure opens it again. State is published as the ``circuit_breaker_state{service}`` gauge
+    (0 closed, 1 half-open, 2 open).
+    """
+
+    def __init__(
+        self,
+        service: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        is_failure: Callable[[Exception], bool] = is_backend_failure,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.service = service
+        self.__failure_threshold = max(1, failure_threshold)
+        self.__reset_timeout = reset_timeout
+        self.__is_failure = is_failure
+        self.__clock = clock
+        self.__state = CircuitState.CLOSED
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__probing = False
+        self.__state_gauge = metrics.gauge("circuit_breaker_state", {"service": service})
+        self.__opened = metrics.counter("circuit_breaker_opened_total", {"service": service})
+        self.__rejected = metrics.counter("circuit_breaker_rejected_total", {"service": service})
+        self.__state_gauge.set(CircuitState.CLOSED.value)
+
+    @property
+    def state(self) -> CircuitState:
+        return self.__state
+
+    @property
+    def retry_after(self) -> float:
+        if self.__state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.__opened_at + self.__reset_timeout - self.__clock())
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "state": self.__state.name,
+            "consecutive_failures": self.__failures,
+            "retry_after": round(self.retry_after, 1),
+        }
+
+    async def __aenter__(self) -> "CircuitBreaker":
+        if self.__state == CircuitState.OPEN:
+            if self.retry_after > 0:
+                self.__reject()
+            self.__set_state(CircuitState.HALF_OPEN)
+        if self.__state == CircuitState.HALF_OPEN:
+            if self.__probing:
+                self.__reject()
+            self.__probing = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self.__probing = False
+        if exc is None or (isinstance(exc, Exception) and not self.__is_failure(exc)):
+            self.__record_success()
+        elif isinstance(exc, Exception):
+            self.__record_failure(exc)
+        # Cancellation is neither: a cancelled probe just frees the slot for the next caller
+        return False
+
+    def __record_success(self):
+        self.__failures = 0
+        if self.__state != CircuitState.CLOSED:
+            logger.info(f"Circuit breaker for {self.service} closed, backend recovered.")
+            self.__set_state(CircuitState.CLOSED)
+
+    def __record_failure(self, error: Exception):
+        self.__failures += 1
+        if self.__state == CircuitState.HALF_OPEN or self.__failures >= self.__failure_threshold:
+            if self.__state != CircuitState.OPEN:
+                logger.warning(
+                    f"Circuit breaker for {self.service} opened after {self.__failures} consecutive failures: {error}"
+                )
+                self.__opened.inc()
+            self.__opened_at = self.__clock()
+            self.__set_state(CircuitState.OPEN)
+
+    def __reject(self):
+        self.__rejected.inc()
+        raise CircuitOpenError(self.service, self.retry_after)
+
+    def __set_state(self, state: CircuitState):
+        self.__state = state
+        self.__state_gauge.set(state.value)
+
+
+class EndpointTimeouts:
+    """Connect and read timeouts in seconds, with read overrides per endpoint (uploads need longer than /status)."""
+
+    def __init__(self, connect: float = 3.0, read: float = 10.0, endpoints: Optional[Dict[str, float]] = None):
+        self.connect = connect
+        self.read = read
+        self.endpoints = dict(endpoints or {})
+
+    def get(self, endpoint: str) -> Tuple[float, float]:
+        return self.connect, float(self.endpoints.get(endpoint, self.read))
+
+
+def timeouts_from_config(config: Config, section: str, endpoint_defaults: Dict[str, float]) -> EndpointTimeouts:
+    """Read ``<section>.timeouts.connect``, ``.read`` and the ``.endpoints`` overrides on top of the defaults."""
+    return EndpointTimeouts(
+        connect=float(config.get(f"{section}.timeouts.connect", 3)),
+        read=float(config.get(f"{section}.timeouts.read", 10)),
+        endpoints={**endpoint_defaults, **(config.get(f"{section}.timeouts.endpoints", {}) or {})},
+    )
+
+
+def circuit_breaker_from_config(config: Config, section: str) -> CircuitBreaker:
+    """Read ``<section>.circuitbreaker.failurethreshold`` and ``.resettimeout``."""
+    return CircuitBreaker(
+        section,
+        failure_threshold=int(config.get(f"{section}.circuitbreaker.failurethreshold", 5)),
+        reset_timeout=float(config.get(f"{section}.circuitbreaker.resettimeout", 30)),
+    )
@@ -1,26 +1,46 @@
 import asyncio
 from enum import Enum, auto
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 import requests
 from loguru import logger
 
 from bot.config import Config
 from bot.exceptions import VpnServiceFactoryException
+from bot.services.resilience import (
+    CircuitBreaker,
+    EndpointTimeouts,
+    circuit_breaker_from_config,
+    timeouts_from_config,
+)
 from bot.services.vpn.vpn_service import VpnService
 
+# Read timeouts in seconds per endpoint; anything not listed uses vpn.timeouts.read
+DEFAULT_ENDPOINT_TIMEOUTS: Dict[str, float] = {
+    "server_ips": 5,
+    "vpn_id": 5,
+    "auth_member": 10,
+}
+
 
 class ApiVpnServiceProviders(VpnService):
-    def __init__(self, api_url: str, token: str = ""):
+    def __init__(
+        self,
+        api_url: str,
+        token: str = "",
+        timeouts: Optional[EndpointTimeouts] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
         self.api_url = api_url.rstrip("/")
         self.token = token
+        self.__timeouts = timeouts or EndpointTimeouts(endpoints=DEFAULT_ENDPOINT_TIMEOUTS)
+        self.__circuit_breaker = circuit_breaker or CircuitBreaker("vpn")
 
     async def get_server_ips(self) -> str:
         url = f"{self.api_url}/server-ips"
         logger.info("Requesting server IP addresses.")
         try:
-            response = await asyncio.to_thread(requests.get, url)
-            response.raise_for_status()
+            response = await self.__send("server_ips", requests.get, url)
 
             logger.debug(f"Raw response status: {response.status_code}")
             logger.debug(f"Raw response text: '{response.text}'")
@@ -49,8 +69,7 @@ class ApiVpnServiceProviders(VpnService):
         logger.info("Requesting VPN ID.")
         logger.debug(f"GET {url}")
         try:
-            response = await asyncio.to_thread(requests.get, url)
-            response.raise_for_status()
+            response = await self.__send("vpn_id", requests.get, url)
             resp_json = response.json()
             logger.debug(f"/vpn_id response received: {resp_json}")
             vpn_id = resp_json.get("vpn_id", "")
@@ -65,13 +84,18 @@ class ApiVpnServiceProviders(VpnService):
         logger.info(f"Sending member ID for authorization: {member_id}")
         logger.debug(f"POST {url} | Payload: {payload}")
         try:
-            response = await asyncio.to_thread(requests.post, url, json=payload)
-            response.raise_for_status()
+            await self.__send("auth_member", requests.post, url, json=payload)
             return self._format_auth_member_response(member_id, True)
         except Exception as e:
             logger.warning(f"Error authorizing member ID: {e}")
             raise
 
+    async def __send(self, endpoint: str, method: Callable, url: str, **kwargs) -> requests.Response:
+        async with self.__circuit_breaker:
+            response = await asyncio.to_thread(method, url, timeout=self.__timeouts.get(endpoint), **kwargs)
+            response.raise_for_status()
+            return response
+
     def _format_server_ips_response(self, server_ips) -> str:
         """Format the server IPs response for Discord display."""
         if not server_ips:
@@ -119,6 +143,8 @@ class VpnServiceFactory:
         VpnServiceProviderType.REST: lambda config: ApiVpnServiceProviders(
             config.get("vpn.connectionstring", "http://localhost:9090"),
             config.get("vpn.token", ""),
+            timeouts=timeouts_from_config(config, "vpn", DEFAULT_ENDPOINT_TIMEOUTS),
+            circuit_breaker=circuit_breaker_from_config(config, "vpn"),
         ),
     }
 
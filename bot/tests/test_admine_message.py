@@ -0,0 +1,141 @@
+import pytest
+
+from bot.exceptions import AdmineMessageError
+from bot.models.admine_message import AdmineMessage, Hop
+from bot.models.admine_message_codec import CodecType, parse_channel_codecs
+
+
+@pytest.fixture
+def message():
+    """Creates a sample message as published by the bot."""
+    return AdmineMessage("Bot", ["server_on", "notification"], "Server started")
+
+
+class TestAdmineMessageModel:
+    """Tests for the immutable message model."""
+
+    def test_is_immutable(self, message):
+        """Verifies that fields cannot be reassigned or added."""
+        with pytest.raises(AttributeError):
+            message.origin = "other"
+        with pytest.raises(AttributeError):
+            message.extra = 1
+
+    def test_tags_are_stored_as_tuple(self, message):
+        """Verifies that tags are copied into a tuple so the message is hashable."""
+        assert message.tags == ("server_on", "notification")
+        assert hash(message) == hash(AdmineMessage("Bot", ["server_on", "notification"], "Server started"))
+
+    def test_equality(self, message):
+        """Verifies that messages with the same fields compare equal."""
+        assert message == AdmineMessage("Bot", ("server_on", "notification"), "Server started")
+        assert message != AdmineMessage("Bot", ["server_off"], "Server started")
+
+
+class TestAdmineMessageValidation:
+    """Tests for strict-but-tolerant decoding."""
+
+    def test_ignores_unknown_fields(self):
+        """Verifies that extra fields from newer producers do not break decoding."""
+        data = b'{"origin":"server_handler","tags":["server_on"],"message":"up","priority":"high"}'
+
+        assert AdmineMessage.from_bytes(data) == AdmineMessage("server_handler", ["server_on"], "up")
+
+    def test_null_tags_and_message_are_empty(self):
+        """Verifies that Go nil slices and missing messages are read as empty values."""
+        message = AdmineMessage.from_bytes(b'{"origin":"server_handler","tags":null}')
+
+        assert message.tags == ()
+        assert message.message == ""
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            b'{"tags":["server_on"],"message":"up"}',
+            b'{"origin":1,"tags":[],"message":""}',
+            b'{"origin":"a","tags":"server_on","message":""}',
+            b'{"origin":"a","tags":[1],"message":""}',
+            b'{"origin":"a","tags":[],"message":5}',
+            b'["not", "an", "object"]',
+            b"not json",
+        ],
+    )
+    def test_rejects_invalid_payloads(self, payload):
+        """Verifies that wrong types and undecodable payloads raise AdmineMessageError."""
+        with pytest.raises(AdmineMessageError):
+            AdmineMessage.from_bytes(payload)
+
+
+class TestAdmineMessageCodec:
+    """Tests for the JSON and msgpack wire formats."""
+
+    def test_json_round_trip(self, message):
+        """Verifies that the JSON bytes path round-trips and stays compact."""
+        payload = message.to_bytes()
+
+        assert payload == b'{"origin":"Bot","tags":["server_on","notification"],"message":"Server started"}'
+        assert AdmineMessage.from_bytes(payload) == message
+
+    def test_legacy_json_helpers(self, message):
+        """Verifies that the str-based helpers still accept and return JSON text."""
+        text = message.from_object_to_json()
+
+        assert isinstance(text, str)
+        assert AdmineMessage.from_json_to_object(text) == message
+
+    def test_msgpack_round_trip(self, message):
+        """Verifies that msgpack payloads decode with the agreed codec and are not mistaken for JSON."""
+        pytest.importorskip("msgpack")
+        payload = message.to_bytes(CodecType.MSGPACK)
+
+        assert AdmineMessage.from_bytes(payload, CodecType.MSGPACK) == message
+        with pytest.raises(AdmineMessageError):
+            AdmineMessage.from_bytes(payload)
+
+    def test_channel_codecs_keep_handler_channels_on_json(self):
+        """Verifies that msgpack can be chosen per bot-only channel but not for channels the handlers read."""
+        assert parse_channel_codecs({"bot_events": "msgpack"}) == {"bot_events": CodecType.MSGPACK}
+        assert parse_channel_codecs(None) == {}
+        with pytest.raises(ValueError, match="command_channel"):
+            parse_channel_codecs({"command_channel": "msgpack"})
+
+
+class TestAdmineMessageEnvelope:
+    """Tests for the optional tracing envelope."""
+
+    def test_envelope_is_omitted_when_unset(self, message):
+        """Verifies that messages without tracing fields keep the three-field wire format."""
+        assert set(message.to_dict()) == {"origin", "tags", "message"}
+
+    def test_stamped_assigns_id_and_publish_hop(self, message):
+        """Verifies that stamping assigns an id, emit time and publish hop, and keeps an existing id."""
+        stamped = message.stamped("bot")
+
+        assert stamped.message_id
+        assert stamped.hops == (Hop("bot", "publish", stamped.emitted_at),)
+        assert stamped.stamped("bot").message_id == stamped.message_id
+
+    def test_envelope_round_trip(self):
+        """Verifies that id, correlation id, emit time and hops survive encoding."""
+        message = AdmineMessage(
+            "server_handler",
+            ["server_on"],
+            "up",
+            message_id="b2",
+            correlation_id="a1",
+            emitted_at=1_700_000_000_500,
+            hops=[Hop("bot", "publish", 1_700_000_000_000), Hop("server_handler", "receive", 1_700_000_000_100)],
+        )
+
+        for codec_type in (CodecType.JSON, CodecType.MSGPACK):
+            if codec_type == CodecType.MSGPACK:
+                pytest.importorskip("msgpack")
+            assert AdmineMessage.from_bytes(message.to_bytes(codec_type), codec_type) == message
+
+    def test_decodes_go_payload_without_hop_stage(self):
+        """Verifies that hops are accepted with a missing stage and that a bad hop is rejected."""
+        message = AdmineMessage.from_bytes(b'{"origin":"a","tags":[],"hops":[{"service":"x","at":5}]}')
+
+        assert message.hops == (Hop("x", "", 5),)
+        with pytest.raises(AdmineMessageError):
+            AdmineMessage.from_bytes(b'{"origin":"a","tags":[],"hops":[{"service":"x","at":"soon"}]}')
@@ -0,0 +1,95 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bot.anomaly_detector import AnomalyDetector, AnomalyRule, rules_with_thresholds
+from bot.metrics import metrics
+from bot.models.minecraft_server_status import HealthStatus, MinecraftServerStatus, ServerStatus
+from bot.models.resource_usage import ResourceUsage
+
+
+def status_with_tps(tps: float) -> MinecraftServerStatus:
+    return MinecraftServerStatus(HealthStatus.HEALTHY, ServerStatus.ONLINE, "", tps=tps)
+
+
+def resources_with_memory(percent: float) -> ResourceUsage:
+    return ResourceUsage(10.0, 0, 0, percent, 0, 0, 50.0)
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest.fixture
+def emit():
+    """Creates a mocked event sink standing in for the EventHandle path."""
+    return AsyncMock()
+
+
+@pytest.fixture
+def detector(emit):
+    """Creates a detector that reacts to the raw value (no smoothing) after two samples."""
+    return AnomalyDetector(emit, alpha=1.0, sustain=2)
+
+
+class TestAnomalyDetector:
+    """Tests for the EWMA/hysteresis anomaly detector."""
+
+    @pytest.mark.asyncio
+    async def test_sustained_tps_drop_alerts_once(self, detector, emit):
+        """Verifies that a TPS drop must last `sustain` samples and is announced once as a notification event."""
+        await detector.observe(status_with_tps(10), None)
+        emit.assert_not_awaited()
+
+        for _ in range(5):
+            await detector.observe(status_with_tps(10), None)
+
+        emit.assert_awaited_once()
+        event = emit.call_args[0][0]
+        assert event.tags == ("notification",)
+        assert "TPS alert" in event.message
+        assert detector.active == ["tps"]
+        assert metrics.snapshot()["anomaly_alerts_total{rule=tps}"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hysteresis_prevents_flapping(self, detector, emit):
+        """Verifies that values between the trigger and clear thresholds neither clear nor re-fire the alert."""
+        for tps in (10, 10, 16, 17, 16, 17):
+            await detector.observe(status_with_tps(tps), None)
+        assert emit.await_count == 1
+
+        await detector.observe(status_with_tps(19), None)
+        await detector.observe(status_with_tps(19.5), None)
+
+        assert emit.await_count == 2
+        assert "recovered" in emit.call_args[0][0].message
+        assert detector.active == []
+
+    @pytest.mark.asyncio
+    async def test_ewma_smooths_single_spike(self, emit):
+        """Verifies that one bad sample among good ones does not raise an alert."""
+        detector = AnomalyDetector(emit, alpha=0.3, sustain=1)
+        for tps in (20, 20, 5, 20, 20):
+            await detector.observe(status_with_tps(tps), None)
+
+        emit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_memory_climbing_alerts(self, detector, emit):
+        """Verifies that high-is-bad rules alert when memory stays above the trigger."""
+        await detector.observe(None, resources_with_memory(95))
+        await detector.observe(None, resources_with_memory(96))
+
+        assert detector.active == ["memory"]
+        assert "Memory usage % alert" in emit.call_args[0][0].message
+
+    def test_threshold_overrides(self):
+        """Verifies that configured thresholds replace the defaults per rule."""
+        rules = {rule.name: rule for rule in rules_with_thresholds({"tps": {"trigger": 12, "clear": 16}})}
+
+        assert rules["tps"] == AnomalyRule("tps", "TPS", 12.0, 16.0)
+        assert rules["disk"].trigger == 90.0
@@ -6,6 +6,7 @@ import pytest
 
 from bot.bot import Bot
 from bot.services.messaging.discord_message_service import MessageServiceProviderType
+from bot.services.minecraft.caching_minecraft_service import CachingMinecraftServerService
 from bot.services.minecraft.server_handler_api_service import MinecraftServiceProviderType
 from bot.services.pubsub.redis_pubsub_service import PubSubServiceProviderType
 from bot.services.vpn.api_vpn_service import VpnServiceProviderType
@@ -46,6 +47,7 @@ def mock_config():
         "providers.minecraft": "REST",
         "providers.vpn": "REST",
         "providers.messaging": "DISCORD",
+        "minecraft.cache.enabled": False,
     }.get(key, default)
     return config
 
@@ -230,3 +232,50 @@ class TestBotIntegration:
         # Verify EventHandle has the correct message services
         event_handle = bot._Bot__event_handle
         assert mock_message_service in event_handle._EventHandle__message_services
+
+    @patch("bot.bot.PubSubServiceFactory.create")
+    @patch("bot.bot.MinecraftServiceFactory.create")
+    @patch("bot.bot.VpnServiceFactory.create")
+    @patch("bot.bot.MessageServiceFactory.create")
+    def test_minecraft_service_is_cached_by_default(
+        self, mock_msg_factory, mock_vpn_factory, mock_mc_factory, mock_pubsub_factory
+    ):
+        """Verifies that the minecraft provider is wrapped in the cache and EventHandle can invalidate it."""
+        config = MagicMock()
+        config.get.side_effect = lambda key, default=None: {
+            "providers.minecraft": "REST",
+            "providers.vpn": "REST",
+        }.get(key, default)
+        mock_pubsub_factory.return_value = MagicMock()
+        mock_mc_factory.return_value = MagicMock()
+        mock_vpn_factory.return_value = MagicMock()
+        mock_msg_factory.return_value = MagicMock()
+
+        bot = Bot(config)
+
+        assert isinstance(bot._Bot__minecraft_info_service, CachingMinecraftServerService)
+        assert bot._Bot__event_handle._EventHandle__minecraft_service is bot._Bot__minecraft_info_service
+
+    @patch("bot.bot.PubSubServiceFactory.create")
+    @patch("bot.bot.MinecraftServiceFactory.create")
+    @patch("bot.bot.VpnServiceFactory.create")
+    @patch("bot.bot.MessageServiceFactory.create")
+    def test_redis_streams_handle_events_inline(
+        self, mock_msg_factory, mock_vpn_factory, mock_mc_factory, mock_pubsub_factory
+    ):
+        """Verifies that with Redis Streams there is no event queue, so entries are acked only after EventHandle ran."""
+        config = MagicMock()
+        config.get.side_effect = lambda key, default=None: {
+            "providers.pubsub": "REDIS_STREAMS",
+            "providers.minecraft": "REST",
+            "providers.vpn": "REST",
+            "events.workers": 4,
+        }.get(key, default)
+        mock_pubsub_factory.return_value = MagicMock()
+        mock_mc_factory.return_value = MagicMock()
+        mock_vpn_factory.return_value = MagicMock()
+        mock_msg_factory.return_value = MagicMock()
+
+        bot = Bot(config)
+
+        assert bot._Bot__event_dispatcher is None
@@ -0,0 +1,145 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bot.cache import StaleWhileRevalidateCache, TtlLruCache
+from bot.metrics import metrics
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTtlLruCache:
+    """Tests for the TTL-bounded LRU cache."""
+
+    def test_entries_expire_after_ttl(self):
+        """Verifies that a value is not returned once its TTL elapsed."""
+        clock = FakeClock()
+        cache = TtlLruCache(10, ttl=5, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_hit_does_not_extend_ttl(self):
+        """Verifies that reading an entry refreshes recency but not its expiry."""
+        clock = FakeClock()
+        cache = TtlLruCache(10, ttl=5, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 3
+        assert "a" in cache
+        clock.now = 6
+        assert "a" not in cache
+
+    def test_evicts_least_recently_used_when_full(self):
+        """Verifies that the least recently used entry is evicted when the cache is full."""
+        cache = TtlLruCache(2, ttl=60, clock=FakeClock())
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_expired_entries_are_dropped_on_insert(self):
+        """Verifies that stale entries do not hold on to memory."""
+        clock = FakeClock()
+        cache = TtlLruCache(100, ttl=1, clock=clock)
+        for i in range(50):
+            cache.set(i, i)
+
+        clock.now = 2
+        cache.set("fresh", 1)
+
+        assert len(cache) == 1
+
+
+class TestStaleWhileRevalidateCache:
+    """Tests for the stale-while-revalidate cache with single-flight loads."""
+
+    @pytest.fixture(autouse=True)
+    def clear_metrics(self):
+        """Resets the shared metrics registry between tests."""
+        metrics.clear()
+        yield
+        metrics.clear()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Verifies that identical concurrent requests are coalesced into one upstream call."""
+        cache = StaleWhileRevalidateCache("status", ttl=5, clock=FakeClock())
+        loader = AsyncMock(return_value="up")
+
+        results = await asyncio.gather(*(cache.get("status", loader) for _ in range(20)))
+
+        assert results == ["up"] * 20
+        loader.assert_awaited_once()
+        snapshot = metrics.snapshot()
+        assert snapshot["cache_requests_total{cache=status,result=miss}"] == 1
+        assert snapshot["cache_requests_total{cache=status,result=coalesced}"] == 19
+
+    @pytest.mark.asyncio
+    async def test_serves_stale_value_while_refreshing(self):
+        """Verifies that a stale value is returned immediately and replaced by a background refresh."""
+        clock = FakeClock()
+        cache = StaleWhileRevalidateCache("status", ttl=5, max_stale=30, clock=clock)
+        await cache.get("status", AsyncMock(return_value="old"))
+        clock.now = 10
+
+        assert await cache.get("status", AsyncMock(return_value="new")) == "old"
+        await asyncio.sleep(0)
+        assert await cache.get("status", AsyncMock(return_value="newer")) == "new"
+
+    @pytest.mark.asyncio
+    async def test_waits_when_too_stale(self):
+        """Verifies that values older than ttl + max_stale are not served."""
+        clock = FakeClock()
+        cache = StaleWhileRevalidateCache("status", ttl=5, max_stale=30, clock=clock)
+        await cache.get("status", AsyncMock(return_value="old"))
+        clock.now = 35
+
+        assert await cache.get("status", AsyncMock(return_value="new")) == "new"
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(self):
+        """Verifies that a failing background refresh keeps serving the stale value."""
+        clock = FakeClock()
+        cache = StaleWhileRevalidateCache("status", ttl=5, max_stale=30, clock=clock)
+        await cache.get("status", AsyncMock(return_value="old"))
+        clock.now = 10
+
+        assert await cache.get("status", AsyncMock(side_effect=ConnectionError())) == "old"
+        await asyncio.sleep(0)
+        assert await cache.get("status", AsyncMock(return_value="new")) == "old"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_discards_in_flight_load(self):
+        """Verifies that a load started before invalidation answers its caller but is not stored."""
+        cache = StaleWhileRevalidateCache("status", ttl=60, clock=FakeClock())
+        release = asyncio.Event()
+
+        async def slow_load():
+            await release.wait()
+            return "before"
+
+        pending = asyncio.ensure_future(cache.get("status", slow_load))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        release.set()
+
+        assert await pending == "before"
+        assert await cache.get("status", AsyncMock(return_value="after")) == "after"
@@ -0,0 +1,66 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bot.metrics import metrics
+from bot.services.minecraft.caching_minecraft_service import CachingMinecraftServerService
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest.fixture
+def inner():
+    """Creates a mocked upstream minecraft service."""
+    service = MagicMock()
+    service.get_status = AsyncMock(return_value="status")
+    service.get_info = AsyncMock(return_value="info")
+    service.get_logs = AsyncMock(return_value="logs")
+    service.close = AsyncMock()
+    return service
+
+
+class TestCachingMinecraftServerService:
+    """Tests for the caching decorator around MinecraftServerService."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_concurrent_status_requests(self, inner):
+        """Verifies that many users asking for /status at once cause one upstream call."""
+        service = CachingMinecraftServerService(inner)
+
+        results = await asyncio.gather(*(service.get_status() for _ in range(20)))
+
+        assert results == ["status"] * 20
+        inner.get_status.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_refetch(self, inner):
+        """Verifies that invalidated endpoints are fetched again and others stay cached."""
+        service = CachingMinecraftServerService(inner)
+        await service.get_status()
+        await service.get_info()
+
+        service.invalidate_cache("status")
+        await service.get_status()
+        await service.get_info()
+
+        assert inner.get_status.await_count == 2
+        inner.get_info.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_passes_through_uncached_calls(self, inner):
+        """Verifies that logs are not cached and close reaches the provider."""
+        service = CachingMinecraftServerService(inner)
+
+        await service.get_logs(10)
+        await service.get_logs(10)
+        await service.close()
+
+        assert inner.get_logs.await_count == 2
+        inner.close.assert_awaited_once()
@@ -0,0 +1,109 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bot.metrics import metrics
+from bot.services.minecraft.command_batch import CommandOutcome, parse_command_script, run_command_batch
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+class TestParseCommandScript:
+    """Tests for splitting a batch script into commands."""
+
+    def test_splits_lines_and_semicolons(self):
+        """Verifies that new lines and semicolons both separate commands, skipping blanks and comments."""
+        script = "/whitelist add Steve; whitelist add Alex\n\n# gamerules\ngamerule keepInventory true;"
+
+        assert parse_command_script(script) == [
+            "whitelist add Steve",
+            "whitelist add Alex",
+            "gamerule keepInventory true",
+        ]
+
+    def test_keeps_semicolons_inside_json_and_quotes(self):
+        """Verifies that semicolons inside JSON text or quoted strings don't split the command."""
+        script = 'tellraw @a {"text":"a;b"}; say "x;y"'
+
+        assert parse_command_script(script) == ['tellraw @a {"text":"a;b"}', 'say "x;y"']
+
+    def test_apostrophes_in_chat_text_do_not_hide_semicolons(self):
+        """Verifies that an apostrophe outside brackets is plain text, while single-quoted NBT strings stay whole."""
+        script = (
+            'say it\'s done; op bob\nsummon zombie ~ ~ ~ {CustomName:\'{"text":"Bob;s"}\'}; tellraw @a {"text":"\\";"}'
+        )
+
+        assert parse_command_script(script) == [
+            "say it's done",
+            "op bob",
+            'summon zombie ~ ~ ~ {CustomName:\'{"text":"Bob;s"}\'}',
+            'tellraw @a {"text":"\\";"}',
+        ]
+
+
+class TestRunCommandBatch:
+    """Tests for ordered and parallel batch execution."""
+
+    @pytest.mark.asyncio
+    async def test_ordered_uses_batch_requests(self):
+        """Verifies that ordered batches go through command_batch in chunks of 100 and keep per-command errors."""
+        service = MagicMock()
+        service.command_batch = AsyncMock(
+            side_effect=lambda chunk: [
+                {"command": c, "output": "ok"} if c != "cmd 150" else {"command": c, "output": "", "error": "bad"}
+                for c in chunk
+            ]
+        )
+        commands = [f"cmd {i}" for i in range(250)]
+
+        report = await run_command_batch(service, commands)
+
+        assert [len(call.args[0]) for call in service.command_batch.await_args_list] == [100, 100, 50]
+        assert [o.command for o in report.outcomes] == commands
+        assert report.failed == 1
+        assert report.outcomes[150] == CommandOutcome("cmd 150", "", "bad")
+        assert metrics.snapshot()["command_batch_commands_total{result=ok}"] == 249
+
+    @pytest.mark.asyncio
+    async def test_ordered_request_failure_marks_chunk(self):
+        """Verifies that a failed batch request is reported on every command of that chunk."""
+        service = MagicMock()
+        service.command_batch = AsyncMock(side_effect=Exception("server down"))
+
+        report = await run_command_batch(service, ["a", "b"])
+
+        assert [o.error for o in report.outcomes] == ["server down", "server down"]
+
+    @pytest.mark.asyncio
+    async def test_parallel_respects_concurrency(self):
+        """Verifies that unordered batches send single commands with at most `concurrency` in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def command(cmd):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if cmd == "boom":
+                raise Exception("rcon error")
+            return {"command": cmd, "response": {"output": f"ran {cmd}"}}
+
+        service = MagicMock()
+        service.command = AsyncMock(side_effect=command)
+
+        report = await run_command_batch(service, ["a", "b", "boom", "c", "d", "e"], ordered=False, concurrency=2)
+
+        assert peak == 2
+        assert [o.command for o in report.outcomes] == ["a", "b", "boom", "c", "d", "e"]
+        assert report.outcomes[0].output == "ran a"
+        assert report.outcomes[2].error == "rcon error"
+        assert report.failed == 1
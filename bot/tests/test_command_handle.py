@@ -1,18 +1,33 @@
+import asyncio
+import hashlib
+import io
+import zipfile
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from bot.exceptions import PubSubNoSubscriberError
 from bot.handles.command_handle import CommandHandle
+from bot.log_index import LogIndex, LogSearchResult
+from bot.metrics import metrics
+from bot.mod_index import ModIndex
 from bot.models.admine_message import AdmineMessage
+from bot.models.dashboard import Dashboard
 from bot.models.logs_response import LogsResponse
 from bot.models.resource_usage import ResourceUsage
+from bot.services.minecraft.caching_minecraft_service import CachingMinecraftServerService
+from bot.services.minecraft.command_batch import CommandBatchReport
+from bot.services.minecraft.mod_bulk_install import BulkModInstall
+from bot.services.minecraft.mod_list_cache import ModListCache
+from bot.services.minecraft.status_poller import StatusSnapshot
 
 
 @pytest.fixture
 def mock_services():
     """Creates mocks for the services used by CommandHandle."""
     pubsub_service = MagicMock()
-    pubsub_service.send_message = MagicMock()
+    pubsub_service.send_message = AsyncMock(return_value={"command_channel": 1})
+    pubsub_service.request = AsyncMock(return_value=AdmineMessage("server_handler", ["server_on"], "zerotier:123"))
 
     minecraft_service = MagicMock()
     minecraft_service.command = AsyncMock(return_value={"exit_code": 0, "output": "Command executed"})
@@ -81,10 +96,10 @@ class TestAdminCommands:
         await command_handle.process_command("on", [], user_id="admin_user", administrators=["admin_user"])
 
         # Verifies that pubsub was called
-        mock_services["pubsub"].send_message.assert_called_once()
+        mock_services["pubsub"].request.assert_called_once()
 
         # Verifies that the message has the correct structure
-        call_args = mock_services["pubsub"].send_message.call_args[0][0]
+        call_args = mock_services["pubsub"].request.call_args[0][0]
         assert isinstance(call_args, AdmineMessage)
         assert call_args.origin == "Bot"
         assert "server_on" in call_args.tags
@@ -96,7 +111,7 @@ class TestAdminCommands:
 
         assert result == "Unauthorized command usage"
         # Verifies that the service was not called
-        mock_services["pubsub"].send_message.assert_not_called()
+        mock_services["pubsub"].request.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_admin_command_without_user_id(self, command_handle, mock_services):
@@ -104,7 +119,7 @@ class TestAdminCommands:
         result = await command_handle.process_command("on", [], user_id=None, administrators=["admin_user"])
 
         assert result == "Unauthorized command usage"
-        mock_services["pubsub"].send_message.assert_not_called()
+        mock_services["pubsub"].request.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_admin_command_without_administrators_list(self, command_handle, mock_services):
@@ -112,7 +127,7 @@ class TestAdminCommands:
         result = await command_handle.process_command("on", [], user_id="user_123", administrators=None)
 
         assert result == "Unauthorized command usage"
-        mock_services["pubsub"].send_message.assert_not_called()
+        mock_services["pubsub"].request.assert_not_called()
 
 
 class TestServerControlCommands:
@@ -123,8 +138,8 @@ class TestServerControlCommands:
         """Tests the server on command."""
         await command_handle.process_command("on", [], user_id="admin", administrators=["admin"])
 
-        mock_services["pubsub"].send_message.assert_called_once()
-        message = mock_services["pubsub"].send_message.call_args[0][0]
+        mock_services["pubsub"].request.assert_called_once()
+        message = mock_services["pubsub"].request.call_args[0][0]
         assert "server_on" in message.tags
 
     @pytest.mark.asyncio
@@ -132,8 +147,8 @@ class TestServerControlCommands:
         """Tests the server off command."""
         await command_handle.process_command("off", [], user_id="admin", administrators=["admin"])
 
-        mock_services["pubsub"].send_message.assert_called_once()
-        message = mock_services["pubsub"].send_message.call_args[0][0]
+        mock_services["pubsub"].request.assert_called_once()
+        message = mock_services["pubsub"].request.call_args[0][0]
         assert "server_off" in message.tags
 
     @pytest.mark.asyncio
@@ -141,10 +156,72 @@ class TestServerControlCommands:
         """Tests the server restart command."""
         await command_handle.process_command("restart", [], user_id="admin", administrators=["admin"])
 
-        mock_services["pubsub"].send_message.assert_called_once()
-        message = mock_services["pubsub"].send_message.call_args[0][0]
+        mock_services["pubsub"].request.assert_called_once()
+        message = mock_services["pubsub"].request.call_args[0][0]
         assert "restart" in message.tags
 
+    @pytest.mark.asyncio
+    async def test_server_on_command_returns_reply(self, command_handle, mock_services):
+        """Verifies that the correlated server_on reply becomes the command response."""
+        result = await command_handle.process_command("on", [], user_id="admin", administrators=["admin"])
+
+        final_tags = mock_services["pubsub"].request.call_args.args[1]
+        assert set(final_tags) == {"server_on", "command_failed"}
+        assert result == "✅ Server started.\nzerotier:123"
+
+    @pytest.mark.asyncio
+    async def test_restart_waits_for_server_on(self, command_handle, mock_services):
+        """Verifies that restart completes on the server_on reply."""
+        result = await command_handle.process_command("restart", [], user_id="admin", administrators=["admin"])
+
+        assert "server_on" in mock_services["pubsub"].request.call_args.args[1]
+        assert result.startswith("✅ Server restarted.")
+
+    @pytest.mark.asyncio
+    async def test_server_off_command_failure(self, command_handle, mock_services):
+        """Verifies that a command_failed reply is reported as an error."""
+        mock_services["pubsub"].request.return_value = AdmineMessage(
+            "server_handler", ["notification", "command_failed"], "Error stopping server: timeout"
+        )
+
+        result = await command_handle.process_command("off", [], user_id="admin", administrators=["admin"])
+
+        assert result == "❌ Error stopping server: timeout"
+
+    @pytest.mark.asyncio
+    async def test_server_on_command_timeout(self, command_handle, mock_services):
+        """Verifies that a missing reply is reported without raising."""
+        mock_services["pubsub"].request.side_effect = TimeoutError()
+
+        result = await command_handle.process_command("on", [], user_id="admin", administrators=["admin"])
+
+        assert result.startswith("⏳ No answer from the server handler")
+
+    @pytest.mark.asyncio
+    async def test_server_on_command_without_subscribers(self, command_handle, mock_services):
+        """Verifies that the caller is warned when nobody received the command."""
+        mock_services["pubsub"].request.side_effect = PubSubNoSubscriberError(["command_channel"])
+
+        result = await command_handle.process_command("on", [], user_id="admin", administrators=["admin"])
+
+        assert "No service is listening" in result
+
+    @pytest.mark.asyncio
+    async def test_status_after_server_on_is_not_cached(self, mock_services):
+        """Verifies that /status right after /on asks the server again instead of answering from the cache."""
+        caching = CachingMinecraftServerService(mock_services["minecraft"])
+        handle = CommandHandle(mock_services["pubsub"], caching, mock_services["vpn"], MagicMock())
+        mock_services["minecraft"].get_status.side_effect = [
+            {"status": "offline"},
+            {"status": "online"},
+        ]
+
+        assert await handle.process_command("status", []) == {"status": "offline"}
+        await handle.process_command("on", [], user_id="admin", administrators=["admin"])
+
+        assert await handle.process_command("status", []) == {"status": "online"}
+        assert mock_services["minecraft"].get_status.await_count == 2
+
 
 class TestMinecraftCommands:
     """Tests for Minecraft related commands."""
@@ -193,6 +270,20 @@ class TestMinecraftCommands:
         mock_services["minecraft"].get_status.assert_called_once()
         assert result == {"status": "running", "health": "healthy"}
 
+    @pytest.mark.asyncio
+    async def test_status_command_reads_poller_snapshot(self, mock_services):
+        """Verifies that a fresh poller snapshot answers /status without calling server_handler."""
+        poller = MagicMock()
+        poller.fresh_snapshot.return_value = StatusSnapshot("snapshot status", None, 0.0)
+        handle = CommandHandle(
+            mock_services["pubsub"], mock_services["minecraft"], mock_services["vpn"], MagicMock(), poller
+        )
+
+        result = await handle.process_command("status", [])
+
+        assert result == "snapshot status"
+        mock_services["minecraft"].get_status.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_status_command_with_error(self, command_handle, mock_services):
         """Tests error handling in status command."""
@@ -244,6 +335,24 @@ class TestMinecraftCommands:
 
         assert result == {"error": "Error getting server logs"}
 
+    @pytest.mark.asyncio
+    async def test_logs_command_uses_log_tail(self, mock_services):
+        """Verifies that /logs is served from the log tail and accepts counts up to its capacity."""
+        log_tail = MagicMock()
+        log_tail.capacity = 500
+        log_tail.tail = AsyncMock(return_value=LogsResponse(lines=["x"] * 300, total=300))
+        handle = CommandHandle(
+            mock_services["pubsub"], mock_services["minecraft"], mock_services["vpn"], MagicMock(), log_tail=log_tail
+        )
+
+        result = await handle.process_command("logs", ["300"], user_id="admin", administrators=["admin"])
+        too_many = await handle.process_command("logs", ["501"], user_id="admin", administrators=["admin"])
+
+        log_tail.tail.assert_awaited_once_with(300)
+        mock_services["minecraft"].get_logs.assert_not_called()
+        assert result.total == 300
+        assert too_many == {"error": "Invalid logs line count. Use a number between 1 and 500."}
+
     @pytest.mark.asyncio
     async def test_logs_command_unauthorized_user(self, command_handle, mock_services):
         """Verifies that non-admin users cannot use logs command."""
@@ -255,6 +364,26 @@ class TestMinecraftCommands:
         mock_services["minecraft"].get_logs.assert_not_called()
 
 
+class TestMetricsCommand:
+    """Tests for the metrics command."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_returns_registry_snapshot(self, command_handle):
+        """Verifies that the metrics command returns the shared registry snapshot."""
+        metrics.counter("test_command_metric_total").inc()
+
+        result = await command_handle.process_command("metrics", [], user_id="admin", administrators=["admin"])
+
+        assert result["test_command_metric_total"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_requires_admin(self, command_handle):
+        """Verifies that non-admin users cannot read metrics."""
+        result = await command_handle.process_command("metrics", [], user_id="user", administrators=["admin"])
+
+        assert result == "Unauthorized command usage"
+
+
 class TestVPNCommands:
     """Tests for VPN related commands."""
 
@@ -317,3 +446,474 @@ class TestVPNCommands:
         # Verifies that error was handled (should not throw exception)
         # Method should return an error message
         pass  # Test passes if no exception is thrown
+
+
+class TestLogsSearch:
+    """Tests for /logs_search over the log tail's index."""
+
+    @pytest.fixture
+    def log_tail(self):
+        """Creates a log tail mock backed by a real index."""
+        index = LogIndex(100)
+        index.add(
+            [
+                "[11:00:00] [Server thread/INFO]: Steve joined the game",
+                "[11:05:00] [Server thread/ERROR]: Exception ticking world",
+            ]
+        )
+        tail = MagicMock()
+        tail.index = index
+        tail.refresh = AsyncMock(return_value=0)
+        return tail
+
+    @pytest.fixture
+    def handle(self, mock_services, log_tail):
+        """Creates a CommandHandle with the log tail attached."""
+        return CommandHandle(
+            mock_services["pubsub"], mock_services["minecraft"], mock_services["vpn"], MagicMock(), log_tail=log_tail
+        )
+
+    @pytest.mark.asyncio
+    async def test_searches_after_refresh(self, handle, log_tail):
+        """Verifies that the tail is refreshed and the query and level filter are applied."""
+        result = await handle.process_command(
+            "logs_search", ["world", "keyword", "error", "", "", "5"], user_id="admin", administrators=["admin"]
+        )
+
+        log_tail.refresh.assert_awaited_once()
+        assert isinstance(result, LogSearchResult)
+        assert [m.line for m in result.matches] == ["[11:05:00] [Server thread/ERROR]: Exception ticking world"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_arguments(self, handle):
+        """Verifies that bad levels, times and regexes come back as errors."""
+        bad_level = await handle.process_command("logs_search", ["", "", "LOUD"], "admin", ["admin"])
+        bad_time = await handle.process_command("logs_search", ["", "", "", "soon"], "admin", ["admin"])
+        bad_regex = await handle.process_command("logs_search", ["(", "regex"], "admin", ["admin"])
+
+        assert "Unknown log level" in bad_level["error"]
+        assert "Invalid time" in bad_time["error"]
+        assert "Invalid regex" in bad_regex["error"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_index(self, command_handle):
+        """Verifies that the command reports when log search is not configured."""
+        result = await command_handle.process_command("logs_search", ["x"], "admin", ["admin"])
+
+        assert "disabled" in result["error"]
+
+
+class TestDashboard:
+    """Tests for the concurrent /dashboard command."""
+
+    @pytest.fixture
+    def handle(self, mock_services):
+        """Creates a CommandHandle whose config sets a short dashboard deadline."""
+        config = MagicMock()
+        config.get.side_effect = lambda key, default=None: 0.2 if key == "dashboard.deadline" else default
+        return CommandHandle(mock_services["pubsub"], mock_services["minecraft"], mock_services["vpn"], config)
+
+    @staticmethod
+    def slow(value, delay):
+        async def call():
+            await asyncio.sleep(delay)
+            return value
+
+        return call
+
+    @pytest.mark.asyncio
+    async def test_fetches_parts_concurrently(self, handle, mock_services):
+        """Verifies that the parts are fetched in parallel, so the total is close to the slowest call."""
+        minecraft = mock_services["minecraft"]
+        minecraft.get_status = AsyncMock(side_effect=self.slow("status", 0.1))
+        minecraft.get_info = AsyncMock(side_effect=self.slow("info", 0.1))
+        minecraft.get_resources = AsyncMock(side_effect=self.slow("resources", 0.1))
+
+        result = await handle.process_command("dashboard", [], "admin", ["admin"])
+
+        assert isinstance(result, Dashboard)
+        assert result.parts == {"status": "status", "info": "info", "resources": "resources"}
+        assert result.missing == {}
+        assert result.elapsed < 0.2
+
+    @pytest.mark.asyncio
+    async def test_marks_timed_out_and_failed_parts(self, handle, mock_services):
+        """Verifies that parts past the deadline or raising are reported as missing while the rest are kept."""
+        minecraft = mock_services["minecraft"]
+        minecraft.get_info = AsyncMock(side_effect=self.slow("info", 5))
+        minecraft.get_resources = AsyncMock(side_effect=Exception("boom"))
+
+        result = await handle.process_command("dashboard", [], "admin", ["admin"])
+
+        assert set(result.parts) == {"status"}
+        assert result.missing == {"info": "timed out", "resources": "error"}
+        assert result.elapsed < 1
+
+    @pytest.mark.asyncio
+    async def test_optional_parts(self, handle, mock_services):
+        """Verifies that mods and server IPs are only fetched when requested."""
+        mock_services["minecraft"].list_mods = AsyncMock(return_value={"mods": [], "total": 0})
+
+        plain = await handle.process_command("dashboard", [], "admin", ["admin"])
+        full = await handle.process_command("dashboard", ["mods", "vpn"], "admin", ["admin"])
+
+        assert "mods" not in plain.parts and "server_ips" not in plain.parts
+        assert full.parts["mods"] == {"mods": [], "total": 0}
+        assert full.parts["server_ips"] == ["192.168.1.1", "192.168.1.2"]
+
+
+class TestCommandBatch:
+    """Tests for the /command_batch command."""
+
+    @pytest.fixture
+    def handle(self, mock_services):
+        """Creates a CommandHandle whose config uses the default batch settings."""
+        config = MagicMock()
+        config.get.side_effect = lambda key, default=None: default
+        return CommandHandle(mock_services["pubsub"], mock_services["minecraft"], mock_services["vpn"], config)
+
+    @pytest.mark.asyncio
+    async def test_runs_parsed_script_in_order(self, handle, mock_services):
+        """Verifies that the script is split into commands and sent as one ordered batch."""
+        mock_services["minecraft"].command_batch = AsyncMock(
+            return_value=[{"command": "say a", "output": ""}, {"command": "say b", "output": ""}]
+        )
+
+        report = await handle.process_command("command_batch", ["say a; say b", "ordered"], "admin", ["admin"])
+
+        mock_services["minecraft"].command_batch.assert_awaited_once_with(["say a", "say b"])
+        assert isinstance(report, CommandBatchReport)
+        assert report.ordered is True
+        assert report.failed == 0
+
+    @pytest.mark.asyncio
+    async def test_parallel_mode_sends_single_commands(self, handle, mock_services):
+        """Verifies that parallel mode uses the single-command endpoint."""
+        report = await handle.process_command("command_batch", ["say a; say b", "parallel"], "admin", ["admin"])
+
+        assert mock_services["minecraft"].command.await_count == 2
+        assert report.ordered is False
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_script(self, handle):
+        """Verifies that a script without commands is rejected."""
+        result = await handle.process_command("command_batch", [" ; \n"], "admin", ["admin"])
+
+        assert "No commands" in result["error"]
+
+
+class TestInstallModStream:
+    """Tests for streaming mod uploads through /install_mod."""
+
+    @pytest.fixture
+    def handle(self, mock_services):
+        """Creates a CommandHandle whose config uses the default upload limit."""
+        config = MagicMock()
+        config.get.side_effect = lambda key, default=None: default
+        return CommandHandle(mock_services["pubsub"], mock_services["minecraft"], mock_services["vpn"], config)
+
+    @pytest.mark.asyncio
+    async def test_reports_upload_throughput(self, handle, mock_services):
+        """Verifies that the stream is passed to the provider and the upload size is reported."""
+
+        async def install(filename, chunks):
+            async for _ in chunks:
+                pass
+            return {"status": "accepted"}
+
+        async def chunks():
+            yield b"a" * 1024
+            yield b"b" * 1024
+
+        mock_services["minecraft"].install_mod_stream = AsyncMock(side_effect=install)
+
+        result = await handle.process_command("install_mod", ["stream", "mod.jar", chunks(), 2048], "admin", ["admin"])
+
+        assert result["status"] == "accepted"
+        assert result["upload"]["bytes"] == 2048
+
+    @pytest.mark.asyncio
+    async def test_rejects_declared_size_over_limit(self, handle, mock_services):
+        """Verifies that an attachment declared over the limit is refused before anything is downloaded."""
+        mock_services["minecraft"].install_mod_stream = AsyncMock()
+
+        result = await handle.process_command(
+            "install_mod", ["stream", "huge.jar", MagicMock(), 300 * 1024**2], "admin", ["admin"]
+        )
+
+        assert "256 MB" in result["error"]
+        mock_services["minecraft"].install_mod_stream.assert_not_awaited()
+
+
+class TestModDeduplication:
+    """Tests for skipping installs of content the mod index already knows."""
+
+    JAR = b"jar content" * 100
+    SHA = hashlib.sha256(JAR).hexdigest()
+
+    @pytest.fixture
+    def index(self):
+        """A mod index in which the test jar is installed as create.jar, from a known URL."""
+        index = ModIndex()
+        index.record(self.SHA, "create.jar", len(self.JAR), "https://example.com/create.jar")
+        index.record_result("create.jar", True)
+        return index
+
+    @pytest.fixture
+    def handle(self, mock_services, index):
+        """Creates a CommandHandle with the mod index and a server that lists create.jar."""
+        config = MagicMock()
+        config.get.side_effect = lambda key, default=None: default
+        mock_services["minecraft"].list_mods = AsyncMock(return_value={"mods": ["create.jar"], "total": 1})
+        mock_services["minecraft"].install_mod_url = AsyncMock(return_value={"status": "accepted"})
+        mock_services["minecraft"].install_mod_stream = AsyncMock(side_effect=self.consume)
+        return CommandHandle(
+            mock_services["pubsub"], mock_services["minecraft"], mock_services["vpn"], config, mod_index=index
+        )
+
+    @staticmethod
+    async def consume(filename, chunks):
+        async for _ in chunks:
+            pass
+        return {"status": "accepted"}
+
+    def open_jar(self):
+        async def chunks():
+            yield self.JAR[:500]
+            yield self.JAR[500:]
+
+        return chunks()
+
+    @pytest.mark.asyncio
+    async def test_known_url_short_circuits(self, handle, mock_services):
+        """Verifies that a URL already installed is not requested again."""
+        result = await handle.process_command("install_mod", ["url", "https://example.com/create.jar"], "a", ["a"])
+
+        assert result["status"] == "duplicate"
+        assert result["file_name"] == "create.jar"
+        mock_services["minecraft"].install_mod_url.assert_not_awaited()
+
+    @pytest.fixture
+    def download(self, monkeypatch):
+        """Serves the test jar to the bot at any URL, announcing ``size`` in HEAD, and counts the downloads."""
+        download = MagicMock(size=len(self.JAR), count=0)
+
+        async def content_length(url, ssl=True):
+            return download.size
+
+        async def chunks(url, ssl=True):
+            download.count += 1
+            yield self.JAR
+
+        monkeypatch.setattr("bot.handles.command_handle.url_content_length", content_length)
+        monkeypatch.setattr("bot.handles.command_handle.iter_url_chunks", chunks)
+        return download
+
+    @pytest.mark.asyncio
+    async def test_new_url_of_unknown_size_is_not_downloaded(self, handle, mock_services, download):
+        """Verifies that a new URL whose size matches no installed jar goes straight to server_handler."""
+        download.size = len(self.JAR) + 1
+
+        result = await handle.process_command("install_mod", ["url", "https://mirror.example/other.jar"], "a", ["a"])
+
+        assert result == {"status": "accepted"}
+        assert download.count == 0
+        mock_services["minecraft"].install_mod_url.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_new_url_of_known_size_is_hashed(self, handle, mock_services, download):
+        """Verifies that a new URL with the size of an installed jar is downloaded and recognized as a copy."""
+        result = await handle.process_command("install_mod", ["url", "https://mirror.example/create.jar"], "a", ["a"])
+
+        assert result["status"] == "duplicate"
+        assert download.count == 1
+        mock_services["minecraft"].install_mod_url.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_hashurls_ignores_the_upload_limit(self, mock_services, index, download):
+        """Verifies that with hashurls every new URL is hashed, and that maxuploadmb doesn't apply to URLs."""
+        config = MagicMock()
+        settings = {"minecraft.mods.hashurls": True, "minecraft.mods.maxuploadmb": 0.0001}
+        config.get.side_effect = lambda key, default=None: settings.get(key, default)
+        mock_services["minecraft"].install_mod_url = AsyncMock(return_value={"status": "accepted"})
+        handle = CommandHandle(
+            mock_services["pubsub"], mock_services["minecraft"], mock_services["vpn"], config, mod_index=index
+        )
+        download.size = None
+
+        result = await handle.process_command(
+            "install_mod", ["url", "https://example.com/big.jar", "force"], "a", ["a"]
+        )
+
+        assert result["sha256"] == self.SHA
+        assert download.count == 1
+        mock_services["minecraft"].install_mod_url.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_same_attachment_content_short_circuits(self, handle, mock_services, index):
+        """Verifies that an attachment with installed content is hashed and skipped without uploading."""
+        args = ["stream", "create-copy.jar", self.open_jar, len(self.JAR)]
+
+        result = await handle.process_command("install_mod", args, "a", ["a"])
+
+        assert result["sha256"] == self.SHA
+        mock_services["minecraft"].install_mod_stream.assert_not_awaited()
+        assert "upload:create-copy.jar" in index.get(self.SHA)["sources"]
+
+    @pytest.mark.asyncio
+    async def test_force_and_missing_jar_install_again(self, handle, mock_services, download):
+        """Verifies that force skips the check, and that a jar gone from the server is not treated as installed."""
+        await handle.process_command("install_mod", ["url", "https://example.com/create.jar", "force"], "a", ["a"])
+        mock_services["minecraft"].list_mods.return_value = {"mods": [], "total": 0}
+        args = ["stream", "create.jar", self.open_jar, len(self.JAR)]
+
+        result = await handle.process_command("install_mod", args, "a", ["a"])
+
+        mock_services["minecraft"].install_mod_url.assert_awaited_once()
+        assert result["status"] == "accepted"
+        assert result["sha256"] == self.SHA
+
+    @pytest.mark.asyncio
+    async def test_installs_again_after_mods_directory_was_emptied(self, handle, mock_services, index, download):
+        """Verifies that a null mod list from server_handler means the indexed jar is gone, so it is installed again."""
+        mock_services["minecraft"].list_mods.return_value = {"mods": None, "total": 0}
+
+        result = await handle.process_command("install_mod", ["url", "https://example.com/create.jar"], "a", ["a"])
+
+        assert result["status"] == "accepted"
+        mock_services["minecraft"].install_mod_url.assert_awaited_once()
+        assert index.get(self.SHA)["status"] == "removed"
+
+    @pytest.mark.asyncio
+    async def test_list_mods_accepts_null_mod_list(self, handle, mock_services, index):
+        """Verifies that /list_mods without the mod list cache reconciles a null list as an empty directory."""
+        mock_services["minecraft"].list_mods.return_value = {"mods": None, "total": 0}
+
+        result = await handle.process_command("list_mods", [], "a", ["a"])
+
+        assert result["sources"] == {}
+        assert index.get(self.SHA)["status"] == "removed"
+
+    @pytest.mark.asyncio
+    async def test_reads_metadata_of_uploaded_jar(self, handle, index):
+        """Verifies that a streamed jar's metadata is read from the spooled copy and cached under its hash."""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as jar:
+            jar.writestr("fabric.mod.json", '{"id": "sodium", "name": "Sodium", "version": "0.5.8"}')
+        content = buffer.getvalue()
+
+        async def chunks():
+            yield content
+
+        result = await handle.process_command(
+            "install_mod", ["stream", "sodium.jar", chunks(), len(content)], "a", ["a"]
+        )
+
+        assert result["metadata"] == {"mod_id": "sodium", "name": "Sodium", "version": "0.5.8", "loader": "Fabric"}
+        assert index.by_filename("sodium.jar")["metadata"]["name"] == "Sodium"
+
+    @pytest.mark.asyncio
+    async def test_list_mods_shows_sources(self, handle):
+        """Verifies that /list_mods adds the hash and source of indexed jars."""
+        result = await handle.process_command("list_mods", [], "a", ["a"])
+
+        assert result["sources"]["create.jar"]["source"] == "https://example.com/create.jar"
+
+
+class TestModListCache:
+    """Tests for serving /list_mods and /remove_mod autocomplete from the mod list cache."""
+
+    @pytest.fixture
+    def cache(self):
+        """An empty mod list cache."""
+        return ModListCache()
+
+    @pytest.fixture
+    def handle(self, mock_services, cache):
+        """Creates a CommandHandle with the cache and a server that lists two jars."""
+        config = MagicMock()
+        config.get.side_effect = lambda key, default=None: default
+        mock_services["minecraft"].list_mods = AsyncMock(
+            return_value={"mods": ["sodium.jar", "create.jar"], "total": 2}
+        )
+        mock_services["minecraft"].remove_mod = AsyncMock(
+            return_value={"success": True, "file_name": "create.jar", "message": "Mod removed"}
+        )
+        return CommandHandle(
+            mock_services["pubsub"], mock_services["minecraft"], mock_services["vpn"], config, mod_list_cache=cache
+        )
+
+    @pytest.mark.asyncio
+    async def test_list_mods_loads_once(self, handle, mock_services):
+        """Verifies that repeated /list_mods are answered from the cache, and refresh asks server_handler again."""
+        await handle.process_command("list_mods", [], "a", ["a"])
+        result = await handle.process_command("list_mods", [], "a", ["a"])
+
+        assert result == {"mods": ["create.jar", "sodium.jar"], "total": 2}
+        mock_services["minecraft"].list_mods.assert_awaited_once()
+
+        await handle.process_command("list_mods", ["refresh"], "a", ["a"])
+        assert mock_services["minecraft"].list_mods.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_remove_patches_cache(self, handle, mock_services):
+        """Verifies that a successful removal drops the jar without reloading the list."""
+        await handle.process_command("list_mods", [], "a", ["a"])
+        await handle.process_command("remove_mod", ["create.jar"], "a", ["a"])
+
+        result = await handle.process_command("list_mods", [], "a", ["a"])
+
+        assert result["mods"] == ["sodium.jar"]
+        mock_services["minecraft"].list_mods.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_suggestions_never_wait_for_server_handler(self, handle, mock_services):
+        """Verifies that suggestions come from the cache, starting a background load when it is empty."""
+        first = await handle.process_command("mod_suggestions", ["cr"], "a", ["a"])
+        assert first == {"mods": []}
+
+        await asyncio.sleep(0)
+        second = await handle.process_command("mod_suggestions", ["cr"], "a", ["a"])
+        assert second == {"mods": ["create.jar"]}
+        mock_services["minecraft"].list_mods.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_suggestions_require_admin(self, handle, mock_services):
+        """Verifies that non-admins get no suggestions and trigger no load."""
+        result = await handle.process_command("mod_suggestions", ["cr"], "b", ["a"])
+
+        assert result == "Unauthorized command usage"
+        mock_services["minecraft"].list_mods.assert_not_awaited()
+
+
+class TestInstallMods:
+    """Tests for the /install_mods bulk command."""
+
+    @pytest.fixture
+    def handle(self, mock_services):
+        """Creates a CommandHandle whose config uses the default bulk settings."""
+        config = MagicMock()
+        config.get.side_effect = lambda key, default=None: default
+        mock_services["minecraft"].install_mod_url = AsyncMock(return_value={"status": "accepted"})
+        return CommandHandle(mock_services["pubsub"], mock_services["minecraft"], mock_services["vpn"], config)
+
+    @pytest.mark.asyncio
+    async def test_starts_bulk_install(self, handle, mock_services):
+        """Verifies that the manifest's URLs are requested through install_mod and tracked in one BulkModInstall."""
+        manifest = "https://cdn.example.com/a.jar\nhttps://cdn.example.com/b.jar\nreadme.txt"
+
+        bulk = await handle.process_command("install_mods", [manifest], "admin", ["admin"])
+        await asyncio.sleep(0.01)
+
+        assert isinstance(bulk, BulkModInstall)
+        assert [item.filename for item in bulk.items] == ["a.jar", "b.jar"]
+        assert bulk.rejected == ["readme.txt"]
+        assert mock_services["minecraft"].install_mod_url.await_count == 2
+        bulk.start().cancel()
+
+    @pytest.mark.asyncio
+    async def test_rejects_manifest_without_urls(self, handle):
+        """Verifies that a manifest without .jar URLs is refused."""
+        result = await handle.process_command("install_mods", ["nothing here"], "admin", ["admin"])
+
+        assert "No mod URLs" in result["error"]
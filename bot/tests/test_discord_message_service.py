@@ -0,0 +1,36 @@
+import pytest
+
+from bot.resource_history import ResourceHistory
+from bot.services.messaging.discord_message_service import DiscordMessageServiceProvider
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self):
+        self.now = 100_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFormatResourceHistory:
+    """Tests for rendering /resources history:True."""
+
+    @pytest.mark.asyncio
+    async def test_formats_real_report(self):
+        """Verifies that each measured series gets a row per window and that unmeasured series are left out."""
+        clock = FakeClock()
+        history = ResourceHistory(100, clock=clock)
+        for i in range(10):
+            history.record(clock.now - 60 + i, cpu=float(i), memory=50.0)
+        # Built inside the loop; the Discord client's connector needs one
+        provider = DiscordMessageServiceProvider("token")
+
+        formatted = provider._format_resource_history_response(history.report())
+
+        assert "(10 samples)" in formatted
+        assert "CPU %    5m       0.0    4.5    9.0    9.0" in formatted
+        assert "Memory % 5m      50.0   50.0   50.0   50.0" in formatted
+        assert "TPS      5m" not in formatted
+        assert "Players" not in formatted
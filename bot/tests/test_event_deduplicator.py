@@ -0,0 +1,86 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bot.handles.event_deduplicator import DedupeKey, EventDeduplicator
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+class TestEventDeduplicator:
+    """Tests for dropping duplicate inbound events."""
+
+    @pytest.mark.asyncio
+    async def test_drops_same_content_from_different_publishers(self):
+        """Verifies that identical events are handled once, whatever their id or origin."""
+        handler = AsyncMock()
+        deduplicator = EventDeduplicator(handler, ttl=10, key=DedupeKey.CONTENT)
+
+        await deduplicator.handle(AdmineMessage("server_handler", ["server_on"], "up", message_id="a"))
+        await deduplicator.handle(AdmineMessage("server_handler_2", ["server_on"], "up", message_id="b"))
+        await deduplicator.handle(AdmineMessage("server_handler", ["server_off"], "up", message_id="c"))
+
+        assert handler.await_count == 2
+        snapshot = metrics.snapshot()
+        assert snapshot["event_dedupe_hits_total"] == 1
+        assert snapshot["event_dedupe_misses_total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_message_id_key_only_drops_redeliveries(self):
+        """Verifies that MESSAGE_ID keying drops redeliveries but keeps distinct messages with the same text."""
+        handler = AsyncMock()
+        deduplicator = EventDeduplicator(handler, ttl=10, key=DedupeKey.MESSAGE_ID)
+        event = AdmineMessage("server_handler", ["notification"], "Starting server", message_id="a")
+
+        await deduplicator.handle(event)
+        await deduplicator.handle(event)
+        await deduplicator.handle(event.replace(message_id="b"))
+
+        assert handler.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_repeated_server_on_is_handled_by_default(self):
+        """Verifies that by default a second server_on with the same text is announced again, unlike a redelivery."""
+        handler = AsyncMock()
+        deduplicator = EventDeduplicator(handler, ttl=10)
+        first = AdmineMessage("server_handler", ["server_on"], "zerotier:123", message_id="a")
+
+        await deduplicator.handle(first)
+        await deduplicator.handle(first)
+        await deduplicator.handle(first.replace(message_id="b"))
+
+        assert handler.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_redelivery_after_failure_is_handled(self):
+        """Verifies that an event whose handler raised is not remembered, so its redelivery is handled."""
+        handler = AsyncMock(side_effect=[RuntimeError("discord down"), None])
+        deduplicator = EventDeduplicator(handler, ttl=10)
+        event = AdmineMessage("server_handler", ["server_on"], "up", message_id="a")
+
+        with pytest.raises(RuntimeError):
+            await deduplicator.handle(event)
+        await deduplicator.handle(event)
+        await deduplicator.handle(event)
+
+        assert handler.await_count == 2
+        assert metrics.snapshot()["event_dedupe_hits_total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tags_and_message_do_not_collide(self):
+        """Verifies that the content key separates tags from the message text."""
+        handler = AsyncMock()
+        deduplicator = EventDeduplicator(handler, ttl=10, key=DedupeKey.CONTENT)
+
+        await deduplicator.handle(AdmineMessage("a", ["notification"], "x"))
+        await deduplicator.handle(AdmineMessage("a", ["notificationx"], ""))
+
+        assert handler.await_count == 2
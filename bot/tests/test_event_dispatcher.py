@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+
+from bot.handles.event_dispatcher import EventDispatcher, OverflowPolicy
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+class RecordingHandler:
+    """Event handler that records handled messages and can be paused."""
+
+    def __init__(self):
+        self.handled = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self, event: AdmineMessage):
+        await self.gate.wait()
+        self.handled.append(event.message)
+
+
+class TestEventDispatcherOrdering:
+    """Tests for per-tag ordering and worker isolation."""
+
+    @pytest.mark.asyncio
+    async def test_preserves_order_per_tag(self):
+        """Verifies that events with the same tag are handled in arrival order."""
+        handler = RecordingHandler()
+        dispatcher = EventDispatcher(handler, workers=4, max_queue_size=50)
+        dispatcher.start()
+
+        for i in range(20):
+            await dispatcher.submit(AdmineMessage("server_handler", ["notification"], str(i)))
+        await dispatcher.join()
+        await dispatcher.stop()
+
+        assert handler.handled == [str(i) for i in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_slow_handler_does_not_block_other_workers(self):
+        """Verifies that a stalled shard does not stop events from other shards."""
+        blocked = asyncio.Event()
+        handled = []
+
+        async def handler(event: AdmineMessage):
+            if event.message == "slow":
+                await blocked.wait()
+            handled.append(event.message)
+
+        dispatcher = EventDispatcher(handler, workers=2, max_queue_size=10)
+        dispatcher._EventDispatcher__shard_index = lambda event: 0 if event.message == "slow" else 1
+        dispatcher.start()
+
+        await dispatcher.submit(AdmineMessage("a", ["server_on"], "slow"))
+        await dispatcher.submit(AdmineMessage("a", ["new_server_ips"], "fast"))
+        await asyncio.sleep(0.01)
+
+        assert handled == ["fast"]
+        blocked.set()
+        await dispatcher.join()
+        await dispatcher.stop()
+        assert handled == ["fast", "slow"]
+
+    @pytest.mark.asyncio
+    async def test_handler_error_does_not_kill_worker(self):
+        """Verifies that an exception in the handler is logged and the worker keeps running."""
+        handled = []
+
+        async def handler(event: AdmineMessage):
+            if event.message == "boom":
+                raise RuntimeError("discord down")
+            handled.append(event.message)
+
+        dispatcher = EventDispatcher(handler, workers=1)
+        dispatcher.start()
+
+        await dispatcher.submit(AdmineMessage("a", ["notification"], "boom"))
+        await dispatcher.submit(AdmineMessage("a", ["notification"], "ok"))
+        await dispatcher.join()
+        await dispatcher.stop()
+
+        assert handled == ["ok"]
+
+
+class TestEventDispatcherOverflow:
+    """Tests for the overflow policies."""
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        """Verifies that DROP_OLDEST discards the oldest queued event when full."""
+        handler = RecordingHandler()
+        dispatcher = EventDispatcher(handler, workers=1, max_queue_size=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+
+        for i in range(4):
+            await dispatcher.submit(AdmineMessage("a", ["notification"], str(i)))
+        dispatcher.start()
+        await dispatcher.join()
+        await dispatcher.stop()
+
+        assert handler.handled == ["2", "3"]
+        assert metrics.snapshot()["event_queue_dropped_total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_spill_keeps_every_event_in_order(self):
+        """Verifies that SPILL overflows into the spill buffer without losing or reordering events."""
+        handler = RecordingHandler()
+        dispatcher = EventDispatcher(handler, workers=1, max_queue_size=2, overflow_policy=OverflowPolicy.SPILL)
+
+        for i in range(6):
+            await dispatcher.submit(AdmineMessage("a", ["notification"], str(i)))
+        assert dispatcher.depth == 6
+
+        dispatcher.start()
+        await dispatcher.join()
+        await dispatcher.stop()
+
+        assert handler.handled == [str(i) for i in range(6)]
+        assert metrics.snapshot()["event_queue_spilled_total"] == 4
+
+    @pytest.mark.asyncio
+    async def test_block_applies_backpressure(self):
+        """Verifies that BLOCK makes submit wait for free space."""
+        handler = RecordingHandler()
+        handler.gate.clear()
+        dispatcher = EventDispatcher(handler, workers=1, max_queue_size=1, overflow_policy=OverflowPolicy.BLOCK)
+        dispatcher.start()
+
+        await dispatcher.submit(AdmineMessage("a", ["notification"], "0"))
+        await asyncio.sleep(0)
+        await dispatcher.submit(AdmineMessage("a", ["notification"], "1"))
+        pending = asyncio.create_task(dispatcher.submit(AdmineMessage("a", ["notification"], "2")))
+        await asyncio.sleep(0.01)
+
+        assert not pending.done()
+        handler.gate.set()
+        await pending
+        await dispatcher.join()
+        await dispatcher.stop()
+        assert handler.handled == ["0", "1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_exports_depth_and_wait_time(self):
+        """Verifies that queue depth and wait time are recorded in the metrics registry."""
+        handler = RecordingHandler()
+        dispatcher = EventDispatcher(handler, workers=1)
+
+        await dispatcher.submit(AdmineMessage("a", ["notification"], "x"))
+        assert metrics.snapshot()["event_queue_depth"] == 1
+
+        dispatcher.start()
+        await dispatcher.join()
+        await dispatcher.stop()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["event_queue_depth"] == 0
+        assert snapshot["event_queue_wait_seconds_count"] == 1
@@ -3,7 +3,11 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from bot.handles.event_handle import EventHandle
-from bot.models.admine_message import AdmineMessage
+from bot.metrics import metrics
+from bot.mod_index import ModIndex
+from bot.models.admine_message import AdmineMessage, Hop, now_ms
+from bot.services.minecraft.mod_bulk_install import ModInstallWaiters
+from bot.services.minecraft.mod_list_cache import ModListCache
 
 
 @pytest.fixture
@@ -73,6 +77,17 @@ class TestServerEvents:
             call_args = service.send_message.call_args[0][0]
             assert "Server has stopped with message: Server stopped gracefully" in call_args
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tag", ["server_on", "server_off"])
+    async def test_server_state_change_invalidates_cache(self, mock_message_services, tag):
+        """Verifies that server_on/server_off drop the cached status, info and resources."""
+        minecraft_service = MagicMock()
+        event_handle = EventHandle(mock_message_services, minecraft_service)
+
+        await event_handle.handle_event(AdmineMessage("ServerHandler", [tag], "done"))
+
+        minecraft_service.invalidate_cache.assert_called_once_with("status", "info", "resources")
+
     @pytest.mark.asyncio
     async def test_new_server_ips_event(self, event_handle, mock_message_services):
         """Tests new_server_ips event processing."""
@@ -212,3 +227,90 @@ class TestEventHandleEdgeCases:
         # The exception should propagate (EventHandle does not handle service exceptions)
         with pytest.raises(Exception, match="Service error"):
             await event_handle.handle_event(event)
+
+
+class TestEventLatency:
+    """Tests for the latency histograms recorded by EventHandle."""
+
+    @pytest.fixture(autouse=True)
+    def clear_metrics(self):
+        """Resets the shared metrics registry between tests."""
+        metrics.clear()
+        yield
+        metrics.clear()
+
+    @pytest.mark.asyncio
+    async def test_records_handling_time_per_tag(self, event_handle):
+        """Verifies that handling time is recorded even for events without tracing fields."""
+        await event_handle.handle_event(AdmineMessage("server_handler", ["server_off"], "bye"))
+
+        snapshot = metrics.snapshot()
+        assert snapshot["event_handle_seconds_count{tag=server_off}"] == 1
+        assert "event_end_to_end_seconds_count{tag=server_off}" not in snapshot
+
+    @pytest.mark.asyncio
+    async def test_records_end_to_end_and_bot_segment(self, event_handle):
+        """Verifies that traced events record the round trip and the receive-to-handled segment."""
+        received_at = now_ms()
+        event = AdmineMessage(
+            "server_handler",
+            ["server_on"],
+            "up",
+            hops=[Hop("bot", "publish", received_at - 2_000), Hop("bot", "receive", received_at)],
+        )
+
+        await event_handle.handle_event(event)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["event_end_to_end_seconds_max{tag=server_on}"] >= 2.0
+        assert snapshot["pubsub_hop_seconds_count{hop=bot.receive -> bot.handled}"] == 1
+
+
+class TestModInstallResult:
+    """Tests for mod_install_result events updating the mod index."""
+
+    @pytest.mark.asyncio
+    async def test_result_marks_indexed_mod(self, mock_message_services):
+        """Verifies that a result naming a jar updates its entry and is still broadcast."""
+        index = ModIndex()
+        index.record("a" * 64, "create.jar", 10, "https://example.com/create.jar")
+        event_handle = EventHandle(mock_message_services, mod_index=index)
+
+        await event_handle.handle_event(
+            AdmineMessage("server_handler", ["mod_install_result"], "create.jar: Mod installed successfully")
+        )
+
+        assert index.by_filename("create.jar")["status"] == "installed"
+        mock_message_services[0].send_message.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_result_for_bulk_install_is_not_broadcast(self, mock_message_services):
+        """Verifies that a result a bulk install waits for goes to it instead of every channel."""
+        waiters = ModInstallWaiters()
+        future = waiters.register("create.jar")
+        event_handle = EventHandle(mock_message_services, mod_install_waiters=waiters)
+
+        await event_handle.handle_event(
+            AdmineMessage("server_handler", ["mod_install_result"], "create.jar: Mod installed successfully")
+        )
+
+        assert future.result() == (True, "create.jar: Mod installed successfully")
+        mock_message_services[0].send_message.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_result_patches_mod_list_cache(self, mock_message_services):
+        """Verifies that a successful result adds the jar to the cached list and an unnamed one invalidates it."""
+        cache = ModListCache()
+        cache.set(["sodium.jar"])
+        event_handle = EventHandle(mock_message_services, mod_list_cache=cache)
+
+        await event_handle.handle_event(
+            AdmineMessage("server_handler", ["mod_install_result"], "create.jar: Mod installed successfully")
+        )
+        await event_handle.handle_event(
+            AdmineMessage("server_handler", ["mod_install_result"], "Failed to install mod broken.jar: bad zip")
+        )
+        assert cache.suggest("") == ["create.jar", "sodium.jar"]
+
+        await event_handle.handle_event(AdmineMessage("server_handler", ["mod_install_result"], "Mod installed"))
+        assert not cache.fresh
@@ -0,0 +1,106 @@
+import io
+import json
+import os
+import time
+import zipfile
+
+import pytest
+
+from bot.jar_metadata import JarMetadata, parse_jar_metadata, read_jar_metadata
+
+MANIFEST = "Manifest-Version: 1.0\r\nImplementation-Title: create\r\nImplementation-Version: 0.5.1.f\r\n\r\n"
+MODS_TOML = """modLoader="javafml"
+loaderVersion="[47,)"
+license="MIT"
+
+[[mods]]
+modId="create"
+version="${file.jarVersion}"
+displayName="Create"
+"""
+
+
+def build_jar(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as jar:
+        jar.writestr("META-INF/MANIFEST.MF", files.pop("META-INF/MANIFEST.MF", "Manifest-Version: 1.0\r\n\r\n"))
+        for name, content in files.items():
+            jar.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def write_jar(tmp_path):
+    """Writes a jar with the given entries to a temporary file and returns its path."""
+
+    def write(files: dict, name: str = "mod.jar") -> str:
+        path = tmp_path / name
+        path.write_bytes(build_jar(dict(files)))
+        return str(path)
+
+    return write
+
+
+class TestReadJarMetadata:
+    """Tests for reading mod metadata from jars."""
+
+    def test_fabric(self, write_jar):
+        """Verifies that fabric.mod.json is read, including strings with raw newlines."""
+        fabric = '{"schemaVersion": 1, "id": "sodium", "version": "0.5.8", "name": "Sodium", "description": "a\nb"}'
+
+        metadata = read_jar_metadata(write_jar({"fabric.mod.json": fabric, "assets/icon.png": os.urandom(4096)}))
+
+        assert metadata == JarMetadata("sodium", "Sodium", "0.5.8", "Fabric")
+
+    def test_quilt(self, write_jar):
+        """Verifies that quilt.mod.json is read."""
+        quilt = {"quilt_loader": {"id": "qsl", "version": "7.0.0", "metadata": {"name": "Quilt Standard Libraries"}}}
+
+        metadata = read_jar_metadata(write_jar({"quilt.mod.json": json.dumps(quilt)}))
+
+        assert metadata == JarMetadata("qsl", "Quilt Standard Libraries", "7.0.0", "Quilt")
+
+    def test_forge_version_from_manifest(self, write_jar):
+        """Verifies that mods.toml is read and ${file.jarVersion} is taken from the manifest."""
+        metadata = read_jar_metadata(write_jar({"META-INF/MANIFEST.MF": MANIFEST, "META-INF/mods.toml": MODS_TOML}))
+
+        assert metadata == JarMetadata("create", "Create", "0.5.1.f", "Forge")
+
+    def test_neoforge_and_invalid_toml(self, write_jar):
+        """Verifies that neoforge.mods.toml is recognized and TOML that tomllib rejects is still read."""
+        broken = 'modLoader="javafml"\n[[mods]]\nmodId="jei"\nversion="19.0.0"\ndisplayName="JEI"\nbad = \n'
+
+        metadata = read_jar_metadata(write_jar({"META-INF/neoforge.mods.toml": broken}))
+
+        assert metadata == JarMetadata("jei", "JEI", "19.0.0", "NeoForge")
+
+    def test_manifest_only(self, write_jar):
+        """Verifies that a jar with only a manifest falls back to its implementation title and version."""
+        metadata = read_jar_metadata(write_jar({"META-INF/MANIFEST.MF": MANIFEST}))
+
+        assert metadata == JarMetadata("create", "create", "0.5.1.f", "Unknown")
+
+    def test_not_a_jar(self, tmp_path):
+        """Verifies that empty and non-zip files give None."""
+        empty = tmp_path / "empty.jar"
+        empty.write_bytes(b"")
+        text = tmp_path / "text.jar"
+        text.write_bytes(b"not a zip" * 100)
+
+        assert read_jar_metadata(str(empty)) is None
+        assert read_jar_metadata(str(text)) is None
+        assert parse_jar_metadata(b"PK\x05\x06" + b"\xff" * 18) is None
+
+    def test_reads_only_directory_and_metadata(self, write_jar):
+        """Verifies that a large jar with thousands of entries is read in milliseconds."""
+        files = {f"assets/textures/block_{i}.png": b"x" * 100 for i in range(5000)}
+        files["data/huge.bin"] = os.urandom(20 * 1024 * 1024)
+        files["fabric.mod.json"] = '{"id": "big", "version": "1.0", "name": "Big"}'
+        path = write_jar(files)
+
+        started = time.perf_counter()
+        metadata = read_jar_metadata(path)
+        elapsed = time.perf_counter() - started
+
+        assert metadata.name == "Big"
+        assert elapsed < 0.05
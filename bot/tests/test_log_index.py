@@ -0,0 +1,137 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from bot.log_index import LogIndex, parse_time_spec
+
+
+class FakeClock:
+    """Manually advanced wall clock, fixed at 12:00:00 local time."""
+
+    def __init__(self):
+        self.now = datetime(2024, 5, 10, 12, 0, 0).timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Creates a manually advanced clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def index(clock):
+    """Creates a log index with a small sample of Minecraft log lines."""
+    log_index = LogIndex(1000, clock=clock)
+    log_index.add(
+        [
+            "[11:00:00] [Server thread/INFO]: Starting minecraft server version 1.20.1",
+            "[11:30:00] [Server thread/INFO]: Steve joined the game",
+            "[11:45:00] [Server thread/WARN]: Can't keep up! Is the server overloaded?",
+            "[11:50:00] [Server thread/ERROR]: Encountered an unexpected exception",
+            "java.lang.NullPointerException: null",
+            "\tat net.minecraft.server.MinecraftServer.tick(MinecraftServer.java:812)",
+            "[11:55:00] [Server thread/INFO]: Alex joined the game",
+        ]
+    )
+    return log_index
+
+
+class TestLogIndex:
+    """Tests for the level/time/token indexed log store."""
+
+    def test_keyword_query_requires_all_words(self, index):
+        """Verifies that keyword queries match lines containing every word, newest first, case-insensitively."""
+        result = index.search("JOINED game")
+
+        assert [m.line for m in result.matches] == [
+            "[11:55:00] [Server thread/INFO]: Alex joined the game",
+            "[11:30:00] [Server thread/INFO]: Steve joined the game",
+        ]
+        assert index.search("steve alex").matches == []
+
+    def test_regex_query(self, index):
+        """Verifies that regex queries are matched against the full line."""
+        result = index.search(r"(Steve|Alex) joined", regex=True)
+
+        assert len(result.matches) == 2
+
+    def test_level_filter_includes_continuation_lines(self, index):
+        """Verifies that stack trace lines inherit the level of the line they follow."""
+        result = index.search(levels=["error"])
+
+        assert [m.level for m in result.matches] == ["ERROR", "ERROR", "ERROR"]
+        assert result.matches[-1].line.endswith("unexpected exception")
+
+    def test_time_range_filter(self, index, clock):
+        """Verifies that since/until restrict matches to lines logged inside the range."""
+        since = datetime(2024, 5, 10, 11, 40).timestamp()
+        until = datetime(2024, 5, 10, 11, 50).timestamp()
+
+        result = index.search(since=since, until=until)
+
+        assert len(result.matches) == 4
+        assert result.matches[-1].line.startswith("[11:45:00]")
+
+    def test_limit_marks_truncation(self, index):
+        """Verifies that hitting the limit returns the newest matches and reports truncation."""
+        result = index.search(limit=2)
+
+        assert len(result.matches) == 2
+        assert result.truncated is True
+        assert result.matches[0].line.endswith("Alex joined the game")
+
+    def test_evicts_oldest_lines(self, clock):
+        """Verifies that the store stays bounded and evicted lines no longer match."""
+        log_index = LogIndex(3000, clock=clock)
+        log_index.add(f"[11:00:00] [Server thread/INFO]: line {i}" for i in range(5000))
+
+        assert len(log_index) == 3000
+        assert log_index.search("0").matches == []
+        assert log_index.search("2000").matches[0].line.endswith("line 2000")
+        assert log_index.search("line", limit=1).matches[0].line.endswith("line 4999")
+
+    def test_searches_large_store_quickly(self, clock):
+        """Verifies that keyword and level searches over 100k lines stay in the millisecond range."""
+        log_index = LogIndex(100_000, clock=clock)
+        log_index.add(
+            f"[11:{i // 3600 % 60:02d}:{i % 60:02d}] [Server thread/{'WARN' if i % 1000 == 0 else 'INFO'}]: "
+            f"player{i % 500} moved to chunk {i}"
+            for i in range(100_000)
+        )
+
+        started = time.perf_counter()
+        keyword = log_index.search("player42 chunk")
+        level = log_index.search(levels=["WARN"])
+        common = log_index.search("moved to")
+        elapsed = time.perf_counter() - started
+        pattern = log_index.search(r"chunk 9999\d$", regex=True)
+
+        assert len(keyword.matches) == 20
+        assert keyword.truncated is True
+        assert all(m.level == "WARN" for m in level.matches)
+        assert common.scanned == 21
+        assert len(pattern.matches) == 10
+        assert elapsed < 0.05
+
+
+class TestParseTimeSpec:
+    """Tests for the /logs_search time filter syntax."""
+
+    def test_durations(self, clock):
+        """Verifies that durations are counted back from now."""
+        assert parse_time_spec("30m", clock.now) == clock.now - 1800
+        assert parse_time_spec("2h", clock.now) == clock.now - 7200
+
+    def test_time_of_day(self, clock):
+        """Verifies that a clock time means today, or yesterday when it is still ahead."""
+        assert parse_time_spec("11:30", clock.now) == datetime(2024, 5, 10, 11, 30).timestamp()
+        assert parse_time_spec("13:00", clock.now) == datetime(2024, 5, 9, 13, 0).timestamp()
+
+    def test_invalid(self, clock):
+        """Verifies that unknown formats are rejected."""
+        with pytest.raises(ValueError):
+            parse_time_spec("yesterday", clock.now)
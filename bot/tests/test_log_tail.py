@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bot.log_index import LogIndex
+from bot.metrics import metrics
+from bot.models.logs_response import LogsResponse
+from bot.services.minecraft.log_tail import LogTail
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest.fixture
+def minecraft_service():
+    """Creates a minecraft service mock whose log reads are scripted per test."""
+    return MagicMock()
+
+
+class TestLogTail:
+    """Tests for the cursor-based local log buffer."""
+
+    @pytest.mark.asyncio
+    async def test_appends_deltas_after_cursor(self, minecraft_service):
+        """Verifies that only lines after the cursor are requested and appended to the buffer."""
+        minecraft_service.get_logs_since = AsyncMock(
+            side_effect=[
+                LogsResponse(["a", "b"], 2, cursor="c1"),
+                LogsResponse(["c"], 1, cursor="c2"),
+            ]
+        )
+        tail = LogTail(minecraft_service, capacity=10)
+
+        await tail.tail(5)
+        result = await tail.tail(5)
+
+        assert result.lines == ["a", "b", "c"]
+        assert result.cursor == "c2"
+        assert minecraft_service.get_logs_since.await_args_list[0].args == (None, 100)
+        assert minecraft_service.get_logs_since.await_args_list[1].args == ("c1", 1000)
+        assert metrics.snapshot()["log_tail_lines_fetched_total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_ring_keeps_newest_lines(self, minecraft_service):
+        """Verifies that the buffer drops the oldest lines beyond its capacity."""
+        minecraft_service.get_logs_since = AsyncMock(
+            side_effect=[
+                LogsResponse(["1", "2", "3"], 3, cursor="c1"),
+                LogsResponse(["4", "5"], 2, cursor="c2"),
+            ]
+        )
+        tail = LogTail(minecraft_service, capacity=4)
+
+        await tail.refresh()
+        result = await tail.tail(10)
+
+        assert result.lines == ["2", "3", "4", "5"]
+        assert result.total == 4
+
+    @pytest.mark.asyncio
+    async def test_without_cursor_replaces_buffer(self, minecraft_service):
+        """Verifies that a server without cursor support gets full reads that replace the buffer."""
+        minecraft_service.get_logs_since = AsyncMock(
+            side_effect=[LogsResponse(["a", "b"], 2), LogsResponse(["b", "c"], 2)]
+        )
+        tail = LogTail(minecraft_service, capacity=10)
+
+        await tail.refresh()
+        result = await tail.tail(10)
+
+        assert result.lines == ["b", "c"]
+        assert minecraft_service.get_logs_since.await_args_list[1].args == (None, 100)
+
+    @pytest.mark.asyncio
+    async def test_marks_gap_when_delta_is_full(self, minecraft_service):
+        """Verifies that a delta hitting the read limit is marked as possibly missing lines."""
+        minecraft_service.get_logs_since = AsyncMock(
+            side_effect=[LogsResponse(["a"], 1, cursor="c1"), LogsResponse(["x", "y"], 2, cursor="c2")]
+        )
+        tail = LogTail(minecraft_service, capacity=10, max_delta=2)
+
+        await tail.refresh()
+        result = await tail.tail(10)
+
+        assert result.lines[0] == "a"
+        assert "skipped" in result.lines[1]
+        assert result.lines[2:] == ["x", "y"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_share_one_read(self, minecraft_service):
+        """Verifies that callers arriving during a refresh wait for it instead of issuing another read."""
+        release = asyncio.Event()
+
+        async def slow_read(cursor, n):
+            await release.wait()
+            return LogsResponse(["a"], 1, cursor="c1")
+
+        minecraft_service.get_logs_since = AsyncMock(side_effect=slow_read)
+        tail = LogTail(minecraft_service)
+
+        first = asyncio.create_task(tail.tail(5))
+        second = asyncio.create_task(tail.tail(5))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(first, second)
+
+        assert minecraft_service.get_logs_since.await_count == 1
+        assert [r.lines for r in results] == [["a"], ["a"]]
+
+    @pytest.mark.asyncio
+    async def test_feeds_only_new_lines_to_index(self, minecraft_service):
+        """Verifies that the index receives each line once, also from overlapping windows without a cursor."""
+        minecraft_service.get_logs_since = AsyncMock(
+            side_effect=[LogsResponse(["a", "b", "c"], 3), LogsResponse(["b", "c", "d"], 3)]
+        )
+        index = LogIndex(100)
+        tail = LogTail(minecraft_service, index=index)
+
+        await tail.refresh()
+        await tail.refresh()
+
+        assert len(index) == 4
+        assert [m.line for m in index.search(limit=10).matches] == ["d", "c", "b", "a"]
@@ -0,0 +1,148 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage
+from bot.services.pubsub.memory_pubsub_service import MemoryBroker, MemoryPubSubServiceProvider
+from bot.services.pubsub.redis_pubsub_service import PubSubServiceFactory, PubSubServiceProviderType
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest.fixture
+def broker():
+    """Creates an isolated in-memory broker."""
+    return MemoryBroker()
+
+
+class Collector:
+    """Callback that records messages and signals once the expected number arrived."""
+
+    def __init__(self, expected: int):
+        self.messages = []
+        self.expected = expected
+        self.done = asyncio.Event()
+
+    async def __call__(self, message: AdmineMessage):
+        self.messages.append(message)
+        if len(self.messages) >= self.expected:
+            self.done.set()
+
+
+async def _listen(provider: MemoryPubSubServiceProvider, callback) -> asyncio.Task:
+    task = asyncio.create_task(provider.listen_message(callback))
+    await asyncio.sleep(0)
+    return task
+
+
+class TestMemoryPubSubFanOut:
+    """Tests for channel semantics of the in-memory provider."""
+
+    @pytest.mark.asyncio
+    async def test_fans_out_to_every_subscriber(self, broker):
+        """Verifies that every subscriber of a channel receives each message and the count is reported."""
+        publisher = MemoryPubSubServiceProvider(producer_channels=["server_channel"], broker=broker)
+        first = MemoryPubSubServiceProvider(subscribed_channels=["server_channel"], broker=broker)
+        second = MemoryPubSubServiceProvider(subscribed_channels=["server_channel"], broker=broker)
+        first_collector, second_collector = Collector(1), Collector(1)
+        tasks = [await _listen(first, first_collector), await _listen(second, second_collector)]
+
+        result = await publisher.send_message(AdmineMessage("server_handler", ["server_on"], "up"))
+        await asyncio.wait_for(asyncio.gather(first_collector.done.wait(), second_collector.done.wait()), 1)
+
+        assert result == {"server_channel": 2}
+        assert first_collector.messages[0].message == "up"
+        assert second_collector.messages[0].hops[-1].label == "bot.receive"
+        for provider in (first, second):
+            await provider.close()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_pattern_subscription(self, broker):
+        """Verifies that glob patterns match channels like Redis PSUBSCRIBE."""
+        publisher = MemoryPubSubServiceProvider(producer_channels=["server_channel", "command_channel"], broker=broker)
+        subscriber = MemoryPubSubServiceProvider(subscribed_channels=["server_*"], broker=broker)
+        collector = Collector(1)
+        task = await _listen(subscriber, collector)
+
+        result = await publisher.send_message(AdmineMessage("a", ["notification"], "hi"))
+        await asyncio.wait_for(collector.done.wait(), 1)
+
+        assert result == {"server_channel": 1, "command_channel": 0}
+        await subscriber.close()
+        await task
+
+    @pytest.mark.asyncio
+    async def test_injected_latency_delays_delivery(self, broker):
+        """Verifies that deliveries are held back by the configured latency."""
+        publisher = MemoryPubSubServiceProvider(producer_channels=["c"], broker=broker, latency=0.05)
+        subscriber = MemoryPubSubServiceProvider(subscribed_channels=["c"], broker=broker)
+        collector = Collector(1)
+        task = await _listen(subscriber, collector)
+
+        await publisher.send_message(AdmineMessage("a", ["notification"], "slow"))
+        await asyncio.sleep(0.01)
+        assert not collector.messages
+        await asyncio.wait_for(collector.done.wait(), 1)
+
+        await subscriber.close()
+        await task
+
+    @pytest.mark.asyncio
+    async def test_injected_loss_is_reproducible(self, broker):
+        """Verifies that loss drops a share of deliveries and a seed makes it deterministic."""
+        publisher = MemoryPubSubServiceProvider(producer_channels=["c"], broker=broker, loss_rate=0.5, seed=7)
+        subscription = broker.subscribe(["c"])
+
+        for i in range(200):
+            await publisher.send_message(AdmineMessage("a", ["notification"], str(i)))
+
+        dropped = metrics.snapshot()["pubsub_memory_dropped_total"]
+        assert subscription.queue.qsize() + dropped == 200
+        assert 60 < dropped < 140
+
+
+class TestMemoryPubSubRequestReply:
+    """Tests for request/reply between two in-process services."""
+
+    @pytest.mark.asyncio
+    async def test_request_reply_round_trip(self, broker):
+        """Verifies that a fake server handler can answer a correlated request in-process."""
+        bot = MemoryPubSubServiceProvider(["server_channel"], ["command_channel"], broker=broker)
+        handler = MemoryPubSubServiceProvider(["command_channel"], ["server_channel"], broker=broker)
+
+        async def answer(command: AdmineMessage):
+            await handler.send_message(
+                AdmineMessage("server_handler", ["server_on"], "up", correlation_id=command.message_id)
+            )
+
+        tasks = [await _listen(bot, Collector(1)), await _listen(handler, answer)]
+        reply = await bot.request(AdmineMessage("Bot", ["server_on"], " "), ["server_on"], timeout=1)
+
+        assert reply.message == "up"
+        for provider in (bot, handler):
+            await provider.close()
+        await asyncio.gather(*tasks)
+
+
+class TestMemoryPubSubFactory:
+    """Tests for creating the provider through the factory."""
+
+    def test_factory_creates_memory_provider(self):
+        """Verifies that MEMORY is registered in PubSubServiceFactory and reads its settings from config."""
+        config = MagicMock()
+        config.get.side_effect = lambda key, default=None: {"memory.latencyms": 20, "memory.seed": 1}.get(key, default)
+
+        provider = PubSubServiceFactory.create(PubSubServiceProviderType.MEMORY, config)
+
+        assert isinstance(provider, MemoryPubSubServiceProvider)
+        assert provider.subscribed_channels == ["server_channel", "vpn_channel"]
+        assert provider.producer_channels == ["command_channel"]
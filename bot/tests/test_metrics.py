@@ -0,0 +1,73 @@
+import pytest
+
+from bot.metrics import Histogram, MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    """Creates an isolated metrics registry."""
+    return MetricsRegistry()
+
+
+class TestMetricsRegistry:
+    """Tests for the in-process metrics registry."""
+
+    def test_counter_is_shared_per_name_and_labels(self, registry):
+        """Verifies that the same name and labels always return the same counter."""
+        registry.counter("events_total", {"tag": "server_on"}).inc()
+        registry.counter("events_total", {"tag": "server_on"}).inc(2)
+        registry.counter("events_total", {"tag": "server_off"}).inc()
+
+        snapshot = registry.snapshot()
+
+        assert snapshot["events_total{tag=server_on}"] == 3
+        assert snapshot["events_total{tag=server_off}"] == 1
+
+    def test_gauge_tracks_last_value(self, registry):
+        """Verifies that gauges can be set, incremented and decremented."""
+        gauge = registry.gauge("queue_depth")
+        gauge.set(5)
+        gauge.inc()
+        gauge.dec(3)
+
+        assert registry.snapshot()["queue_depth"] == 3
+
+    def test_histogram_summary_in_snapshot(self, registry):
+        """Verifies that histograms are flattened into count, mean, p95 and max."""
+        histogram = registry.histogram("latency_seconds")
+        for value in (0.01, 0.02, 0.03, 2.0):
+            histogram.observe(value)
+
+        snapshot = registry.snapshot()
+
+        assert snapshot["latency_seconds_count"] == 4
+        assert snapshot["latency_seconds_mean"] == pytest.approx(0.515)
+        assert snapshot["latency_seconds_max"] == 2.0
+
+    def test_clear_removes_all_metrics(self, registry):
+        """Verifies that clear empties the registry."""
+        registry.counter("a").inc()
+        registry.clear()
+
+        assert registry.snapshot() == {}
+
+
+class TestHistogram:
+    """Tests for bucketed histograms."""
+
+    def test_quantile_uses_bucket_upper_bound(self):
+        """Verifies that quantiles resolve to the bucket that contains the rank."""
+        histogram = Histogram(buckets=(0.1, 1.0, 10.0))
+        for _ in range(9):
+            histogram.observe(0.05)
+        histogram.observe(5.0)
+
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(1.0) == 5.0
+
+    def test_empty_histogram(self):
+        """Verifies that an empty histogram reports zeros."""
+        histogram = Histogram()
+
+        assert histogram.quantile(0.95) == 0.0
+        assert histogram.mean == 0.0
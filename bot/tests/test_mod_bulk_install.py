@@ -0,0 +1,156 @@
+import asyncio
+import json
+
+import pytest
+
+from bot.metrics import metrics
+from bot.services.minecraft.mod_bulk_install import BulkModInstall, ModInstallWaiters, parse_mod_manifest
+
+URLS = [f"https://cdn.example.com/mod{i}.jar" for i in range(6)]
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+class FakeServerHandler:
+    """Accepts installs and reports each result a moment later through the waiters, like EventHandle would."""
+
+    def __init__(self, waiters: ModInstallWaiters, failing=(), silent=(), duplicates=()):
+        self.waiters = waiters
+        self.failing = set(failing)
+        self.silent = set(silent)
+        self.duplicates = set(duplicates)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.installed = []
+
+    async def install(self, url: str) -> dict:
+        filename = url.rsplit("/", 1)[1]
+        if url in self.duplicates:
+            return {"status": "duplicate", "message": f"Already installed as {filename}, nothing to do."}
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        asyncio.get_running_loop().call_later(0.01, self.finish, filename, url)
+        return {"status": "accepted"}
+
+    def finish(self, filename: str, url: str):
+        self.in_flight -= 1
+        if url in self.silent:
+            self.installed.append(filename)
+        elif url in self.failing:
+            self.waiters.resolve(filename, False, f"Failed to download mod {filename}: HTTP 404 Not Found")
+        else:
+            self.installed.append(filename)
+            self.waiters.resolve(filename, True, f"{filename}: Mod installed successfully")
+
+    async def list_mods(self) -> dict:
+        return {"mods": self.installed, "total": len(self.installed)}
+
+
+class TestParseModManifest:
+    """Tests for reading mod URLs out of a manifest."""
+
+    def test_plain_text(self):
+        """Verifies that URLs are read per line and separated by spaces or commas, skipping comments."""
+        text = f"# modpack\n{URLS[0]}, {URLS[1]}\n\n{URLS[2]}  # optional\nnot-a-url.jar\n{URLS[0]}"
+
+        urls, rejected = parse_mod_manifest(text)
+
+        assert urls == URLS[:3]
+        assert rejected == ["not-a-url.jar"]
+
+    def test_json_formats(self):
+        """Verifies that JSON lists, {"mods": [...]} and Modrinth indexes are accepted."""
+        modrinth = {"files": [{"path": "mods/mod0.jar", "downloads": [URLS[0]]}, {"downloads": [URLS[1]]}]}
+
+        assert parse_mod_manifest(json.dumps(URLS[:2]))[0] == URLS[:2]
+        assert parse_mod_manifest(json.dumps({"mods": URLS[:2]}))[0] == URLS[:2]
+        assert parse_mod_manifest(json.dumps(modrinth))[0] == URLS[:2]
+
+    def test_rejects_repeated_file_names(self):
+        """Verifies that a second URL for the same jar name is rejected, as results are matched by name."""
+        urls, rejected = parse_mod_manifest(f"{URLS[0]}\nhttps://mirror.example.com/mod0.jar")
+
+        assert urls == [URLS[0]]
+        assert rejected == ["https://mirror.example.com/mod0.jar"]
+
+
+class TestModInstallWaiters:
+    """Tests for matching mod_install_result events to waiting installs."""
+
+    @pytest.mark.asyncio
+    async def test_resolve_completes_waiting_future(self):
+        """Verifies that a result completes the future for its jar and reports whether anyone waited."""
+        waiters = ModInstallWaiters()
+        future = waiters.register("mod0.jar")
+
+        assert waiters.resolve("other.jar", True, "other.jar: ok") is False
+        assert waiters.resolve("mod0.jar", True, "mod0.jar: ok") is True
+        assert future.result() == (True, "mod0.jar: ok")
+        assert len(waiters) == 0
+
+
+class TestBulkModInstall:
+    """Tests for bulk installs with bounded parallelism."""
+
+    @pytest.mark.asyncio
+    async def test_installs_with_bounded_concurrency(self):
+        """Verifies that at most `concurrency` installs are in flight and results are correlated per jar."""
+        waiters = ModInstallWaiters()
+        server = FakeServerHandler(waiters, failing=[URLS[3]], duplicates=[URLS[5]])
+        bulk = BulkModInstall(URLS, server.install, waiters, server.list_mods, concurrency=2)
+
+        await bulk.wait()
+
+        assert server.max_in_flight == 2
+        assert [item.state for item in bulk.items] == ["installed"] * 3 + ["failed", "installed", "skipped"]
+        assert "HTTP 404" in bulk.items[3].message
+        assert bulk.done
+        assert metrics.snapshot()["mod_bulk_install_items_total{result=installed}"] == 4
+        assert len(waiters) == 0
+
+    @pytest.mark.asyncio
+    async def test_missing_results_are_checked_against_list_mods(self):
+        """Verifies that jars without a result event are resolved from list_mods after the timeout."""
+        waiters = ModInstallWaiters()
+        server = FakeServerHandler(waiters, silent=[URLS[0]])
+        bulk = BulkModInstall(URLS[:2], server.install, waiters, server.list_mods, result_timeout=0.05)
+
+        await bulk.wait()
+
+        assert [item.state for item in bulk.items] == ["installed", "installed"]
+        assert "list_mods" in bulk.items[0].message
+
+    @pytest.mark.asyncio
+    async def test_errors_fail_only_their_item(self):
+        """Verifies that a rejected request fails its item and the rest continue."""
+        waiters = ModInstallWaiters()
+        server = FakeServerHandler(waiters)
+
+        async def install(url):
+            if url == URLS[0]:
+                return {"error": "Error installing mod: 400 Bad Request"}
+            return await server.install(url)
+
+        bulk = BulkModInstall(URLS[:2], install, waiters, server.list_mods)
+
+        await bulk.wait()
+
+        assert [item.state for item in bulk.items] == ["failed", "installed"]
+
+    @pytest.mark.asyncio
+    async def test_updates_yield_progress_until_done(self):
+        """Verifies that updates yields while items change and ends with the final state."""
+        waiters = ModInstallWaiters()
+        server = FakeServerHandler(waiters)
+        bulk = BulkModInstall(URLS[:3], server.install, waiters, server.list_mods, concurrency=1)
+
+        snapshots = [progress.counts()["installed"] async for progress in bulk.updates(min_interval=0)]
+
+        assert len(snapshots) >= 2
+        assert snapshots[-1] == 3
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from bot.mod_index import ModIndex, parse_mod_install_result
+
+SHA_A = "a" * 64
+SHA_B = "b" * 64
+URL = "https://cdn.example.com/create-1.0.jar"
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    """Path of a mod index file that doesn't exist yet."""
+    return str(tmp_path / "mod_index.json")
+
+
+class TestParseModInstallResult:
+    """Tests for reading the jar name out of mod_install_result messages."""
+
+    @pytest.mark.parametrize(
+        "message, expected",
+        [
+            ("create.jar: Mod installed successfully", ("create.jar", True)),
+            ("Failed to install mod create.jar: exit status 1", ("create.jar", False)),
+            ("Failed to download mod create.jar: HTTP 404 Not Found", ("create.jar", False)),
+            ("Mod installed successfully", None),
+        ],
+    )
+    def test_parses_messages(self, message, expected):
+        """Verifies that successes, failures and messages from an older server_handler are recognized."""
+        assert parse_mod_install_result(message) == expected
+
+
+class TestModIndex:
+    """Tests for the content-addressed mod index."""
+
+    def test_tracks_install_lifecycle(self):
+        """Verifies that an entry goes from pending to installed and is found by hash, source and size."""
+        index = ModIndex()
+
+        index.record(SHA_A, "create.jar", 1234, URL)
+        assert index.get(SHA_A)["status"] == "pending"
+        assert not index.has_size(1234)
+
+        index.record_result("create.jar", True, "create.jar: Mod installed successfully")
+
+        assert index.by_source(URL)["filename"] == "create.jar"
+        assert index.by_filename("create.jar")["status"] == "installed"
+        assert index.has_size(1234)
+
+    def test_new_content_under_same_name_replaces_old(self):
+        """Verifies that installing a different jar under an indexed name retires the old entry."""
+        index = ModIndex()
+        index.record(SHA_A, "create.jar", 1234, URL)
+        index.record_result("create.jar", True)
+
+        index.record(SHA_B, "create.jar", 1300, "upload:create.jar")
+
+        assert index.get(SHA_A)["status"] == "replaced"
+        assert index.by_filename("create.jar")["sha256"] == SHA_B
+
+    def test_reconcile_with_list_mods(self):
+        """Verifies that missing jars become removed and listed pending jars become installed."""
+        index = ModIndex()
+        index.record(SHA_A, "create.jar", 1, URL)
+        index.record(SHA_B, "jei.jar", 2, "upload:jei.jar")
+        index.record_result("jei.jar", True)
+
+        index.reconcile(["create.jar", "unknown.jar"])
+
+        assert index.get(SHA_A)["status"] == "installed"
+        assert index.get(SHA_B)["status"] == "removed"
+        assert index.by_filename("jei.jar") is None
+        assert set(index.describe(["create.jar", "unknown.jar"])) == {"create.jar"}
+
+    def test_reconcile_keeps_pending_jars_until_they_expire(self):
+        """Verifies that a jar still being installed survives a list_mods without it, then expires after pending_ttl."""
+        now = [1000.0]
+        index = ModIndex(clock=lambda: now[0], pending_ttl=600)
+        index.record(SHA_A, "create.jar", 1, URL)
+        index.record(SHA_B, "jei.jar", 2, "upload:jei.jar")
+
+        index.reconcile([])
+
+        assert index.record_result("create.jar", True)["status"] == "installed"
+        assert index.by_filename("jei.jar")["status"] == "pending"
+
+        now[0] += 600
+        index.reconcile([])
+
+        assert index.get(SHA_B)["status"] == "removed"
+        assert index.record_result("jei.jar", True) is None
+
+    def test_persists_across_restarts(self, index_path):
+        """Verifies that entries are written to disk and read back."""
+        index = ModIndex(index_path)
+        index.record(SHA_A, "create.jar", 1234, URL)
+        index.record_result("create.jar", True)
+
+        reloaded = ModIndex(index_path)
+
+        assert reloaded.by_source(URL)["status"] == "installed"
+        assert reloaded.by_filename("create.jar")["sha256"] == SHA_A
+        with open(index_path) as f:
+            assert json.load(f)["mods"][0]["sha256"] == SHA_A
+
+    @pytest.mark.asyncio
+    async def test_changes_in_a_loop_are_batched(self, index_path):
+        """Verifies that inside the event loop many changes become one write after the delay, and flush forces it."""
+        index = ModIndex(index_path, save_delay=60)
+        for i in range(100):
+            index.record(f"{i:064x}", f"mod{i}.jar", i, f"https://cdn.example.com/mod{i}.jar")
+
+        assert not os.path.exists(index_path)
+        await index.flush()
+
+        assert len(ModIndex(index_path)) == 100
+
+    @pytest.mark.asyncio
+    async def test_batched_write_happens_after_delay(self, index_path):
+        """Verifies that a change is saved by itself once the delay has passed, including one made while writing."""
+        index = ModIndex(index_path, save_delay=0.01)
+        index.record(SHA_A, "create.jar", 1, URL)
+        await asyncio.sleep(0.1)
+        index.record_result("create.jar", True)
+        await asyncio.sleep(0.1)
+
+        assert ModIndex(index_path).get(SHA_A)["status"] == "installed"
+        assert not os.path.exists(f"{index_path}.tmp")
+
+    def test_unreadable_file_starts_empty(self, index_path):
+        """Verifies that a corrupt index file is ignored instead of stopping the bot."""
+        with open(index_path, "w") as f:
+            f.write("{not json")
+
+        assert len(ModIndex(index_path)) == 0
+
+    @pytest.mark.parametrize(
+        "mods",
+        [
+            [{"sha256": SHA_A, "filename": "create.jar", "size": 1, "sources": [], "status": "installed"}, {}],
+            [{"sha256": SHA_A, "filename": "create.jar", "size": 1, "sources": None, "status": "installed"}],
+            ["create.jar"],
+        ],
+    )
+    def test_malformed_entries_start_empty(self, index_path, mods):
+        """Verifies that missing fields or non-dict entries are ignored as a whole instead of stopping the bot."""
+        with open(index_path, "w") as f:
+            json.dump({"mods": mods}, f)
+
+        index = ModIndex(index_path)
+
+        assert len(index) == 0
+        assert index.by_filename("create.jar") is None
+
+    def test_metadata_cached_by_hash(self, index_path):
+        """Verifies that jar metadata is stored with its entry, survives a restart and is returned by describe."""
+        index = ModIndex(index_path)
+        index.record(SHA_A, "create.jar", 1234, URL)
+        index.set_metadata(SHA_A, {"mod_id": "create", "name": "Create", "version": "0.5.1", "loader": "Forge"})
+
+        described = ModIndex(index_path).describe(["create.jar"])
+
+        assert described["create.jar"]["metadata"]["name"] == "Create"
+
+    def test_describe_hundreds_of_mods_is_fast(self):
+        """Verifies that looking up metadata for a 500-mod pack takes a few milliseconds."""
+        index = ModIndex()
+        filenames = [f"mod{i}.jar" for i in range(500)]
+        for i, filename in enumerate(filenames):
+            sha256 = f"{i:064x}"
+            index.record(sha256, filename, i, f"https://cdn.example.com/{filename}")
+            index.set_metadata(sha256, {"mod_id": f"mod{i}", "name": f"Mod {i}", "version": "1.0", "loader": "Fabric"})
+
+        started = time.perf_counter()
+        described = index.describe(filenames + ["unknown.jar"])
+        elapsed = time.perf_counter() - started
+
+        assert len(described) == 500
+        assert elapsed < 0.005
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bot.metrics import metrics
+from bot.services.minecraft.mod_list_cache import ModListCache
+
+MODS = [
+    "create-1.20.1-0.5.1.jar",
+    "jei-1.20.1-forge-15.2.0.jar",
+    "just-enough-items-15.2.jar",
+    "sodium-fabric-0.5.8+mc1.20.1.jar",
+    "Xaeros_Minimap_23.9.jar",
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestModListCache:
+    """Tests for loading, expiring and patching the cached mod list."""
+
+    @pytest.mark.asyncio
+    async def test_loads_once_until_ttl(self):
+        """Verifies that the list is loaded on first use, served from memory, and reloaded after the TTL."""
+        clock = FakeClock()
+        cache = ModListCache(ttl=60, clock=clock)
+        loader = AsyncMock(return_value=["b.jar", "a.jar"])
+
+        assert await cache.get(loader) == ["a.jar", "b.jar"]
+        assert await cache.get(loader) == ["a.jar", "b.jar"]
+        loader.assert_awaited_once()
+
+        clock.now += 61
+        await cache.get(loader)
+        assert loader.await_count == 2
+        assert metrics.counter("cache_requests_total", {"cache": "mod_list", "result": "hit"}).value == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_share_one_load(self):
+        """Verifies that callers arriving during a load wait for it instead of starting their own."""
+        cache = ModListCache()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["a.jar"]
+
+        results = await asyncio.gather(*(cache.get(loader) for _ in range(5)))
+
+        assert calls == 1
+        assert results == [["a.jar"]] * 5
+
+    @pytest.mark.asyncio
+    async def test_patches_apply_without_reloading(self):
+        """Verifies that installs and removals change the cached list in place."""
+        cache = ModListCache()
+        loader = AsyncMock(return_value=["a.jar", "b.jar"])
+        await cache.get(loader)
+
+        cache.add("c.jar")
+        cache.discard("a.jar")
+
+        assert await cache.get(loader) == ["b.jar", "c.jar"]
+        loader.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_patch_during_load_discards_its_result(self):
+        """Verifies that a list fetched before a change isn't stored, so the change isn't lost."""
+        cache = ModListCache()
+        release = asyncio.Event()
+
+        async def loader():
+            await release.wait()
+            return ["a.jar"]
+
+        pending = asyncio.ensure_future(cache.get(loader))
+        await asyncio.sleep(0)
+        cache.add("b.jar")
+        release.set()
+
+        assert await pending == ["a.jar"]
+        assert not cache.fresh
+
+    @pytest.mark.asyncio
+    async def test_invalidate_and_failed_load(self):
+        """Verifies that invalidation forces a reload and a failing load raises without caching anything."""
+        cache = ModListCache()
+        await cache.get(AsyncMock(return_value=["a.jar"]))
+        cache.invalidate()
+
+        with pytest.raises(ConnectionError):
+            await cache.get(AsyncMock(side_effect=ConnectionError("down")))
+        assert cache.suggest("") == []
+
+
+class TestSuggest:
+    """Tests for ranking cached names against what was typed."""
+
+    @pytest.fixture
+    def cache(self):
+        """A cache holding MODS."""
+        cache = ModListCache()
+        cache.set(MODS)
+        return cache
+
+    def test_ranks_name_prefix_then_word_prefix_then_fuzzy(self, cache):
+        """Verifies the order: name prefix, then a later word's prefix, then substring, then in-order characters."""
+        assert cache.suggest("jei") == [
+            "jei-1.20.1-forge-15.2.0.jar",
+            "just-enough-items-15.2.jar",
+        ]
+        assert cache.suggest("fabric")[0] == "sodium-fabric-0.5.8+mc1.20.1.jar"
+        assert cache.suggest("minimap") == ["Xaeros_Minimap_23.9.jar"]
+        assert cache.suggest("odium") == ["sodium-fabric-0.5.8+mc1.20.1.jar"]
+
+    def test_empty_query_and_limit(self, cache):
+        """Verifies that an empty query lists names alphabetically and that results respect the limit."""
+        assert cache.suggest("") == sorted(MODS)
+        assert cache.suggest("1", limit=2) == ["create-1.20.1-0.5.1.jar", "jei-1.20.1-forge-15.2.0.jar"]
+
+    def test_nothing_before_first_load(self):
+        """Verifies that suggestions never trigger a load."""
+        assert ModListCache().suggest("create") == []
+
+    def test_suggest_is_fast_for_large_packs(self):
+        """Verifies that ranking 1000 names takes well under Discord's 3 second autocomplete deadline."""
+        cache = ModListCache()
+        cache.set([f"mod-{i:04d}-fabric-1.20.1.jar" for i in range(1000)])
+
+        started = time.perf_counter()
+        for query in ("mod-05", "fabric", "m0f", "zzz"):
+            cache.suggest(query)
+        elapsed = time.perf_counter() - started
+
+        assert len(cache.suggest("mod-05")) == 25
+        assert elapsed < 0.05
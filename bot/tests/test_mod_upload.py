@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import os
+import time
+import tracemalloc
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.exceptions import UploadTooLargeError
+from bot.metrics import metrics
+from bot.services.minecraft.server_handler_aiohttp_service import ServerHandlerAiohttpMinecraftServerServiceProvider
+from bot.services.minecraft.server_handler_api_service import ServerHandlerApiMinecraftServerServiceProvider
+from bot.services.mod_upload import (
+    BYTE_RATE_BUCKETS,
+    JarSpool,
+    UploadStream,
+    hash_chunks,
+    iter_url_chunks,
+    url_content_length,
+)
+from bot.services.resilience import CircuitBreaker, CircuitState, EndpointTimeouts
+
+CHUNK = bytes(range(256)) * 1024  # 256 KB
+
+
+async def chunks(count: int):
+    for _ in range(count):
+        yield CHUNK
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Runs a server_handler stand-in that reads uploads part by part and serves a file to download."""
+    received = []
+
+    async def mods(request):
+        reader = await request.multipart()
+        part = await reader.next()
+        digest, size = hashlib.sha256(), 0
+        while chunk := await part.read_chunk():
+            digest.update(chunk)
+            size += len(chunk)
+        received.append((part.filename, size, digest.hexdigest()))
+        return web.json_response({"status": "accepted", "message": f"Mod installation started for: {part.filename}"})
+
+    async def download(request):
+        return web.Response(body=CHUNK * 4)
+
+    app = web.Application(client_max_size=1024**3)
+    app.router.add_post("/mods", mods)
+    app.router.add_get("/attachment.jar", download)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    test_server.received = received
+    yield test_server
+    await test_server.close()
+
+
+class TestUploadStream:
+    """Tests for the metered upload stream."""
+
+    @pytest.mark.asyncio
+    async def test_counts_bytes_and_throughput(self):
+        """Verifies that the stream passes chunks through and reports size and throughput."""
+        upload = UploadStream(chunks(4))
+
+        received = [chunk async for chunk in upload]
+
+        assert len(received) == 4
+        assert upload.bytes == 4 * len(CHUNK)
+        assert upload.throughput > 0
+        assert upload.sha256 == hashlib.sha256(CHUNK * 4).hexdigest()
+        assert metrics.snapshot()["mod_upload_bytes_total"] == 4 * len(CHUNK)
+
+    @pytest.mark.asyncio
+    async def test_throughput_lands_in_byte_rate_buckets(self):
+        """Verifies that upload rates are bucketed in bytes per second, so p95 isn't just the maximum."""
+        ticks = iter([0.0, 1.0])
+        upload = UploadStream(chunks(4), clock=lambda: next(ticks))
+
+        async for _ in upload:
+            pass
+
+        histogram = metrics.histogram("mod_upload_bytes_per_second")
+        assert upload.throughput == 1024**2
+        assert histogram.counts[-1] == 0
+        assert histogram.counts[histogram.buckets.index(1024**2)] == 1
+        assert BYTE_RATE_BUCKETS[0] == 64 * 1024 and BYTE_RATE_BUCKETS[-1] == 1024**3
+
+    @pytest.mark.asyncio
+    async def test_enforces_limit_while_streaming(self):
+        """Verifies that exceeding max_bytes aborts as soon as the limit is crossed."""
+        upload = UploadStream(chunks(100), max_bytes=3 * len(CHUNK))
+        seen = 0
+
+        with pytest.raises(UploadTooLargeError):
+            async for _ in upload:
+                seen += 1
+
+        assert seen == 3
+
+    @pytest.mark.asyncio
+    async def test_hash_chunks(self):
+        """Verifies that hashing a stream returns its SHA-256 and size."""
+        assert await hash_chunks(chunks(3)) == (hashlib.sha256(CHUNK * 3).hexdigest(), 3 * len(CHUNK))
+
+    @pytest.mark.asyncio
+    async def test_spool_copies_stream_and_cleans_up(self):
+        """Verifies that the spool keeps a copy of the stream on disk and deletes it on exit."""
+        with JarSpool() as spool:
+            passed = [chunk async for chunk in spool.tee(chunks(2))]
+            with open(spool.path, "rb") as f:
+                assert f.read() == CHUNK * 2
+            assert spool.complete
+
+        assert passed == [CHUNK, CHUNK]
+        assert not os.path.exists(spool.path)
+
+    @pytest.mark.asyncio
+    async def test_downloads_url_in_chunks(self, server):
+        """Verifies that a URL is read chunk by chunk."""
+        received = [chunk async for chunk in iter_url_chunks(str(server.make_url("/attachment.jar")), 64 * 1024)]
+
+        assert b"".join(received) == CHUNK * 4
+        assert max(len(chunk) for chunk in received) <= 64 * 1024
+
+    @pytest.mark.asyncio
+    async def test_reads_url_size_without_downloading(self, server):
+        """Verifies that the size of a URL comes from a HEAD request."""
+        assert await url_content_length(str(server.make_url("/attachment.jar"))) == len(CHUNK) * 4
+
+
+class TestStreamingProviders:
+    """Tests for streaming mod uploads through both server_handler providers."""
+
+    @pytest.mark.asyncio
+    async def test_aiohttp_provider_streams_with_flat_memory(self, server):
+        """Verifies that a 32 MB upload arrives intact while the process never holds more than a few chunks."""
+        provider = ServerHandlerAiohttpMinecraftServerServiceProvider(str(server.make_url("/")))
+        tracemalloc.start()
+        try:
+            response = await provider.install_mod_stream("big.jar", UploadStream(chunks(128)))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            await provider.close()
+
+        expected = hashlib.sha256(CHUNK * 128).hexdigest()
+        assert response["status"] == "accepted"
+        assert server.received == [("big.jar", 128 * len(CHUNK), expected)]
+        assert peak < 8 * 1024**2
+
+    @pytest.mark.asyncio
+    async def test_rest_provider_streams_chunked_body(self, server):
+        """Verifies that the requests-based provider sends the stream as a chunked multipart body."""
+        provider = ServerHandlerApiMinecraftServerServiceProvider(str(server.make_url("/")))
+
+        response = await provider.install_mod_stream('we"ird.jar', UploadStream(chunks(8)))
+
+        assert response["status"] == "accepted"
+        assert server.received == [('we"ird.jar', 8 * len(CHUNK), hashlib.sha256(CHUNK * 8).hexdigest())]
+
+    @pytest.mark.asyncio
+    async def test_requests_provider_gives_up_on_a_stalled_stream(self, server):
+        """Verifies that the upload thread stops waiting once no chunk arrives within the install_mod read timeout."""
+        provider = ServerHandlerApiMinecraftServerServiceProvider(
+            str(server.make_url("/")), timeouts=EndpointTimeouts(endpoints={"install_mod": 0.2})
+        )
+
+        async def stalled():
+            yield CHUNK
+            await asyncio.sleep(30)
+            yield CHUNK
+
+        started = time.monotonic()
+        with pytest.raises(Exception, match="No data to upload"):
+            await provider.install_mod_stream("stalled.jar", stalled())
+        assert time.monotonic() - started < 5
+        assert server.received == []
+
+    @pytest.mark.asyncio
+    async def test_requests_provider_stops_reading_when_cancelled(self, server):
+        """Verifies that cancelling the upload stops the worker thread from pulling more chunks."""
+        provider = ServerHandlerApiMinecraftServerServiceProvider(str(server.make_url("/")))
+        pulled = 0
+
+        async def endless():
+            nonlocal pulled
+            while True:
+                pulled += 1
+                await asyncio.sleep(0.01)
+                yield CHUNK
+
+        upload = asyncio.create_task(provider.install_mod_stream("endless.jar", endless()))
+        while pulled < 3:
+            await asyncio.sleep(0.01)
+        upload.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await upload
+        await asyncio.sleep(0.1)
+        stopped_at = pulled
+        await asyncio.sleep(0.2)
+
+        assert pulled == stopped_at
+
+    @pytest.mark.asyncio
+    async def test_too_large_upload_is_aborted(self, server):
+        """Verifies that the limit aborts the request and does not count as a backend failure."""
+        breaker = CircuitBreaker("minecraft", failure_threshold=1)
+        provider = ServerHandlerAiohttpMinecraftServerServiceProvider(
+            str(server.make_url("/")), circuit_breaker=breaker
+        )
+        try:
+            with pytest.raises(UploadTooLargeError):
+                await provider.install_mod_stream("big.jar", UploadStream(chunks(10), max_bytes=len(CHUNK)))
+        finally:
+            await provider.close()
+
+        assert server.received == []
+        assert breaker.state == CircuitState.CLOSED
@@ -0,0 +1,260 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from bot.exceptions import PubSubNoSubscriberError
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage
+from bot.models.admine_message_codec import CodecType
+from bot.services.pubsub.redis_pubsub_service import RedisPubSubServiceProvider
+
+
+def _redis_message(message: AdmineMessage) -> dict:
+    return {"type": "message", "channel": b"server_channel", "data": message.from_object_to_json().encode("utf-8")}
+
+
+@pytest.fixture
+def mock_redis():
+    """Patches the asyncio Redis client used by the provider."""
+    pubsub = MagicMock()
+    pubsub.subscribe = AsyncMock()
+    pubsub.get_message = AsyncMock()
+    pubsub.aclose = AsyncMock()
+
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+
+    client = MagicMock()
+    client.pubsub.return_value = pubsub
+    client.pipeline.return_value = pipe
+    client.aclose = AsyncMock()
+
+    with patch("bot.services.pubsub.redis_pubsub_service.create_redis_client", return_value=client):
+        yield {"client": client, "pubsub": pubsub, "pipe": pipe}
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest.fixture
+def provider(mock_redis):
+    """Creates a RedisPubSubServiceProvider on top of the mocked clients."""
+    return RedisPubSubServiceProvider(
+        "localhost", 6379, subscribed_channels=["server_channel", "vpn_channel"], producer_channels=["command_channel"]
+    )
+
+
+class TestRedisPubSubListen:
+    """Tests for the push-based listen loop."""
+
+    @pytest.mark.asyncio
+    async def test_subscribes_to_all_channels(self, provider, mock_redis):
+        """Verifies that listen_message subscribes to every configured channel."""
+        mock_redis["pubsub"].get_message.side_effect = asyncio.CancelledError()
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(AsyncMock())
+
+        mock_redis["pubsub"].subscribe.assert_awaited_once_with("server_channel", "vpn_channel")
+
+    @pytest.mark.asyncio
+    async def test_blocks_until_message_arrives(self, provider, mock_redis):
+        """Verifies that the read blocks for a whole health check interval instead of polling."""
+        mock_redis["pubsub"].get_message.side_effect = asyncio.CancelledError()
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(AsyncMock())
+
+        assert mock_redis["pubsub"].get_message.call_args.kwargs["timeout"] == 30
+
+    @pytest.mark.asyncio
+    async def test_drains_burst_in_one_wakeup(self, provider, mock_redis):
+        """Verifies that buffered messages are delivered without waiting for another wakeup."""
+        first = AdmineMessage("server_handler", ["server_on"], "first")
+        second = AdmineMessage("server_handler", ["notification"], "second")
+        mock_redis["pubsub"].get_message.side_effect = [
+            _redis_message(first),
+            _redis_message(second),
+            None,
+            asyncio.CancelledError(),
+        ]
+        callback = AsyncMock()
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+
+        assert [call.args[0].message for call in callback.await_args_list] == ["first", "second"]
+        timeouts = [call.kwargs["timeout"] for call in mock_redis["pubsub"].get_message.call_args_list]
+        assert timeouts == [30, 0, 0, 30]
+
+
+class TestRedisPubSubReconnect:
+    """Tests for recovering from Redis connection loss."""
+
+    @pytest.mark.asyncio
+    async def test_resubscribes_after_connection_loss(self, provider, mock_redis):
+        """Verifies that a dropped connection is recovered and the channels are subscribed again."""
+        broken = mock_redis["pubsub"]
+        broken.get_message.side_effect = RedisConnectionError("Connection reset by peer")
+        fresh = MagicMock()
+        fresh.subscribe = AsyncMock()
+        fresh.get_message = AsyncMock(side_effect=asyncio.CancelledError())
+        mock_redis["client"].pubsub.return_value = fresh
+        mock_redis["client"].ping = AsyncMock(side_effect=[RedisConnectionError("refused"), True])
+
+        with patch("bot.services.pubsub.redis_reconnect.asyncio.sleep", new=AsyncMock()) as sleep:
+            with pytest.raises(asyncio.CancelledError):
+                await provider.listen_message(AsyncMock())
+
+        broken.aclose.assert_awaited_once()
+        fresh.subscribe.assert_awaited_once_with("server_channel", "vpn_channel")
+        assert mock_redis["client"].ping.await_count == 2
+        assert sleep.await_count == 2
+        assert provider.reconnect_count == 1
+        assert provider.last_recovery_seconds is not None
+
+
+class TestRedisPubSubSend:
+    """Tests for the pipelined publish path."""
+
+    @pytest.mark.asyncio
+    async def test_publishes_to_all_channels_in_one_pipeline(self, mock_redis):
+        """Verifies that every producer channel is published through a single non-transactional pipeline."""
+        provider = RedisPubSubServiceProvider(
+            "localhost", 6379, producer_channels=["command_channel", "server_channel"]
+        )
+        mock_redis["pipe"].execute.return_value = [2, 0]
+        message = AdmineMessage("Bot", ["server_on"], " ")
+
+        receivers = await provider.send_message(message)
+
+        mock_redis["client"].pipeline.assert_called_once_with(transaction=False)
+        published = [call.args for call in mock_redis["pipe"].publish.call_args_list]
+        assert [channel for channel, _ in published] == ["command_channel", "server_channel"]
+        assert published[0][1] == published[1][1]
+        sent = AdmineMessage.from_bytes(published[0][1])
+        assert (sent.origin, sent.tags, sent.message) == ("Bot", ("server_on",), " ")
+        mock_redis["pipe"].execute.assert_awaited_once()
+        assert receivers == {"command_channel": 2, "server_channel": 0}
+
+    @pytest.mark.asyncio
+    async def test_codec_is_chosen_per_channel(self, mock_redis):
+        """Verifies that msgpack is used only on the channels configured for it, in both directions."""
+        pytest.importorskip("msgpack")
+        provider = RedisPubSubServiceProvider(
+            "localhost",
+            6379,
+            subscribed_channels=["bot_events"],
+            producer_channels=["command_channel", "bot_events"],
+            codecs={"bot_events": CodecType.MSGPACK},
+        )
+        message = AdmineMessage("Bot", ["notification"], "packed")
+
+        await provider.send_message(message)
+        published = dict(call.args for call in mock_redis["pipe"].publish.call_args_list)
+        assert AdmineMessage.from_bytes(published["command_channel"]).message == "packed"
+
+        mock_redis["pubsub"].get_message.side_effect = [
+            {"type": "message", "channel": b"bot_events", "data": published["bot_events"]},
+            None,
+            asyncio.CancelledError(),
+        ]
+        callback = AsyncMock()
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+        assert callback.await_args.args[0].message == "packed"
+
+
+class TestRedisPubSubRequest:
+    """Tests for request/reply over pub/sub."""
+
+    @pytest.mark.asyncio
+    async def test_request_resolves_on_final_reply(self, provider, mock_redis):
+        """Verifies that progress is consumed and a final server_on reply completes the request and is still broadcast."""
+        request = AdmineMessage("Bot", ["server_on"], " ", message_id="req-1")
+        progress = AdmineMessage("server_handler", ["notification"], "Starting server", correlation_id="req-1")
+        final = AdmineMessage("server_handler", ["server_on"], "up", correlation_id="req-1")
+        mock_redis["pubsub"].get_message.side_effect = [
+            _redis_message(progress),
+            _redis_message(final),
+            None,
+            asyncio.CancelledError(),
+        ]
+        callback = AsyncMock()
+
+        pending = asyncio.create_task(provider.request(request, ["server_on", "command_failed"], timeout=1))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+        reply = await pending
+
+        assert reply.message == "up"
+        callback.assert_awaited_once()
+        assert callback.await_args.args[0].message == "up"
+        assert metrics.snapshot()["pubsub_requests_total{result=ok,tag=server_on}"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_reply_is_consumed(self, provider, mock_redis):
+        """Verifies that a command_failed reply only answers the requester."""
+        request = AdmineMessage("Bot", ["server_on"], " ", message_id="req-3")
+        failed = AdmineMessage("server_handler", ["notification", "command_failed"], "boom", correlation_id="req-3")
+        mock_redis["pubsub"].get_message.side_effect = [_redis_message(failed), None, asyncio.CancelledError()]
+        callback = AsyncMock()
+
+        pending = asyncio.create_task(provider.request(request, ["server_on", "command_failed"], timeout=1))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+
+        assert (await pending).message == "boom"
+        callback.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_uncorrelated_messages_reach_callback(self, provider, mock_redis):
+        """Verifies that replies to unknown requests are handled as normal events."""
+        late = AdmineMessage("server_handler", ["server_on"], "late", correlation_id="expired")
+        mock_redis["pubsub"].get_message.side_effect = [_redis_message(late), None, asyncio.CancelledError()]
+        callback = AsyncMock()
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+
+        callback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_request_times_out(self, provider, mock_redis):
+        """Verifies that a request without a final reply raises TimeoutError and is forgotten."""
+        with pytest.raises(TimeoutError):
+            await provider.request(AdmineMessage("Bot", ["server_off"], " ", message_id="req-2"), ["server_off"], 0.01)
+
+        assert not provider.resolve_reply(AdmineMessage("server_handler", ["server_off"], "", correlation_id="req-2"))
+        assert metrics.snapshot()["pubsub_requests_total{result=timeout,tag=server_off}"] == 1
+
+    @pytest.mark.asyncio
+    async def test_request_without_subscribers(self, provider, mock_redis):
+        """Verifies that a request nobody received fails fast."""
+        mock_redis["pipe"].execute.return_value = [0]
+
+        with pytest.raises(PubSubNoSubscriberError):
+            await provider.request(AdmineMessage("Bot", ["server_on"], " "), ["server_on"], timeout=5)
+
+
+class TestRedisPubSubClose:
+    """Tests for provider shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_close_releases_connections(self, provider, mock_redis):
+        """Verifies that close shuts down the subscription and the client."""
+        await provider.close()
+
+        mock_redis["pubsub"].aclose.assert_awaited_once()
+        mock_redis["client"].aclose.assert_awaited_once()
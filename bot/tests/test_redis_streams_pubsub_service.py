@@ -0,0 +1,215 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ResponseError
+
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage
+from bot.models.admine_message_codec import CodecType
+from bot.services.pubsub.redis_streams_pubsub_service import RedisStreamsPubSubServiceProvider
+
+
+def _entry(entry_id: bytes, message: AdmineMessage) -> tuple:
+    return entry_id, {b"data": message.from_object_to_json().encode("utf-8")}
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest.fixture
+def mock_client():
+    """Patches the asyncio Redis client used by the streams provider."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[b"1-0"])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+
+    client = MagicMock()
+    client.pipeline.return_value = pipe
+    client.xgroup_create = AsyncMock()
+    client.xreadgroup = AsyncMock(return_value=[])
+    client.xautoclaim = AsyncMock(return_value=[b"0-0", [], []])
+    client.xpending_range = AsyncMock(return_value=[])
+    client.xack = AsyncMock()
+    client.aclose = AsyncMock()
+
+    with patch("bot.services.pubsub.redis_streams_pubsub_service.create_redis_client", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def provider(mock_client):
+    """Creates a streams provider subscribed to a single stream."""
+    return RedisStreamsPubSubServiceProvider(
+        "localhost",
+        6379,
+        subscribed_channels=["server_channel"],
+        producer_channels=["command_channel"],
+        consumer="bot-test",
+        batch_size=20,
+        max_len=500,
+    )
+
+
+class TestRedisStreamsSend:
+    """Tests for appending messages to streams."""
+
+    @pytest.mark.asyncio
+    async def test_send_uses_xadd_with_maxlen(self, provider, mock_client):
+        """Verifies that messages are appended with an approximate MAXLEN trim."""
+        message = AdmineMessage("Bot", ["server_on"], " ")
+
+        result = await provider.send_message(message)
+
+        pipe = mock_client.pipeline.return_value
+        pipe.xadd.assert_called_once()
+        stream, fields = pipe.xadd.call_args.args
+        assert stream == "command_channel"
+        assert fields[b"codec"] == "json"
+        assert AdmineMessage.from_bytes(fields[b"data"]).message == " "
+        assert pipe.xadd.call_args.kwargs == {"maxlen": 500, "approximate": True}
+        assert result == {"command_channel": 1}
+
+
+class TestRedisStreamsListen:
+    """Tests for the consumer group read loop."""
+
+    @pytest.mark.asyncio
+    async def test_creates_group_and_ignores_busygroup(self, provider, mock_client):
+        """Verifies that an existing consumer group is not treated as an error."""
+        mock_client.xgroup_create.side_effect = ResponseError("BUSYGROUP Consumer Group name already exists")
+        mock_client.xreadgroup.side_effect = [[], asyncio.CancelledError()]
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(AsyncMock())
+
+        mock_client.xgroup_create.assert_awaited_once_with("server_channel", "admine-bot", id="$", mkstream=True)
+
+    @pytest.mark.asyncio
+    async def test_batched_blocking_read_acks_after_callback(self, provider, mock_client):
+        """Verifies that a batch is read with BLOCK/COUNT and acknowledged once the callback succeeds."""
+        first = AdmineMessage("server_handler", ["server_on"], "up")
+        second = AdmineMessage("vpn_handler", ["new_server_ips"], "10.0.0.1")
+        mock_client.xreadgroup.side_effect = [
+            [],
+            [[b"server_channel", [_entry(b"1-0", first), _entry(b"2-0", second)]]],
+            asyncio.CancelledError(),
+        ]
+        callback = AsyncMock()
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+
+        read_call = mock_client.xreadgroup.call_args_list[1]
+        assert read_call.args[2] == {"server_channel": ">"}
+        assert read_call.kwargs == {"count": 20, "block": 5000}
+        assert [call.args[0].message for call in callback.await_args_list] == ["up", "10.0.0.1"]
+        mock_client.xack.assert_awaited_once_with(b"server_channel", "admine-bot", b"1-0", b"2-0")
+
+    @pytest.mark.asyncio
+    async def test_failed_callback_leaves_entry_pending(self, provider, mock_client):
+        """Verifies that entries are not acknowledged when the callback raises."""
+        message = AdmineMessage("server_handler", ["server_on"], "up")
+        mock_client.xreadgroup.side_effect = [
+            [],
+            [[b"server_channel", [_entry(b"1-0", message)]]],
+            asyncio.CancelledError(),
+        ]
+        callback = AsyncMock(side_effect=RuntimeError("discord down"))
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+
+        mock_client.xack.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_replays_own_pending_entries_on_start(self, provider, mock_client):
+        """Verifies that entries left pending by a previous run are replayed before new reads."""
+        message = AdmineMessage("server_handler", ["server_on"], "replayed")
+        mock_client.xreadgroup.side_effect = [
+            [[b"server_channel", [_entry(b"7-0", message)]]],
+            [[b"server_channel", []]],
+            asyncio.CancelledError(),
+        ]
+        callback = AsyncMock()
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+
+        assert mock_client.xreadgroup.call_args_list[0].args[2] == {"server_channel": "0"}
+        assert mock_client.xreadgroup.call_args_list[1].args[2] == {b"server_channel": b"7-0"}
+        callback.assert_awaited_once()
+        mock_client.xack.assert_awaited_once_with(b"server_channel", "admine-bot", b"7-0")
+
+    @pytest.mark.asyncio
+    async def test_reclaims_idle_entries_from_other_consumers(self, provider, mock_client):
+        """Verifies that entries abandoned by a crashed consumer are claimed and processed."""
+        message = AdmineMessage("server_handler", ["mod_install_result"], "ok")
+        mock_client.xreadgroup.side_effect = [[], asyncio.CancelledError()]
+        mock_client.xautoclaim.return_value = [b"0-0", [_entry(b"3-0", message)], []]
+        callback = AsyncMock()
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+
+        mock_client.xautoclaim.assert_awaited_once_with(
+            "server_channel", "admine-bot", "bot-test", 60000, start_id="0-0", count=20
+        )
+        callback.assert_awaited_once()
+        mock_client.xack.assert_awaited_once_with("server_channel", "admine-bot", b"3-0")
+
+    @pytest.mark.asyncio
+    async def test_gives_up_on_entries_past_max_deliveries(self, provider, mock_client):
+        """Verifies that a reclaimed entry delivered too often is acked without running, and others still run."""
+        poison = AdmineMessage("server_handler", ["notification"], "poison")
+        fresh = AdmineMessage("server_handler", ["notification"], "fresh")
+        mock_client.xreadgroup.side_effect = [[], asyncio.CancelledError()]
+        mock_client.xautoclaim.return_value = [b"0-0", [_entry(b"3-0", poison), _entry(b"4-0", fresh)], []]
+        mock_client.xpending_range.return_value = [
+            {"message_id": b"3-0", "consumer": b"bot-test", "time_since_delivered": 0, "times_delivered": 6},
+            {"message_id": b"4-0", "consumer": b"bot-test", "time_since_delivered": 0, "times_delivered": 2},
+        ]
+        callback = AsyncMock()
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+
+        mock_client.xpending_range.assert_awaited_once_with(
+            "server_channel", "admine-bot", min=b"3-0", max=b"4-0", count=2
+        )
+        assert [call.args[0].message for call in callback.await_args_list] == ["fresh"]
+        assert mock_client.xack.await_args_list[0].args == ("server_channel", "admine-bot", b"3-0")
+        assert mock_client.xack.await_args_list[1].args == ("server_channel", "admine-bot", b"4-0")
+        assert metrics.counter("pubsub_dead_letter_total", {"stream": "server_channel"}).value == 1
+
+    @pytest.mark.asyncio
+    async def test_decodes_entry_using_codec_field(self, provider, mock_client):
+        """Verifies that the codec field selects the payload format and malformed entries are acked and dropped."""
+        message = AdmineMessage("Bot", ["server_on"], "packed")
+        mock_client.xreadgroup.side_effect = [
+            [],
+            [
+                [
+                    b"server_channel",
+                    [
+                        (b"1-0", {b"data": message.to_bytes(CodecType.MSGPACK), b"codec": b"msgpack"}),
+                        (b"2-0", {b"data": b'{"origin": 1}'}),
+                    ],
+                ]
+            ],
+            asyncio.CancelledError(),
+        ]
+        callback = AsyncMock()
+
+        with pytest.raises(asyncio.CancelledError):
+            await provider.listen_message(callback)
+
+        callback.assert_awaited_once()
+        assert callback.await_args.args[0].message == "packed"
+        mock_client.xack.assert_awaited_once_with(b"server_channel", "admine-bot", b"1-0", b"2-0")
@@ -0,0 +1,135 @@
+import pytest
+import requests
+
+from bot.exceptions import CircuitOpenError
+from bot.metrics import metrics
+from bot.services.resilience import CircuitBreaker, CircuitState, EndpointTimeouts, is_backend_failure
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest.fixture
+def clock():
+    """Creates a manually advanced clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    """Creates a breaker that opens after two failures and probes after 10 seconds."""
+    return CircuitBreaker("minecraft", failure_threshold=2, reset_timeout=10, clock=clock)
+
+
+async def fail(breaker: CircuitBreaker, error: Exception = None):
+    with pytest.raises(type(error or ConnectionError())):
+        async with breaker:
+            raise error or ConnectionError("refused")
+
+
+async def succeed(breaker: CircuitBreaker):
+    async with breaker:
+        pass
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class TestCircuitBreaker:
+    """Tests for the consecutive-failure circuit breaker."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_threshold_and_fails_fast(self, breaker):
+        """Verifies that consecutive failures open the breaker and further calls are rejected without running."""
+        await fail(breaker)
+        assert breaker.state == CircuitState.CLOSED
+        await fail(breaker)
+
+        with pytest.raises(CircuitOpenError) as error:
+            await succeed(breaker)
+
+        assert breaker.state == CircuitState.OPEN
+        assert error.value.retry_after == 10
+        snapshot = metrics.snapshot()
+        assert snapshot["circuit_breaker_state{service=minecraft}"] == CircuitState.OPEN.value
+        assert snapshot["circuit_breaker_opened_total{service=minecraft}"] == 1
+        assert snapshot["circuit_breaker_rejected_total{service=minecraft}"] == 1
+
+    @pytest.mark.asyncio
+    async def test_success_resets_failure_count(self, breaker):
+        """Verifies that only consecutive failures count."""
+        await fail(breaker)
+        await succeed(breaker)
+        await fail(breaker)
+
+        assert breaker.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_closes_on_success(self, breaker, clock):
+        """Verifies that one probe is let through after the reset timeout and closes the breaker."""
+        await fail(breaker)
+        await fail(breaker)
+        clock.now = 10
+
+        async with breaker:
+            assert breaker.state == CircuitState.HALF_OPEN
+            with pytest.raises(CircuitOpenError):
+                await succeed(breaker)
+
+        assert breaker.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_failure_reopens(self, breaker, clock):
+        """Verifies that a failed probe opens the breaker for another full reset timeout."""
+        await fail(breaker)
+        await fail(breaker)
+        clock.now = 10
+
+        await fail(breaker)
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.retry_after == 10
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_count(self, breaker):
+        """Verifies that a 4xx answer leaves the breaker closed while a 5xx counts as a failure."""
+        for _ in range(3):
+            await fail(breaker, http_error(404))
+        assert breaker.state == CircuitState.CLOSED
+
+        await fail(breaker, http_error(503))
+        await fail(breaker, http_error(503))
+        assert breaker.state == CircuitState.OPEN
+
+
+class TestResilienceHelpers:
+    """Tests for failure classification and endpoint timeouts."""
+
+    def test_is_backend_failure(self):
+        """Verifies that timeouts and 5xx are backend failures and 4xx are not."""
+        assert is_backend_failure(requests.Timeout())
+        assert is_backend_failure(http_error(500))
+        assert not is_backend_failure(http_error(400))
+
+    def test_endpoint_timeouts(self):
+        """Verifies that per-endpoint read timeouts override the default and connect is shared."""
+        timeouts = EndpointTimeouts(connect=2, read=10, endpoints={"install_mod": 120})
+
+        assert timeouts.get("install_mod") == (2, 120)
+        assert timeouts.get("status") == (2, 10)
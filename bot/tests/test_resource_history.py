@@ -0,0 +1,89 @@
+import math
+
+import pytest
+
+from bot.resource_history import ResourceHistory, WindowStats
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self):
+        self.now = 100_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Creates a manually advanced clock."""
+    return FakeClock()
+
+
+class TestResourceHistory:
+    """Tests for the array-backed resource history ring buffer."""
+
+    def test_summarizes_window(self, clock):
+        """Verifies min/avg/p95/max over the samples inside the window only."""
+        history = ResourceHistory(1000, clock=clock)
+        history.record(clock.now - 600, cpu=99)
+        for i in range(1, 101):
+            history.record(clock.now - 100 + i, cpu=float(i))
+
+        stats = history.summarize(300)["cpu"]
+
+        assert stats == WindowStats(100, 1.0, 50.5, 95.0, 100.0)
+        assert history.summarize(3600)["cpu"].count == 101
+
+    def test_missing_values_are_skipped(self, clock):
+        """Verifies that series recorded as None do not affect the statistics."""
+        history = ResourceHistory(10, clock=clock)
+        history.record(clock.now, cpu=10, tps=None)
+        history.record(clock.now, cpu=20, tps=19.5)
+
+        summary = history.summarize(60)
+
+        assert summary["tps"] == WindowStats(1, 19.5, 19.5, 19.5, 19.5)
+        assert summary["disk"] is None
+
+    def test_ring_overwrites_oldest(self, clock):
+        """Verifies that memory is fixed and the oldest samples are replaced once the ring is full."""
+        history = ResourceHistory(5, clock=clock)
+        for i in range(8):
+            history.record(clock.now - 8 + i, cpu=float(i))
+
+        timestamps, values = history.window(3600, "cpu")
+
+        assert len(history) == 5
+        assert list(values) == [3.0, 4.0, 5.0, 6.0, 7.0]
+        assert list(timestamps) == sorted(timestamps)
+
+    def test_sparkline(self, clock):
+        """Verifies that the sparkline rises with the values and leaves gaps blank."""
+        history = ResourceHistory(100, clock=clock)
+        history.record(clock.now - 35, cpu=0)
+        history.record(clock.now - 5, cpu=100)
+
+        sparkline = history.sparkline(40, "cpu", width=4)
+
+        assert sparkline == "▁  █"
+
+    def test_rejects_unknown_series(self, clock):
+        """Verifies that typos in series names fail loudly."""
+        history = ResourceHistory(10, clock=clock)
+
+        with pytest.raises(ValueError):
+            history.record(cpus=1)
+
+    def test_report(self, clock):
+        """Verifies that the report covers every window and has a sample count."""
+        history = ResourceHistory(10, clock=clock)
+        history.record(cpu=50, memory=25, tps=20)
+
+        report = history.report()
+
+        assert report.samples == 1
+        assert set(report.windows) == {"5m", "1h", "24h"}
+        assert math.isclose(report.windows["24h"]["memory"].avg, 25)
+        assert report.sparklines["cpu"]
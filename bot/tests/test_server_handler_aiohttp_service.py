@@ -0,0 +1,163 @@
+import pytest
+import pytest_asyncio
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+
+from bot.exceptions import CircuitOpenError
+from bot.metrics import metrics
+from bot.models.minecraft_server_status import MinecraftServerStatus
+from bot.services.minecraft.server_handler_aiohttp_service import ServerHandlerAiohttpMinecraftServerServiceProvider
+from bot.services.resilience import CircuitBreaker, CircuitState
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Runs a local server_handler stand-in with the endpoints the provider calls."""
+    uploads = []
+
+    async def status(request):
+        return web.json_response(
+            {"health": "healthy", "status": "online", "description": "ok", "uptime": "1h", "tps": 20}
+        )
+
+    async def mods(request):
+        form = await request.post()
+        uploads.append((form["file"].filename, form["file"].file.read()))
+        return web.json_response({"status": "installed"})
+
+    async def remove(request):
+        return web.json_response({"removed": request.match_info["name"]})
+
+    async def broken(request):
+        return web.Response(status=503)
+
+    async def command(request):
+        body = await request.json()
+        return web.json_response({"output": f"ran {body['command']}"})
+
+    async def commands(request):
+        body = await request.json()
+        return web.json_response({"results": [{"command": c, "output": f"ran {c}"} for c in body["commands"]]})
+
+    app = web.Application()
+    app.router.add_get("/status", status)
+    app.router.add_post("/mods", mods)
+    app.router.add_delete("/mods/{name}", remove)
+    app.router.add_get("/logs", broken)
+    app.router.add_post("/command", command)
+    app.router.add_post("/commands", commands)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    test_server.uploads = uploads
+    yield test_server
+    await test_server.close()
+
+
+@pytest_asyncio.fixture
+async def provider(server):
+    """Creates a provider pointed at the local server."""
+    provider = ServerHandlerAiohttpMinecraftServerServiceProvider(str(server.make_url("/")))
+    yield provider
+    await provider.close()
+
+
+class TestServerHandlerAiohttpProvider:
+    """Tests for the pooled aiohttp server_handler client."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_connections(self, provider):
+        """Verifies that sequential calls share one keep-alive connection and are counted."""
+        for _ in range(3):
+            status = await provider.get_status()
+
+        assert isinstance(status, MinecraftServerStatus)
+        assert provider.connection_stats["requests"] == 3
+        assert provider.connection_stats["connections_created"] == 1
+        assert provider.connection_stats["connections_reused"] == 2
+        assert metrics.snapshot()["http_connections_reused_total{service=minecraft}"] == 2
+
+    @pytest.mark.asyncio
+    async def test_uploads_mod_as_multipart(self, provider, server):
+        """Verifies that mod files are sent in the multipart 'file' field."""
+        response = await provider.install_mod_file("mod.jar", b"jar-bytes")
+
+        assert response == {"status": "installed"}
+        assert server.uploads == [("mod.jar", b"jar-bytes")]
+
+    @pytest.mark.asyncio
+    async def test_remove_mod(self, provider):
+        """Verifies that the DELETE path carries the filename."""
+        assert await provider.remove_mod("mod.jar") == {"removed": "mod.jar"}
+
+    @pytest.mark.asyncio
+    async def test_command_batch_in_one_request(self, provider):
+        """Verifies that a batch is sent to /commands in a single request."""
+        results = await provider.command_batch(["say a", "say b"])
+
+        assert results == [{"command": "say a", "output": "ran say a"}, {"command": "say b", "output": "ran say b"}]
+        assert provider.connection_stats["requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_command_batch_falls_back_without_endpoint(self):
+        """Verifies that a server_handler without /commands gets the commands one by one."""
+
+        async def command(request):
+            body = await request.json()
+            return web.json_response({"output": f"ran {body['command']}"})
+
+        app = web.Application()
+        app.router.add_post("/command", command)
+        old_server = TestServer(app)
+        await old_server.start_server()
+        provider = ServerHandlerAiohttpMinecraftServerServiceProvider(str(old_server.make_url("/")))
+
+        results = await provider.command_batch(["say a", "say b"])
+        await provider.close()
+        await old_server.close()
+
+        assert [r["output"] for r in results] == ["ran say a", "ran say b"]
+        assert provider.connection_stats["requests"] == 3
+
+    @pytest.mark.asyncio
+    async def test_raises_on_http_error(self, provider):
+        """Verifies that non-2xx responses are raised like the requests-based provider."""
+        with pytest.raises(ClientResponseError):
+            await provider.get_logs(10)
+
+    @pytest.mark.asyncio
+    async def test_close_allows_reopen(self, provider):
+        """Verifies that a closed provider opens a fresh session on the next call."""
+        await provider.get_status()
+        await provider.close()
+
+        await provider.get_status()
+
+        assert provider.connection_stats["connections_created"] == 2
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_fails_fast(self, server):
+        """Verifies that repeated 5xx answers open the breaker and the next call never reaches the server."""
+        breaker = CircuitBreaker("minecraft", failure_threshold=2, reset_timeout=60)
+        provider = ServerHandlerAiohttpMinecraftServerServiceProvider(
+            str(server.make_url("/")), circuit_breaker=breaker
+        )
+        try:
+            for _ in range(2):
+                with pytest.raises(ClientResponseError):
+                    await provider.get_logs(10)
+
+            with pytest.raises(CircuitOpenError):
+                await provider.get_logs(10)
+        finally:
+            await provider.close()
+
+        assert breaker.state == CircuitState.OPEN
+        assert provider.connection_stats["requests"] == 2
@@ -0,0 +1,134 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bot.metrics import metrics
+from bot.models.minecraft_server_status import HealthStatus, MinecraftServerStatus, ServerStatus
+from bot.services.minecraft.status_poller import StatusPoller
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def server_status(status: ServerStatus, health: HealthStatus = HealthStatus.HEALTHY) -> MinecraftServerStatus:
+    return MinecraftServerStatus(health, status, "")
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest.fixture
+def clock():
+    """Creates a manually advanced clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def minecraft_service():
+    """Creates a minecraft service that reports a healthy online server."""
+    service = MagicMock()
+    service.get_status = AsyncMock(return_value=server_status(ServerStatus.ONLINE))
+    service.get_resources = AsyncMock(return_value="resources")
+    return service
+
+
+@pytest.fixture
+def message_service():
+    """Creates a mocked message service."""
+    service = MagicMock()
+    service.send_message = AsyncMock()
+    return service
+
+
+@pytest.fixture
+def poller(minecraft_service, message_service, clock):
+    """Creates a poller with 1s/10s/30s intervals and a 20s settle time."""
+    return StatusPoller(
+        minecraft_service,
+        [message_service],
+        fast_interval=1,
+        slow_interval=10,
+        offline_interval=30,
+        settle_time=20,
+        clock=clock,
+    )
+
+
+class TestStatusPoller:
+    """Tests for the background status poller."""
+
+    @pytest.mark.asyncio
+    async def test_keeps_snapshot(self, poller, clock):
+        """Verifies that a poll stores status and resources, and old snapshots are not served."""
+        await poller.poll_once()
+
+        assert poller.fresh_snapshot().status.status == ServerStatus.ONLINE
+        assert poller.fresh_snapshot().resources == "resources"
+        clock.now = 61
+        assert poller.fresh_snapshot() is None
+
+    @pytest.mark.asyncio
+    async def test_notifies_only_on_change(self, poller, minecraft_service, message_service):
+        """Verifies that repeated identical polls stay quiet and a health change is announced once."""
+        await poller.poll_once()
+        await poller.poll_once()
+        message_service.send_message.assert_not_called()
+
+        minecraft_service.get_status.return_value = server_status(ServerStatus.ONLINE, HealthStatus.SICK)
+        await poller.poll_once()
+        await poller.poll_once()
+
+        message_service.send_message.assert_awaited_once()
+        assert "healthy → sick" in message_service.send_message.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_adaptive_interval(self, poller, minecraft_service, clock):
+        """Verifies the slow interval when stable, fast after a change or poke, and offline when stopped."""
+        await poller.poll_once()
+        assert poller.next_interval() == 10
+
+        minecraft_service.get_status.return_value = server_status(ServerStatus.OFFLINE)
+        await poller.poll_once()
+        assert poller.next_interval() == 1
+        clock.now = 21
+        assert poller.next_interval() == 30
+
+        poller.poke()
+        assert poller.next_interval() == 1
+
+    @pytest.mark.asyncio
+    async def test_reports_outage_and_recovery(self, poller, minecraft_service, message_service):
+        """Verifies that losing and regaining server_handler is announced once each."""
+        await poller.poll_once()
+        minecraft_service.get_status.side_effect = ConnectionError()
+        await poller.poll_once()
+        await poller.poll_once()
+        minecraft_service.get_status.side_effect = None
+        await poller.poll_once()
+
+        messages = [call.args[0] for call in message_service.send_message.await_args_list]
+        assert len(messages) == 2
+        assert "stopped responding" in messages[0]
+        assert "responding again" in messages[1]
+
+    @pytest.mark.asyncio
+    async def test_startup_failure_is_quiet(self, poller, minecraft_service, message_service):
+        """Verifies that server_handler being down before the first successful poll is not announced."""
+        minecraft_service.get_status.side_effect = ConnectionError()
+        await poller.poll_once()
+        minecraft_service.get_status.side_effect = None
+        await poller.poll_once()
+
+        message_service.send_message.assert_not_called()
@@ -0,0 +1,53 @@
+import pytest
+
+from bot.metrics import metrics
+from bot.models.admine_message import AdmineMessage, Hop
+from bot.services.pubsub.tracing import record_incoming, stamp_outgoing
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Resets the shared metrics registry between tests."""
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+class TestTracing:
+    """Tests for envelope stamping and per-hop latency recording."""
+
+    def test_stamp_outgoing_adds_bot_publish_hop(self):
+        """Verifies that outgoing messages get an id and a bot publish hop."""
+        stamped = stamp_outgoing(AdmineMessage("Bot", ["server_on"], " "))
+
+        assert stamped.message_id
+        assert stamped.hops[-1].label == "bot.publish"
+
+    def test_record_incoming_observes_each_segment(self):
+        """Verifies that every segment of a reply's hop chain lands in its own histogram."""
+        reply = AdmineMessage(
+            "server_handler",
+            ["server_on"],
+            "up",
+            correlation_id="a1",
+            hops=[
+                Hop("bot", "publish", 1_000),
+                Hop("server_handler", "receive", 1_050),
+                Hop("server_handler", "publish", 3_050),
+            ],
+        )
+
+        received = record_incoming(reply)
+
+        assert received.hops[-1].label == "bot.receive"
+        snapshot = metrics.snapshot()
+        assert snapshot["pubsub_hop_seconds_max{hop=bot.publish -> server_handler.receive}"] == pytest.approx(0.05)
+        assert snapshot["pubsub_hop_seconds_max{hop=server_handler.receive -> server_handler.publish}"] == 2.0
+        assert "pubsub_hop_seconds_count{hop=server_handler.publish -> bot.receive}" in snapshot
+
+    def test_record_incoming_without_envelope_records_nothing(self):
+        """Verifies that messages from producers without tracing fields are passed through untouched."""
+        received = record_incoming(AdmineMessage("vpn_handler", ["new_server_ips"], "10.0.0.1"))
+
+        assert received.message == "10.0.0.1"
+        assert not any(key.startswith("pubsub_hop_seconds") for key in metrics.snapshot())
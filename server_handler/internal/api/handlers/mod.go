@@ -5,6 +5,7 @@ import (
 	"io"
 	"log/slog"
 	"net/http"
+	"os"
 	"path/filepath"
 	"strings"
 	"time"
@@ -52,6 +53,7 @@ func NewModHandler(
 
 func (h *ModHandler) publish(tags []string, message string) {
 	msg := pubsub.NewAdmineMessage(h.origin, tags, message)
+	msg.Stamp(h.origin)
 	h.pubsub.Publish(h.serverChannel, msg)
 }
 
@@ -88,16 +90,26 @@ func (h *ModHandler) handleFileUpload(c *gin.Context) {
 		return
 	}
 
-	fileData, err := io.ReadAll(file)
+	// Spool to a file of our own: the multipart temp file is deleted when this request ends, and holding the jar in
+	// memory would cost its full size per upload
+	spool, err := os.CreateTemp("", "admine-upload-*.jar")
 	if err != nil {
+		slog.Error("Failed to create upload spool file", "error", err)
+		c.JSON(http.StatusInternalServerError, apimodels.NewModInstallResponse("error", "Failed to store file data"))
+		return
+	}
+	if _, err := io.Copy(spool, file); err != nil {
+		spool.Close()
+		os.Remove(spool.Name())
 		slog.Error("Failed to read uploaded file", "error", err)
 		c.JSON(http.StatusInternalServerError, apimodels.NewModInstallResponse("error", "Failed to read file data"))
 		return
 	}
+	spool.Close()
 
 	c.JSON(http.StatusAccepted, apimodels.NewModInstallResponse("accepted", "Mod installation started for: "+fileName))
 
-	go h.installMod(fileName, fileData)
+	go h.installMod(fileName, spool.Name())
 }
 
 func (h *ModHandler) handleURLDownload(c *gin.Context) {
@@ -119,13 +131,21 @@ func (h *ModHandler) handleURLDownload(c *gin.Context) {
 	go h.downloadAndInstallMod(req.URL, fileName)
 }
 
-func (h *ModHandler) installMod(fileName string, fileData []byte) {
+func (h *ModHandler) installMod(fileName string, spoolPath string) {
 	ctx, cancel := context.WithTimeout(h.mainCtx, h.modTimeout)
 	defer cancel()
+	defer os.Remove(spoolPath)
 
 	h.publish([]string{"notification"}, "Installing mod: "+fileName)
 
-	reader := strings.NewReader(string(fileData))
+	reader, err := os.Open(spoolPath)
+	if err != nil {
+		slog.Error("Failed to open upload spool file", "file", fileName, "error", err)
+		h.publish([]string{"mod_install_result"}, "Failed to install mod "+fileName+": "+err.Error())
+		return
+	}
+	defer reader.Close()
+
 	result, err := h.server.InstallMod(ctx, fileName, reader)
 	if err != nil {
 		slog.Error("Failed to install mod", "file", fileName, "error", err)
@@ -136,7 +156,7 @@ func (h *ModHandler) installMod(fileName string, fileData []byte) {
 		return
 	}
 
-	h.publish([]string{"mod_install_result"}, result.Message)
+	h.publish([]string{"mod_install_result"}, fileName+": "+result.Message)
 	slog.Info("Mod installed successfully", "file", fileName)
 }
 
@@ -185,7 +205,7 @@ func (h *ModHandler) downloadAndInstallMod(url string, fileName string) {
 		return
 	}
 
-	h.publish([]string{"mod_install_result"}, result.Message)
+	h.publish([]string{"mod_install_result"}, fileName+": "+result.Message)
 	slog.Info("Mod downloaded and installed successfully", "file", fileName, "url", url)
 }
 
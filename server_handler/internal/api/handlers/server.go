@@ -15,8 +15,9 @@ import (
 )
 
 const (
-	defaultLogLines = 100
-	maxLogLines     = 100
+	defaultLogLines  = 100
+	maxLogLines      = 100
+	maxLogDeltaLines = 1000
 )
 
 // ServerHandler handles server-related API endpoints
@@ -71,7 +72,7 @@ func (h *ServerHandler) GetStatus(c *gin.Context) {
 	c.JSON(http.StatusOK, serverStatus)
 }
 
-// GetLogs handles GET /logs?n=<int>
+// GetLogs handles GET /logs?n=<int>[&since=<cursor>]
 func (h *ServerHandler) GetLogs(c *gin.Context) {
 	slog.Info("GET /logs endpoint called")
 
@@ -81,6 +82,11 @@ func (h *ServerHandler) GetLogs(c *gin.Context) {
 		return
 	}
 
+	if since, ok := c.GetQuery("since"); ok {
+		h.getLogsSince(c, since)
+		return
+	}
+
 	n := defaultLogLines
 	if nRaw := c.Query("n"); nRaw != "" {
 		parsedN, err := strconv.Atoi(nRaw)
@@ -108,6 +114,68 @@ func (h *ServerHandler) GetLogs(c *gin.Context) {
 	c.JSON(http.StatusOK, models.NewLogsResponse(logs))
 }
 
+// getLogsSince serves incremental reads: only lines logged after the since cursor (the last n lines when it is empty),
+// plus the cursor to send next time.
+func (h *ServerHandler) getLogsSince(c *gin.Context, sinceRaw string) {
+	var since time.Time
+	if sinceRaw != "" {
+		parsed, err := time.Parse(time.RFC3339Nano, sinceRaw)
+		if err != nil {
+			c.JSON(http.StatusBadRequest, models.NewErrorResponse("Invalid query param 'since': must be a cursor returned by a previous call"))
+			return
+		}
+		since = parsed
+	}
+
+	n := defaultLogLines
+	if nRaw := c.Query("n"); nRaw != "" {
+		parsedN, err := strconv.Atoi(nRaw)
+		if err != nil || parsedN < 1 || parsedN > maxLogDeltaLines {
+			c.JSON(http.StatusBadRequest, models.NewErrorResponse("Invalid query param 'n': must be an integer between 1 and 1000"))
+			return
+		}
+		n = parsedN
+	}
+
+	lines, cursor, err := h.server.LogsSince(c.Request.Context(), since, n)
+	if err != nil {
+		slog.Error("Failed to get server logs", "error", err.Error())
+		c.JSON(http.StatusInternalServerError, models.NewErrorResponse("Failed to get server logs: "+err.Error()))
+		return
+	}
+
+	slog.Debug("Successfully retrieved server log delta", "lines", len(lines), "cursor", cursor)
+	c.JSON(http.StatusOK, models.NewLogsDeltaResponse(lines, cursor))
+}
+
+// PostCommands handles POST /commands, running a batch of commands in order
+func (h *ServerHandler) PostCommands(c *gin.Context) {
+	slog.Info("POST /commands endpoint called")
+
+	var batch models.CommandBatch
+	if err := c.ShouldBindJSON(&batch); err != nil {
+		slog.Error("Invalid command batch request", "error", err.Error())
+		c.JSON(http.StatusBadRequest, models.NewErrorResponse("Invalid request: "+err.Error()))
+		return
+	}
+
+	if h.server == nil {
+		slog.Error("MinecraftServer is not initialized")
+		c.JSON(http.StatusInternalServerError, models.NewErrorResponse("Minecraft server not initialized"))
+		return
+	}
+
+	result, err := h.server.ExecuteCommands(c.Request.Context(), batch.Commands)
+	if err != nil {
+		slog.Error("Failed to execute command batch", "commands", len(batch.Commands), "error", err.Error())
+		c.JSON(http.StatusInternalServerError, models.NewErrorResponse("Failed to execute commands: "+err.Error()))
+		return
+	}
+
+	slog.Info("Executed command batch", "commands", len(batch.Commands))
+	c.JSON(http.StatusOK, result)
+}
+
 // PostCommand handles POST /command
 func (h *ServerHandler) PostCommand(c *gin.Context) {
 	slog.Info("POST /command endpoint called")
@@ -8,6 +8,7 @@ import (
 	"net/http"
 	"net/http/httptest"
 	"testing"
+	"time"
 
 	"github.com/GustaMantovani/Admine/server_handler/internal/api/models"
 	"github.com/GustaMantovani/Admine/server_handler/internal/server"
@@ -227,6 +228,61 @@ func TestGetLogs_InvalidN(t *testing.T) {
 	}
 }
 
+func TestGetLogs_SinceCursor(t *testing.T) {
+	mockServer := new(testutils.MockMinecraftServer)
+	handler := NewServerHandler(mockServer)
+
+	since := time.Date(2024, 5, 1, 12, 0, 0, 500, time.UTC)
+	next := time.Date(2024, 5, 1, 12, 0, 3, 0, time.UTC)
+	mockServer.On("LogsSince", context.Background(), since, 500).Return([]string{"new line"}, next, nil)
+
+	w := httptest.NewRecorder()
+	c, _ := gin.CreateTestContext(w)
+	c.Request, _ = http.NewRequest("GET", "/logs?n=500&since="+since.Format(time.RFC3339Nano), nil)
+
+	handler.GetLogs(c)
+
+	assert.Equal(t, http.StatusOK, w.Code)
+
+	var response models.LogsResponse
+	assert.NoError(t, json.Unmarshal(w.Body.Bytes(), &response))
+	assert.Equal(t, []string{"new line"}, response.Lines)
+	assert.Equal(t, next.Format(time.RFC3339Nano), response.Cursor)
+
+	mockServer.AssertExpectations(t)
+}
+
+func TestGetLogs_EmptySinceStartsTail(t *testing.T) {
+	mockServer := new(testutils.MockMinecraftServer)
+	handler := NewServerHandler(mockServer)
+
+	next := time.Date(2024, 5, 1, 12, 0, 3, 0, time.UTC)
+	mockServer.On("LogsSince", context.Background(), time.Time{}, 100).Return([]string{"a", "b"}, next, nil)
+
+	w := httptest.NewRecorder()
+	c, _ := gin.CreateTestContext(w)
+	c.Request, _ = http.NewRequest("GET", "/logs?since=", nil)
+
+	handler.GetLogs(c)
+
+	assert.Equal(t, http.StatusOK, w.Code)
+	mockServer.AssertExpectations(t)
+}
+
+func TestGetLogs_InvalidSince(t *testing.T) {
+	mockServer := new(testutils.MockMinecraftServer)
+	handler := NewServerHandler(mockServer)
+
+	w := httptest.NewRecorder()
+	c, _ := gin.CreateTestContext(w)
+	c.Request, _ = http.NewRequest("GET", "/logs?since=yesterday", nil)
+
+	handler.GetLogs(c)
+
+	assert.Equal(t, http.StatusBadRequest, w.Code)
+	mockServer.AssertNotCalled(t, "LogsSince", mock.Anything, mock.Anything, mock.Anything)
+}
+
 func TestGetLogs_ServerNotInitialized(t *testing.T) {
 	handler := NewServerHandler(nil)
 
@@ -366,6 +422,47 @@ func TestPostCommand_ExecuteCommandError(t *testing.T) {
 	mockServer.AssertExpectations(t)
 }
 
+func TestPostCommands_Success(t *testing.T) {
+	mockServer := new(testutils.MockMinecraftServer)
+	handler := NewServerHandler(mockServer)
+
+	commands := []string{"whitelist add Steve", "whitelist add Alex"}
+	expectedResult := &server.CommandBatchResult{Results: []server.BatchCommandResult{
+		{Command: commands[0], Output: "Added Steve to the whitelist"},
+		{Command: commands[1], Error: "connection reset"},
+	}}
+	mockServer.On("ExecuteCommands", context.Background(), commands).Return(expectedResult, nil)
+
+	payload, _ := json.Marshal(models.CommandBatch{Commands: commands})
+	w := httptest.NewRecorder()
+	c, _ := gin.CreateTestContext(w)
+	c.Request, _ = http.NewRequest("POST", "/commands", bytes.NewBuffer(payload))
+	c.Request.Header.Set("Content-Type", "application/json")
+
+	handler.PostCommands(c)
+
+	assert.Equal(t, http.StatusOK, w.Code)
+
+	var response server.CommandBatchResult
+	assert.NoError(t, json.Unmarshal(w.Body.Bytes(), &response))
+	assert.Equal(t, *expectedResult, response)
+
+	mockServer.AssertExpectations(t)
+}
+
+func TestPostCommands_EmptyBatch(t *testing.T) {
+	handler := NewServerHandler(nil)
+
+	w := httptest.NewRecorder()
+	c, _ := gin.CreateTestContext(w)
+	c.Request, _ = http.NewRequest("POST", "/commands", bytes.NewBufferString(`{"commands": []}`))
+	c.Request.Header.Set("Content-Type", "application/json")
+
+	handler.PostCommands(c)
+
+	assert.Equal(t, http.StatusBadRequest, w.Code)
+}
+
 func TestPostCommand_WithExitCode(t *testing.T) {
 	mockServer := new(testutils.MockMinecraftServer)
 	handler := NewServerHandler(mockServer)
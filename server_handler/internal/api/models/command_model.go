@@ -5,6 +5,11 @@ type Command struct {
 	Command string `json:"command" binding:"required"`
 }
 
+// CommandBatch represents commands to be executed in order on the Minecraft server
+type CommandBatch struct {
+	Commands []string `json:"commands" binding:"required,min=1,max=100,dive,required"`
+}
+
 // NewCommand creates a new Command instance
 func NewCommand(command string) *Command {
 	return &Command{
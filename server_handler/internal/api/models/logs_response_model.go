@@ -1,9 +1,12 @@
 package models
 
+import "time"
+
 // LogsResponse represents a logs response from the API
 type LogsResponse struct {
-	Lines []string `json:"lines"`
-	Total int      `json:"total"`
+	Lines  []string `json:"lines"`
+	Total  int      `json:"total"`
+	Cursor string   `json:"cursor,omitempty"`
 }
 
 // NewLogsResponse creates a new LogsResponse instance
@@ -13,3 +16,13 @@ func NewLogsResponse(lines []string) *LogsResponse {
 		Total: len(lines),
 	}
 }
+
+// NewLogsDeltaResponse creates a LogsResponse for an incremental read. cursor is the timestamp of the newest line
+// and is passed back as ?since= to read only what was logged after it.
+func NewLogsDeltaResponse(lines []string, cursor time.Time) *LogsResponse {
+	response := NewLogsResponse(lines)
+	if !cursor.IsZero() {
+		response.Cursor = cursor.UTC().Format(time.RFC3339Nano)
+	}
+	return response
+}
@@ -71,6 +71,7 @@ func SetupRouter(
 		api.GET("/status", serverHandler.GetStatus)
 		api.GET("/logs", serverHandler.GetLogs)
 		api.POST("/command", serverHandler.PostCommand)
+		api.POST("/commands", serverHandler.PostCommands)
 		api.GET("/resources", serverHandler.GetResourceUsage)
 		api.POST("/mods", modHandler.PostInstallMod)
 		api.GET("/mods", modHandler.GetListMods)
@@ -38,9 +38,24 @@ type AdmineChannelsMap struct {
 }
 
 type RedisConfig struct {
-	Addr     string `yaml:"addr"`
-	Password string `yaml:"password"`
-	Db       int    `yaml:"db"`
+	Addr     string             `yaml:"addr"`
+	Password string             `yaml:"password"`
+	Db       int                `yaml:"db"`
+	Streams  RedisStreamsConfig `yaml:"streams"`
+}
+
+// RedisStreamsConfig is used when pubsub.type is "redis_streams".
+type RedisStreamsConfig struct {
+	// Group is the consumer group reading the command stream.
+	Group string `yaml:"group"`
+	// Consumer names this instance inside the group; keep it stable so pending entries are replayed after a restart.
+	Consumer string `yaml:"consumer"`
+	// BatchSize is the maximum number of entries read per XREADGROUP.
+	BatchSize int64 `yaml:"batch_size"`
+	// Block is how long one XREADGROUP waits for new entries.
+	Block time.Duration `yaml:"block"`
+	// MaxLen approximately caps the length of the streams written to.
+	MaxLen int64 `yaml:"max_len"`
 }
 
 type MinecraftServerConfig struct {
@@ -132,6 +147,13 @@ func NewDefaultConfig() *Config {
 				Addr:     "localhost:6379",
 				Password: "",
 				Db:       0,
+				Streams: RedisStreamsConfig{
+					Group:     "server-handler",
+					Consumer:  "server-handler",
+					BatchSize: 10,
+					Block:     5 * time.Second,
+					MaxLen:    10000,
+				},
 			},
 			AdmineChannelsMap: AdmineChannelsMap{
 				ServerChannel:  "server_channel",
@@ -127,6 +127,41 @@ func (dc *DockerCompose) ReadLastServiceLogs(n uint, services ...string) ([]stri
 	return lines, nil
 }
 
+// ReadServiceLogsSince returns up to n log lines written after since, each prefixed with its RFC3339Nano timestamp
+// and without the service prefix. An empty since reads the last n lines.
+func (dc *DockerCompose) ReadServiceLogsSince(since string, n uint, services ...string) ([]string, error) {
+	baseArgs := []string{"compose"}
+	if dc.File != "" {
+		baseArgs = append(baseArgs, "-f", dc.File)
+	}
+
+	cmdArgs := append(baseArgs, "logs", "--timestamps", "--no-log-prefix", "--tail", fmt.Sprintf("%d", n))
+	if since != "" {
+		cmdArgs = append(cmdArgs, "--since", since)
+	}
+	if len(services) > 0 {
+		cmdArgs = append(cmdArgs, services...)
+	}
+
+	slog.Debug("Running command", "cmd", "docker", "args", cmdArgs)
+
+	output, err := exec.Command("docker", cmdArgs...).CombinedOutput()
+	if err != nil {
+		rawOutput := strings.TrimSpace(string(output))
+		slog.Error("Command failed", "cmd", "docker", "args", cmdArgs, "error", err, "output", rawOutput)
+		if rawOutput != "" {
+			return nil, fmt.Errorf("%w: %s", err, rawOutput)
+		}
+		return nil, err
+	}
+
+	rawOutput := strings.TrimSpace(string(output))
+	if rawOutput == "" {
+		return []string{}, nil
+	}
+	return strings.Split(rawOutput, "\n"), nil
+}
+
 // Exec runs a command for each specified service
 func (dc *DockerCompose) Exec(command []string, services ...string) error {
 	if len(services) == 0 {
@@ -10,6 +10,10 @@ import (
 	"github.com/GustaMantovani/Admine/server_handler/internal/server"
 )
 
+// failedTags marks the final reply of a command that did not succeed. The notification tag keeps
+// it visible to consumers that don't wait for the reply.
+var failedTags = []string{"notification", "command_failed"}
+
 // EventHandler routes incoming pub/sub messages to the appropriate server operations
 type EventHandler struct {
 	server        server.MinecraftServer
@@ -39,47 +43,51 @@ func NewEventHandler(
 	}
 }
 
-func (eh *EventHandler) publish(tags []string, message string) {
-	msg := NewAdmineMessage(eh.origin, tags, message)
+// publish sends a reply to cause, carrying its correlation id and hops for latency tracing
+func (eh *EventHandler) publish(cause *AdmineMessage, tags []string, message string) {
+	msg := NewReply(cause, eh.origin, tags, message)
+	msg.Stamp(eh.origin)
 	eh.pubsub.Publish(eh.serverChannel, msg)
 }
 
 // ManageCommand processes an incoming message and routes it to the appropriate handler
 func (eh *EventHandler) ManageCommand(msg *AdmineMessage) error {
+	msg.AddHop(eh.origin, "receive")
+
 	if eh.server == nil {
 		slog.Error("MinecraftServer is not initialized")
-		eh.publish([]string{"notification"}, "Server not initialized")
+		eh.publish(msg, failedTags, "Server not initialized")
 		return fmt.Errorf("minecraft server is not initialized")
 	}
 
 	switch {
 	case msg.HasTag("server_on"):
-		eh.serverUp()
+		eh.serverUp(msg)
 	case msg.HasTag("server_off"):
-		eh.serverOff()
+		eh.serverOff(msg)
 	case msg.HasTag("server_down"):
-		eh.serverDown()
+		eh.serverDown(msg)
 	case msg.HasTag("restart"):
-		eh.restart()
+		eh.restart(msg)
 	case msg.HasTag("command"):
-		eh.command(msg.Message)
+		eh.command(msg)
 	default:
-		eh.publish([]string{"notification"}, "Invalid tag.")
+		eh.publish(msg, failedTags, "Invalid tag.")
 		slog.Error("Received an invalid tag", "tags", msg.Tags)
 	}
 
 	return nil
 }
 
-func (eh *EventHandler) serverUp() {
-	eh.publish([]string{"notification"}, "Starting server")
+func (eh *EventHandler) serverUp(cause *AdmineMessage) {
+	eh.publish(cause, []string{"notification"}, "Starting server")
 
 	startCtx, cancel := context.WithTimeout(eh.mainCtx, eh.cfg.ServerOnTimeout)
 	defer cancel()
 
 	if err := eh.server.Start(startCtx); err != nil {
 		slog.Error("Error starting server", "error", err.Error())
-		eh.publish([]string{"notification"}, "Failed to start server: "+err.Error())
+		eh.publish(cause, failedTags, "Failed to start server: "+err.Error())
 		return
 	}
 
@@ -88,29 +96,29 @@ func (eh *EventHandler) serverUp() {
 
 	startInfo := eh.server.StartUpInfo(infoCtx)
 	slog.Debug("VPN startup info", "node_key", startInfo)
-	eh.publish([]string{"server_on"}, startInfo)
+	eh.publish(cause, []string{"server_on"}, startInfo)
 
 	slog.Info("Server started successfully")
 }
 
-func (eh *EventHandler) serverOff() {
-	eh.publish([]string{"notification"}, "Stopping server")
+func (eh *EventHandler) serverOff(cause *AdmineMessage) {
+	eh.publish(cause, []string{"notification"}, "Stopping server")
 
 	stopCtx, cancel := context.WithTimeout(eh.mainCtx, eh.cfg.ServerOffTimeout)
 	defer cancel()
 
 	if err := eh.server.Stop(stopCtx); err != nil {
 		slog.Error("Error stopping server", "error", err.Error())
-		eh.publish([]string{"notification"}, "Error stopping server: "+err.Error())
+		eh.publish(cause, failedTags, "Error stopping server: "+err.Error())
 		return
 	}
 
-	eh.publish([]string{"server_off"}, "Server stopped successfully")
+	eh.publish(cause, []string{"server_off"}, "Server stopped successfully")
 	slog.Info("Server stopped successfully")
 }
 
-func (eh *EventHandler) serverDown() {
-	eh.publish([]string{"notification"}, "Removing server")
+func (eh *EventHandler) serverDown(cause *AdmineMessage) {
+	eh.publish(cause, []string{"notification"}, "Removing server")
 
 	cmdCtx, cmdCancel := context.WithTimeout(eh.mainCtx, eh.cfg.ServerCommandExecTimeout)
 	defer cmdCancel()
@@ -124,16 +132,16 @@ func (eh *EventHandler) serverDown() {
 
 	if err := eh.server.Down(downCtx); err != nil {
 		slog.Error("Error stopping server", "error", err.Error())
-		eh.publish([]string{"notification"}, "Error removing server: "+err.Error())
+		eh.publish(cause, failedTags, "Error removing server: "+err.Error())
 		return
 	}
 
-	eh.publish([]string{"server_off"}, "Server removed successfully")
+	eh.publish(cause, []string{"server_off"}, "Server removed successfully")
 	slog.Info("Server removed successfully")
 }
 
-func (eh *EventHandler) restart() {
-	eh.publish([]string{"notification"}, "Restarting server")
+func (eh *EventHandler) restart(cause *AdmineMessage) {
+	eh.publish(cause, []string{"notification"}, "Restarting server")
 	slog.Info("Starting server restart process")
 
 	stopCtx, stopCancel := context.WithTimeout(eh.mainCtx, eh.cfg.ServerOffTimeout)
@@ -141,7 +149,7 @@ func (eh *EventHandler) restart() {
 
 	if err := eh.server.Stop(stopCtx); err != nil {
 		slog.Error("Error stopping server for restart", "error", err.Error())
-		eh.publish([]string{"notification"}, "Failed to restart server: "+err.Error())
+		eh.publish(cause, failedTags, "Failed to restart server: "+err.Error())
 		return
 	}
 
@@ -150,7 +158,7 @@ func (eh *EventHandler) restart() {
 
 	if err := eh.server.Start(startCtx); err != nil {
 		slog.Error("Error starting server after restart", "error", err.Error())
-		eh.publish([]string{"notification"}, "Failed to start server after stop: "+err.Error())
+		eh.publish(cause, failedTags, "Failed to start server after stop: "+err.Error())
 		return
 	}
 
@@ -159,19 +167,21 @@ func (eh *EventHandler) restart() {
 
 	startInfo := eh.server.StartUpInfo(infoCtx)
 	slog.Debug("VPN startup info", "node_key", startInfo)
-	eh.publish([]string{"server_on"}, startInfo)
+	eh.publish(cause, []string{"server_on"}, startInfo)
 
 	slog.Info("Server restarted successfully")
 }
 
-func (eh *EventHandler) command(message string) {
+func (eh *EventHandler) command(cause *AdmineMessage) {
+	message := cause.Message
+
 	cmdCtx, cancel := context.WithTimeout(eh.mainCtx, eh.cfg.ServerCommandExecTimeout)
 	defer cancel()
 
 	result, err := eh.server.ExecuteCommand(cmdCtx, message)
 	if err != nil {
 		slog.Error("Error executing command", "command", message, "error", err.Error())
-		eh.publish([]string{"notification"}, "Failed to execute command: "+err.Error())
+		eh.publish(cause, failedTags, "Failed to execute command: "+err.Error())
 		return
 	}
 
@@ -180,6 +190,6 @@ func (eh *EventHandler) command(message string) {
 		responseMessage = result.Output
 	}
 
-	eh.publish([]string{"command_result"}, responseMessage)
+	eh.publish(cause, []string{"command_result"}, responseMessage)
 	slog.Info("Executed command successfully", "command", message)
 }
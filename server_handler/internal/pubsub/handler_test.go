@@ -359,3 +359,27 @@ func TestCommand_Failure(t *testing.T) {
 	mockPubSub.AssertExpectations(t)
 	mockServer.AssertExpectations(t)
 }
+
+func TestServerUp_RepliesAreCorrelated(t *testing.T) {
+	mockPubSub := new(testutils.MockPubSubService)
+	mockServer := new(testutils.MockMinecraftServer)
+	handler := newTestHandler(mockServer, mockPubSub)
+
+	msg := pubsub.NewAdmineMessage("Bot", []string{"server_on"}, "")
+
+	mockPubSub.On("Publish", "test_server_channel", mock.MatchedBy(func(reply *pubsub.AdmineMessage) bool {
+		return reply.HasTag("notification") && !reply.HasTag("command_failed") && reply.CorrelationID == msg.ID
+	})).Return(nil).Once()
+
+	mockServer.On("Start", mock.AnythingOfType("*context.timerCtx")).Return(errors.New("start failed")).Once()
+
+	mockPubSub.On("Publish", "test_server_channel", mock.MatchedBy(func(reply *pubsub.AdmineMessage) bool {
+		return reply.HasTag("command_failed") && reply.CorrelationID == msg.ID && len(reply.Hops) == 2
+	})).Return(nil).Once()
+
+	err := handler.ManageCommand(msg)
+
+	assert.NoError(t, err)
+	mockPubSub.AssertExpectations(t)
+	mockServer.AssertExpectations(t)
+}
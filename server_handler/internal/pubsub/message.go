@@ -1,12 +1,31 @@
 package pubsub
 
-import "encoding/json"
+import (
+	"crypto/rand"
+	"encoding/hex"
+	"encoding/json"
+	"time"
+)
 
-// AdmineMessage is the message format used across all Admine pub/sub channels
+// AdmineMessage is the message format used across all Admine pub/sub channels.
+// ID, CorrelationID, EmittedAt and Hops are optional tracing fields, omitted when empty
+// so consumers that only know origin/tags/message keep working.
 type AdmineMessage struct {
-	Origin  string   `json:"origin"`
-	Tags    []string `json:"tags"`
-	Message string   `json:"message"`
+	Origin        string   `json:"origin"`
+	Tags          []string `json:"tags"`
+	Message       string   `json:"message"`
+	ID            string   `json:"id,omitempty"`
+	CorrelationID string   `json:"correlation_id,omitempty"`
+	EmittedAt     int64    `json:"emitted_at,omitempty"`
+	Hops          []Hop    `json:"hops,omitempty"`
+}
+
+// Hop is a timestamped stamp left by a service a message passed through.
+// At is in Unix milliseconds, like EmittedAt.
+type Hop struct {
+	Service string `json:"service"`
+	Stage   string `json:"stage"`
+	At      int64  `json:"at"`
 }
 
 // NewAdmineMessage creates an AdmineMessage with an explicit origin
@@ -15,7 +34,35 @@ func NewAdmineMessage(origin string, tags []string, message string) *AdmineMessa
 		Origin:  origin,
 		Tags:    tags,
 		Message: message,
+		ID:      newMessageID(),
+	}
+}
+
+// NewReply creates a message caused by cause. It carries the correlation id and the hops of
+// cause so the receiver can measure the whole round trip.
+func NewReply(cause *AdmineMessage, origin string, tags []string, message string) *AdmineMessage {
+	msg := NewAdmineMessage(origin, tags, message)
+	if cause == nil {
+		return msg
+	}
+
+	msg.CorrelationID = cause.CorrelationID
+	if msg.CorrelationID == "" {
+		msg.CorrelationID = cause.ID
 	}
+	msg.Hops = append([]Hop(nil), cause.Hops...)
+	return msg
+}
+
+// AddHop appends a hop stamped with the current time
+func (m *AdmineMessage) AddHop(service string, stage string) {
+	m.Hops = append(m.Hops, Hop{Service: service, Stage: stage, At: time.Now().UnixMilli()})
+}
+
+// Stamp sets EmittedAt and records the publish hop, right before the message is sent
+func (m *AdmineMessage) Stamp(service string) {
+	m.AddHop(service, "publish")
+	m.EmittedAt = m.Hops[len(m.Hops)-1].At
 }
 
 func (m *AdmineMessage) HasTag(tag string) bool {
@@ -34,3 +81,11 @@ func (m AdmineMessage) ToString() string {
 	}
 	return string(bytes)
 }
+
+func newMessageID() string {
+	b := make([]byte, 16)
+	if _, err := rand.Read(b); err != nil {
+		return ""
+	}
+	return hex.EncodeToString(b)
+}
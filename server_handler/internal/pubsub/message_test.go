@@ -0,0 +1,50 @@
+package pubsub_test
+
+import (
+	"encoding/json"
+	"testing"
+
+	"github.com/GustaMantovani/Admine/server_handler/internal/pubsub"
+	"github.com/stretchr/testify/assert"
+)
+
+func TestAdmineMessage_OmitsEmptyEnvelope(t *testing.T) {
+	msg := pubsub.AdmineMessage{Origin: "server_handler", Tags: []string{"server_on"}, Message: "up"}
+
+	assert.JSONEq(t, `{"origin":"server_handler","tags":["server_on"],"message":"up"}`, msg.ToString())
+}
+
+func TestAdmineMessage_DecodesBotEnvelope(t *testing.T) {
+	payload := `{"origin":"Bot","tags":["server_on"],"message":" ","id":"a1","emitted_at":1000,` +
+		`"hops":[{"service":"bot","stage":"publish","at":1000}]}`
+
+	var msg pubsub.AdmineMessage
+	assert.NoError(t, json.Unmarshal([]byte(payload), &msg))
+	assert.Equal(t, "a1", msg.ID)
+	assert.Equal(t, int64(1000), msg.EmittedAt)
+	assert.Equal(t, []pubsub.Hop{{Service: "bot", Stage: "publish", At: 1000}}, msg.Hops)
+}
+
+func TestNewReply_CarriesCorrelationAndHops(t *testing.T) {
+	cause := &pubsub.AdmineMessage{ID: "a1", Hops: []pubsub.Hop{{Service: "bot", Stage: "publish", At: 1000}}}
+	cause.AddHop("server_handler", "receive")
+
+	reply := pubsub.NewReply(cause, "server_handler", []string{"server_on"}, "up")
+	reply.Stamp("server_handler")
+
+	assert.Equal(t, "a1", reply.CorrelationID)
+	assert.NotEmpty(t, reply.ID)
+	assert.NotEqual(t, cause.ID, reply.ID)
+	assert.Len(t, reply.Hops, 3)
+	assert.Equal(t, "publish", reply.Hops[2].Stage)
+	assert.Equal(t, reply.Hops[2].At, reply.EmittedAt)
+	assert.Len(t, cause.Hops, 2, "the cause's hops must not be modified by the reply")
+}
+
+func TestNewReply_KeepsExistingCorrelationID(t *testing.T) {
+	cause := &pubsub.AdmineMessage{ID: "b2", CorrelationID: "a1"}
+
+	reply := pubsub.NewReply(cause, "server_handler", []string{"notification"}, "ok")
+
+	assert.Equal(t, "a1", reply.CorrelationID)
+}
@@ -19,6 +19,8 @@ func NewRedis(c config.PubSubConfig, ctx context.Context) (PubSubService, error)
 	switch c.Type {
 	case "redis":
 		return newRedisPubSub(c.Redis, ctx), nil
+	case "redis_streams":
+		return newRedisStreamsPubSub(c.Redis, ctx), nil
 	default:
 		return nil, fmt.Errorf("unknown pubsub type: %s", c.Type)
 	}
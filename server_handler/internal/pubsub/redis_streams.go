@@ -0,0 +1,156 @@
+package pubsub
+
+import (
+	"context"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"log/slog"
+	"strings"
+	"time"
+
+	"github.com/GustaMantovani/Admine/server_handler/internal/config"
+	"github.com/redis/go-redis/v9"
+)
+
+// Stream entry fields shared with the bot's REDIS_STREAMS provider
+const (
+	streamPayloadField = "data"
+	streamCodecField   = "codec"
+)
+
+// redisStreamsPubSub maps every topic to a Redis Stream. Publish appends with XADD and Subscribe
+// reads through a consumer group, so commands sent while server_handler is down are delivered
+// when it comes back.
+type redisStreamsPubSub struct {
+	client *redis.Client
+	cfg    config.RedisStreamsConfig
+	ctx    context.Context
+	cancel context.CancelFunc
+}
+
+func newRedisStreamsPubSub(c config.RedisConfig, ctx context.Context) *redisStreamsPubSub {
+	ctx, cancel := context.WithCancel(ctx)
+
+	client := redis.NewClient(&redis.Options{
+		Addr:     c.Addr,
+		Password: c.Password,
+		DB:       c.Db,
+	})
+
+	return &redisStreamsPubSub{
+		client: client,
+		cfg:    c.Streams,
+		ctx:    ctx,
+		cancel: cancel,
+	}
+}
+
+func (r *redisStreamsPubSub) Publish(topic string, msg *AdmineMessage) error {
+	data, err := json.Marshal(msg)
+	if err != nil {
+		return fmt.Errorf("failed to marshal message: %w", err)
+	}
+
+	slog.Debug("Appending stream entry", "stream", topic, "payload", string(data))
+	return r.client.XAdd(r.ctx, &redis.XAddArgs{
+		Stream: topic,
+		MaxLen: r.cfg.MaxLen,
+		Approx: true,
+		Values: map[string]interface{}{streamPayloadField: data, streamCodecField: "json"},
+	}).Err()
+}
+
+func (r *redisStreamsPubSub) Subscribe(topics ...string) (<-chan *AdmineMessage, error) {
+	for _, topic := range topics {
+		err := r.client.XGroupCreateMkStream(r.ctx, topic, r.cfg.Group, "$").Err()
+		if err != nil && !strings.Contains(err.Error(), "BUSYGROUP") {
+			return nil, fmt.Errorf("failed to create consumer group on %s: %w", topic, err)
+		}
+	}
+
+	ch := make(chan *AdmineMessage)
+	go func() {
+		defer close(ch)
+		// Entries delivered to this consumer before a restart are read again first
+		r.consume(ch, topics, "0")
+		r.consume(ch, topics, ">")
+	}()
+
+	return ch, nil
+}
+
+// consume reads entries from topics starting at id. "0" reads this consumer's pending entries
+// and returns once they are drained; ">" reads new entries until the context ends.
+func (r *redisStreamsPubSub) consume(ch chan<- *AdmineMessage, topics []string, id string) {
+	streams := make([]string, 0, 2*len(topics))
+	streams = append(streams, topics...)
+	for range topics {
+		streams = append(streams, id)
+	}
+
+	for r.ctx.Err() == nil {
+		result, err := r.client.XReadGroup(r.ctx, &redis.XReadGroupArgs{
+			Group:    r.cfg.Group,
+			Consumer: r.cfg.Consumer,
+			Streams:  streams,
+			Count:    r.cfg.BatchSize,
+			Block:    r.cfg.Block,
+		}).Result()
+		if errors.Is(err, redis.Nil) {
+			continue
+		}
+		if err != nil {
+			if r.ctx.Err() == nil {
+				slog.Error("Error reading streams", "error", err)
+				time.Sleep(time.Second)
+			}
+			continue
+		}
+
+		delivered := 0
+		for _, stream := range result {
+			for _, entry := range stream.Messages {
+				delivered++
+				if msg, err := decodeStreamEntry(entry.Values); err != nil {
+					slog.Error("Dropping malformed stream entry", "stream", stream.Stream, "id", entry.ID, "error", err)
+				} else {
+					select {
+					case ch <- msg:
+					case <-r.ctx.Done():
+						return
+					}
+				}
+				// Acknowledged once handed over; the handler runs commands one at a time
+				if err := r.client.XAck(r.ctx, stream.Stream, r.cfg.Group, entry.ID).Err(); err != nil {
+					slog.Error("Error acknowledging stream entry", "stream", stream.Stream, "id", entry.ID, "error", err)
+				}
+			}
+		}
+		if id != ">" && delivered == 0 {
+			return
+		}
+	}
+}
+
+// decodeStreamEntry reads the JSON envelope of a stream entry. Entries written with another codec
+// (the bot's msgpack option) can't be read here and are reported as errors.
+func decodeStreamEntry(values map[string]interface{}) (*AdmineMessage, error) {
+	if codec, ok := values[streamCodecField]; ok && codec != "json" {
+		return nil, fmt.Errorf("unsupported codec %v", codec)
+	}
+	data, ok := values[streamPayloadField].(string)
+	if !ok {
+		return nil, fmt.Errorf("missing %q field", streamPayloadField)
+	}
+	var msg AdmineMessage
+	if err := json.Unmarshal([]byte(data), &msg); err != nil {
+		return nil, err
+	}
+	return &msg, nil
+}
+
+func (r *redisStreamsPubSub) Close() error {
+	r.cancel()
+	return r.client.Close()
+}
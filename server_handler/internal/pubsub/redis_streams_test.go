@@ -0,0 +1,35 @@
+package pubsub
+
+import (
+	"testing"
+
+	"github.com/stretchr/testify/assert"
+)
+
+func TestDecodeStreamEntry_ReadsJSONEnvelope(t *testing.T) {
+	values := map[string]interface{}{
+		"data":  `{"origin":"Bot","tags":["server_on"],"message":" ","id":"a1"}`,
+		"codec": "json",
+	}
+
+	msg, err := decodeStreamEntry(values)
+
+	assert.NoError(t, err)
+	assert.Equal(t, "a1", msg.ID)
+	assert.True(t, msg.HasTag("server_on"))
+}
+
+func TestDecodeStreamEntry_WithoutCodecFieldIsJSON(t *testing.T) {
+	msg, err := decodeStreamEntry(map[string]interface{}{"data": `{"origin":"Bot","tags":["command"],"message":"list"}`})
+
+	assert.NoError(t, err)
+	assert.Equal(t, "list", msg.Message)
+}
+
+func TestDecodeStreamEntry_RejectsOtherCodecsAndMissingData(t *testing.T) {
+	_, err := decodeStreamEntry(map[string]interface{}{"data": "\x83", "codec": "msgpack"})
+	assert.ErrorContains(t, err, "unsupported codec")
+
+	_, err = decodeStreamEntry(map[string]interface{}{})
+	assert.ErrorContains(t, err, "missing")
+}
@@ -254,6 +254,52 @@ func (d *dockerMinecraftServer) Logs(ctx context.Context, n int) ([]string, erro
 	return d.compose.ReadLastServiceLogs(uint(n))
 }
 
+// LogsSince returns up to n lines logged after since (the last n lines for a zero since) together with the
+// timestamp of the newest line, which callers pass back as the next since to only receive new lines.
+func (d *dockerMinecraftServer) LogsSince(ctx context.Context, since time.Time, n int) ([]string, time.Time, error) {
+	sinceArg := ""
+	if !since.IsZero() {
+		// docker includes lines logged exactly at --since, so start one nanosecond after the last line seen
+		sinceArg = since.Add(time.Nanosecond).UTC().Format(time.RFC3339Nano)
+	}
+
+	var raw []string
+	var err error
+	if d.cfg.Docker.ServiceName != "" {
+		raw, err = d.compose.ReadServiceLogsSince(sinceArg, uint(n), d.cfg.Docker.ServiceName)
+		if err != nil {
+			slog.Warn("Failed to read logs for configured service, retrying without service filter", "service", d.cfg.Docker.ServiceName, "error", err)
+			raw, err = d.compose.ReadServiceLogsSince(sinceArg, uint(n))
+		}
+	} else {
+		raw, err = d.compose.ReadServiceLogsSince(sinceArg, uint(n))
+	}
+	if err != nil {
+		return nil, since, err
+	}
+
+	lines, cursor := splitTimestampedLines(raw, since)
+	return lines, cursor, nil
+}
+
+// splitTimestampedLines strips the leading RFC3339Nano timestamp docker adds with --timestamps and returns the
+// newest timestamp seen, or fallback when there is none.
+func splitTimestampedLines(raw []string, fallback time.Time) ([]string, time.Time) {
+	lines := make([]string, 0, len(raw))
+	cursor := fallback
+	for _, line := range raw {
+		stamp, text, found := strings.Cut(line, " ")
+		if at, err := time.Parse(time.RFC3339Nano, stamp); found && err == nil {
+			if at.After(cursor) {
+				cursor = at
+			}
+			line = text
+		}
+		lines = append(lines, line)
+	}
+	return lines, cursor
+}
+
 func (d *dockerMinecraftServer) StartUpInfo(ctx context.Context) string {
 	if d.cfg.Tailscale.Enabled && d.cfg.Tailscale.ContainerName != "" {
 		tsContainer := d.cfg.Tailscale.ContainerName
@@ -315,6 +361,47 @@ func (d *dockerMinecraftServer) ExecuteCommand(ctx context.Context, command stri
 	return NewCommandResultWithOutput(response), nil
 }
 
+// ExecuteCommands runs the commands in order over a single RCON connection. A failing command is recorded in its
+// result and the connection is re-established for the next one; only failing to connect at all is an error.
+func (d *dockerMinecraftServer) ExecuteCommands(ctx context.Context, commands []string) (*CommandBatchResult, error) {
+	conn, err := rcon.Dial(d.cfg.RconAddress, d.cfg.RconPassword)
+	if err != nil {
+		return nil, err
+	}
+	defer func() {
+		if conn != nil {
+			conn.Close()
+		}
+	}()
+
+	results := make([]BatchCommandResult, 0, len(commands))
+	for _, command := range commands {
+		if err := ctx.Err(); err != nil {
+			results = append(results, BatchCommandResult{Command: command, Error: err.Error()})
+			continue
+		}
+		if conn == nil {
+			if conn, err = rcon.Dial(d.cfg.RconAddress, d.cfg.RconPassword); err != nil {
+				conn = nil
+				results = append(results, BatchCommandResult{Command: command, Error: err.Error()})
+				continue
+			}
+		}
+
+		response, err := conn.Execute(command)
+		if err != nil {
+			slog.Warn("Batch command failed", "command", command, "error", err.Error())
+			results = append(results, BatchCommandResult{Command: command, Error: err.Error()})
+			conn.Close()
+			conn = nil
+			continue
+		}
+		results = append(results, BatchCommandResult{Command: command, Output: response})
+	}
+
+	return &CommandBatchResult{Results: results}, nil
+}
+
 func (d *dockerMinecraftServer) InstallMod(ctx context.Context, fileName string, modData io.Reader) (*ModInstallResult, error) {
 	serviceName := d.cfg.Docker.ServiceName
 
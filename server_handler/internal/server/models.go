@@ -87,6 +87,18 @@ func NewCommandResultWithExitCode(output string, exitCode int) *CommandResult {
 	}
 }
 
+// BatchCommandResult is the outcome of one command of a batch; Error is set instead of Output when it failed
+type BatchCommandResult struct {
+	Command string `json:"command"`
+	Output  string `json:"output"`
+	Error   string `json:"error,omitempty"`
+}
+
+// CommandBatchResult holds the results of a command batch, in the order the commands were given
+type CommandBatchResult struct {
+	Results []BatchCommandResult `json:"results"`
+}
+
 // ModInstallResult represents the result of a mod installation operation
 type ModInstallResult struct {
 	FileName string `json:"file_name"`
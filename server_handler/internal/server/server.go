@@ -4,6 +4,7 @@ import (
 	"context"
 	"fmt"
 	"io"
+	"time"
 
 	"github.com/GustaMantovani/Admine/server_handler/internal/config"
 	"github.com/GustaMantovani/Admine/server_handler/internal/docker"
@@ -18,8 +19,10 @@ type MinecraftServer interface {
 	Status(ctx context.Context) (*ServerStatus, error)
 	Info(ctx context.Context) (*ServerInfo, error)
 	Logs(ctx context.Context, n int) ([]string, error)
+	LogsSince(ctx context.Context, since time.Time, n int) ([]string, time.Time, error)
 	StartUpInfo(ctx context.Context) string
 	ExecuteCommand(ctx context.Context, command string) (*CommandResult, error)
+	ExecuteCommands(ctx context.Context, commands []string) (*CommandBatchResult, error)
 	InstallMod(ctx context.Context, fileName string, modData io.Reader) (*ModInstallResult, error)
 	ListMods(ctx context.Context) (*ModListResult, error)
 	RemoveMod(ctx context.Context, fileName string) (*ModInstallResult, error)
@@ -3,6 +3,7 @@ package testutils
 import (
 	"context"
 	"io"
+	"time"
 
 	"github.com/GustaMantovani/Admine/server_handler/internal/pubsub"
 	"github.com/GustaMantovani/Admine/server_handler/internal/server"
@@ -58,6 +59,14 @@ func (m *MockMinecraftServer) Logs(ctx context.Context, n int) ([]string, error)
 	return args.Get(0).([]string), args.Error(1)
 }
 
+func (m *MockMinecraftServer) LogsSince(ctx context.Context, since time.Time, n int) ([]string, time.Time, error) {
+	args := m.Called(ctx, since, n)
+	if args.Get(0) == nil {
+		return nil, since, args.Error(2)
+	}
+	return args.Get(0).([]string), args.Get(1).(time.Time), args.Error(2)
+}
+
 func (m *MockMinecraftServer) StartUpInfo(ctx context.Context) string {
 	args := m.Called(ctx)
 	return args.String(0)
@@ -71,6 +80,14 @@ func (m *MockMinecraftServer) ExecuteCommand(ctx context.Context, command string
 	return args.Get(0).(*server.CommandResult), args.Error(1)
 }
 
+func (m *MockMinecraftServer) ExecuteCommands(ctx context.Context, commands []string) (*server.CommandBatchResult, error) {
+	args := m.Called(ctx, commands)
+	if args.Get(0) == nil {
+		return nil, args.Error(1)
+	}
+	return args.Get(0).(*server.CommandBatchResult), args.Error(1)
+}
+
 func (m *MockMinecraftServer) InstallMod(ctx context.Context, fileName string, modData io.Reader) (*server.ModInstallResult, error) {
 	args := m.Called(ctx, fileName, modData)
 	if args.Get(0) == nil {